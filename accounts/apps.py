@@ -3,4 +3,7 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
-    verbose_name = '계정 관리'
\ No newline at end of file
+    verbose_name = '계정 관리'
+
+    def ready(self):
+        import accounts.signals  # 권한 캐시 무효화 시그널 등록
@@ -250,40 +250,9 @@ class User(AbstractUser):
         return False
     
     def has_permission(self, permission_code):
-        """특정 권한 보유 여부 확인"""
-        # 최고 관리자는 모든 권한 보유
-        if self.user_type == 'ADMIN' and self.admin_level == 5:
-            return True
-        
-        # 권한 레벨에 따른 기본 권한 체크
-        if self.user_type == 'ADMIN':
-            # 읽기 권한은 레벨 1 이상
-            if permission_code.endswith('_view') and self.admin_level >= 1:
-                return True
-            
-            # 생성/수정 권한은 레벨 2 이상
-            if permission_code in ['product_create', 'product_edit', 'order_edit'] and self.admin_level >= 2:
-                return True
-            
-            # 삭제/취소 권한은 레벨 3 이상
-            if permission_code in ['product_delete', 'order_cancel', 'user_edit'] and self.admin_level >= 3:
-                return True
-            
-            # 시스템/재무 권한은 레벨 4 이상
-            if permission_code.startswith(('system_', 'financial_')) and self.admin_level >= 4:
-                return True
-        
-        # 개별 권한 체크
-        from django.utils import timezone
-        permission = self.permissions.filter(
-            permission=permission_code,
-            is_active=True
-        ).first()
-        
-        if permission and not permission.is_expired:
-            return True
-        
-        return False
+        """특정 권한 보유 여부 확인 (관리자 레벨 규칙 + 개별 권한, accounts.permission_sets 참고)"""
+        from .permission_sets import user_has_permission
+        return user_has_permission(self, permission_code)
     
     def get_permissions(self):
         """사용자가 가진 모든 유효한 권한 목록 반환"""
@@ -315,14 +284,8 @@ class User(AbstractUser):
                 permissions.update([p[0] for p in UserPermission.PERMISSION_CHOICES if p[0].startswith(('system_', 'financial_', 'platform_'))])
         
         # 개별 부여된 권한
-        from django.utils import timezone
-        individual_perms = self.permissions.filter(
-            is_active=True
-        ).exclude(
-            expires_at__lt=timezone.now()
-        ).values_list('permission', flat=True)
-        
-        permissions.update(individual_perms)
+        from .permission_sets import get_granted_permissions
+        permissions.update(get_granted_permissions(self))
         
         return list(permissions)
 
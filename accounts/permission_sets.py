@@ -0,0 +1,110 @@
+# accounts/permission_sets.py
+"""
+사용자 권한 집합
+
+User.has_permission 은 관리자 레벨 규칙을 먼저 보고, 해당하지 않으면 개별로
+부여된 UserPermission 을 확인한다. 개별 권한은 사용자별로 한 번의 쿼리로
+읽어 {권한 코드: 만료일시} 로 공유 캐시에 보관하고, 같은 사용자 객체(요청의
+request.user)에도 보관하므로 한 요청 안의 권한 확인은 캐시를 한 번만 읽는다.
+
+만료일시는 확인할 때마다 비교하므로 캐시된 권한도 만료 시점에 바로 무효가
+된다. UserPermission 저장/삭제 시그널에서 해당 사용자의 캐시를 지운다.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+PERMISSION_CACHE_TIMEOUT = 60 * 60
+PERMISSION_CACHE_KEY = 'user_permission_grants:{user_id}'
+
+# 관리자 레벨 2/3 에서 허용되는 권한 (User.has_permission 규칙)
+LEVEL2_PERMISSIONS = frozenset(['product_create', 'product_edit', 'order_edit'])
+LEVEL3_PERMISSIONS = frozenset(['product_delete', 'order_cancel', 'user_edit'])
+
+
+def admin_level_allows(user, permission_code):
+    """관리자 레벨에 따른 기본 권한 여부"""
+    if user.user_type != 'ADMIN':
+        return False
+    level = user.admin_level
+    # 최고 관리자는 모든 권한 보유
+    if level >= 5:
+        return True
+    # 읽기 권한은 레벨 1 이상
+    if permission_code.endswith('_view') and level >= 1:
+        return True
+    # 생성/수정 권한은 레벨 2 이상
+    if permission_code in LEVEL2_PERMISSIONS and level >= 2:
+        return True
+    # 삭제/취소 권한은 레벨 3 이상
+    if permission_code in LEVEL3_PERMISSIONS and level >= 3:
+        return True
+    # 시스템/재무 권한은 레벨 4 이상
+    if permission_code.startswith(('system_', 'financial_')) and level >= 4:
+        return True
+    return False
+
+
+def load_permission_grants(user_id):
+    """활성 개별 권한 {권한 코드: 만료일시(None 이면 무기한)}"""
+    from .models import UserPermission
+
+    return dict(
+        UserPermission.objects.filter(user_id=user_id, is_active=True)
+        .values_list('permission', 'expires_at')
+    )
+
+
+def get_permission_grants(user):
+    """사용자의 개별 권한 (사용자 객체 → 공유 캐시 → DB 순으로 조회)"""
+    grants = getattr(user, '_permission_grants', None)
+    if grants is None:
+        key = PERMISSION_CACHE_KEY.format(user_id=user.pk)
+        grants = cache.get(key)
+        if grants is None:
+            grants = load_permission_grants(user.pk)
+            cache.set(key, grants, PERMISSION_CACHE_TIMEOUT)
+        user._permission_grants = grants
+    return grants
+
+
+def get_granted_permissions(user, now=None):
+    """만료되지 않은 개별 권한 코드 집합"""
+    now = now or timezone.now()
+    return {
+        code for code, expires_at in get_permission_grants(user).items()
+        if expires_at is None or expires_at >= now
+    }
+
+
+def has_granted_permission(user, permission_code):
+    """개별 권한 보유 여부"""
+    grants = get_permission_grants(user)
+    if permission_code not in grants:
+        return False
+    expires_at = grants[permission_code]
+    return expires_at is None or timezone.now() <= expires_at
+
+
+def user_has_permission(user, permission_code):
+    """관리자 레벨 규칙 + 개별 권한"""
+    if admin_level_allows(user, permission_code):
+        return True
+    return has_granted_permission(user, permission_code)
+
+
+def clear_permission_grants(user):
+    """사용자 객체에 보관된 권한 제거"""
+    user.__dict__.pop('_permission_grants', None)
+
+
+def invalidate_permission_grants(user_id):
+    """
+    사용자 권한 캐시 무효화
+
+    바로 지우고 트랜잭션 커밋 후에 한 번 더 지운다 (커밋 전에 다른 요청이
+    이전 권한으로 다시 채운 경우 대비).
+    """
+    key = PERMISSION_CACHE_KEY.format(user_id=user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
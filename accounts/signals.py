@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import UserPermission
+from .permission_sets import clear_permission_grants, invalidate_permission_grants
+
+
+@receiver(post_save, sender=UserPermission)
+@receiver(post_delete, sender=UserPermission)
+def invalidate_user_permissions(sender, instance, **kwargs):
+    """개별 권한 변경 시 해당 사용자의 권한 캐시 무효화"""
+    invalidate_permission_grants(instance.user_id)
+    
+    # 같은 사용자 객체로 권한을 부여한 경우 (user.permissions.create 등) 바로 반영
+    user = instance._state.fields_cache.get('user')
+    if user is not None:
+        clear_permission_grants(user)
@@ -37,7 +37,8 @@ class ProductSerializer(serializers.ModelSerializer):
         ]
     
     def get_primary_image(self, obj):
-        primary_image = obj.images.filter(is_primary=True).first()
+        # 목록 쿼리셋은 Product.objects.with_primary_image() 로 대표 이미지를 미리 가져온다
+        primary_image = obj.primary_image
         if primary_image:
             return ProductImageSerializer(primary_image).data
         return None
@@ -1,3 +1,58 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+from products.models import Brand, Category, Product, ProductImage
+
+from .views import ProductViewSet
+
+
+class ProductListQueryCountTest(TestCase):
+    """상품 목록 API 의 쿼리 수는 페이지 크기와 무관"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='api', password='pass', user_type='ADMIN')
+        brand = Brand.objects.create(name='브랜드', code='BR')
+        parent = Category.objects.create(name='의류', code='CLOTH')
+        category = Category.objects.create(name='상의', code='TOP', parent=parent)
+
+        for i in range(12):
+            # 절반은 재고 부족 (min_stock_level 이하)
+            product = Product.objects.create(
+                sku=f'API-{i}', name=f'상품 {i}', brand=brand, category=category,
+                cost_price=500, selling_price=1000, status='ACTIVE',
+                stock_quantity=1 if i % 2 else 100, min_stock_level=5
+            )
+            ProductImage.objects.create(product=product, image=f'products/{i}.jpg', is_primary=True)
+            ProductImage.objects.create(product=product, image=f'products/{i}-2.jpg')
+
+    def get(self, url, action, page_size):
+        request = APIRequestFactory().get(url)
+        force_authenticate(request, user=self.user)
+        with mock.patch.object(PageNumberPagination, 'page_size', page_size):
+            response = ProductViewSet.as_view({'get': action})(request)
+            response.render()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), page_size)
+
+    def assert_same_query_count(self, url, action, small, large):
+        # 카테고리 트리 등 프로세스 캐시를 먼저 채운다
+        self.get(url, action, small)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get(url, action, small)
+
+        with self.assertNumQueries(len(queries)):
+            self.get(url, action, large)
+
+    def test_product_list(self):
+        self.assert_same_query_count('/api/products/', 'list', 2, 12)
 
-# Create your tests here.
+    def test_low_stock(self):
+        self.assert_same_query_count('/api/products/low_stock/', 'low_stock', 2, 6)
@@ -11,8 +11,10 @@ from datetime import timedelta
 
 from products.models import Product, Category, Brand
 from orders.models import Order, OrderItem
+from orders.rollups import sales_totals, daily_sales_totals
 from platforms.models import Platform, PlatformProduct
 from inventory.models import StockMovement
+from search.backends import search_products
 from .serializers import (
     ProductSerializer, ProductDetailSerializer,
     OrderSerializer, OrderDetailSerializer,
@@ -21,7 +23,7 @@ from .serializers import (
 )
 
 class ProductViewSet(viewsets.ModelViewSet):
-    queryset = Product.objects.select_related('brand', 'category').prefetch_related('images')
+    queryset = Product.objects.select_related('brand', 'category', 'category__parent').with_primary_image()
     serializer_class = ProductSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -179,9 +181,10 @@ class DashboardStatsView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        today = timezone.now().date()
+        today = timezone.localdate()
         week_ago = today - timedelta(days=7)
         month_ago = today - timedelta(days=30)
+        revenue_statuses = ['CONFIRMED', 'PROCESSING', 'SHIPPED', 'DELIVERED']
         
         # 상품 통계
         total_products = Product.objects.filter(status='ACTIVE').count()
@@ -190,24 +193,16 @@ class DashboardStatsView(APIView):
             status='ACTIVE'
         ).count()
         
-        # 주문 통계
-        today_orders = Order.objects.filter(order_date__date=today).count()
-        week_orders = Order.objects.filter(order_date__date__gte=week_ago).count()
-        month_revenue = Order.objects.filter(
-            order_date__date__gte=month_ago,
-            status__in=['CONFIRMED', 'PROCESSING', 'SHIPPED', 'DELIVERED']
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
+        # 주문 통계 (일별 매출 집계에서 조회)
+        today_orders = sales_totals(today, today)['orders']
+        week_orders = sales_totals(week_ago)['orders']
+        month_revenue = sales_totals(month_ago, statuses=revenue_statuses)['revenue']
         
         # 매출 차트 데이터 (최근 30일)
-        daily_sales = Order.objects.filter(
-            order_date__date__gte=month_ago,
-            status__in=['CONFIRMED', 'PROCESSING', 'SHIPPED', 'DELIVERED']
-        ).extra(
-            select={'day': 'date(order_date)'}
-        ).values('day').annotate(
-            total=Sum('total_amount'),
-            count=Count('id')
-        ).order_by('day')
+        daily_sales = [
+            {'day': row['date'].isoformat(), 'total': row['total'], 'count': row['count']}
+            for row in daily_sales_totals(month_ago, statuses=revenue_statuses)
+        ]
         
         # 상품 상태별 통계
         product_status = Product.objects.values('status').annotate(
@@ -225,7 +220,7 @@ class DashboardStatsView(APIView):
                 'month_revenue': float(month_revenue),
             },
             'charts': {
-                'daily_sales': list(daily_sales),
+                'daily_sales': daily_sales,
                 'product_status': list(product_status),
             }
         })
@@ -240,9 +235,9 @@ class ProductSearchView(APIView):
         if len(query) < 2:
             return Response({'products': []})
         
-        products = Product.objects.filter(
-            Q(name__icontains=query) | Q(sku__icontains=query)
-        ).select_related('brand')[:20]
+        products = search_products(
+            query, Product.objects.select_related('brand').with_primary_image()
+        )[:20]
         
         data = [
             {
@@ -252,7 +247,7 @@ class ProductSearchView(APIView):
                 'brand': product.brand.name if product.brand else '',
                 'price': str(product.final_price),
                 'stock': product.stock_quantity,
-                'image': product.images.filter(is_primary=True).first().image.url if product.images.filter(is_primary=True).exists() else None,
+                'image': product.primary_image_url,
             }
             for product in products
         ]
@@ -1,20 +1,44 @@
 import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.core.exceptions import ValidationError
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.contrib.auth import get_user_model
+from .message_buffer import get_message_buffer
 from .models import ChatSession, ChatMessage, ChatNote
+from .scheduler import (
+    DASHBOARD_GROUP, AGENT_GROUP, session_entry, get_waiting_queue, claim_session,
+    assign_session, fill_agent, release_session_agent, mark_agent_online,
+    mark_agent_offline, touch_agent
+)
 
 User = get_user_model()
 
 
 class ChatConsumer(AsyncWebsocketConsumer):
+    """
+    채팅 세션 WebSocket Consumer
+    
+    세션과 발신자 정보는 연결 시 한 번만 읽는다. 메시지는 MessageBuffer 에 넣은
+    뒤 바로 브로드캐스트하고, 저장은 버퍼가 모아서 한다 (chat.message_buffer).
+    """
+
     async def connect(self):
-        print(f"ChatConsumer connect called")  # 디버깅용
         self.session_id = self.scope['url_route']['kwargs']['session_id']
         self.session_group_name = f'chat_{self.session_id}'
         self.user = self.scope['user']
-        print(f"Session ID: {self.session_id}, User: {self.user}")  # 디버깅용
+        
+        self.session = await self.load_session()
+        if self.session is None:
+            await self.close()
+            return
+        
+        self.is_agent = self.user.is_authenticated and self.user.user_type in ['STAFF', 'ADMIN']
+        self.sender_type = 'agent' if self.is_agent else 'customer'
+        self.sender_name = self.user.username if self.user.is_authenticated else '익명'
+        self.message_buffer = get_message_buffer()
         
         # 그룹에 참가
         await self.channel_layer.group_add(
@@ -23,21 +47,38 @@ class ChatConsumer(AsyncWebsocketConsumer):
         )
         
         await self.accept()
-        print(f"WebSocket accepted for session {self.session_id}")  # 디버깅용
         
         # 세션 상태 업데이트
-        if self.user.is_authenticated and self.user.user_type in ['STAFF', 'ADMIN']:
+        if self.is_agent:
+            was_waiting = self.session.status == 'waiting'
             await self.update_session_status('active')
             await self.send_system_message('상담원이 연결되었습니다.')
+            if was_waiting:
+                # 대시보드 대기열에서 제거
+                await self.channel_layer.group_send(
+                    DASHBOARD_GROUP,
+                    {
+                        'type': 'session_status_update',
+                        'data': {
+                            'session_id': str(self.session_id),
+                            'status': 'active',
+                            'agent': self.user.username
+                        }
+                    }
+                )
         else:
             await self.send_system_message('고객님이 연결되었습니다.')
-            # 새 채팅 상담 알림을 관리자 대시보드에 전송
-            await self.notify_new_chat_session()
+            if self.session.status == 'waiting':
+                # 새 채팅 상담 알림을 관리자 대시보드에 전송하고 한가한 상담원에게 배정
+                await self.notify_new_chat_session()
+                await database_sync_to_async(assign_session)(self.session_id)
     
     async def disconnect(self, close_code):
+        if getattr(self, 'session', None) is None:
+            return
+        
         # 연결 종료 전에 상대방에게 알림
-        user_type = await self.get_sender_type()
-        if user_type == 'agent':
+        if self.sender_type == 'agent':
             await self.send_system_message('상담원이 채팅을 종료했습니다.')
         else:
             await self.send_system_message('고객님이 채팅을 종료했습니다.')
@@ -47,12 +88,13 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.session_group_name,
             self.channel_name
         )
+        
+        # 이 연결이 보낸 메시지가 저장된 뒤 종료
+        await self.message_buffer.flush()
     
     async def receive(self, text_data):
-        print(f"Received data: {text_data}")  # 디버깅용
         data = json.loads(text_data)
         message_type = data.get('type', 'message')
-        print(f"Message type: {message_type}")  # 디버깅용
         
         if message_type == 'message':
             await self.handle_message(data)
@@ -69,11 +111,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
         content = data.get('message', '') or data.get('content', '')  # 'message' 필드도 체크
         file_url = data.get('file_url', '')
         message_type = data.get('message_type', 'text')
-        print(f"Handling message: {content}")  # 디버깅용
         
-        # 메시지 저장
+        # 메시지 저장 (버퍼)
         message = await self.save_message(content, message_type, file_url)
-        print(f"Message saved: {message.id}")  # 디버깅용
         
         # 그룹의 모든 사용자에게 메시지 전송
         await self.channel_layer.group_send(
@@ -83,8 +123,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 'message': {
                     'id': str(message.id),
                     'content': content,
-                    'sender': self.user.username if self.user.is_authenticated else '익명',
-                    'sender_type': await self.get_sender_type(),
+                    'sender': self.sender_name,
+                    'sender_type': self.sender_type,
                     'message_type': message_type,
                     'file_url': file_url,
                     'created_at': message.created_at.isoformat(),
@@ -100,7 +140,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
             {
                 'type': 'typing_indicator',
                 'data': {
-                    'user': self.user.username if self.user.is_authenticated else '익명',
+                    'user': self.sender_name,
                     'is_typing': is_typing,
                 }
             }
@@ -109,6 +149,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
     async def handle_read(self, data):
         message_id = data.get('message_id')
         if message_id:
+            # 아직 버퍼에 있는 메시지일 수 있으므로 먼저 저장
+            await self.message_buffer.flush()
             await self.mark_message_as_read(message_id)
     
     async def handle_end_chat(self, data):
@@ -135,7 +177,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         
         # 관리자 대시보드에도 알림
         await self.channel_layer.group_send(
-            'agent_dashboard',
+            DASHBOARD_GROUP,
             {
                 'type': 'session_status_update',
                 'data': {
@@ -145,6 +187,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 }
             }
         )
+        
+        # 담당 상담원에게 다음 대기 채팅 배정
+        await database_sync_to_async(release_session_agent)(self.session_id)
     
     async def handle_rating(self, data):
         rating = data.get('rating')
@@ -194,98 +239,87 @@ class ChatConsumer(AsyncWebsocketConsumer):
         )
     
     @database_sync_to_async
-    def save_message(self, content, message_type='text', file_url=''):
-        session = ChatSession.objects.get(id=self.session_id)
-        sender_type = self.get_sender_type_sync()
-        
-        return ChatMessage.objects.create(
-            session=session,
+    def load_session(self):
+        try:
+            return ChatSession.objects.select_related('customer').filter(id=self.session_id).first()
+        except ValidationError:
+            # 잘못된 세션 ID
+            return None
+    
+    async def save_message(self, content, message_type='text', file_url=''):
+        return await self.message_buffer.add(
+            session=self.session,
             sender=self.user if self.user.is_authenticated else None,
-            sender_type=sender_type,
+            sender_type=self.sender_type,
             message_type=message_type,
             content=content,
             file_url=file_url
         )
     
-    @database_sync_to_async
-    def save_system_message(self, content):
-        session = ChatSession.objects.get(id=self.session_id)
-        
-        return ChatMessage.objects.create(
-            session=session,
+    async def save_system_message(self, content):
+        return await self.message_buffer.add(
+            session=self.session,
             sender=None,
             sender_type='system',
             message_type='system',
             content=content
         )
     
-    @database_sync_to_async
-    def get_sender_type(self):
-        return self.get_sender_type_sync()
-    
-    def get_sender_type_sync(self):
-        if not self.user.is_authenticated:
-            return 'customer'
-        elif self.user.user_type in ['STAFF', 'ADMIN']:
-            return 'agent'
-        else:
-            return 'customer'
-    
     @database_sync_to_async
     def update_session_status(self, status):
-        session = ChatSession.objects.get(id=self.session_id)
-        session.status = status
+        now = timezone.now()
+        fields = {'status': status}
         
-        if status == 'active' and not session.started_at:
-            session.started_at = timezone.now()
-            if self.user.is_authenticated and self.user.user_type in ['STAFF', 'ADMIN']:
-                session.agent = self.user
-        elif status == 'closed' and not session.ended_at:
-            session.ended_at = timezone.now()
+        if status == 'active':
+            # 시작 시각과 상담원은 처음 시작될 때만 기록 (UPDATE 는 이전 값 기준으로 평가)
+            fields['started_at'] = Coalesce('started_at', Value(now))
+            if self.is_agent:
+                fields['agent'] = Case(
+                    When(started_at__isnull=True, then=Value(self.user.pk)),
+                    default=F('agent'),
+                    output_field=ChatSession._meta.get_field('agent').target_field
+                )
+        elif status == 'closed':
+            fields['ended_at'] = Coalesce('ended_at', Value(now))
         
-        session.save()
+        ChatSession.objects.filter(id=self.session_id).update(**fields)
+        self.session.status = status
     
     @database_sync_to_async
     def mark_message_as_read(self, message_id):
         try:
-            message = ChatMessage.objects.get(id=message_id, session_id=self.session_id)
-            if not message.is_read:
-                message.is_read = True
-                message.read_at = timezone.now()
-                message.save()
-        except ChatMessage.DoesNotExist:
+            ChatMessage.objects.filter(
+                id=message_id, session_id=self.session_id, is_read=False
+            ).update(is_read=True, read_at=timezone.now())
+        except ValidationError:
+            # 잘못된 메시지 ID
             pass
     
     @database_sync_to_async
     def save_rating(self, rating, feedback):
-        session = ChatSession.objects.get(id=self.session_id)
-        session.rating = rating
-        session.feedback = feedback
-        session.save()
+        ChatSession.objects.filter(id=self.session_id).update(rating=rating, feedback=feedback)
+        self.session.rating = rating
+        self.session.feedback = feedback
     
-    @database_sync_to_async
-    def notify_new_chat_session(self):
+    async def notify_new_chat_session(self):
         """새 채팅 세션을 관리자 대시보드에 알림"""
-        session = ChatSession.objects.get(id=self.session_id)
-        
         # 관리자 대시보드에 알림
-        return self.channel_layer.group_send(
-            'agent_dashboard',
+        await self.channel_layer.group_send(
+            DASHBOARD_GROUP,
             {
                 'type': 'new_chat_session',
-                'data': {
-                    'id': str(session.id),
-                    'session_number': session.session_number,
-                    'customer_name': session.customer_name or (session.customer.username if session.customer else '익명'),
-                    'subject': session.subject or '상담 요청',
-                    'created_at': session.created_at.isoformat(),
-                }
+                'data': session_entry(self.session)
             }
         )
 
 
 class AgentDashboardConsumer(AsyncWebsocketConsumer):
-    """상담원 대시보드용 WebSocket Consumer"""
+    """
+    상담원 대시보드용 WebSocket Consumer
+    
+    연결 시 워커의 대기열(chat.scheduler.WaitingQueue) 전체를 보내고, 이후에는
+    대기열 추가/제거와 이 상담원에게 배정된 채팅만 보낸다.
+    """
     
     async def connect(self):
         self.user = self.scope['user']
@@ -294,24 +328,33 @@ class AgentDashboardConsumer(AsyncWebsocketConsumer):
             await self.close()
             return
         
-        self.dashboard_group_name = 'agent_dashboard'
+        self.dashboard_group_name = DASHBOARD_GROUP
+        self.agent_group_name = AGENT_GROUP.format(agent_id=self.user.pk)
+        self.waiting_queue = get_waiting_queue()
         
-        # 대시보드 그룹에 참가
-        await self.channel_layer.group_add(
-            self.dashboard_group_name,
-            self.channel_name
-        )
+        # 대시보드 그룹과 상담원 그룹에 참가 (대기열을 읽기 전에 참가해야 변경분을 놓치지 않음)
+        await self.channel_layer.group_add(self.dashboard_group_name, self.channel_name)
+        await self.channel_layer.group_add(self.agent_group_name, self.channel_name)
         
         await self.accept()
         
-        # 현재 대기중인 채팅 세션 정보 전송
+        await self.waiting_queue.acquire()
+        await database_sync_to_async(mark_agent_online)(self.user.pk)
+        
+        # 현재 대기열 전송
         await self.send_waiting_sessions()
+        
+        # 여유가 있으면 대기 중인 채팅 배정
+        await self.fill_capacity()
     
     async def disconnect(self, close_code):
-        await self.channel_layer.group_discard(
-            self.dashboard_group_name,
-            self.channel_name
-        )
+        if not hasattr(self, 'waiting_queue'):
+            return
+        
+        await self.channel_layer.group_discard(self.dashboard_group_name, self.channel_name)
+        await self.channel_layer.group_discard(self.agent_group_name, self.channel_name)
+        self.waiting_queue.release()
+        await database_sync_to_async(mark_agent_offline)(self.user.pk)
     
     async def receive(self, text_data):
         data = json.loads(text_data)
@@ -322,60 +365,56 @@ class AgentDashboardConsumer(AsyncWebsocketConsumer):
         elif action == 'join_chat':
             session_id = data.get('session_id')
             await self.join_chat_session(session_id)
+        elif action == 'ping':
+            await database_sync_to_async(touch_agent)(self.user.pk)
     
     async def new_chat_session(self, event):
-        """새로운 채팅 세션 알림"""
+        """새로운 채팅 세션: 대기열에 추가"""
+        self.waiting_queue.add(event['data'])
         await self.send(text_data=json.dumps({
-            'type': 'new_session',
+            'type': 'queue_add',
             'data': event['data']
         }))
     
     async def session_status_update(self, event):
-        """세션 상태 업데이트"""
+        """세션 상태 업데이트: 대기 상태가 아니면 대기열에서 제거"""
+        data = event['data']
+        if data.get('status') != 'waiting':
+            self.waiting_queue.remove(data['session_id'])
+        await self.send(text_data=json.dumps({
+            'type': 'queue_remove',
+            'data': data
+        }))
+    
+    async def chat_assigned(self, event):
+        """이 상담원에게 채팅 배정"""
         await self.send(text_data=json.dumps({
-            'type': 'status_update',
+            'type': 'assigned',
             'data': event['data']
         }))
     
-    @database_sync_to_async
-    def send_waiting_sessions(self):
-        sessions = ChatSession.objects.filter(status='waiting').select_related('customer')
-        
-        session_data = []
-        for session in sessions:
-            session_data.append({
-                'id': str(session.id),
-                'session_number': session.session_number,
-                'customer_name': session.customer_name or (session.customer.username if session.customer else '익명'),
-                'subject': session.subject or '상담 요청',
-                'created_at': session.created_at.isoformat(),
-            })
-        
-        return self.send(text_data=json.dumps({
-            'type': 'waiting_sessions',
-            'data': session_data
+    async def send_waiting_sessions(self):
+        await self.send(text_data=json.dumps({
+            'type': 'queue_snapshot',
+            'data': self.waiting_queue.entries()
         }))
     
-    @database_sync_to_async
-    def join_chat_session(self, session_id):
+    async def fill_capacity(self):
+        candidate_ids = self.waiting_queue.waiting_ids()
+        if candidate_ids:
+            await database_sync_to_async(fill_agent)(self.user, candidate_ids)
+    
+    async def join_chat_session(self, session_id):
         try:
-            session = ChatSession.objects.get(id=session_id, status='waiting')
-            session.agent = self.user
-            session.status = 'active'
-            session.started_at = timezone.now()
-            session.save()
-            
-            # 다른 상담원들에게 알림
-            return self.channel_layer.group_send(
-                self.dashboard_group_name,
-                {
-                    'type': 'session_status_update',
-                    'data': {
-                        'session_id': str(session.id),
-                        'status': 'active',
-                        'agent': self.user.username
-                    }
-                }
-            )
-        except ChatSession.DoesNotExist:
-            pass
\ No newline at end of file
+            claimed = await database_sync_to_async(claim_session)(session_id, self.user)
+        except ValidationError:
+            claimed = False
+        
+        await self.send(text_data=json.dumps({
+            'type': 'join_result',
+            'data': {
+                'session_id': session_id,
+                'success': claimed,
+                'redirect_url': f'/chat/room/{session_id}/' if claimed else None
+            }
+        }))
@@ -0,0 +1,88 @@
+# chat/management/commands/chat_benchmark.py
+import asyncio
+import time
+
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from chat.consumers import ChatConsumer
+from chat.message_buffer import DEFAULT_BATCH_SIZE, DEFAULT_FLUSH_INTERVAL_MS
+from chat.models import ChatMessage, ChatSession
+
+
+class Command(BaseCommand):
+    help = '채팅 Consumer 처리량 측정 (한 프로세스 안에서 WebSocket 세션 여러 개로 메시지 전송)'
+
+    def add_arguments(self, parser):
+        chat_settings = getattr(settings, 'CHAT_SETTINGS', {})
+        parser.add_argument('--clients', type=int, default=10, help='동시 채팅 세션 수 (기본값: 10)')
+        parser.add_argument('--messages', type=int, default=200, help='세션당 메시지 수 (기본값: 200)')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=chat_settings.get('MESSAGE_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+            help='메시지 저장 배치 크기 (1 이면 메시지마다 저장)'
+        )
+        parser.add_argument(
+            '--flush-interval',
+            type=int,
+            default=chat_settings.get('MESSAGE_FLUSH_INTERVAL_MS', DEFAULT_FLUSH_INTERVAL_MS),
+            help='메시지 저장 간격 (ms)'
+        )
+
+    def handle(self, *args, **options):
+        clients = options['clients']
+        messages = options['messages']
+
+        sessions = [
+            ChatSession.objects.create(customer_name='부하 테스트', subject='chat_benchmark')
+            for _ in range(clients)
+        ]
+        session_ids = [session.id for session in sessions]
+        chat_settings = {
+            'MESSAGE_BATCH_SIZE': options['batch_size'],
+            'MESSAGE_FLUSH_INTERVAL_MS': options['flush_interval'],
+        }
+
+        try:
+            with override_settings(CHAT_SETTINGS=chat_settings):
+                elapsed = asyncio.run(self.run_clients(session_ids, messages))
+            stored = ChatMessage.objects.filter(session_id__in=session_ids, sender_type='customer').count()
+        finally:
+            ChatSession.objects.filter(id__in=session_ids).delete()
+
+        total = clients * messages
+        self.stdout.write(
+            f"세션 {clients}개 x 메시지 {messages}개, 배치 {options['batch_size']}, "
+            f"간격 {options['flush_interval']}ms"
+        )
+        self.stdout.write(f'{total}개 / {elapsed:.2f}초 = {total / elapsed:,.0f} msgs/sec')
+        if stored == total:
+            self.stdout.write(self.style.SUCCESS(f'저장된 메시지: {stored}개'))
+        else:
+            self.stdout.write(self.style.ERROR(f'저장된 메시지: {stored}개 (기대값 {total}개)'))
+
+    async def run_clients(self, session_ids, messages):
+        start = time.perf_counter()
+        await asyncio.gather(*(self.run_client(session_id, messages) for session_id in session_ids))
+        return time.perf_counter() - start
+
+    async def run_client(self, session_id, messages):
+        """메시지를 보내고 브로드캐스트를 받을 때까지 기다리는 것을 반복"""
+        communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), f'/ws/chat/{session_id}/')
+        communicator.scope['url_route'] = {'kwargs': {'session_id': str(session_id)}}
+        communicator.scope['user'] = AnonymousUser()
+
+        connected, _ = await communicator.connect(timeout=10)
+        if not connected:
+            raise RuntimeError(f'WebSocket 연결 실패: {session_id}')
+        await communicator.receive_json_from(timeout=10)  # 연결 시스템 메시지
+
+        for i in range(messages):
+            await communicator.send_json_to({'type': 'message', 'message': f'부하 테스트 메시지 {i}'})
+            await communicator.receive_json_from(timeout=10)
+
+        await communicator.disconnect(timeout=10)
@@ -0,0 +1,110 @@
+# chat/message_buffer.py
+"""
+채팅 메시지 지연 저장 (write-behind)
+
+ChatConsumer 는 메시지를 바로 INSERT 하지 않고 워커(이벤트 루프)마다 하나인
+MessageBuffer 에 넣은 뒤 바로 브로드캐스트한다. 버퍼는 BATCH_SIZE 개가
+모이거나 첫 메시지 후 FLUSH_INTERVAL_MS 가 지나면 bulk_create 로 한 번에
+저장한다.
+
+- 메시지 ID(UUID)와 created_at 은 버퍼에 넣을 때 정해지므로 브로드캐스트한
+  값과 저장된 값이 같다. created_at 은 워커 안에서 단조 증가하도록 보정한다.
+- 저장은 잠금 아래에서 넣은 순서대로만 일어나므로 배치 사이 순서가 바뀌지
+  않는다.
+- 연결 종료, 읽음 처리처럼 저장된 메시지가 필요한 작업 전에는 flush() 를
+  기다린다.
+"""
+import asyncio
+import logging
+from datetime import timedelta
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL_MS = 50
+
+
+def get_chat_setting(name, default):
+    return getattr(settings, 'CHAT_SETTINGS', {}).get(name, default)
+
+
+class MessageBuffer:
+    """이벤트 루프 하나에서 공유하는 메시지 저장 버퍼"""
+
+    def __init__(self, batch_size=None, flush_interval_ms=None):
+        self.batch_size = batch_size or get_chat_setting('MESSAGE_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        self.flush_interval = (
+            flush_interval_ms if flush_interval_ms is not None
+            else get_chat_setting('MESSAGE_FLUSH_INTERVAL_MS', DEFAULT_FLUSH_INTERVAL_MS)
+        ) / 1000
+        self._pending = []
+        self._lock = asyncio.Lock()
+        self._timer = None
+        self._flush_task = None
+        self._last_created_at = None
+
+    def _next_created_at(self):
+        """워커 안에서 단조 증가하는 생성 시각"""
+        now = timezone.now()
+        if self._last_created_at is not None and now <= self._last_created_at:
+            now = self._last_created_at + timedelta(microseconds=1)
+        self._last_created_at = now
+        return now
+
+    async def add(self, **fields):
+        """메시지를 버퍼에 넣고 (아직 저장되지 않은) ChatMessage 반환"""
+        message = ChatMessage(created_at=self._next_created_at(), **fields)
+        self._pending.append(message)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._flush_later)
+        return message
+
+    def _flush_later(self):
+        self._timer = None
+        self._flush_task = asyncio.ensure_future(self.flush())
+
+    async def flush(self):
+        """버퍼의 메시지를 넣은 순서대로 저장"""
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch, self._pending = self._pending, []
+            if batch:
+                await database_sync_to_async(self._write)(batch)
+
+    @staticmethod
+    def _write(batch):
+        try:
+            ChatMessage.objects.bulk_create(batch)
+        except Exception as e:
+            # 한 건 때문에 배치 전체를 잃지 않도록 개별 저장으로 재시도
+            logger.warning(f"채팅 메시지 일괄 저장 실패, 개별 저장으로 재시도: {str(e)}")
+            for message in batch:
+                try:
+                    message.save(force_insert=True)
+                except Exception as e:
+                    logger.error(f"채팅 메시지 저장 실패: {message.id} - {str(e)}")
+
+
+_buffers = {}
+
+
+def get_message_buffer():
+    """현재 이벤트 루프의 메시지 버퍼"""
+    loop = asyncio.get_running_loop()
+    buffer = _buffers.get(loop)
+    if buffer is None:
+        # 닫힌 루프의 버퍼 정리 (테스트 등에서 루프가 바뀌는 경우)
+        for stale in [key for key in _buffers if key.is_closed()]:
+            del _buffers[stale]
+        buffer = _buffers[loop] = MessageBuffer()
+    return buffer
@@ -84,8 +84,8 @@ class ChatMessage(models.Model):
     content = models.TextField()
     file_url = models.URLField(null=True, blank=True)
     
-    # 시간 정보
-    created_at = models.DateTimeField(auto_now_add=True)
+    # 시간 정보 (지연 저장 시 버퍼에 넣은 시각을 유지하도록 auto_now_add 대신 default 사용)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     is_read = models.BooleanField(default=False)
     read_at = models.DateTimeField(null=True, blank=True)
     
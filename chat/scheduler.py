@@ -0,0 +1,313 @@
+# chat/scheduler.py
+"""
+채팅 상담 배정 스케줄러
+
+새 채팅은 접속 중인 상담원 중 진행 중인 채팅이 가장 적은 상담원에게 자동
+배정한다 (같으면 무작위). 배정과 상담원의 직접 참여는 모두 claim_session 의
+UPDATE ... WHERE status='waiting' (compare-and-set) 으로 처리하므로 같은
+채팅을 두 상담원이 동시에 가져갈 수 없다. 자동 배정은 같은 UPDATE 에
+상담원의 진행 중인 채팅 수 < MAX_CHATS_PER_AGENT 조건을 더하고 상담원 행을
+잠가, 여러 워커가 동시에 배정해도 한도를 넘지 않는다.
+
+- 상담원 접속 여부: 공유 캐시의 상담원별 연결 수 (대시보드 연결/해제 시
+  증감, 대시보드 ping 으로 PRESENCE_TIMEOUT 마다 갱신). 접속 중인 상담원
+  목록은 공유 색인 없이 상담원(STAFF/ADMIN) ID 의 키를 한 번에 읽어 구한다.
+- 대기열: 대시보드가 연결된 워커마다 WaitingQueue 하나를 메모리에 두고,
+  첫 연결 때 DB 에서 읽은 뒤에는 'agent_dashboard' 그룹의 변경분(추가/제거)만
+  반영한다. 변경분 적용은 멱등이므로 같은 워커의 여러 Consumer 가 같은
+  이벤트를 받아도 된다. 대시보드에는 연결 시 대기열 전체, 이후 변경분만 보낸다.
+- 상담원 여유가 생기면(대시보드 접속, 채팅 종료) 가장 오래 기다린 채팅부터
+  가져간다.
+"""
+import asyncio
+import heapq
+import random
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, IntegerField, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .message_buffer import get_chat_setting
+from .models import ChatSession
+
+DASHBOARD_GROUP = 'agent_dashboard'
+AGENT_GROUP = 'chat_agent_{agent_id}'
+PRESENCE_KEY = 'chat_agent_online:{agent_id}'
+AGENT_USER_TYPES = ['STAFF', 'ADMIN']
+
+DEFAULT_MAX_CHATS_PER_AGENT = 5
+DEFAULT_PRESENCE_TIMEOUT = 120  # 초
+
+
+def session_entry(session):
+    """대기열 항목 (대시보드로 보내는 세션 정보)"""
+    return {
+        'id': str(session.id),
+        'session_number': session.session_number,
+        'customer_name': session.customer_name or (session.customer.username if session.customer else '익명'),
+        'subject': session.subject or '상담 요청',
+        'created_at': session.created_at.isoformat(),
+    }
+
+
+def _group_send(group, message):
+    channel_layer = get_channel_layer()
+    if channel_layer:
+        async_to_sync(channel_layer.group_send)(group, message)
+
+
+# 상담원 접속 여부
+
+def _presence_timeout():
+    return get_chat_setting('AGENT_PRESENCE_TIMEOUT', DEFAULT_PRESENCE_TIMEOUT)
+
+
+def mark_agent_online(agent_id):
+    key = PRESENCE_KEY.format(agent_id=agent_id)
+    cache.add(key, 0, _presence_timeout())
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, _presence_timeout())
+    cache.touch(key, _presence_timeout())
+
+
+def mark_agent_offline(agent_id):
+    try:
+        cache.decr(PRESENCE_KEY.format(agent_id=agent_id))
+    except ValueError:
+        pass
+
+
+def touch_agent(agent_id):
+    """대시보드 ping: 접속 표시 만료 연장 (이미 만료됐으면 다시 접속 표시)"""
+    key = PRESENCE_KEY.format(agent_id=agent_id)
+    if not cache.touch(key, _presence_timeout()):
+        cache.add(key, 1, _presence_timeout())
+
+
+def online_agent_ids():
+    """접속 중인 상담원 ID (상담원 ID 를 DB 에서 읽고 접속 표시는 한 번에 조회)"""
+    agent_ids = (
+        get_user_model().objects.filter(user_type__in=AGENT_USER_TYPES, is_active=True)
+        .order_by('pk').values_list('pk', flat=True)
+    )
+    keys = {agent_id: PRESENCE_KEY.format(agent_id=agent_id) for agent_id in agent_ids}
+    if not keys:
+        return []
+    values = cache.get_many(list(keys.values()))
+    return [agent_id for agent_id, key in keys.items() if (values.get(key) or 0) > 0]
+
+
+def agent_loads(agent_ids):
+    """상담원별 진행 중인 채팅 수"""
+    loads = dict.fromkeys(agent_ids, 0)
+    rows = (
+        ChatSession.objects.filter(status='active', agent_id__in=agent_ids)
+        .values('agent_id').annotate(count=Count('id')).order_by()
+    )
+    for row in rows:
+        loads[row['agent_id']] = row['count']
+    return loads
+
+
+# 배정
+
+def claim_session(session_id, agent, max_chats=None):
+    """
+    대기 중인 채팅을 상담원에게 배정 (compare-and-set)
+
+    다른 상담원이 먼저 가져갔거나 대기 중이 아니면 False. max_chats 를 주면
+    (자동 배정) 상담원의 진행 중인 채팅이 그보다 적을 때만 배정한다. 성공하면
+    대시보드에 대기열 제거를, 상담원에게 배정 알림을 보낸다.
+    """
+    sessions = ChatSession.objects.filter(id=session_id, status='waiting')
+    with transaction.atomic():
+        if max_chats is not None:
+            # 같은 상담원에 대한 배정을 직렬화 (동시 배정이 서로의 건수를 보도록)
+            list(get_user_model().objects.select_for_update().filter(pk=agent.pk).values_list('pk'))
+            active = (
+                ChatSession.objects.filter(agent=agent, status='active')
+                .order_by().values('agent').annotate(count=Count('id')).values('count')
+            )
+            sessions = sessions.alias(
+                agent_load=Coalesce(Subquery(active), Value(0), output_field=IntegerField())
+            ).filter(agent_load__lt=max_chats)
+
+        claimed = sessions.update(
+            status='active',
+            agent=agent,
+            started_at=timezone.now()
+        )
+    if not claimed:
+        return False
+
+    broadcast_removed(session_id, 'active', agent.username)
+    _group_send(AGENT_GROUP.format(agent_id=agent.pk), {
+        'type': 'chat_assigned',
+        'data': {
+            'session_id': str(session_id),
+            'redirect_url': f'/chat/room/{session_id}/',
+        }
+    })
+    return True
+
+
+def assign_session(session_id):
+    """
+    접속 중인 상담원 중 가장 한가한 상담원에게 배정 (배정된 상담원 반환)
+
+    진행 중인 채팅 수가 같으면 무작위로 고른다. 그 사이 다른 배정으로 상담원이
+    한도에 도달했으면 다음 상담원에게 시도한다.
+    """
+    agent_ids = online_agent_ids()
+    if not agent_ids:
+        return None
+
+    max_chats = get_chat_setting('MAX_CHATS_PER_AGENT', DEFAULT_MAX_CHATS_PER_AGENT)
+    loads = agent_loads(agent_ids)
+    candidates = [agent_id for agent_id, load in loads.items() if load < max_chats]
+    random.shuffle(candidates)
+    candidates.sort(key=loads.get)
+    agents = get_user_model().objects.in_bulk(candidates)
+
+    for agent_id in candidates:
+        agent = agents.get(agent_id)
+        if agent is not None and claim_session(session_id, agent, max_chats):
+            return agent
+        if not ChatSession.objects.filter(id=session_id, status='waiting').exists():
+            return None
+    return None
+
+
+def fill_agent(agent, candidate_ids=None):
+    """
+    상담원의 여유만큼 가장 오래 기다린 채팅을 배정
+
+    candidate_ids 를 주면 그 순서대로 시도하고 (대시보드 워커의 대기열),
+    없으면 DB 에서 대기 중인 채팅을 오래된 순으로 읽는다. 배정한 세션 ID 목록 반환.
+    """
+    max_chats = get_chat_setting('MAX_CHATS_PER_AGENT', DEFAULT_MAX_CHATS_PER_AGENT)
+    free = max_chats - agent_loads([agent.pk])[agent.pk]
+    if free <= 0:
+        return []
+
+    if candidate_ids is None:
+        candidate_ids = list(
+            ChatSession.objects.filter(status='waiting').order_by('created_at')
+            .values_list('id', flat=True)[:free * 2]
+        )
+
+    claimed = []
+    for session_id in candidate_ids:
+        if len(claimed) >= free:
+            break
+        if claim_session(session_id, agent, max_chats):
+            claimed.append(session_id)
+    return claimed
+
+
+def release_session_agent(session_id):
+    """채팅 종료 후 담당 상담원이 접속 중이면 다음 대기 채팅 배정"""
+    session = ChatSession.objects.select_related('agent').filter(id=session_id).first()
+    if session is None or session.agent is None:
+        return []
+    if session.agent_id not in online_agent_ids():
+        return []
+    return fill_agent(session.agent)
+
+
+def broadcast_removed(session_id, status, agent_username=None):
+    data = {'session_id': str(session_id), 'status': status}
+    if agent_username:
+        data['agent'] = agent_username
+    _group_send(DASHBOARD_GROUP, {'type': 'session_status_update', 'data': data})
+
+
+class WaitingQueue:
+    """
+    워커의 대기열 (created_at 순 우선순위 큐)
+
+    제거는 항목만 지우고 힙에는 남겨 두었다가 꺼낼 때 건너뛴다. DB 에서 읽는
+    동안 들어온 제거는 기록해 두었다가 읽은 결과에서 뺀다.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._removed_while_loading = set()
+        self._lock = asyncio.Lock()
+        self._users = 0
+        self.loaded = False
+
+    async def acquire(self):
+        """대시보드 연결: 첫 연결이면 DB 에서 대기열을 읽음"""
+        self._users += 1
+        async with self._lock:
+            if not self.loaded:
+                self._removed_while_loading = set()
+                entries = await database_sync_to_async(self._load)()
+                for entry in entries:
+                    if entry['id'] not in self._removed_while_loading:
+                        self.add(entry)
+                self._removed_while_loading = set()
+                self.loaded = True
+
+    def release(self):
+        """대시보드 연결 해제: 마지막 연결이면 대기열을 버림 (다음 연결 때 다시 읽음)"""
+        self._users -= 1
+        if self._users <= 0:
+            self._users = 0
+            self._heap = []
+            self._entries = {}
+            self.loaded = False
+
+    @staticmethod
+    def _load():
+        sessions = ChatSession.objects.filter(status='waiting').select_related('customer').order_by('created_at')
+        return [session_entry(session) for session in sessions]
+
+    def add(self, entry):
+        if entry['id'] in self._entries:
+            return False
+        self._entries[entry['id']] = entry
+        heapq.heappush(self._heap, (entry['created_at'], entry['id']))
+        return True
+
+    def remove(self, session_id):
+        session_id = str(session_id)
+        if not self.loaded:
+            self._removed_while_loading.add(session_id)
+        return self._entries.pop(session_id, None) is not None
+
+    def entries(self):
+        """대기 순서대로 항목 목록 (지워진 힙 항목 정리)"""
+        self._heap = [item for item in self._heap if item[1] in self._entries]
+        heapq.heapify(self._heap)
+        return [self._entries[session_id] for created_at, session_id in sorted(self._heap)]
+
+    def waiting_ids(self, limit=None):
+        return [entry['id'] for entry in self.entries()[:limit]]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_queues = {}
+
+
+def get_waiting_queue():
+    """현재 이벤트 루프의 대기열"""
+    loop = asyncio.get_running_loop()
+    queue = _queues.get(loop)
+    if queue is None:
+        for stale in [key for key in _queues if key.is_closed()]:
+            del _queues[stale]
+        queue = _queues[loop] = WaitingQueue()
+    return queue
@@ -1,3 +1,212 @@
-from django.test import TestCase
+import asyncio
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .message_buffer import MessageBuffer
+from .models import ChatMessage, ChatSession
+from .scheduler import (
+    PRESENCE_KEY, assign_session, claim_session, fill_agent, mark_agent_offline, mark_agent_online,
+    online_agent_ids, touch_agent
+)
+
+User = get_user_model()
+
+
+@override_settings(CHAT_SETTINGS={'MAX_CHATS_PER_AGENT': 2})
+class ChatAssignmentTest(TestCase):
+
+    def setUp(self):
+        self.agent = User.objects.create_user(username='agent1', password='pass', user_type='STAFF')
+        self.other = User.objects.create_user(username='agent2', password='pass', user_type='STAFF')
+
+    def waiting(self, count=1):
+        return [ChatSession.objects.create(customer_name=f'고객 {i}') for i in range(count)]
+
+    def activate(self, agent, count):
+        for session in self.waiting(count):
+            self.assertTrue(claim_session(session.id, agent))
+
+    def status(self, session):
+        session.refresh_from_db()
+        return session.status, session.agent_id
+
+    def test_claim_respects_capacity(self):
+        self.activate(self.agent, 2)
+        session, = self.waiting()
+
+        self.assertFalse(claim_session(session.id, self.agent, max_chats=2))
+        self.assertEqual(self.status(session), ('waiting', None))
+
+        # 직접 참여는 한도와 무관
+        self.assertTrue(claim_session(session.id, self.agent))
+        self.assertEqual(self.status(session), ('active', self.agent.pk))
+
+    def test_claim_is_compare_and_set(self):
+        session, = self.waiting()
+
+        self.assertTrue(claim_session(session.id, self.agent, max_chats=2))
+        self.assertFalse(claim_session(session.id, self.other, max_chats=2))
+        self.assertEqual(self.status(session), ('active', self.agent.pk))
+
+    def test_fill_agent_stops_at_capacity(self):
+        self.activate(self.agent, 1)
+        sessions = self.waiting(3)
+
+        claimed = fill_agent(self.agent, [session.id for session in sessions])
+
+        self.assertEqual(claimed, [sessions[0].id])
+        self.assertEqual(ChatSession.objects.filter(agent=self.agent, status='active').count(), 2)
+
+    def test_assign_picks_least_loaded(self):
+        self.activate(self.agent, 1)
+        session, = self.waiting()
+
+        with mock.patch('chat.scheduler.online_agent_ids', return_value=[self.agent.pk, self.other.pk]):
+            self.assertEqual(assign_session(session.id), self.other)
+
+    def test_assign_breaks_ties_randomly(self):
+        assigned = set()
+        with mock.patch('chat.scheduler.online_agent_ids', return_value=[self.agent.pk, self.other.pk]):
+            for order in ([self.agent.pk, self.other.pk], [self.other.pk, self.agent.pk]):
+                session, = self.waiting()
+                with mock.patch('chat.scheduler.random.shuffle', side_effect=lambda ids: ids.sort(key=order.index)):
+                    assigned.add(assign_session(session.id))
+                # 다음 시도도 동점이 되도록 종료
+                ChatSession.objects.filter(pk=session.pk).update(status='ended')
+
+        self.assertEqual(assigned, {self.agent, self.other})
+
+    def test_assign_tries_next_agent_when_full(self):
+        session, = self.waiting()
+        # 부하 조회 이후 다른 워커가 첫 상담원을 한도까지 채운 경우
+        loads = {self.agent.pk: 0, self.other.pk: 1}
+        self.activate(self.agent, 2)
+
+        with mock.patch('chat.scheduler.online_agent_ids', return_value=[self.agent.pk, self.other.pk]), \
+                mock.patch('chat.scheduler.agent_loads', return_value=loads):
+            self.assertEqual(assign_session(session.id), self.other)
+
+
+class AgentPresenceTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.agent = User.objects.create_user(username='agent1', password='pass', user_type='STAFF')
+        self.admin = User.objects.create_user(username='admin1', password='pass', user_type='ADMIN')
+        self.customer = User.objects.create_user(username='customer', password='pass', user_type='CUSTOMER')
+
+    def test_online_agents_from_presence_keys(self):
+        for user in (self.agent, self.admin, self.customer):
+            mark_agent_online(user.pk)
+
+        # 공유 색인이 없으므로 동시에 접속해도 빠지는 상담원이 없다
+        self.assertEqual(online_agent_ids(), [self.agent.pk, self.admin.pk])
+
+    def test_connection_count(self):
+        mark_agent_online(self.agent.pk)
+        mark_agent_online(self.agent.pk)
+
+        mark_agent_offline(self.agent.pk)
+        self.assertEqual(online_agent_ids(), [self.agent.pk])
+
+        mark_agent_offline(self.agent.pk)
+        self.assertEqual(online_agent_ids(), [])
+
+    def test_ping_after_expiry_marks_online_again(self):
+        mark_agent_online(self.agent.pk)
+        cache.delete(PRESENCE_KEY.format(agent_id=self.agent.pk))
+        self.assertEqual(online_agent_ids(), [])
+
+        touch_agent(self.agent.pk)
+
+        self.assertEqual(online_agent_ids(), [self.agent.pk])
+
+
+def stored_ids():
+    return [str(pk) for pk in ChatMessage.objects.order_by('created_at').values_list('id', flat=True)]
+
+
+class MessageBufferTest(TestCase):
+    """async_to_sync 로 실행하므로 DB 접근은 테스트 스레드에서 일어난다"""
+
+    def setUp(self):
+        self.session = ChatSession.objects.create(customer_name='고객')
+
+    def message(self, i):
+        return {'session': self.session, 'sender_type': 'customer', 'content': f'메시지 {i}'}
+
+    def test_flush_at_batch_size(self):
+        buffer = MessageBuffer(batch_size=3, flush_interval_ms=60000)
+
+        @async_to_sync
+        async def run():
+            for i in range(2):
+                await buffer.add(**self.message(i))
+            before = await database_sync_to_async(ChatMessage.objects.count)()
+            await buffer.add(**self.message(2))
+            return before
+
+        self.assertEqual(run(), 0)
+        self.assertEqual(ChatMessage.objects.count(), 3)
+        self.assertIsNone(buffer._timer)
+
+    def test_timer_flush(self):
+        buffer = MessageBuffer(batch_size=100, flush_interval_ms=20)
+
+        @async_to_sync
+        async def run():
+            await buffer.add(**self.message(0))
+            before = await database_sync_to_async(ChatMessage.objects.count)()
+            await asyncio.sleep(0.1)
+            await buffer._flush_task
+            return before
+
+        self.assertEqual(run(), 0)
+        self.assertEqual(ChatMessage.objects.count(), 1)
+
+    def test_created_at_increases_and_order_is_kept(self):
+        buffer = MessageBuffer(batch_size=4, flush_interval_ms=60000)
+        now = timezone.now()
+
+        @async_to_sync
+        async def run():
+            # 시계가 멈추거나 되돌아가도 생성 시각은 넣은 순서대로 증가
+            with mock.patch('chat.message_buffer.timezone.now', side_effect=[now, now, now - timedelta(seconds=1), now]):
+                return [await buffer.add(**self.message(i)) for i in range(4)]
+
+        messages = run()
+
+        created = [message.created_at for message in messages]
+        self.assertTrue(all(earlier < later for earlier, later in zip(created, created[1:])))
+        self.assertEqual(stored_ids(), [str(message.id) for message in messages])
+        self.assertEqual(
+            list(ChatMessage.objects.order_by('created_at').values_list('content', flat=True)),
+            [f'메시지 {i}' for i in range(4)]
+        )
+
+
+class MessageBufferFallbackTest(TransactionTestCase):
+    """개별 저장 중 실패한 행이 트랜잭션을 깨지 않도록 자동 커밋 모드에서 실행"""
+
+    def test_rows_saved_one_by_one_when_bulk_insert_fails(self):
+        session = ChatSession.objects.create(customer_name='고객')
+        buffer = MessageBuffer(batch_size=3, flush_interval_ms=60000)
+
+        @async_to_sync
+        async def run():
+            return [
+                await buffer.add(session=session, sender_type='customer', content=content)
+                for content in ['첫 메시지', None, '세 번째 메시지']
+            ]
+
+        with mock.patch.object(ChatMessage.objects, 'bulk_create', side_effect=RuntimeError('bulk failed')):
+            messages = run()
+
+        self.assertEqual(stored_ids(), [str(messages[0].id), str(messages[2].id)])
@@ -7,6 +7,7 @@ from django.utils import timezone
 from django.db.models import Q, Count, Avg
 from django.core.paginator import Paginator
 from .models import ChatSession, ChatMessage, ChatNote, ChatQuickReply
+from .scheduler import claim_session
 import uuid
 import json
 
@@ -115,25 +116,14 @@ def agent_dashboard(request):
 @require_POST
 def join_chat_session(request, session_id):
     """상담원이 채팅 세션에 참여"""
-    # 디버깅용 로그
-    print(f"join_chat_session called: user={request.user}, session_id={session_id}")
-    print(f"Method: {request.method}")
-    print(f"Headers: {dict(request.headers)}")
-    
     # 상담원 권한 확인
     if request.user.user_type not in ['STAFF', 'ADMIN']:
         return JsonResponse({'success': False, 'error': '권한이 없습니다.'})
     
-    try:
-        session = ChatSession.objects.get(id=session_id, status='waiting')
-        session.agent = request.user
-        session.status = 'active'
-        session.started_at = timezone.now()
-        session.save()
-        
+    # 대기 중일 때만 배정 (다른 상담원과 동시에 눌러도 한 명만 성공)
+    if claim_session(session_id, request.user):
         return JsonResponse({'success': True, 'redirect_url': f'/chat/room/{session_id}/'})
-    except ChatSession.DoesNotExist:
-        return JsonResponse({'success': False, 'error': '존재하지 않거나 이미 처리된 채팅입니다.'})
+    return JsonResponse({'success': False, 'error': '존재하지 않거나 이미 처리된 채팅입니다.'})
 
 
 @login_required
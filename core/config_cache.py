@@ -0,0 +1,155 @@
+# core/config_cache.py
+"""
+시스템 설정/이메일 템플릿 캐시
+
+SystemSettings 와 활성 EmailTemplate 을 프로세스 메모리에 보관하고, 저장 시
+공유 캐시의 버전 토큰을 바꿔 다른 프로세스에 알린다.
+
+- 요청 단위 메모: 한 요청 안에서는 처음 읽은 설정을 그대로 쓴다 (미들웨어,
+  컨텍스트 프로세서, 템플릿 태그가 같은 값을 본다).
+- 프로세스 사본: 버전 토큰은 VERSION_CHECK_INTERVAL 초마다 한 번만 확인하므로
+  대부분의 호출은 DB 나 캐시를 읽지 않는다. 다른 프로세스의 변경은 길어야
+  이 간격 뒤에 반영되고, 변경한 프로세스에서는 커밋 즉시 반영된다.
+
+반환되는 인스턴스는 여러 요청이 공유하므로 수정하지 말 것. 설정을 편집할
+때는 DB 에서 새로 읽어야 한다.
+"""
+import threading
+import time
+import uuid
+
+from asgiref.local import Local
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+from django.db import transaction
+
+CONFIG_VERSION_KEY = 'config_cache_version'
+VERSION_CHECK_INTERVAL = 2  # 초
+
+_request = Local()
+
+
+class VersionedProcessCache:
+    """
+    공유 캐시의 버전 토큰으로 무효화되는 프로세스 메모리 사본
+
+    버전 토큰은 VERSION_CHECK_INTERVAL 초마다 한 번만 확인하고, 토큰이
+    바뀌었으면 loader() 로 다시 적재한다. 카테고리 트리 캐시
+    (products.category_tree)도 같은 방식을 쓴다.
+    """
+
+    def __init__(self, version_key, loader):
+        self.version_key = version_key
+        self.loader = loader
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = None
+        self._checked_at = 0.0
+
+    def _shared_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid.uuid4().hex, None)
+            version = cache.get(self.version_key)
+        return version
+
+    def get(self):
+        """프로세스 사본 (확인 간격이 지났으면 버전 토큰과 비교해 다시 적재)"""
+        value = self._value
+        now = time.monotonic()
+        if value is not None and now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return value
+
+        version = self._shared_version()
+        with self._lock:
+            if self._value is None or self._version != version:
+                self._value = self.loader()
+                self._version = version
+            self._checked_at = now
+            return self._value
+
+    def clear_local(self):
+        """현재 프로세스 사본만 버림"""
+        self._value = None
+
+    def reset(self):
+        """현재 프로세스 사본을 버리고 버전 토큰을 바꿔 다른 프로세스에 알림"""
+        self.clear_local()
+        cache.set(self.version_key, uuid.uuid4().hex, None)
+
+
+class ConfigSnapshot:
+    """한 시점의 설정과 활성 이메일 템플릿"""
+
+    def __init__(self, settings, email_templates):
+        self.settings = settings
+        self.email_templates = email_templates
+
+
+def load_config():
+    """DB 에서 설정과 활성 이메일 템플릿 적재"""
+    from .models import EmailTemplate, SystemSettings
+
+    settings, created = SystemSettings.objects.get_or_create(pk=1)
+    email_templates = {
+        template.template_type: template
+        for template in EmailTemplate.objects.filter(is_active=True)
+    }
+    return ConfigSnapshot(settings, email_templates)
+
+
+_config = VersionedProcessCache(CONFIG_VERSION_KEY, load_config)
+
+
+def get_config():
+    """현재 설정 스냅샷 (요청 안에서는 같은 스냅샷)"""
+    if getattr(_request, 'active', False):
+        snapshot = getattr(_request, 'snapshot', None)
+        if snapshot is None:
+            snapshot = _request.snapshot = _config.get()
+        return snapshot
+    return _config.get()
+
+
+def get_system_settings():
+    return get_config().settings
+
+
+def get_email_template(template_type):
+    """활성 이메일 템플릿 (없으면 None)"""
+    return get_config().email_templates.get(template_type)
+
+
+def _clear_local():
+    _config.clear_local()
+    _request.snapshot = None
+
+
+def _reset_config():
+    _request.snapshot = None
+    _config.reset()
+
+
+def invalidate_config():
+    """
+    설정 캐시 무효화
+
+    현재 프로세스의 사본은 바로 버리고 (변경한 요청이 자신의 변경을 보도록),
+    다른 프로세스에는 트랜잭션 커밋 후 버전 토큰을 바꿔 알린다.
+    """
+    _clear_local()
+    transaction.on_commit(_reset_config)
+
+
+def _start_request(**kwargs):
+    _request.active = True
+    _request.snapshot = None
+
+
+def _finish_request(**kwargs):
+    _request.active = False
+    _request.snapshot = None
+
+
+request_started.connect(_start_request, dispatch_uid='config_cache_start_request')
+request_finished.connect(_finish_request, dispatch_uid='config_cache_finish_request')
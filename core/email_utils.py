@@ -21,12 +21,8 @@ class EmailService:
             return False
         
         # 이메일 템플릿 가져오기
-        try:
-            email_template = EmailTemplate.objects.get(
-                template_type=template_type,
-                is_active=True
-            )
-        except EmailTemplate.DoesNotExist:
+        email_template = EmailTemplate.get_active(template_type)
+        if email_template is None:
             logger.error(f"Email template '{template_type}' not found or inactive")
             return False
         
@@ -0,0 +1,73 @@
+# core/exports.py
+"""
+스트리밍 CSV 내보내기
+
+대용량 목록을 HttpResponse 에 한 번에 쓰지 않고 StreamingHttpResponse 로
+조금씩 내려보낸다. 행은 values_list().iterator(chunk_size=...) 로 읽어
+모델 인스턴스를 만들지 않으며, 일정 행 수마다 버퍼를 비우므로 메모리
+사용량이 전체 행 수와 무관하게 일정하다.
+
+엑셀에서 한글이 깨지지 않도록 첫 청크에 UTF-8 BOM 을 붙인다.
+
+행은 뷰가 응답을 반환한 뒤 내려보내면서 만들어지므로 쿼리/변환 오류는 뷰의
+try/except 로 잡을 수 없다. 이런 오류는 iter_csv 에서 기록하고 다시 던진다
+(응답 헤더는 이미 전송되어 오류 페이지로 바꿀 수 없다).
+"""
+import csv
+import io
+import logging
+
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000  # DB 에서 한 번에 가져오는 행 수
+FLUSH_ROWS = 500  # 응답으로 내보내는 행 묶음 크기
+
+UTF8_BOM = '\ufeff'
+
+logger = logging.getLogger(__name__)
+
+
+def iter_values(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """쿼리셋을 values_list 튜플로 스트리밍 (PostgreSQL 에서는 서버 측 커서 사용)"""
+    return queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+
+
+def iter_csv(header, rows, flush_rows=FLUSH_ROWS, bom=True):
+    """헤더와 행들을 CSV 문자열 청크로 변환하는 제너레이터"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if bom:
+        buffer.write(UTF8_BOM)
+    writer.writerow(header)
+
+    pending = 0
+    written = 0
+    try:
+        for row in rows:
+            writer.writerow(row)
+            pending += 1
+            written += 1
+            if pending >= flush_rows:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+    except Exception:
+        logger.exception(f"CSV 내보내기 중 오류 ({written}행 작성 후)")
+        raise
+
+    chunk = buffer.getvalue()
+    if chunk:
+        yield chunk
+
+
+def streaming_csv_response(filename, header, rows, **kwargs):
+    """CSV 스트리밍 다운로드 응답"""
+    response = StreamingHttpResponse(iter_csv(header, rows, **kwargs), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def format_datetime(value, fmt='%Y-%m-%d %H:%M:%S'):
+    """날짜/시간 값 포맷 (None 이면 빈 문자열)"""
+    return value.strftime(fmt) if value else ''
@@ -0,0 +1,239 @@
+# core/metrics.py
+"""
+요청 계측
+
+RequestMetricsMiddleware 가 요청마다 URL 이름별 응답 시간, DB 쿼리 수,
+DB 시간을 프로세스 메모리의 히스토그램에 기록한다. 쿼리는
+connection.execute_wrapper 로 가로채 세며, 같은 형태의 SQL(리터럴을 지운
+지문)이 몇 번 실행됐는지도 센다.
+
+- 각 프로세스는 FLUSH_INTERVAL 초마다 누적값 전체를 공유 캐시에 기록하고,
+  metrics 엔드포인트는 모든 프로세스의 값을 합쳐 Prometheus 텍스트 형식으로
+  내보낸다.
+- 쿼리 수나 응답 시간이 METRICS_SETTINGS 의 예산을 넘은 요청은 가장 많이
+  반복된 SQL 지문과 함께 경고 로그로 남긴다 (N+1 쿼리 추적용).
+"""
+import bisect
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = 'shopuda'
+PROCESS_KEY = 'metrics:process:{process_id}'
+PROCESS_INDEX_KEY = 'metrics:processes'
+PROCESS_TTL = 60 * 60 * 24
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# 히스토그램: 이름 → (버킷, 설명)
+HISTOGRAMS = {
+    'http_request_duration_seconds': (LATENCY_BUCKETS, '요청 처리 시간 (초)'),
+    'db_queries_per_request': (QUERY_COUNT_BUCKETS, '요청당 DB 쿼리 수'),
+    'db_time_seconds': (LATENCY_BUCKETS, '요청당 DB 쿼리 시간 (초)'),
+}
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'FLUSH_INTERVAL': 10,  # 공유 캐시에 기록하는 간격 (초)
+    'SLOW_REQUEST_MS': 1000,  # 이 시간을 넘는 요청은 경고 로그
+    'QUERY_BUDGET': 50,  # 이 쿼리 수를 넘는 요청은 경고 로그
+    'TOP_FINGERPRINTS': 5,  # 경고 로그에 남기는 반복 SQL 수
+}
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST_RE = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def get_metrics_setting(name):
+    return getattr(settings, 'METRICS_SETTINGS', {}).get(name, DEFAULT_SETTINGS[name])
+
+
+def sql_fingerprint(sql):
+    """리터럴과 자리표시자를 ? 로 바꾸고 IN (...) 목록을 접은 SQL 형태"""
+    sql = _STRING_RE.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _PLACEHOLDER_LIST_RE.sub('(...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()[:300]
+
+
+class QueryCollector:
+    """execute_wrapper: 요청 중 실행된 쿼리 수/시간/지문 집계"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[sql_fingerprint(sql)] += 1
+
+    def repeated(self, limit):
+        """두 번 이상 실행된 SQL 지문 (많은 순)"""
+        return [(sql, count) for sql, count in self.fingerprints.most_common(limit) if count > 1]
+
+
+class MetricsRegistry:
+    """프로세스의 누적 지표 (스레드 안전)"""
+
+    def __init__(self):
+        self.process_id = f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        self._lock = threading.Lock()
+        self._flushed_at = 0.0
+        self.requests = Counter()  # (view, method, status) → 요청 수
+        self.histograms = {name: {} for name in HISTOGRAMS}  # 이름 → view → [버킷별 수..., 합계, 개수]
+
+    def _observe(self, name, view, value):
+        buckets = HISTOGRAMS[name][0]
+        series = self.histograms[name].get(view)
+        if series is None:
+            series = self.histograms[name][view] = [0] * (len(buckets) + 3)
+        series[bisect.bisect_left(buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def record(self, view, method, status, duration, query_count, db_time):
+        with self._lock:
+            self.requests[(view, method, f'{status // 100}xx')] += 1
+            self._observe('http_request_duration_seconds', view, duration)
+            self._observe('db_queries_per_request', view, query_count)
+            self._observe('db_time_seconds', view, db_time)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': [[*key, count] for key, count in self.requests.items()],
+                'histograms': {
+                    name: {view: list(series) for view, series in views.items()}
+                    for name, views in self.histograms.items()
+                },
+            }
+
+    def flush(self, force=False):
+        """누적값을 공유 캐시에 기록 (FLUSH_INTERVAL 마다)"""
+        now = time.monotonic()
+        if not force and now - self._flushed_at < get_metrics_setting('FLUSH_INTERVAL'):
+            return False
+        self._flushed_at = now
+        try:
+            cache.set(PROCESS_KEY.format(process_id=self.process_id), self.snapshot(), PROCESS_TTL)
+            index = cache.get(PROCESS_INDEX_KEY) or {}
+            index[self.process_id] = time.time()
+            cache.set(PROCESS_INDEX_KEY, index, PROCESS_TTL)
+        except Exception as e:
+            logger.warning(f"지표 기록 실패: {str(e)}")
+            return False
+        return True
+
+
+registry = MetricsRegistry()
+
+
+def collect_snapshots():
+    """모든 프로세스의 지표 스냅샷 (오래된 프로세스는 색인에서 정리)"""
+    index = cache.get(PROCESS_INDEX_KEY) or {}
+    keys = {process_id: PROCESS_KEY.format(process_id=process_id) for process_id in index}
+    values = cache.get_many(list(keys.values())) if keys else {}
+
+    snapshots = []
+    stale = []
+    for process_id, key in keys.items():
+        if key in values:
+            snapshots.append(values[key])
+        else:
+            stale.append(process_id)
+    if stale:
+        for process_id in stale:
+            index.pop(process_id, None)
+        cache.set(PROCESS_INDEX_KEY, index, PROCESS_TTL)
+    return snapshots
+
+
+def merge_snapshots(snapshots):
+    """여러 프로세스 스냅샷 합산"""
+    requests = Counter()
+    histograms = {name: {} for name in HISTOGRAMS}
+    for snapshot in snapshots:
+        for *key, count in snapshot.get('requests', []):
+            requests[tuple(key)] += count
+        for name, views in snapshot.get('histograms', {}).items():
+            if name not in histograms:
+                continue
+            for view, series in views.items():
+                merged = histograms[name].get(view)
+                if merged is None:
+                    histograms[name][view] = list(series)
+                elif len(merged) == len(series):
+                    histograms[name][view] = [a + b for a, b in zip(merged, series)]
+    return requests, histograms
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(requests, histograms):
+    """Prometheus 텍스트 형식 (0.0.4)"""
+    lines = [
+        f'# HELP {METRIC_PREFIX}_http_requests_total 요청 수',
+        f'# TYPE {METRIC_PREFIX}_http_requests_total counter',
+    ]
+    for (view, method, status), count in sorted(requests.items()):
+        lines.append(
+            f'{METRIC_PREFIX}_http_requests_total'
+            f'{{view="{_label(view)}",method="{_label(method)}",status="{status}"}} {count}'
+        )
+
+    for name, (buckets, description) in HISTOGRAMS.items():
+        metric = f'{METRIC_PREFIX}_{name}'
+        lines.append(f'# HELP {metric} {description}')
+        lines.append(f'# TYPE {metric} histogram')
+        for view, series in sorted(histograms[name].items()):
+            view_label = f'view="{_label(view)}"'
+            cumulative = 0
+            for bound, count in zip(buckets, series):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{view_label},le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{view_label},le="+Inf"}} {series[-1]}')
+            lines.append(f'{metric}_sum{{{view_label}}} {_number(series[-2])}')
+            lines.append(f'{metric}_count{{{view_label}}} {series[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+def export_prometheus():
+    """현재 프로세스를 기록한 뒤 모든 프로세스 지표를 합쳐 텍스트로 반환"""
+    registry.flush(force=True)
+    return render_prometheus(*merge_snapshots(collect_snapshots()))
+
+
+def log_slow_request(request, view, status, duration, collector):
+    """예산을 넘은 요청 경고 로그"""
+    top = collector.repeated(get_metrics_setting('TOP_FINGERPRINTS'))
+    repeated = ''.join(f'\n  {count}x {sql}' for sql, count in top)
+    logger.warning(
+        f"느린 요청: {request.method} {request.path} view={view} status={status} "
+        f"{duration * 1000:.0f}ms, 쿼리 {collector.count}개 ({collector.duration * 1000:.0f}ms)"
+        f"{repeated}"
+    )
@@ -1,8 +1,43 @@
+import time
+from contextlib import ExitStack
+
 from django.shortcuts import render, redirect
 from django.urls import reverse
 from django.conf import settings
 from django.contrib import messages
+from django.db import connections
 from .models import SystemSettings
+from . import metrics
+
+
+class RequestMetricsMiddleware:
+    """요청별 응답 시간/DB 쿼리 계측 미들웨어 (core.metrics 참고)"""
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        
+    def __call__(self, request):
+        if not metrics.get_metrics_setting('ENABLED'):
+            return self.get_response(request)
+        
+        collector = metrics.QueryCollector()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+        
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name if match else None) or 'unresolved'
+        metrics.registry.record(view, request.method, response.status_code, duration, collector.count, collector.duration)
+        
+        if (collector.count > metrics.get_metrics_setting('QUERY_BUDGET') or
+                duration * 1000 > metrics.get_metrics_setting('SLOW_REQUEST_MS')):
+            metrics.log_slow_request(request, view, response.status_code, duration, collector)
+        
+        metrics.registry.flush()
+        return response
 
 
 class MaintenanceModeMiddleware:
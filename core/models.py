@@ -1,6 +1,7 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.core.cache import cache
+
+from .config_cache import get_email_template, get_system_settings, invalidate_config
 
 
 class SystemSettings(models.Model):
@@ -204,8 +205,8 @@ class SystemSettings(models.Model):
         # 단일 인스턴스만 존재하도록 보장
         self.pk = 1
         super().save(*args, **kwargs)
-        # 캐시 초기화
-        cache.delete('system_settings')
+        # 캐시 초기화 (모든 프로세스)
+        invalidate_config()
     
     def delete(self, *args, **kwargs):
         # 삭제 방지
@@ -213,12 +214,8 @@ class SystemSettings(models.Model):
     
     @classmethod
     def get_settings(cls):
-        """설정 가져오기 (캐시 사용)"""
-        settings = cache.get('system_settings')
-        if settings is None:
-            settings, created = cls.objects.get_or_create(pk=1)
-            cache.set('system_settings', settings, 3600)  # 1시간 캐시
-        return settings
+        """설정 가져오기 (캐시 사용, 반환된 인스턴스는 수정하지 말 것)"""
+        return get_system_settings()
 
 
 class EmailTemplate(models.Model):
@@ -273,6 +270,20 @@ class EmailTemplate(models.Model):
     
     def __str__(self):
         return f"{self.get_template_type_display()} - {self.subject}"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_config()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_config()
+        return result
+    
+    @classmethod
+    def get_active(cls, template_type):
+        """활성 템플릿 가져오기 (캐시 사용, 없으면 None)"""
+        return get_email_template(template_type)
 
 
 class EmailTrigger(models.Model):
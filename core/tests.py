@@ -0,0 +1,145 @@
+import csv
+import io
+import tracemalloc
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone
+
+from core.exports import UTF8_BOM, iter_csv, streaming_csv_response
+from core.timeseries import GRANULARITY_DAY, GRANULARITY_MONTH, GRANULARITY_WEEK, aggregate_series
+from orders.models import Order
+from products.models import Product
+from products.views import PRODUCT_CSV_HEADERS, export_products_csv
+
+
+def generate_rows(count):
+    for i in range(count):
+        yield [f'SKU-{i:06d}', f'상품 {i}', '설명 ' * 10, i * 100]
+
+
+class IterCsvTest(SimpleTestCase):
+
+    def peak_memory(self, row_count):
+        """iter_csv 를 끝까지 소비하는 동안의 최대 메모리 사용량 (바이트)"""
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            size = 0
+            for chunk in iter_csv(['SKU', '상품명', '설명', '금액'], generate_rows(row_count)):
+                size += len(chunk)
+            return tracemalloc.get_traced_memory()[1], size
+        finally:
+            tracemalloc.stop()
+
+    def test_peak_memory_does_not_grow_with_row_count(self):
+        small_peak, small_size = self.peak_memory(1000)
+        large_peak, large_size = self.peak_memory(100000)
+
+        self.assertGreater(large_size, small_size * 50)
+        # 내보내는 데이터가 100배여도 최대 메모리는 버퍼 하나 수준
+        self.assertLess(large_peak, small_peak * 2)
+        self.assertLess(large_peak, large_size / 10)
+
+    def test_chunks(self):
+        chunks = list(iter_csv(['a', 'b'], ([i, i] for i in range(5)), flush_rows=2))
+
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[0], f'{UTF8_BOM}a,b\r\n0,0\r\n1,1\r\n')
+        self.assertEqual(''.join(chunks[1:]), '2,2\r\n3,3\r\n4,4\r\n')
+
+    def test_row_error_is_logged(self):
+        def failing_rows():
+            yield [1, 1]
+            raise ValueError('row failed')
+
+        chunks = iter_csv(['a', 'b'], failing_rows())
+        with self.assertLogs('core.exports', 'ERROR') as logs, self.assertRaises(ValueError):
+            list(chunks)
+        self.assertIn('1행 작성 후', logs.output[0])
+
+    def test_streaming_response(self):
+        response = streaming_csv_response('test.csv', ['이름'], [['홍길동']])
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="test.csv"')
+        self.assertEqual(b''.join(response.streaming_content).decode('utf-8'), f'{UTF8_BOM}이름\r\n홍길동\r\n')
+
+
+class ProductCsvExportTest(TestCase):
+
+    def test_export_body(self):
+        Product.objects.create(sku='CSV-1', name='내보내기 상품', cost_price=500, selling_price=1000, status='ACTIVE')
+        Product.objects.create(sku='CSV-2', name='단종 상품', cost_price=500, selling_price=1000, status='DISCONTINUED')
+        request = RequestFactory().get('/products/export/csv/')
+        request.user = get_user_model().objects.create_user(username='staff', password='pass')
+
+        response = export_products_csv(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        body = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(body.startswith(UTF8_BOM))
+
+        rows = list(csv.reader(io.StringIO(body[len(UTF8_BOM):])))
+        self.assertEqual(rows[0], PRODUCT_CSV_HEADERS)
+        self.assertEqual([(row[0], row[1]) for row in rows[1:]], [('CSV-1', '내보내기 상품')])
+
+
+def create_order(number, day, status='DELIVERED', amount=1000):
+    """day 정오(현재 타임존)에 들어온 주문"""
+    return Order.objects.create(
+        order_number=number, customer_name='고객', shipping_address='서울', shipping_zipcode='00000',
+        status=status, total_amount=Decimal(amount),
+        order_date=timezone.make_aware(datetime.combine(day, time(12)))
+    )
+
+
+class AggregateSeriesTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.localdate()
+        create_order('TS-1', cls.today - timedelta(days=2), amount=1000)
+        create_order('TS-2', cls.today - timedelta(days=2), status='CANCELLED', amount=500)
+        create_order('TS-3', cls.today - timedelta(days=100), amount=2000)
+
+    def series(self, days, granularity):
+        return aggregate_series(
+            Order.objects.all(), self.today - timedelta(days=days - 1), self.today, granularity,
+            value_filter=Q(status='DELIVERED')
+        )
+
+    def test_single_query_regardless_of_period(self):
+        for days, granularity in [(7, GRANULARITY_DAY), (90, GRANULARITY_WEEK), (360, GRANULARITY_MONTH)]:
+            with self.assertNumQueries(1):
+                self.series(days, granularity)
+
+    def test_daily_gaps_are_filled(self):
+        series = self.series(7, GRANULARITY_DAY)
+
+        self.assertEqual([point['start'] for point in series],
+                         [self.today - timedelta(days=6 - i) for i in range(7)])
+        self.assertEqual([point['count'] for point in series], [0, 0, 0, 0, 2, 0, 0])
+        self.assertEqual(series[4]['total'], Decimal('1000'))
+        self.assertEqual(sum(point['total'] for point in series), Decimal('1000'))
+
+    def test_monthly_buckets_cover_period(self):
+        start_date = self.today - timedelta(days=359)
+        series = self.series(360, GRANULARITY_MONTH)
+
+        self.assertEqual(series[0]['start'], start_date)
+        self.assertEqual(series[-1]['end'], self.today)
+        for previous, point in zip(series, series[1:]):
+            self.assertEqual(point['start'], previous['end'] + timedelta(days=1))
+        self.assertEqual(sum(point['count'] for point in series), 3)
+        self.assertEqual(sum(point['total'] for point in series), Decimal('3000'))
+
+        old_month = (self.today - timedelta(days=100)).replace(day=1)
+        self.assertEqual(
+            [point['total'] for point in series if point['start'].replace(day=1) == old_month],
+            [Decimal('2000')]
+        )
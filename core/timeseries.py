@@ -0,0 +1,119 @@
+# core/timeseries.py
+"""
+시계열 집계 유틸리티
+
+기간 내 데이터를 한 번의 GROUP BY 쿼리로 집계한 뒤, 비어 있는 구간을 0으로
+채워 일별/주별/월별 시계열을 만든다. 날짜 경계는 현재 타임존 기준이다.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+GRANULARITY_DAY = 'day'
+GRANULARITY_WEEK = 'week'
+GRANULARITY_MONTH = 'month'
+
+
+def _month_start(date):
+    return date.replace(day=1)
+
+
+def _next_month(date):
+    if date.month == 12:
+        return date.replace(year=date.year + 1, month=1, day=1)
+    return date.replace(month=date.month + 1, day=1)
+
+
+def build_buckets(start_date, end_date, granularity=GRANULARITY_DAY):
+    """
+    기간을 구간 목록 [(시작일, 종료일), ...] 으로 나눈다.
+
+    - day: 하루 단위
+    - week: start_date 부터 7일 단위 (마지막 구간은 end_date 에서 잘림)
+    - month: 달력 월 단위 (첫/마지막 구간은 기간에 맞게 잘림)
+    """
+    buckets = []
+    if start_date > end_date:
+        return buckets
+
+    if granularity == GRANULARITY_DAY:
+        current = start_date
+        while current <= end_date:
+            buckets.append((current, current))
+            current += timedelta(days=1)
+    elif granularity == GRANULARITY_WEEK:
+        current = start_date
+        while current <= end_date:
+            bucket_end = min(current + timedelta(days=6), end_date)
+            buckets.append((current, bucket_end))
+            current += timedelta(days=7)
+    elif granularity == GRANULARITY_MONTH:
+        current = _month_start(start_date)
+        while current <= end_date:
+            next_month = _next_month(current)
+            buckets.append((max(current, start_date), min(next_month - timedelta(days=1), end_date)))
+            current = next_month
+    else:
+        raise ValueError(f'지원하지 않는 집계 단위입니다: {granularity}')
+
+    return buckets
+
+
+def aggregate_series(queryset, start_date, end_date, granularity=GRANULARITY_DAY,
+                     date_field='order_date', value_field='total_amount', value_filter=None):
+    """
+    queryset 을 기간별로 집계한 시계열을 반환한다.
+
+    집계는 단일 GROUP BY 쿼리로 수행되며, 결과는 빈 구간이 채워진 목록이다:
+    [{'start': date, 'end': date, 'count': int, 'total': Decimal}, ...]
+
+    count 는 queryset 의 전체 건수, total 은 value_filter(Q)를 만족하는 행의
+    value_field 합계이다. 예를 들어 주문 건수는 전체로, 매출은 완료 상태만으로
+    집계할 수 있다.
+    """
+    buckets = build_buckets(start_date, end_date, granularity)
+    if not buckets:
+        return []
+
+    tzinfo = timezone.get_current_timezone()
+    if granularity == GRANULARITY_MONTH:
+        trunc = TruncMonth(date_field, output_field=DateField(), tzinfo=tzinfo)
+    else:
+        # 주별 구간은 start_date 기준 7일 단위이므로 일별 집계를 접어서 만든다
+        trunc = TruncDate(date_field, tzinfo=tzinfo)
+
+    rows = queryset.filter(**{
+        f'{date_field}__date__gte': start_date,
+        f'{date_field}__date__lte': end_date,
+    }).order_by().annotate(
+        bucket=trunc
+    ).values('bucket').annotate(
+        count=Count('pk'),
+        total=Sum(value_field, filter=value_filter),
+    )
+
+    totals = {}
+    for row in rows:
+        totals[row['bucket']] = (row['count'], row['total'] or Decimal('0'))
+
+    series = []
+    if granularity == GRANULARITY_WEEK:
+        for bucket_start, bucket_end in buckets:
+            count, total = 0, Decimal('0')
+            day = bucket_start
+            while day <= bucket_end:
+                day_count, day_total = totals.get(day, (0, Decimal('0')))
+                count += day_count
+                total += day_total
+                day += timedelta(days=1)
+            series.append({'start': bucket_start, 'end': bucket_end, 'count': count, 'total': total})
+    else:
+        for bucket_start, bucket_end in buckets:
+            key = _month_start(bucket_start) if granularity == GRANULARITY_MONTH else bucket_start
+            count, total = totals.get(key, (0, Decimal('0')))
+            series.append({'start': bucket_start, 'end': bucket_end, 'count': count, 'total': total})
+
+    return series
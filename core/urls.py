@@ -10,4 +10,7 @@ urlpatterns = [
     # 이메일 템플릿 관리
     path('email-templates/', views.EmailTemplateListView.as_view(), name='email_template_list'),
     path('email-templates/<str:template_type>/edit/', views.email_template_edit, name='email_template_edit'),
+    
+    # 요청 지표 (Prometheus)
+    path('metrics/', views.metrics_view, name='metrics'),
 ]
\ No newline at end of file
@@ -1,6 +1,8 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
 from django.utils.decorators import method_decorator
 from django.views.generic import View, ListView
 from django.db.models import Q
@@ -9,13 +11,15 @@ from django.urls import reverse_lazy
 from accounts.permissions import admin_level_required, permission_required
 from .models import SystemSettings, EmailTemplate
 from .forms import SystemSettingsForm, EmailTemplateForm
+from . import metrics
 
 
 @login_required
 @admin_level_required(4)
 def system_settings_view(request):
     """시스템 설정 뷰"""
-    settings = SystemSettings.get_settings()
+    # 캐시된 설정 인스턴스는 공유되므로 편집용으로 DB 에서 새로 읽는다
+    settings, created = SystemSettings.objects.get_or_create(pk=1)
     active_tab = request.GET.get('tab', 'brand')
     
     if request.method == 'POST':
@@ -276,4 +280,10 @@ def _get_available_variables(template_type):
         'birthday_greeting': ['{{coupon_code}}', '{{coupon_discount}}', '{{birth_date}}'],
     }
     
-    return common_vars + type_specific_vars.get(template_type, [])
\ No newline at end of file
+    return common_vars + type_specific_vars.get(template_type, [])
+
+
+@staff_member_required
+def metrics_view(request):
+    """요청 지표 (Prometheus 텍스트 형식, 모든 워커 합산)"""
+    return HttpResponse(metrics.export_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -114,10 +114,11 @@ class CouponAdmin(admin.ModelAdmin):
     
     def duplicate_coupon(self, request, queryset):
         """쿠폰 복제"""
+        codes = Coupon.generate_codes(len(queryset))
         for coupon in queryset:
             new_coupon = coupon
             new_coupon.pk = None
-            new_coupon.code = None  # 새로운 코드 자동 생성
+            new_coupon.code = codes.pop()  # 새로운 코드 일괄 생성
             new_coupon.issued_quantity = 0
             new_coupon.used_count = 0
             new_coupon.save()
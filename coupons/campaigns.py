@@ -0,0 +1,177 @@
+# coupons/campaigns.py
+"""
+캠페인 쿠폰 일괄 발급
+
+대상 회원(회원 등급, 생일 월, 구매 이력)을 쿼리 하나로 고르고, 회원 ID 순으로
+CHUNK_SIZE 명씩 UserCoupon/CouponLog 를 bulk_create 한다.
+
+- 청크마다 트랜잭션 하나로 저장하고 발급 수량은 마지막에 Coupon.reserve_quantity
+  로 한 번에 늘린다. 수량이 모자라면 남은 수량만큼 줄여서 다시 시도한다.
+- 대상에서 이미 사용자별 발급 한도만큼 받은 회원을 빼므로, 중간에 실패해도 같은
+  조건으로 다시 실행하면 저장된 청크는 건너뛰고 이어서 발급한다.
+- 사용자별 발급 순번(issue_seq)은 기존 발급 수 + 1 이다. 같은 회원에게 개별 발급이
+  동시에 일어나 유일 제약에 걸리면 그 청크만 다시 읽어 시도한다.
+"""
+import logging
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import CouponLog, UserCoupon
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+MAX_CHUNK_RETRIES = 3
+PURCHASE_STATUSES = ['PROCESSING', 'SHIPPED', 'DELIVERED', 'COMPLETED']
+
+
+def campaign_audience(coupon, membership_levels=None, birth_month=None, birth_day=None,
+                      min_orders=None, min_purchase_amount=None, ordered_since=None):
+    """
+    캠페인 대상 회원 queryset (아직 발급 한도가 남은 활성 회원)
+
+    issued 로 쿠폰별 기존 발급 수를 annotate 한다. 쿠폰의 대상 등급/대상 사용자
+    설정도 함께 적용한다.
+    """
+    from orders.models import Order
+
+    users = get_user_model().objects.filter(is_active=True)
+
+    levels = membership_levels or coupon.target_membership_levels
+    if levels:
+        users = users.filter(membership_level__in=levels)
+    if coupon.target_users.exists():
+        users = users.filter(targeted_coupons=coupon)
+
+    if birth_month:
+        users = users.filter(birth_date__month=birth_month)
+    if birth_day:
+        users = users.filter(birth_date__day=birth_day)
+
+    # 구매 이력 (매출 집계와 같은 주문 상태 기준)
+    if min_orders or min_purchase_amount or ordered_since:
+        orders = Order.objects.filter(user=OuterRef('pk'), status__in=PURCHASE_STATUSES)
+        if ordered_since:
+            orders = orders.filter(order_date__gte=ordered_since)
+        orders = orders.order_by().values('user')
+        users = users.annotate(
+            order_count=Coalesce(
+                Subquery(orders.annotate(count=Count('id')).values('count')),
+                Value(0), output_field=IntegerField()
+            ),
+            purchase_amount=Coalesce(
+                Subquery(orders.annotate(total=Sum('total_amount')).values('total')),
+                Value(0), output_field=DecimalField(max_digits=20, decimal_places=2)
+            )
+        ).filter(order_count__gte=min_orders or 1)
+        if min_purchase_amount:
+            users = users.filter(purchase_amount__gte=min_purchase_amount)
+
+    issued = (
+        UserCoupon.objects.filter(coupon=coupon, user=OuterRef('pk'))
+        .order_by().values('user').annotate(count=Count('id')).values('count')
+    )
+    return users.annotate(
+        issued=Coalesce(Subquery(issued), Value(0), output_field=IntegerField())
+    ).filter(issued__lt=coupon.usage_limit_per_user)
+
+
+def issue_campaign(coupon, audience, chunk_size=CHUNK_SIZE, issued_by=None, progress=None):
+    """
+    대상 회원에게 쿠폰 일괄 발급
+
+    progress(발급 수) 를 주면 청크마다 호출한다. 유효하지 않은 쿠폰(비활성,
+    유효 기간 외, 발급 수량/사용 한도 소진)이면 ValueError.
+    반환값: {'issued': 발급 수, 'sold_out': 수량 소진 여부}
+    """
+    if not coupon.is_valid:
+        raise ValueError(f"유효하지 않은 쿠폰입니다: {coupon.code}")
+
+    if coupon.days_valid_after_issue:
+        expires_at = timezone.now() + timedelta(days=coupon.days_valid_after_issue)
+    else:
+        expires_at = coupon.valid_to
+
+    issued = 0
+    sold_out = False
+    last_id = 0
+    while not sold_out:
+        rows = list(
+            audience.filter(pk__gt=last_id).order_by('pk').values_list('pk', 'issued')[:chunk_size]
+        )
+        if not rows:
+            break
+        chunk_last_id = rows[-1][0]
+
+        for _ in range(MAX_CHUNK_RETRIES):
+            try:
+                count, sold_out = _issue_chunk(coupon, rows, expires_at)
+                break
+            except IntegrityError:
+                # 개별 발급과 겹침: 이 청크 대상만 다시 읽어 재시도
+                logger.warning(f"Campaign chunk conflict for coupon {coupon.code}, retrying")
+                chunk_ids = [user_id for user_id, _ in rows]
+                rows = list(
+                    audience.filter(pk__in=chunk_ids).order_by('pk').values_list('pk', 'issued')
+                )
+        else:
+            raise RuntimeError(f"쿠폰 {coupon.code} 일괄 발급 청크 저장 실패 (회원 ID {last_id} 이후)")
+
+        issued += count
+        last_id = chunk_last_id
+        if progress:
+            progress(issued)
+
+    CouponLog.objects.create(
+        coupon=coupon,
+        user=issued_by,
+        action='ISSUED',
+        details={
+            'campaign': True,
+            'success_count': issued,
+            'sold_out': sold_out
+        }
+    )
+    logger.info(f"Campaign coupon {coupon.code} issued to {issued} users")
+    return {'issued': issued, 'sold_out': sold_out}
+
+
+def _issue_chunk(coupon, rows, expires_at):
+    """청크 하나 저장, 반환값: (발급 수, 수량 소진 여부)"""
+    sold_out = False
+    with transaction.atomic():
+        if coupon.total_quantity is not None:
+            coupon.refresh_from_db(fields=['issued_quantity'])
+            remaining = coupon.total_quantity - coupon.issued_quantity
+            if remaining < len(rows):
+                rows, sold_out = rows[:max(remaining, 0)], True
+        if not rows:
+            return 0, sold_out
+
+        user_coupons = UserCoupon.objects.bulk_create([
+            UserCoupon(user_id=user_id, coupon=coupon, expires_at=expires_at, issue_seq=issued + 1)
+            for user_id, issued in rows
+        ])
+        CouponLog.objects.bulk_create([
+            CouponLog(
+                coupon=coupon,
+                user_id=user_coupon.user_id,
+                action='ISSUED',
+                details={
+                    'user_coupon_id': user_coupon.id,
+                    'expires_at': expires_at.isoformat(),
+                    'campaign': True
+                }
+            )
+            for user_coupon in user_coupons
+        ])
+
+        # 발급 수량 증가 (그 사이 개별 발급으로 모자라면 청크 전체를 되돌림)
+        if not coupon.reserve_quantity(len(rows)):
+            raise IntegrityError("발급 수량 부족")
+    return len(rows), sold_out
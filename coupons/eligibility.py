@@ -0,0 +1,105 @@
+# coupons/eligibility.py
+"""
+쿠폰 적용 가능 여부 일괄 판정
+
+후보 쿠폰들의 적용 상품/카테고리 규칙을 M2M 중간 테이블에서 쿼리 두 번으로
+읽어 쿠폰별 ID 집합으로 만들고, 장바구니 상품과의 비교는 메모리에서 한다.
+쿠폰 수나 상품 수와 관계없이 쿼리 수가 일정하다.
+
+판정 규칙과 메시지는 CouponService.validate_coupon_for_order 와 같다.
+"""
+from .models import Coupon
+
+
+class CouponRules:
+    """쿠폰 하나의 적용 상품/카테고리 ID 집합 (비어 있으면 제한 없음)"""
+
+    def __init__(self):
+        self.product_ids = set()
+        self.category_ids = set()
+
+
+class CartItems:
+    """판정에 필요한 장바구니 상품 정보"""
+
+    def __init__(self, products):
+        products = list(products or [])
+        self.is_empty = not products
+        self.product_ids = {p.pk for p in products}
+        self.category_ids = {p.category_id for p in products if p.category_id}
+        self.has_sale = any(p.discount_price for p in products)
+
+
+def load_coupon_rules(coupon_ids):
+    """{쿠폰 ID: CouponRules} (중간 테이블 쿼리 2번)"""
+    rules = {coupon_id: CouponRules() for coupon_id in coupon_ids}
+    if not rules:
+        return rules
+
+    product_links = Coupon.applicable_products.through.objects.filter(
+        coupon_id__in=rules
+    ).values_list('coupon_id', 'product_id')
+    for coupon_id, product_id in product_links:
+        rules[coupon_id].product_ids.add(product_id)
+
+    category_links = Coupon.applicable_categories.through.objects.filter(
+        coupon_id__in=rules
+    ).values_list('coupon_id', 'category_id')
+    for coupon_id, category_id in category_links:
+        rules[coupon_id].category_ids.add(category_id)
+
+    return rules
+
+
+def check_coupon(user_coupon, order_amount, cart, rules):
+    """사용자 쿠폰 하나를 주문에 적용할 수 있는지 판정, 반환값: (가능 여부, 메시지)"""
+    coupon = user_coupon.coupon
+
+    # 기본 유효성 확인
+    if not user_coupon.is_valid:
+        return False, "사용할 수 없는 쿠폰입니다."
+
+    # 최소 주문 금액 확인
+    if order_amount < coupon.min_order_amount:
+        return False, f"최소 주문 금액 ₩{coupon.min_order_amount:,.0f} 이상에서 사용 가능합니다."
+
+    # 적용 가능 상품/카테고리 확인
+    if not cart.is_empty:
+        coupon_rules = rules.get(coupon.pk) or CouponRules()
+
+        if coupon_rules.product_ids and not (coupon_rules.product_ids & cart.product_ids):
+            return False, "해당 상품에는 쿠폰을 사용할 수 없습니다."
+
+        if coupon_rules.category_ids and not (coupon_rules.category_ids & cart.category_ids):
+            return False, "해당 카테고리 상품에는 쿠폰을 사용할 수 없습니다."
+
+        # 세일 상품 제외 확인
+        if coupon.exclude_sale_items and cart.has_sale:
+            return False, "세일 상품에는 쿠폰을 사용할 수 없습니다."
+
+    return True, "사용 가능"
+
+
+def evaluate_coupons(user_coupons, order_amount, products=None):
+    """
+    사용자 쿠폰들을 주문에 대해 한 번에 판정
+
+    사용 가능한 쿠폰만 [{'user_coupon', 'discount', 'message'}] 로, 할인 금액이
+    큰 순서로 반환한다 (같으면 원래 순서).
+    """
+    user_coupons = list(user_coupons)
+    cart = CartItems(products)
+    rules = load_coupon_rules({uc.coupon_id for uc in user_coupons}) if not cart.is_empty else {}
+
+    available = []
+    for user_coupon in user_coupons:
+        is_valid, message = check_coupon(user_coupon, order_amount, cart, rules)
+        if is_valid:
+            available.append({
+                'user_coupon': user_coupon,
+                'discount': user_coupon.coupon.calculate_discount(order_amount),
+                'message': message
+            })
+
+    available.sort(key=lambda item: item['discount'], reverse=True)
+    return available
@@ -0,0 +1,104 @@
+# coupons/management/commands/coupon_issue_benchmark.py
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+
+from coupons.models import Coupon, UserCoupon
+from coupons.services import CouponService
+
+
+class Command(BaseCommand):
+    help = '선착순 쿠폰 동시 발급 측정 (스레드 여러 개로 같은 쿠폰 코드를 동시에 요청)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2000, help='요청 사용자 수 (기본값: 2000)')
+        parser.add_argument('--quantity', type=int, default=500, help='쿠폰 총 발급 수량 (기본값: 500)')
+        parser.add_argument('--workers', type=int, default=32, help='동시 요청 스레드 수 (기본값: 32)')
+        parser.add_argument('--repeat', type=int, default=2, help='사용자당 요청 횟수 (중복 요청, 기본값: 2)')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        prefix = f'coupon_bench_{uuid.uuid4().hex[:8]}'
+        now = timezone.now()
+
+        User.objects.bulk_create([
+            User(username=f'{prefix}_{i}', password='!')
+            for i in range(options['users'])
+        ], batch_size=1000)
+        users = list(User.objects.filter(username__startswith=prefix))
+        coupon = Coupon.objects.create(
+            code=prefix.upper(),
+            name='동시 발급 측정',
+            discount_value=1000,
+            total_quantity=options['quantity'],
+            valid_from=now - timedelta(minutes=1),
+            valid_to=now + timedelta(days=1)
+        )
+
+        requests = [user for _ in range(options['repeat']) for user in users]
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+                results = list(executor.map(lambda user: self.claim(coupon.code, user), requests))
+            elapsed = time.perf_counter() - start
+
+            coupon.refresh_from_db()
+            issued = UserCoupon.objects.filter(coupon=coupon).count()
+            duplicated = (
+                UserCoupon.objects.filter(coupon=coupon).values('user_id')
+                .annotate(count=Count('id')).filter(count__gt=coupon.usage_limit_per_user).count()
+            )
+        finally:
+            coupon.delete()
+            User.objects.filter(username__startswith=prefix).delete()
+
+        latencies = sorted(latency for _, _, latency in results)
+        succeeded = sum(1 for success, _, _ in results if success)
+        errors = sum(1 for success, error, _ in results if error)
+
+        self.stdout.write(
+            f"요청 {len(requests)}건 (사용자 {options['users']}명 x {options['repeat']}회), "
+            f"수량 {options['quantity']}, 스레드 {options['workers']}개"
+        )
+        self.stdout.write(f'{len(requests)}건 / {elapsed:.2f}초 = {len(requests) / elapsed:,.0f} req/sec')
+        self.stdout.write(
+            f'지연 시간(ms): p50 {self.percentile(latencies, 50):.1f}, '
+            f'p95 {self.percentile(latencies, 95):.1f}, p99 {self.percentile(latencies, 99):.1f}, '
+            f'최대 {latencies[-1]:.1f}, 평균 {statistics.mean(latencies):.1f}'
+        )
+        self.stdout.write(f'성공 {succeeded}건, 거절 {len(requests) - succeeded - errors}건, 오류 {errors}건')
+
+        expected = min(options['quantity'], options['users'])
+        if issued == coupon.issued_quantity == succeeded == expected and not duplicated:
+            self.stdout.write(self.style.SUCCESS(f'발급 {issued}건 (초과 발급/중복 발급 없음)'))
+        else:
+            self.stdout.write(self.style.ERROR(
+                f'발급 {issued}건, issued_quantity {coupon.issued_quantity}, '
+                f'성공 응답 {succeeded}건, 중복 사용자 {duplicated}명 (기대값 {expected}건)'
+            ))
+
+    @staticmethod
+    def claim(code, user):
+        """쿠폰 코드 요청 하나, 반환값: (성공 여부, 오류 여부, 지연 시간 ms)"""
+        start = time.perf_counter()
+        try:
+            success, _ = CouponService.issue_coupon_by_code(code, user)
+            error = False
+        except Exception:
+            success, error = False, True
+        finally:
+            connection.close()
+        return success, error, (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def percentile(values, percent):
+        index = min(len(values) - 1, int(len(values) * percent / 100))
+        return values[index]
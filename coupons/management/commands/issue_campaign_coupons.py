@@ -0,0 +1,82 @@
+# coupons/management/commands/issue_campaign_coupons.py
+import time
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from coupons.campaigns import CHUNK_SIZE, campaign_audience, issue_campaign
+from coupons.models import Coupon
+
+
+class Command(BaseCommand):
+    help = '조건에 맞는 회원에게 캠페인 쿠폰을 일괄 발급합니다 (중단 후 같은 조건으로 다시 실행하면 이어서 발급)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('code', type=str, help='발급할 쿠폰 코드')
+        parser.add_argument(
+            '--membership-levels',
+            type=str,
+            help='대상 회원 등급 (쉼표 구분, 예: GOLD,PLATINUM)'
+        )
+        parser.add_argument('--birth-month', type=int, help='생일 월 (1-12)')
+        parser.add_argument('--min-orders', type=int, help='최소 구매 횟수')
+        parser.add_argument('--min-purchase-amount', type=str, help='최소 누적 구매 금액')
+        parser.add_argument('--ordered-since', type=str, help='구매 이력 기준 시작일 (YYYY-MM-DD)')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f'한 번에 저장할 회원 수 (기본값: {CHUNK_SIZE})'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='발급하지 않고 대상 회원 수만 출력')
+
+    def handle(self, *args, **options):
+        coupon = Coupon.objects.filter(code=options['code'].upper()).first()
+        if coupon is None:
+            raise CommandError(f"쿠폰을 찾을 수 없습니다: {options['code']}")
+        if not coupon.is_valid:
+            raise CommandError(f"유효하지 않은 쿠폰입니다 (비활성, 유효 기간 외 또는 수량 소진): {coupon.code}")
+
+        if options['birth_month'] and not 1 <= options['birth_month'] <= 12:
+            raise CommandError('생일 월은 1-12 사이여야 합니다.')
+
+        try:
+            min_purchase_amount = (
+                Decimal(options['min_purchase_amount']) if options['min_purchase_amount'] else None
+            )
+            ordered_since = None
+            if options['ordered_since']:
+                ordered_since = timezone.make_aware(datetime.strptime(options['ordered_since'], '%Y-%m-%d'))
+        except (InvalidOperation, ValueError):
+            raise CommandError('금액은 숫자, 날짜는 YYYY-MM-DD 형식으로 입력해주세요.')
+
+        levels = options['membership_levels']
+        audience = campaign_audience(
+            coupon,
+            membership_levels=[level.strip().upper() for level in levels.split(',')] if levels else None,
+            birth_month=options['birth_month'],
+            min_orders=options['min_orders'],
+            min_purchase_amount=min_purchase_amount,
+            ordered_since=ordered_since
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{coupon.code} 발급 대상: {audience.count():,}명')
+            return
+
+        start = time.perf_counter()
+        result = issue_campaign(
+            coupon,
+            audience,
+            chunk_size=options['chunk_size'],
+            progress=lambda issued: self.stdout.write(f'  {issued:,}건 발급')
+        )
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{coupon.code} 쿠폰 {result['issued']:,}건을 발급했습니다 ({elapsed:.1f}초)"
+        ))
+        if result['sold_out']:
+            self.stdout.write(self.style.WARNING('총 발급 수량이 소진되어 일부 회원에게는 발급하지 못했습니다.'))
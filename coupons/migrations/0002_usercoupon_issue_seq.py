@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def number_existing_issues(apps, schema_editor):
+    """기존 발급 건에 사용자/쿠폰별 발급 순번 부여 (발급일 순)"""
+    UserCoupon = apps.get_model('coupons', 'UserCoupon')
+    seqs = {}
+    changed = []
+    for user_coupon in UserCoupon.objects.order_by('issued_at', 'id').only('id', 'user_id', 'coupon_id'):
+        key = (user_coupon.user_id, user_coupon.coupon_id)
+        seqs[key] = seqs.get(key, 0) + 1
+        if seqs[key] > 1:
+            user_coupon.issue_seq = seqs[key]
+            changed.append(user_coupon)
+    UserCoupon.objects.bulk_update(changed, ['issue_seq'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coupons', '0001_initial'),
+        ('orders', '0002_dailysalesrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usercoupon',
+            name='issue_seq',
+            field=models.PositiveIntegerField(default=1, help_text='같은 사용자에게 같은 쿠폰을 발급한 순번 (중복 발급 방지)', verbose_name='발급 순번'),
+        ),
+        migrations.RunPython(number_existing_issues, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='usercoupon',
+            constraint=models.UniqueConstraint(fields=('user', 'coupon', 'issue_seq'), name='unique_user_coupon_issue_seq'),
+        ),
+    ]
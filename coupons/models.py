@@ -174,13 +174,27 @@ class Coupon(models.Model):
     
     def generate_code(self, length=10):
         """쿠폰 코드 자동 생성"""
-        while True:
-            code = ''.join(random.choices(
-                string.ascii_uppercase + string.digits, 
-                k=length
-            ))
-            if not Coupon.objects.filter(code=code).exists():
-                return code
+        return Coupon.generate_codes(1, length)[0]
+    
+    @staticmethod
+    def generate_codes(count, length=10, batch_size=1000):
+        """
+        중복되지 않는 쿠폰 코드 count 개 생성
+        
+        후보를 한 번에 만들고 기존 코드와의 충돌은 배치마다 code__in 쿼리 한 번으로
+        확인한다. 충돌한 만큼만 다시 만든다.
+        """
+        alphabet = string.ascii_uppercase + string.digits
+        codes = set()
+        while len(codes) < count:
+            candidates = set()
+            while len(candidates) < min(count - len(codes), batch_size):
+                code = ''.join(random.choices(alphabet, k=length))
+                if code not in codes:
+                    candidates.add(code)
+            taken = set(Coupon.objects.filter(code__in=candidates).values_list('code', flat=True))
+            codes |= candidates - taken
+        return list(codes)
     
     @property
     def is_valid(self):
@@ -218,9 +232,8 @@ class Coupon(models.Model):
                 return False, "회원 등급이 맞지 않습니다."
         
         # 대상 사용자 확인
-        if self.target_users.exists():
-            if user not in self.target_users.all():
-                return False, "대상 사용자가 아닙니다."
+        if not self.is_target_user(user):
+            return False, "대상 사용자가 아닙니다."
         
         # 이미 발급받았는지 확인
         existing = UserCoupon.objects.filter(
@@ -232,6 +245,26 @@ class Coupon(models.Model):
         
         return True, "발급 가능"
     
+    def is_target_user(self, user):
+        """대상 사용자 확인 (대상 사용자가 없으면 모두 대상, 쿼리 1번)"""
+        targets = Coupon.target_users.through.objects.filter(coupon_id=self.pk).aggregate(
+            total=models.Count('id'),
+            matched=models.Count('id', filter=models.Q(user_id=user.pk))
+        )
+        return not targets['total'] or targets['matched'] > 0
+    
+    def reserve_quantity(self, count=1):
+        """
+        발급 수량 count 만큼 증가 (원자적 조건부 UPDATE)
+        
+        총 발급 수량이 있으면 issued_quantity + count <= total_quantity 인 경우에만
+        증가시키고, 남은 수량이 모자라면 False.
+        """
+        queryset = Coupon.objects.filter(pk=self.pk)
+        if self.total_quantity is not None:
+            queryset = queryset.filter(issued_quantity__lte=models.F('total_quantity') - count)
+        return queryset.update(issued_quantity=models.F('issued_quantity') + count) == 1
+    
     def calculate_discount(self, order_amount, applicable_amount=None):
         """할인 금액 계산"""
         if applicable_amount is None:
@@ -302,6 +335,12 @@ class UserCoupon(models.Model):
         help_text='실제 적용된 할인 금액'
     )
     
+    issue_seq = models.PositiveIntegerField(
+        '발급 순번',
+        default=1,
+        help_text='같은 사용자에게 같은 쿠폰을 발급한 순번 (중복 발급 방지)'
+    )
+    
     class Meta:
         verbose_name = '사용자 쿠폰'
         verbose_name_plural = '사용자 쿠폰'
@@ -310,6 +349,12 @@ class UserCoupon(models.Model):
             models.Index(fields=['user', 'status']),
             models.Index(fields=['expires_at']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'coupon', 'issue_seq'],
+                name='unique_user_coupon_issue_seq'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.coupon.name}"
@@ -1,25 +1,58 @@
 """
 쿠폰 시스템 서비스 레이어
 """
+from django.core.cache import cache
 from django.utils import timezone
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from .models import Coupon, UserCoupon, CouponLog
+from .eligibility import CartItems, check_coupon, evaluate_coupons, load_coupon_rules
 import logging
 
 logger = logging.getLogger(__name__)
 
+SOLD_OUT_KEY = 'coupon_sold_out:{coupon_id}:{total_quantity}'
+SOLD_OUT_TIMEOUT = 60 * 10
+
+
+class CouponSoldOut(Exception):
+    """발급 수량 소진"""
+
 
 class CouponService:
     """쿠폰 관련 비즈니스 로직"""
     
     @staticmethod
-    @transaction.atomic
     def issue_coupon_to_user(coupon, user, log=True):
-        """사용자에게 쿠폰 발급"""
+        """
+        사용자에게 쿠폰 발급
+        
+        동시에 많은 요청이 몰려도 초과 발급되지 않도록 수량은 조건부 UPDATE
+        (Coupon.reserve_quantity) 로, 사용자별 중복 발급은 (user, coupon,
+        issue_seq) 유일 제약으로 막는다. 쿠폰 행 잠금은 트랜잭션 마지막의
+        UPDATE 부터 커밋까지만 잡는다. 소진된 쿠폰은 캐시 표시로 DB 조회 없이 거절한다.
+        """
+        sold_out_key = SOLD_OUT_KEY.format(coupon_id=coupon.pk, total_quantity=coupon.total_quantity)
+        if coupon.total_quantity is not None and cache.get(sold_out_key):
+            return False, "쿠폰이 모두 소진되었습니다."
+        
+        if coupon.total_quantity is not None and coupon.issued_quantity >= coupon.total_quantity:
+            cache.set(sold_out_key, True, SOLD_OUT_TIMEOUT)
+            return False, "쿠폰이 모두 소진되었습니다."
+        
         # 발급 가능 여부 확인
-        can_issue, message = coupon.can_issue_to_user(user)
-        if not can_issue:
-            return False, message
+        if not coupon.is_valid:
+            return False, "유효하지 않은 쿠폰입니다."
+        
+        if coupon.target_membership_levels:
+            if user.membership_level not in coupon.target_membership_levels:
+                return False, "회원 등급이 맞지 않습니다."
+        
+        if not coupon.is_target_user(user):
+            return False, "대상 사용자가 아닙니다."
+        
+        existing = UserCoupon.objects.filter(user=user, coupon=coupon).count()
+        if existing >= coupon.usage_limit_per_user:
+            return False, "이미 최대 발급 수량에 도달했습니다."
         
         # 만료일 계산
         if coupon.days_valid_after_issue:
@@ -28,28 +61,36 @@ class CouponService:
         else:
             expires_at = coupon.valid_to
         
-        # 쿠폰 발급
-        user_coupon = UserCoupon.objects.create(
-            user=user,
-            coupon=coupon,
-            expires_at=expires_at
-        )
-        
-        # 발급 수량 증가
-        coupon.issued_quantity += 1
-        coupon.save()
-        
-        # 로그 기록
-        if log:
-            CouponLog.objects.create(
-                coupon=coupon,
-                user=user,
-                action='ISSUED',
-                details={
-                    'user_coupon_id': user_coupon.id,
-                    'expires_at': expires_at.isoformat()
-                }
-            )
+        try:
+            with transaction.atomic():
+                # 쿠폰 발급 (같은 순번을 동시에 발급하면 유일 제약 위반)
+                user_coupon = UserCoupon.objects.create(
+                    user=user,
+                    coupon=coupon,
+                    expires_at=expires_at,
+                    issue_seq=existing + 1
+                )
+                
+                # 로그 기록
+                if log:
+                    CouponLog.objects.create(
+                        coupon=coupon,
+                        user=user,
+                        action='ISSUED',
+                        details={
+                            'user_coupon_id': user_coupon.id,
+                            'expires_at': expires_at.isoformat()
+                        }
+                    )
+                
+                # 발급 수량 증가 (남은 수량이 없으면 발급 취소)
+                if not coupon.reserve_quantity():
+                    raise CouponSoldOut()
+        except IntegrityError:
+            return False, "이미 최대 발급 수량에 도달했습니다."
+        except CouponSoldOut:
+            cache.set(sold_out_key, True, SOLD_OUT_TIMEOUT)
+            return False, "쿠폰이 모두 소진되었습니다."
         
         logger.info(f"Coupon {coupon.code} issued to user {user.username}")
         return True, user_coupon
@@ -169,36 +210,9 @@ class CouponService:
     @staticmethod
     def validate_coupon_for_order(user_coupon, order_amount, products=None):
         """주문에 대한 쿠폰 유효성 검증"""
-        coupon = user_coupon.coupon
-        
-        # 기본 유효성 확인
-        if not user_coupon.is_valid:
-            return False, "사용할 수 없는 쿠폰입니다."
-        
-        # 최소 주문 금액 확인
-        if order_amount < coupon.min_order_amount:
-            return False, f"최소 주문 금액 ₩{coupon.min_order_amount:,.0f} 이상에서 사용 가능합니다."
-        
-        # 적용 가능 상품/카테고리 확인
-        if products:
-            if coupon.applicable_products.exists():
-                applicable = any(p in coupon.applicable_products.all() for p in products)
-                if not applicable:
-                    return False, "해당 상품에는 쿠폰을 사용할 수 없습니다."
-            
-            if coupon.applicable_categories.exists():
-                product_categories = [p.category for p in products if p.category]
-                applicable = any(c in coupon.applicable_categories.all() for c in product_categories)
-                if not applicable:
-                    return False, "해당 카테고리 상품에는 쿠폰을 사용할 수 없습니다."
-            
-            # 세일 상품 제외 확인
-            if coupon.exclude_sale_items:
-                has_sale = any(p.discount_price for p in products)
-                if has_sale:
-                    return False, "세일 상품에는 쿠폰을 사용할 수 없습니다."
-        
-        return True, "사용 가능"
+        cart = CartItems(products)
+        rules = load_coupon_rules([user_coupon.coupon_id]) if not cart.is_empty else {}
+        return check_coupon(user_coupon, order_amount, cart, rules)
     
     @staticmethod
     def calculate_discount(coupon, order_amount, applicable_amount=None):
@@ -207,7 +221,7 @@ class CouponService:
     
     @staticmethod
     def get_user_available_coupons(user, order_amount=None, products=None):
-        """사용자가 사용 가능한 쿠폰 목록"""
+        """사용자가 사용 가능한 쿠폰 목록 (주문 금액이 있으면 할인 금액이 큰 순)"""
         user_coupons = UserCoupon.objects.filter(
             user=user,
             status='ISSUED',
@@ -215,29 +229,14 @@ class CouponService:
             coupon__is_active=True
         ).select_related('coupon')
         
-        available_coupons = []
-        for user_coupon in user_coupons:
-            if order_amount:
-                is_valid, message = CouponService.validate_coupon_for_order(
-                    user_coupon, order_amount, products
-                )
-                if is_valid:
-                    discount = CouponService.calculate_discount(
-                        user_coupon.coupon, order_amount
-                    )
-                    available_coupons.append({
-                        'user_coupon': user_coupon,
-                        'discount': discount,
-                        'message': message
-                    })
-            else:
-                available_coupons.append({
-                    'user_coupon': user_coupon,
-                    'discount': 0,
-                    'message': ''
-                })
-        
-        return available_coupons
+        # 주문 금액이 있으면 쿠폰 규칙을 한 번에 읽어 판정 (할인 금액이 큰 순)
+        if order_amount:
+            return evaluate_coupons(user_coupons, order_amount, products)
+        
+        return [
+            {'user_coupon': user_coupon, 'discount': 0, 'message': ''}
+            for user_coupon in user_coupons
+        ]
     
     @staticmethod
     def expire_old_coupons():
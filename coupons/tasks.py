@@ -0,0 +1,53 @@
+# coupons/tasks.py
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+import logging
+
+from .campaigns import campaign_audience, issue_campaign
+from .models import Coupon
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def issue_campaign_coupons(coupon_id, issued_by_id=None, **audience_filters):
+    """
+    캠페인 쿠폰 일괄 발급
+
+    audience_filters 는 campaign_audience 인자 (membership_levels, birth_month,
+    min_orders 등). 실패 후 같은 인자로 다시 실행하면 이어서 발급한다.
+    """
+    coupon = Coupon.objects.filter(pk=coupon_id).first()
+    if coupon is None:
+        logger.warning(f"캠페인 발급 대상 쿠폰 없음: {coupon_id}")
+        return 0
+    if not coupon.is_valid:
+        logger.warning(f"유효하지 않은 캠페인 쿠폰: {coupon.code}")
+        return 0
+
+    issued_by = get_user_model().objects.filter(pk=issued_by_id).first() if issued_by_id else None
+    result = issue_campaign(coupon, campaign_audience(coupon, **audience_filters), issued_by=issued_by)
+    return result['issued']
+
+
+@shared_task
+def issue_birthday_coupons():
+    """오늘 생일인 회원에게 생일 쿠폰 일괄 발급"""
+    now = timezone.now()
+    today = timezone.localdate()
+    birthday_coupons = Coupon.objects.filter(
+        issue_type='BIRTHDAY',
+        is_active=True,
+        valid_from__lte=now,
+        valid_to__gte=now
+    )
+
+    total = 0
+    for coupon in birthday_coupons:
+        if not coupon.is_valid:
+            # 발급 수량/사용 한도 소진
+            continue
+        audience = campaign_audience(coupon, birth_month=today.month, birth_day=today.day)
+        total += issue_campaign(coupon, audience)['issued']
+    return total
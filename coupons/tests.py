@@ -0,0 +1,44 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from .campaigns import campaign_audience, issue_campaign
+from .models import Coupon, UserCoupon
+
+
+class CampaignIssueValidityTest(TestCase):
+    """유효하지 않은 쿠폰은 캠페인으로 발급하지 않는다"""
+
+    def setUp(self):
+        now = timezone.now()
+        self.coupon = Coupon.objects.create(
+            code='CAMPAIGN', name='캠페인 쿠폰', discount_type='FIXED', discount_value=1000,
+            valid_from=now - timedelta(days=1), valid_to=now + timedelta(days=30)
+        )
+        for i in range(3):
+            get_user_model().objects.create_user(username=f'member{i}', password='pass')
+
+    def test_valid_coupon_is_issued(self):
+        result = issue_campaign(self.coupon, campaign_audience(self.coupon))
+
+        self.assertEqual(result['issued'], 3)
+        self.assertEqual(UserCoupon.objects.filter(coupon=self.coupon).count(), 3)
+
+    def test_expired_coupon_is_rejected(self):
+        Coupon.objects.filter(pk=self.coupon.pk).update(valid_to=timezone.now() - timedelta(hours=1))
+        self.coupon.refresh_from_db()
+
+        with self.assertRaises(ValueError):
+            issue_campaign(self.coupon, campaign_audience(self.coupon))
+        self.assertFalse(UserCoupon.objects.exists())
+
+    def test_command_rejects_inactive_coupon_before_dry_run(self):
+        Coupon.objects.filter(pk=self.coupon.pk).update(is_active=False)
+
+        with self.assertRaisesMessage(CommandError, '유효하지 않은 쿠폰'):
+            call_command('issue_campaign_coupons', 'CAMPAIGN', '--dry-run', stdout=StringIO())
+        self.assertFalse(UserCoupon.objects.exists())
@@ -1,3 +1,63 @@
-from django.test import TestCase
+import json
+from datetime import datetime, time, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from orders.models import Order
+
+from .views import dashboard_chart_data
+
+
+def create_order(number, day, status='DELIVERED', amount=1000):
+    return Order.objects.create(
+        order_number=number, customer_name='고객', shipping_address='서울', shipping_zipcode='00000',
+        status=status, total_amount=Decimal(amount),
+        order_date=timezone.make_aware(datetime.combine(day, time(12)))
+    )
+
+
+class SalesChartQueryCountTest(TestCase):
+    """매출 차트의 쿼리 수는 기간과 무관"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='dashboard', password='pass', user_type='ADMIN')
+        today = timezone.localdate()
+        create_order('CHART-1', today - timedelta(days=1), amount=1000)
+        create_order('CHART-2', today - timedelta(days=1), status='CANCELLED', amount=500)
+        create_order('CHART-3', today - timedelta(days=200), amount=2000)
+
+    def get(self, period):
+        request = RequestFactory().get('/dashboard/chart-data/', {'type': 'sales', 'period': period})
+        request.user = self.user
+        response = dashboard_chart_data(request)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_same_query_count_for_short_and_long_periods(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get(7)
+
+        with self.assertNumQueries(len(queries)):
+            self.get(360)
+
+    def test_daily_gaps_are_filled(self):
+        data = self.get(7)
+
+        self.assertEqual(len(data['labels']), 7)
+        self.assertEqual(data['labels'][-1], timezone.localdate().strftime('%m/%d'))
+        self.assertEqual(data['data'], [0, 0, 0, 0, 0, 1000, 0])
+
+    def test_monthly_buckets(self):
+        data = self.get(360)
+
+        today = timezone.localdate()
+        self.assertEqual(data['labels'][0], (today - timedelta(days=359)).strftime('%Y-%m'))
+        self.assertEqual(data['labels'][-1], today.strftime('%Y-%m'))
+        self.assertEqual(len(data['labels']), len(set(data['labels'])))
+        self.assertEqual(sorted(value for value in data['data'] if value), [1000, 2000])
@@ -3,34 +3,33 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from django.db.models import Sum, Count, F
+from django.db.models import Sum, Count, F, Q
 from django.utils import timezone
 from datetime import timedelta, datetime
 from orders.models import Order
+from orders.rollups import sales_totals, REVENUE_STATUSES
 from products.models import Product
 from platforms.models import Platform
+from core.timeseries import (
+    aggregate_series, GRANULARITY_DAY, GRANULARITY_WEEK, GRANULARITY_MONTH
+)
 
 @login_required
 def dashboard_home(request):
     """대시보드 홈 페이지"""
-    today = timezone.now().date()
+    today = timezone.localdate()
     
-    # 기본 통계
+    # 기본 통계 (주문/매출은 일별 매출 집계에서 조회)
     context = {
-        'total_orders': Order.objects.count(),
-        'total_sales': Order.objects.filter(
-            status__in=['PROCESSING', 'SHIPPED', 'DELIVERED']
-        ).aggregate(total=Sum('total_amount'))['total'] or 0,
+        'total_orders': sales_totals()['orders'],
+        'total_sales': sales_totals(statuses=REVENUE_STATUSES)['revenue'],
+        'today_orders': sales_totals(today, today)['orders'],
+        'today_sales': sales_totals(today, today, statuses=REVENUE_STATUSES)['revenue'],
         'total_products': Product.objects.filter(status='ACTIVE').count(),
         'low_stock_count': Product.objects.filter(
             stock_quantity__lte=F('min_stock_level'),
             status='ACTIVE'
         ).count(),
-        'today_orders': Order.objects.filter(order_date__date=today).count(),
-        'today_sales': Order.objects.filter(
-            order_date__date=today,
-            status__in=['PROCESSING', 'SHIPPED', 'DELIVERED']
-        ).aggregate(total=Sum('total_amount'))['total'] or 0,
         'new_products_week': Product.objects.filter(
             created_at__date__gte=today - timedelta(days=7)
         ).count(),
@@ -73,7 +72,7 @@ def dashboard_chart_data(request):
     except (ValueError, TypeError):
         days = 7
     
-    today = timezone.now().date()
+    today = timezone.localdate()
     start_date = today - timedelta(days=days-1)
     
     if chart_type == 'sales':
@@ -81,62 +80,27 @@ def dashboard_chart_data(request):
         sales_data = []
         labels = []
         
-        # 기간에 따라 그룹핑 방식 결정
+        # 기간에 따라 그룹핑 방식 결정 (30일 이하 일별, 90일 이하 주별, 그 외 월별)
         if days <= 30:
-            # 30일 이하는 일별로 표시
-            for i in range(days):
-                date = start_date + timedelta(days=i)
-                daily_sales = Order.objects.filter(
-                    order_date__date=date,
-                    status__in=['PROCESSING', 'SHIPPED', 'DELIVERED']
-                ).aggregate(total=Sum('total_amount'))['total'] or 0
-                
-                sales_data.append(float(daily_sales))
-                labels.append(date.strftime('%m/%d'))
-        
+            granularity = GRANULARITY_DAY
         elif days <= 90:
-            # 60일, 90일은 주별로 표시
-            weeks = days // 7
-            for week in range(weeks):
-                week_start = start_date + timedelta(weeks=week)
-                week_end = week_start + timedelta(days=6)
-                
-                weekly_sales = Order.objects.filter(
-                    order_date__date__range=[week_start, week_end],
-                    status__in=['PROCESSING', 'SHIPPED', 'DELIVERED']
-                ).aggregate(total=Sum('total_amount'))['total'] or 0
-                
-                sales_data.append(float(weekly_sales))
-                labels.append(f"{week_start.strftime('%m/%d')}~{week_end.strftime('%m/%d')}")
-        
+            granularity = GRANULARITY_WEEK
         else:
-            # 180일, 360일은 월별로 표시
-            current_date = start_date
-            while current_date <= today:
-                month_start = current_date.replace(day=1)
-                # 다음 달 첫날 계산
-                if month_start.month == 12:
-                    month_end = month_start.replace(year=month_start.year + 1, month=1, day=1) - timedelta(days=1)
-                else:
-                    month_end = month_start.replace(month=month_start.month + 1, day=1) - timedelta(days=1)
-                
-                # 실제 기간 내에서만 계산
-                actual_start = max(month_start, start_date)
-                actual_end = min(month_end, today)
-                
-                monthly_sales = Order.objects.filter(
-                    order_date__date__range=[actual_start, actual_end],
-                    status__in=['PROCESSING', 'SHIPPED', 'DELIVERED']
-                ).aggregate(total=Sum('total_amount'))['total'] or 0
-                
-                sales_data.append(float(monthly_sales))
-                labels.append(month_start.strftime('%Y-%m'))
-                
-                # 다음 달로 이동
-                if month_start.month == 12:
-                    current_date = month_start.replace(year=month_start.year + 1, month=1)
-                else:
-                    current_date = month_start.replace(month=month_start.month + 1)
+            granularity = GRANULARITY_MONTH
+        
+        series = aggregate_series(
+            Order.objects.all(), start_date, today, granularity,
+            value_filter=Q(status__in=['PROCESSING', 'SHIPPED', 'DELIVERED'])
+        )
+        
+        for point in series:
+            sales_data.append(float(point['total']))
+            if granularity == GRANULARITY_DAY:
+                labels.append(point['start'].strftime('%m/%d'))
+            elif granularity == GRANULARITY_WEEK:
+                labels.append(f"{point['start'].strftime('%m/%d')}~{point['end'].strftime('%m/%d')}")
+            else:
+                labels.append(point['start'].strftime('%Y-%m'))
         
         return JsonResponse({
             'labels': labels,
@@ -200,15 +164,12 @@ def dashboard_stats(request):
         return JsonResponse({'error': '잘못된 요청입니다.'}, status=405)
     
     try:
-        today = timezone.now().date()
+        today = timezone.localdate()
         
         # 오늘 통계
         today_stats = {
-            'todayOrders': Order.objects.filter(order_date__date=today).count(),
-            'todaySales': float(Order.objects.filter(
-                order_date__date=today,
-                status__in=['PROCESSING', 'SHIPPED', 'DELIVERED']
-            ).aggregate(total=Sum('total_amount'))['total'] or 0),
+            'todayOrders': sales_totals(today, today)['orders'],
+            'todaySales': float(sales_totals(today, today, statuses=REVENUE_STATUSES)['revenue']),
             'new_customers': Order.objects.filter(
                 order_date__date=today
             ).values('customer_email').distinct().count()
@@ -217,11 +178,8 @@ def dashboard_stats(request):
         # 이번 주 통계
         week_ago = today - timedelta(days=7)
         week_stats = {
-            'orders': Order.objects.filter(order_date__date__gte=week_ago).count(),
-            'sales': float(Order.objects.filter(
-                order_date__date__gte=week_ago,
-                status__in=['PROCESSING', 'SHIPPED', 'DELIVERED']
-            ).aggregate(total=Sum('total_amount'))['total'] or 0)
+            'orders': sales_totals(week_ago)['orders'],
+            'sales': float(sales_totals(week_ago, statuses=REVENUE_STATUSES)['revenue'])
         }
         
         # 재고 알림
@@ -246,10 +204,8 @@ def dashboard_stats(request):
         
         # 전체 통계
         total_stats = {
-            'totalOrders': Order.objects.count(),
-            'totalSales': float(Order.objects.filter(
-                status__in=['PROCESSING', 'SHIPPED', 'DELIVERED']
-            ).aggregate(total=Sum('total_amount'))['total'] or 0),
+            'totalOrders': sales_totals()['orders'],
+            'totalSales': float(sales_totals(statuses=REVENUE_STATUSES)['revenue']),
             'totalProducts': Product.objects.filter(status='ACTIVE').count(),
             'connectedPlatforms': Platform.objects.filter(is_active=True).count(),
             'lowStock': low_stock
@@ -0,0 +1,138 @@
+"""
+재고 관리 서비스 레이어
+"""
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+
+from products.models import Product
+from .models import StockMovement
+from .signals import check_and_create_stock_alerts_bulk
+from .snapshot import invalidate_inventory_snapshot
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StockAdjustmentService:
+    """재고 조정 관련 비즈니스 로직"""
+
+    BATCH_SIZE = 500
+
+    @staticmethod
+    def calculate_new_quantity(old_quantity, adjustment_type, adjustment_value):
+        """조정 후 수량 계산 (수량, 오류 메시지) 반환"""
+        if adjustment_type == 'set':
+            return int(adjustment_value), None
+        if adjustment_type == 'add':
+            return old_quantity + int(adjustment_value), None
+        if adjustment_type == 'subtract':
+            new_quantity = old_quantity - int(adjustment_value)
+            if new_quantity < 0:
+                return None, '재고 수량이 음수가 될 수 없습니다.'
+            return new_quantity, None
+        return None, '올바르지 않은 조정 타입입니다.'
+
+    @staticmethod
+    def apply_bulk_adjustment(product_ids, adjustment_type, adjustment_value, reason, user=None):
+        """
+        여러 상품의 재고를 일괄 조정
+
+        대상 상품을 한 번에 조회하고, 조정 수량은 메모리에서 계산한 뒤
+        bulk_update/bulk_create 로 기록한다. 상품별 save() 와 시그널을
+        거치지 않으므로 재고 알림과 스냅샷 무효화는 여기서 직접 처리한다.
+
+        (성공 목록, 실패 목록)을 요청된 상품 순서대로 반환한다.
+        """
+        successful_adjustments = []
+        failed_adjustments = []
+
+        valid_ids = []
+        for product_id in product_ids:
+            try:
+                valid_ids.append(uuid.UUID(str(product_id)))
+            except ValueError:
+                pass
+
+        now = timezone.now()
+        reference_time = now.strftime("%Y%m%d%H%M%S")
+
+        with transaction.atomic():
+            products = Product.objects.select_for_update().filter(
+                id__in=valid_ids, status='ACTIVE'
+            ).in_bulk()
+
+            changed_products = {}
+            movements = []
+
+            for product_id in product_ids:
+                try:
+                    product = products.get(uuid.UUID(str(product_id)))
+                except ValueError:
+                    product = None
+
+                if product is None:
+                    failed_adjustments.append({
+                        'product_name': f'상품 ID {product_id}',
+                        'reason': '상품을 찾을 수 없습니다.'
+                    })
+                    continue
+
+                old_quantity = product.stock_quantity
+                try:
+                    new_quantity, error = StockAdjustmentService.calculate_new_quantity(
+                        old_quantity, adjustment_type, adjustment_value
+                    )
+                except (TypeError, ValueError) as e:
+                    new_quantity, error = None, str(e)
+
+                if error:
+                    failed_adjustments.append({
+                        'product_name': product.name,
+                        'reason': error
+                    })
+                    continue
+
+                if new_quantity != old_quantity:
+                    product.stock_quantity = new_quantity
+                    product.updated_at = now
+                    changed_products[product.pk] = product
+
+                    movements.append(StockMovement(
+                        product=product,
+                        movement_type='ADJUST',
+                        quantity=abs(new_quantity - old_quantity),
+                        previous_stock=old_quantity,
+                        current_stock=new_quantity,
+                        reference_number=f'BULK-ADJ-{reference_time}-{product.id}',
+                        reason=reason,
+                        notes=f'일괄 재고 조정: {old_quantity}개 → {new_quantity}개',
+                        created_by=user
+                    ))
+
+                successful_adjustments.append({
+                    'product_name': product.name,
+                    'old_quantity': old_quantity,
+                    'new_quantity': new_quantity
+                })
+
+            if changed_products:
+                Product.objects.bulk_update(
+                    changed_products.values(),
+                    ['stock_quantity', 'updated_at'],
+                    batch_size=StockAdjustmentService.BATCH_SIZE
+                )
+                StockMovement.objects.bulk_create(
+                    movements, batch_size=StockAdjustmentService.BATCH_SIZE
+                )
+                check_and_create_stock_alerts_bulk(changed_products.values())
+
+        if changed_products:
+            invalidate_inventory_snapshot()
+
+        logger.info(
+            f'Bulk stock adjustment: {len(successful_adjustments)} succeeded, '
+            f'{len(failed_adjustments)} failed, {len(changed_products)} products changed'
+        )
+        return successful_adjustments, failed_adjustments
@@ -1,5 +1,5 @@
 # inventory/signals.py - 재고 관리 시그널
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, pre_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from django.core.mail import send_mail
@@ -8,8 +8,11 @@ from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
-from products.models import Product
+from products.models import Product, Category
+from notifications.tasks import send_stock_alert_notifications
+from notifications.utils import dispatch_task
 from .models import StockMovement, StockAlert, StockLevel
+from .snapshot import invalidate_inventory_snapshot
 
 @receiver(pre_save, sender=Product)
 def track_stock_changes(sender, instance, **kwargs):
@@ -82,59 +85,55 @@ def create_automatic_stock_movement(product, old_quantity, new_quantity):
         logger = logging.getLogger(__name__)
         logger.error(f'자동 재고 이동 기록 생성 실패: {str(e)}')
 
-def check_and_create_stock_alerts(product):
-    """재고 알림 확인 및 생성"""
+def evaluate_stock_alert_rule(product):
+    """
+    상품 재고 상태에 따른 알림 규칙 평가
+
+    (생성할 알림 유형, 메시지, 기준값, 해결할 알림 유형 목록)을 반환한다.
+    생성할 알림이 없으면 알림 유형은 None 이다.
+    """
     current_stock = product.stock_quantity
     
-    # 기존 활성 알림들 조회
-    active_alerts = StockAlert.objects.filter(
-        product=product,
-        status='ACTIVE'
-    ).values_list('alert_type', flat=True)
-    
-    alerts_to_create = []
-    alerts_to_resolve = []
-    
     # 재고 없음 체크
     if current_stock == 0:
-        if 'OUT_OF_STOCK' not in active_alerts:
-            alerts_to_create.append(create_alert_data(
-                product, 'OUT_OF_STOCK', 
+        return ('OUT_OF_STOCK',
                 f'{product.name}의 재고가 모두 소진되었습니다.',
-                threshold_value=0,
-                current_value=current_stock
-            ))
-        # 다른 알림들은 해결 처리
-        alerts_to_resolve.extend(['LOW_STOCK', 'OVERSTOCK'])
+                0, ['LOW_STOCK', 'OVERSTOCK'])
     
     # 재고 부족 체크
-    elif current_stock <= product.min_stock_level:
-        if 'LOW_STOCK' not in active_alerts:
-            alerts_to_create.append(create_alert_data(
-                product, 'LOW_STOCK',
+    if current_stock <= product.min_stock_level:
+        return ('LOW_STOCK',
                 f'{product.name}의 재고가 부족합니다. (현재: {current_stock}개, 최소: {product.min_stock_level}개)',
-                threshold_value=product.min_stock_level,
-                current_value=current_stock
-            ))
-        # OUT_OF_STOCK과 OVERSTOCK 알림 해결
-        alerts_to_resolve.extend(['OUT_OF_STOCK', 'OVERSTOCK'])
+                product.min_stock_level, ['OUT_OF_STOCK', 'OVERSTOCK'])
     
     # 재고 과다 체크
-    elif current_stock > product.max_stock_level:
-        if 'OVERSTOCK' not in active_alerts:
-            alerts_to_create.append(create_alert_data(
-                product, 'OVERSTOCK',
+    if current_stock > product.max_stock_level:
+        return ('OVERSTOCK',
                 f'{product.name}의 재고가 과도합니다. (현재: {current_stock}개, 최대: {product.max_stock_level}개)',
-                threshold_value=product.max_stock_level,
-                current_value=current_stock
-            ))
-        # 다른 알림들은 해결 처리
-        alerts_to_resolve.extend(['OUT_OF_STOCK', 'LOW_STOCK'])
+                product.max_stock_level, ['OUT_OF_STOCK', 'LOW_STOCK'])
     
-    # 정상 재고 상태
-    else:
-        # 모든 재고 관련 알림 해결
-        alerts_to_resolve.extend(['OUT_OF_STOCK', 'LOW_STOCK', 'OVERSTOCK'])
+    # 정상 재고 상태: 모든 재고 관련 알림 해결
+    return (None, '', None, ['OUT_OF_STOCK', 'LOW_STOCK', 'OVERSTOCK'])
+
+def check_and_create_stock_alerts(product):
+    """재고 알림 확인 및 생성"""
+    current_stock = product.stock_quantity
+    
+    # 기존 활성 알림들 조회
+    active_alerts = StockAlert.objects.filter(
+        product=product,
+        status='ACTIVE'
+    ).values_list('alert_type', flat=True)
+    
+    alerts_to_create = []
+    alert_type, message, threshold_value, alerts_to_resolve = evaluate_stock_alert_rule(product)
+    
+    if alert_type and alert_type not in active_alerts:
+        alerts_to_create.append(create_alert_data(
+            product, alert_type, message,
+            threshold_value=threshold_value,
+            current_value=current_stock
+        ))
     
     # 알림 생성
     for alert_data in alerts_to_create:
@@ -142,6 +141,7 @@ def check_and_create_stock_alerts(product):
             alert = StockAlert.objects.create(**alert_data)
             # 이메일 알림 발송 (비동기 처리 권장)
             send_stock_alert_email(alert)
+            notify_stock_alerts([alert])
         except Exception as e:
             import logging
             logger = logging.getLogger(__name__)
@@ -149,14 +149,97 @@ def check_and_create_stock_alerts(product):
     
     # 알림 해결
     if alerts_to_resolve:
+        resolve_stock_alerts([product.pk], alerts_to_resolve)
+
+def check_and_create_stock_alerts_bulk(products):
+    """
+    여러 상품의 재고 알림을 한 번에 확인 및 생성
+
+    활성 알림 조회 1회, 알림 생성 bulk_create 1회, 해결 유형 조합별 update 로 처리한다.
+    """
+    products = list(products)
+    if not products:
+        return []
+    
+    active_alerts = set(
         StockAlert.objects.filter(
-            product=product,
-            alert_type__in=alerts_to_resolve,
+            product_id__in=[product.pk for product in products],
             status='ACTIVE'
-        ).update(
-            status='RESOLVED',
-            resolved_at=timezone.now()
-        )
+        ).values_list('product_id', 'alert_type')
+    )
+    
+    alerts_to_create = []
+    resolve_groups = {}
+    
+    for product in products:
+        alert_type, message, threshold_value, alerts_to_resolve = evaluate_stock_alert_rule(product)
+        
+        if alert_type and (product.pk, alert_type) not in active_alerts:
+            alerts_to_create.append(StockAlert(**create_alert_data(
+                product, alert_type, message,
+                threshold_value=threshold_value,
+                current_value=product.stock_quantity
+            )))
+        
+        resolve_groups.setdefault(tuple(alerts_to_resolve), []).append(product.pk)
+    
+    # 알림 해결 (해결할 알림 유형 조합별 1회)
+    for alert_types, product_ids in resolve_groups.items():
+        resolve_stock_alerts(product_ids, alert_types)
+    
+    # 알림 생성
+    created_alerts = StockAlert.objects.bulk_create(alerts_to_create, batch_size=500)
+    for alert in created_alerts:
+        send_stock_alert_email(alert, save=False)
+    notify_stock_alerts(created_alerts)
+    
+    # 이메일 발송 기록 (1회 갱신)
+    sent_alerts = [alert for alert in created_alerts if alert.is_email_sent and alert.pk]
+    if sent_alerts:
+        StockAlert.objects.bulk_update(sent_alerts, ['is_email_sent', 'email_sent_at'], batch_size=500)
+    
+    return created_alerts
+
+def notify_stock_alerts(alerts):
+    """
+    새로 생성된 재고 부족/품절 알림을 재고 관리자들에게 발송
+
+    활성 알림이 이미 있으면 알림을 만들지 않으므로, 재고가 회복되기 전까지
+    상품당 한 번만 발송된다 (커밋 후 Celery 작업으로 일괄 발송).
+    """
+    for alert in alerts:
+        if alert.alert_type in ('LOW_STOCK', 'OUT_OF_STOCK'):
+            dispatch_task(send_stock_alert_notifications, alert.product_id, alert.current_value)
+
+def resolve_stock_alerts(product_ids, alert_types):
+    """
+    활성 재고 알림 해결 처리
+
+    (상품, 알림 유형, 상태)는 유일해야 하므로, 같은 유형의 이전 해결 알림은
+    새로 해결되는 알림으로 대체한다.
+    """
+    active_alerts = StockAlert.objects.filter(
+        product_id__in=product_ids,
+        alert_type__in=alert_types,
+        status='ACTIVE'
+    )
+    resolving = {}
+    for product_id, alert_type in active_alerts.values_list('product_id', 'alert_type'):
+        resolving.setdefault(alert_type, []).append(product_id)
+    if not resolving:
+        return 0
+    
+    for alert_type, resolving_product_ids in resolving.items():
+        StockAlert.objects.filter(
+            product_id__in=resolving_product_ids,
+            alert_type=alert_type,
+            status='RESOLVED'
+        ).delete()
+    
+    return active_alerts.update(
+        status='RESOLVED',
+        resolved_at=timezone.now()
+    )
 
 def create_alert_data(product, alert_type, message, threshold_value=None, current_value=None):
     """알림 데이터 생성"""
@@ -168,8 +251,8 @@ def create_alert_data(product, alert_type, message, threshold_value=None, curren
         'current_value': current_value,
     }
 
-def send_stock_alert_email(alert):
-    """재고 알림 이메일 발송"""
+def send_stock_alert_email(alert, save=True):
+    """재고 알림 이메일 발송 (save=False 이면 발송 기록은 호출자가 저장)"""
     try:
         if not getattr(settings, 'ENABLE_STOCK_EMAIL_ALERTS', False):
             return
@@ -221,7 +304,8 @@ def send_stock_alert_email(alert):
         # 이메일 발송 기록
         alert.is_email_sent = True
         alert.email_sent_at = timezone.now()
-        alert.save(update_fields=['is_email_sent', 'email_sent_at'])
+        if save:
+            alert.save(update_fields=['is_email_sent', 'email_sent_at'])
         
     except Exception as e:
         import logging
@@ -263,6 +347,14 @@ def sync_product_stock_levels(sender, instance, created, **kwargs):
         logger = logging.getLogger(__name__)
         logger.error(f'Product 재고 수준 동기화 실패: {str(e)}')
 
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_snapshot_on_change(sender, **kwargs):
+    """상품/카테고리 변경시 재고 스냅샷 캐시 무효화"""
+    invalidate_inventory_snapshot()
+
 # 앱 시작시 시그널 연결
 def connect_signals():
     """시그널 연결 함수"""
@@ -0,0 +1,90 @@
+# inventory/snapshot.py - 재고 스냅샷 서비스
+"""
+재고 현황 스냅샷
+
+상품 수, 재고 상태별 분포, 카테고리별 수량/가치를 한 번의 조건부 집계
+쿼리로 계산한다. 활성 상품 전체에 대한 스냅샷은 캐시되며, 상품/카테고리
+변경 시그널에서 무효화된다.
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.utils import timezone
+
+from products.models import Product
+
+SNAPSHOT_CACHE_KEY = 'inventory_snapshot'
+SNAPSHOT_CACHE_TIMEOUT = 300  # 5분
+
+_VALUE_FIELD = DecimalField(max_digits=20, decimal_places=2)
+
+_COUNTER_KEYS = ['product_count', 'total_stock', 'normal_count', 'low_count', 'out_count', 'below_min_count']
+_VALUE_KEYS = ['cost_value', 'selling_value']
+
+
+def build_inventory_snapshot(products=None):
+    """
+    주어진 상품 쿼리셋(기본: 활성 상품)의 재고 스냅샷을 계산한다.
+
+    재고 상태 구분:
+    - normal: 재고 > 최소 재고
+    - low: 0 < 재고 <= 최소 재고
+    - out: 재고 = 0
+    - below_min: 재고 <= 최소 재고 (low + out)
+    """
+    if products is None:
+        products = Product.objects.filter(status='ACTIVE')
+
+    rows = products.order_by().values(
+        'category_id', 'category__name', 'category__is_active'
+    ).annotate(
+        product_count=Count('pk'),
+        total_stock=Sum('stock_quantity'),
+        cost_value=Sum(F('stock_quantity') * F('cost_price'), output_field=_VALUE_FIELD),
+        selling_value=Sum(F('stock_quantity') * F('selling_price'), output_field=_VALUE_FIELD),
+        normal_count=Count('pk', filter=Q(stock_quantity__gt=F('min_stock_level'))),
+        low_count=Count('pk', filter=Q(stock_quantity__lte=F('min_stock_level'), stock_quantity__gt=0)),
+        out_count=Count('pk', filter=Q(stock_quantity=0)),
+        below_min_count=Count('pk', filter=Q(stock_quantity__lte=F('min_stock_level'))),
+    )
+
+    totals = {key: 0 for key in _COUNTER_KEYS}
+    totals.update({key: Decimal('0') for key in _VALUE_KEYS})
+    categories = []
+
+    for row in rows:
+        category = {
+            'id': row['category_id'],
+            'name': row['category__name'],
+            'is_active': bool(row['category__is_active']),
+        }
+        for key in _COUNTER_KEYS:
+            category[key] = row[key] or 0
+            totals[key] += category[key]
+        for key in _VALUE_KEYS:
+            category[key] = row[key] or Decimal('0')
+            totals[key] += category[key]
+        categories.append(category)
+
+    categories.sort(key=lambda item: item['cost_value'], reverse=True)
+
+    return {
+        'totals': totals,
+        'categories': categories,
+        'generated_at': timezone.now(),
+    }
+
+
+def get_inventory_snapshot():
+    """활성 상품 전체의 재고 스냅샷 (캐시 사용)"""
+    snapshot = cache.get(SNAPSHOT_CACHE_KEY)
+    if snapshot is None:
+        snapshot = build_inventory_snapshot()
+        cache.set(SNAPSHOT_CACHE_KEY, snapshot, SNAPSHOT_CACHE_TIMEOUT)
+    return snapshot
+
+
+def invalidate_inventory_snapshot():
+    """재고 스냅샷 캐시 무효화"""
+    cache.delete(SNAPSHOT_CACHE_KEY)
@@ -1,3 +1,85 @@
-from django.test import TestCase
+import csv
+import io
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+
+from core.exports import UTF8_BOM
+from products.models import Category, Product
+
+from .signals import check_and_create_stock_alerts_bulk
+from .views import export_stock_data
+
+
+@mock.patch('notifications.tasks.send_stock_alert_notifications.delay')
+class StockAlertNotificationTest(TestCase):
+    """재고 부족/품절 알림이 생성될 때 한 번만 재고 관리자 알림을 예약"""
+
+    def setUp(self):
+        self.product = Product.objects.create(
+            sku='STOCK-1', name='재고 상품', cost_price=500, selling_price=1000,
+            stock_quantity=100, min_stock_level=5, max_stock_level=1000
+        )
+
+    def set_stock(self, quantity):
+        self.product.stock_quantity = quantity
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+
+    def test_low_stock_notifies_once(self, delay):
+        self.set_stock(50)
+        delay.assert_not_called()
+
+        self.set_stock(3)
+        delay.assert_called_once_with(self.product.pk, 3)
+
+        # 활성 알림이 있는 동안에는 다시 보내지 않는다
+        self.set_stock(2)
+        delay.assert_called_once()
+
+        self.set_stock(0)
+        delay.assert_called_with(self.product.pk, 0)
+        self.assertEqual(delay.call_count, 2)
+
+    def test_bulk_path_notifies(self, delay):
+        other = Product.objects.create(
+            sku='STOCK-2', name='재고 상품 2', cost_price=500, selling_price=1000,
+            stock_quantity=100, min_stock_level=5, max_stock_level=1000
+        )
+        Product.objects.filter(pk__in=[self.product.pk, other.pk]).update(stock_quantity=1)
+        products = list(Product.objects.filter(pk__in=[self.product.pk, other.pk]))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            check_and_create_stock_alerts_bulk(products)
+
+        self.assertEqual(
+            sorted(call.args for call in delay.call_args_list),
+            sorted([(self.product.pk, 1), (other.pk, 1)])
+        )
+
+
+class StockCsvExportTest(TestCase):
+
+    def test_export_body(self):
+        category = Category.objects.create(name='의류', code='CLOTH')
+        Product.objects.create(
+            sku='STOCK-CSV-1', name='재고 상품', category=category, cost_price=500, selling_price=1000,
+            stock_quantity=4, min_stock_level=5, max_stock_level=100, status='ACTIVE'
+        )
+        Product.objects.create(sku='STOCK-CSV-2', name='단종 상품', cost_price=500, selling_price=1000, status='DISCONTINUED')
+        request = RequestFactory().get('/inventory/export/')
+        request.user = get_user_model().objects.create_user(username='staff', password='pass')
+
+        response = export_stock_data(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        body = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(body.startswith(UTF8_BOM))
+
+        rows = list(csv.reader(io.StringIO(body[len(UTF8_BOM):])))
+        self.assertEqual(rows[0][:2], ['SKU', '상품명'])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][:3], ['STOCK-CSV-1', '재고 상품', '의류'])
+        self.assertEqual(rows[1][-1], '2000.00')
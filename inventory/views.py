@@ -18,6 +18,9 @@ from datetime import timedelta
 import decimal
 
 from products.models import Product, Category
+from .snapshot import get_inventory_snapshot
+from core.exports import format_datetime, iter_values, streaming_csv_response
+from .services import StockAdjustmentService
 
 # StockMovement 모델 안전한 import
 try:
@@ -282,72 +285,10 @@ def apply_bulk_stock_adjustment(request):
         if not reason:
             return JsonResponse({'error': '조정 사유를 입력해주세요.'}, status=400)
         
-        successful_adjustments = []
-        failed_adjustments = []
-        
-        # 트랜잭션으로 일괄 처리
-        with transaction.atomic():
-            for product_id in product_ids:
-                try:
-                    product = Product.objects.get(id=product_id, status='ACTIVE')
-                    old_quantity = product.stock_quantity
-                    
-                    # 새 수량 계산
-                    if adjustment_type == 'set':
-                        new_quantity = int(adjustment_value)
-                    elif adjustment_type == 'add':
-                        new_quantity = old_quantity + int(adjustment_value)
-                    elif adjustment_type == 'subtract':
-                        new_quantity = old_quantity - int(adjustment_value)
-                        if new_quantity < 0:
-                            failed_adjustments.append({
-                                'product_name': product.name,
-                                'reason': '재고 수량이 음수가 될 수 없습니다.'
-                            })
-                            continue
-                    else:
-                        failed_adjustments.append({
-                            'product_name': product.name,
-                            'reason': '올바르지 않은 조정 타입입니다.'
-                        })
-                        continue
-                    
-                    # 재고 업데이트
-                    product.stock_quantity = new_quantity
-                    product.save(update_fields=['stock_quantity', 'updated_at'])
-                    
-                    # 재고 이동 기록 생성
-                    if HAS_STOCK_MOVEMENT and new_quantity != old_quantity:
-                        quantity_change = abs(new_quantity - old_quantity)
-                        
-                        StockMovement.objects.create(
-                            product=product,
-                            movement_type='ADJUST',
-                            quantity=quantity_change,
-                            previous_stock=old_quantity,
-                            current_stock=new_quantity,
-                            reference_number=f'BULK-ADJ-{timezone.now().strftime("%Y%m%d%H%M%S")}-{product.id}',
-                            reason=reason,
-                            notes=f'일괄 재고 조정: {old_quantity}개 → {new_quantity}개',
-                            created_by=request.user
-                        )
-                    
-                    successful_adjustments.append({
-                        'product_name': product.name,
-                        'old_quantity': old_quantity,
-                        'new_quantity': new_quantity
-                    })
-                    
-                except Product.DoesNotExist:
-                    failed_adjustments.append({
-                        'product_name': f'상품 ID {product_id}',
-                        'reason': '상품을 찾을 수 없습니다.'
-                    })
-                except Exception as e:
-                    failed_adjustments.append({
-                        'product_name': f'상품 ID {product_id}',
-                        'reason': str(e)
-                    })
+        # 일괄 조회/갱신으로 처리 (상품별 save 및 시그널 생략)
+        successful_adjustments, failed_adjustments = StockAdjustmentService.apply_bulk_adjustment(
+            product_ids, adjustment_type, adjustment_value, reason, user=request.user
+        )
         
         # 결과 메시지 생성
         success_count = len(successful_adjustments)
@@ -378,87 +319,81 @@ def apply_bulk_stock_adjustment(request):
 @login_required
 def export_stock_data(request):
     """재고 데이터 CSV 내보내기"""
-    try:
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        current_date = timezone.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'stock_data_{current_date}.csv'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        
-        # UTF-8 BOM 추가 (엑셀에서 한글 깨짐 방지)
-        response.write('\ufeff')
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'SKU', '상품명', '브랜드', '카테고리', '현재재고', '최소재고', '최대재고', 
-            '재고상태', '판매가격', '원가', '재고가치', '등록일', '수정일'
-        ])
-        
-        # 현재 필터 조건 적용 (URL 파라미터 기반)
-        search = request.GET.get('search', '').strip()
-        category = request.GET.get('category', '')
-        stock_status = request.GET.get('stock_status', '')
-        
-        products = Product.objects.select_related('brand', 'category').filter(status='ACTIVE')
-        
-        if search:
+    current_date = timezone.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'stock_data_{current_date}.csv'
+    
+    header = [
+        'SKU', '상품명', '브랜드', '카테고리', '현재재고', '최소재고', '최대재고', 
+        '재고상태', '판매가격', '원가', '재고가치', '등록일', '수정일'
+    ]
+    
+    # 현재 필터 조건 적용 (URL 파라미터 기반)
+    search = request.GET.get('search', '').strip()
+    category = request.GET.get('category', '')
+    stock_status = request.GET.get('stock_status', '')
+    
+    products = Product.objects.filter(status='ACTIVE')
+    
+    if search:
+        products = products.filter(
+            Q(name__icontains=search) | 
+            Q(sku__icontains=search) |
+            Q(brand__name__icontains=search)
+        )
+    
+    if category:
+        products = products.filter(category_id=category)
+    
+    if stock_status:
+        if stock_status == 'low':
+            products = products.filter(stock_quantity__lte=F('min_stock_level'))
+        elif stock_status == 'normal':
             products = products.filter(
-                Q(name__icontains=search) | 
-                Q(sku__icontains=search) |
-                Q(brand__name__icontains=search)
+                stock_quantity__gt=F('min_stock_level'),
+                stock_quantity__lte=F('max_stock_level')
             )
-        
-        if category:
-            products = products.filter(category_id=category)
-        
-        if stock_status:
-            if stock_status == 'low':
-                products = products.filter(stock_quantity__lte=F('min_stock_level'))
-            elif stock_status == 'normal':
-                products = products.filter(
-                    stock_quantity__gt=F('min_stock_level'),
-                    stock_quantity__lte=F('max_stock_level')
-                )
-            elif stock_status == 'excess':
-                products = products.filter(stock_quantity__gt=F('max_stock_level'))
-            elif stock_status == 'out':
-                products = products.filter(stock_quantity=0)
-        
-        # 데이터 작성
-        for product in products:
+        elif stock_status == 'excess':
+            products = products.filter(stock_quantity__gt=F('max_stock_level'))
+        elif stock_status == 'out':
+            products = products.filter(stock_quantity=0)
+    
+    # 데이터 작성 (모델 인스턴스 없이 스트리밍)
+    fields = [
+        'sku', 'name', 'brand__name', 'category__name', 'stock_quantity',
+        'min_stock_level', 'max_stock_level', 'selling_price', 'cost_price',
+        'created_at', 'updated_at'
+    ]
+    
+    def rows():
+        for (sku, name, brand_name, category_name, stock_quantity, min_stock_level,
+             max_stock_level, selling_price, cost_price, created_at, updated_at) in iter_values(products, fields):
             # 재고 상태 판단
-            if product.stock_quantity == 0:
+            if stock_quantity == 0:
                 stock_status_text = '재고없음'
-            elif product.stock_quantity <= product.min_stock_level:
+            elif stock_quantity <= min_stock_level:
                 stock_status_text = '부족'
-            elif product.stock_quantity > product.max_stock_level:
+            elif stock_quantity > max_stock_level:
                 stock_status_text = '과다'
             else:
                 stock_status_text = '정상'
             
-            # 재고 가치 계산
-            stock_value = product.stock_quantity * (product.cost_price or 0)
-            
-            writer.writerow([
-                product.sku,
-                product.name,
-                product.brand.name if product.brand else '',
-                product.category.name if product.category else '',
-                product.stock_quantity,
-                product.min_stock_level,
-                product.max_stock_level,
+            yield [
+                sku,
+                name,
+                brand_name or '',
+                category_name or '',
+                stock_quantity,
+                min_stock_level,
+                max_stock_level,
                 stock_status_text,
-                product.selling_price,
-                product.cost_price or 0,
-                stock_value,
-                product.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                product.updated_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        return response
-        
-    except Exception as e:
-        messages.error(request, f'데이터 내보내기 중 오류가 발생했습니다: {str(e)}')
-        return redirect('inventory:adjustment')
+                selling_price,
+                cost_price or 0,
+                stock_quantity * (cost_price or 0),
+                format_datetime(created_at),
+                format_datetime(updated_at)
+            ]
+    
+    return streaming_csv_response(filename, header, rows())
 
 @login_required
 def export_movement_data(request):
@@ -669,25 +604,21 @@ def inventory_overview(request):
     # 1. 주요 지표 (Metrics)
     # ===========================================
     
+    # 활성 상품 재고 스냅샷 (단일 집계 쿼리, 캐시 사용)
+    snapshot = get_inventory_snapshot()
+    totals = snapshot['totals']
+    
     # 총 상품 수
-    total_products = Product.objects.filter(status='ACTIVE').count()
+    total_products = totals['product_count']
     
     # 총 재고 가치 계산 (cost_price 사용)
-    total_value = Product.objects.filter(status='ACTIVE').aggregate(
-        total=Sum(F('stock_quantity') * F('cost_price'))
-    )['total'] or 0
+    total_value = totals['cost_value']
     
     # 부족 재고 상품 수
-    low_stock_count = Product.objects.filter(
-        stock_quantity__lte=F('min_stock_level'),
-        status='ACTIVE'
-    ).count()
+    low_stock_count = totals['below_min_count']
     
     # 품절 상품 수
-    out_of_stock_count = Product.objects.filter(
-        stock_quantity=0,
-        status='ACTIVE'
-    ).count()
+    out_of_stock_count = totals['out_count']
     
     # 지난 달 대비 성장률 계산 (임시로 랜덤 값 사용, 실제로는 월별 데이터 비교)
     products_growth = f"+{random.uniform(5, 15):.1f}%"
@@ -698,17 +629,10 @@ def inventory_overview(request):
     # ===========================================
     
     # 정상 재고 (최소 재고 이상)
-    normal_stock = Product.objects.filter(
-        stock_quantity__gt=F('min_stock_level'),
-        status='ACTIVE'
-    ).count()
+    normal_stock = totals['normal_count']
     
     # 주의 재고 (최소 재고 이하이지만 0이 아님)
-    warning_stock = Product.objects.filter(
-        stock_quantity__lte=F('min_stock_level'),
-        stock_quantity__gt=0,
-        status='ACTIVE'
-    ).count()
+    warning_stock = totals['low_count']
     
     # 위험 재고 (품절)
     critical_stock = out_of_stock_count
@@ -739,47 +663,32 @@ def inventory_overview(request):
     # ===========================================
     
     category_stats = []
-    try:
-        # 단순화된 카테고리 통계
-        categories = Category.objects.filter(is_active=True)
-        
-        # 카테고리별 아이콘 및 색상 매핑
-        category_icons = {
-            '전자제품': {'icon': 'fas fa-laptop', 'color': '#3b82f6'},
-            '의류': {'icon': 'fas fa-tshirt', 'color': '#10b981'},
-            '가전제품': {'icon': 'fas fa-tv', 'color': '#f59e0b'},
-            '생활용품': {'icon': 'fas fa-home', 'color': '#8b5cf6'},
-            '뷰티': {'icon': 'fas fa-gem', 'color': '#ec4899'},
-            '스포츠': {'icon': 'fas fa-dumbbell', 'color': '#06b6d4'},
-            '기타': {'icon': 'fas fa-box', 'color': '#6b7280'},
-        }
+    
+    # 카테고리별 아이콘 및 색상 매핑
+    category_icons = {
+        '전자제품': {'icon': 'fas fa-laptop', 'color': '#3b82f6'},
+        '의류': {'icon': 'fas fa-tshirt', 'color': '#10b981'},
+        '가전제품': {'icon': 'fas fa-tv', 'color': '#f59e0b'},
+        '생활용품': {'icon': 'fas fa-home', 'color': '#8b5cf6'},
+        '뷰티': {'icon': 'fas fa-gem', 'color': '#ec4899'},
+        '스포츠': {'icon': 'fas fa-dumbbell', 'color': '#06b6d4'},
+        '기타': {'icon': 'fas fa-box', 'color': '#6b7280'},
+    }
+    
+    for category in snapshot['categories']:
+        # 활성 카테고리에 속한 상품이 있는 경우만 표시
+        if category['id'] is None or not category['is_active'] or not category['product_count']:
+            continue
         
-        for category in categories:
-            # 각 카테고리별로 개별 쿼리 실행
-            products_in_category = Product.objects.filter(
-                category=category,
-                status='ACTIVE'
-            )
-            
-            product_count = products_in_category.count()
-            if product_count > 0:
-                # 카테고리 총 가치 계산
-                total_value = 0
-                for product in products_in_category:
-                    total_value += (product.stock_quantity * product.cost_price)
-                
-                icon_data = category_icons.get(category.name, category_icons['기타'])
-                category_stats.append({
-                    'name': category.name,
-                    'count': product_count,
-                    'value': float(total_value),
-                    'trend': random.uniform(-5, 15),  # 실제로는 월별 비교 데이터 사용
-                    'color': icon_data['color'],
-                    'icon': icon_data['icon']
-                })
-    except Exception as e:
-        logger.error(f"카테고리 통계 계산 중 오류: {str(e)}")
-        # 오류 발생시 빈 리스트 사용
+        icon_data = category_icons.get(category['name'], category_icons['기타'])
+        category_stats.append({
+            'name': category['name'],
+            'count': category['product_count'],
+            'value': float(category['cost_value']),
+            'trend': random.uniform(-5, 15),  # 실제로는 월별 비교 데이터 사용
+            'color': icon_data['color'],
+            'icon': icon_data['icon']
+        })
     
     # ===========================================
     # 5. 최근 재고 이동 내역
@@ -1112,26 +1021,27 @@ class OverstockListView(LoginRequiredMixin, ListView):
 
 @login_required
 def export_stock_data(request):
-    """재고 데이터 CSV 내보내기"""
-    response = HttpResponse(content_type='text/csv; charset=utf-8')
-    response['Content-Disposition'] = 'attachment; filename="stock_data.csv"'
-    response.write('\ufeff')  # BOM for UTF-8
-    
-    writer = csv.writer(response)
-    writer.writerow(['SKU', '상품명', '카테고리', '브랜드', '현재재고', '최소재고', '최대재고', '원가', '재고가치'])
-    
-    products = Product.objects.filter(status='ACTIVE').select_related('category', 'brand')
-    for product in products:
-        writer.writerow([
-            product.sku,
-            product.name,
-            product.category.name if product.category else '',
-            product.brand.name if product.brand else '',
-            product.stock_quantity,
-            product.min_stock_level,
-            product.max_stock_level,
-            product.cost_price,
-            product.stock_quantity * product.cost_price
-        ])
+    """재고 데이터 CSV 내보내기 (스트리밍)"""
+    header = ['SKU', '상품명', '카테고리', '브랜드', '현재재고', '최소재고', '최대재고', '원가', '재고가치']
+    fields = [
+        'sku', 'name', 'category__name', 'brand__name', 'stock_quantity',
+        'min_stock_level', 'max_stock_level', 'cost_price'
+    ]
+    products = Product.objects.filter(status='ACTIVE')
+    
+    def rows():
+        for (sku, name, category_name, brand_name, stock_quantity,
+             min_stock_level, max_stock_level, cost_price) in iter_values(products, fields):
+            yield [
+                sku,
+                name,
+                category_name or '',
+                brand_name or '',
+                stock_quantity,
+                min_stock_level,
+                max_stock_level,
+                cost_price,
+                stock_quantity * cost_price
+            ]
     
-    return response
\ No newline at end of file
+    return streaming_csv_response('stock_data.csv', header, rows())
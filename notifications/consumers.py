@@ -7,16 +7,22 @@ from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from .models import Notification
+from .snapshot import aget_snapshot, mark_read
 
 User = get_user_model()
 
 class NotificationConsumer(AsyncWebsocketConsumer):
+    """
+    사용자 알림 WebSocket Consumer
+    
+    연결 시 스냅샷(읽지 않은 개수 + 최근 알림) 한 건을 보내고, 이후에는
+    새 알림('notification')과 읽음 처리('read') 변경분만 보낸다.
+    """
+    
     async def connect(self):
         self.user = self.scope["user"]
-        print(f"NotificationConsumer connect - User: {self.user}")  # 디버깅용
         
         if self.user.is_anonymous:
-            print(f"Rejecting anonymous user")  # 디버깅용
             await self.close()
             return
             
@@ -32,8 +38,8 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         # WebSocket 연결 수락
         await self.accept()
         
-        # 연결 시 읽지 않은 알림 전송
-        await self.send_unread_notifications()
+        # 연결 시 스냅샷 전송
+        await self.send_snapshot()
     
     async def disconnect(self, close_code):
         # 그룹에서 채널 제거
@@ -68,51 +74,32 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             'data': event['data']
         }))
     
-    async def send_unread_notifications(self):
-        """읽지 않은 알림들을 전송"""
-        notifications = await self.get_unread_notifications()
-        
-        for notification in notifications:
-            await self.send(text_data=json.dumps({
-                'type': 'notification',
-                'data': {
-                    'id': notification.id,
-                    'title': notification.title,
-                    'message': notification.message,
-                    'notification_type': notification.notification_type,
-                    'created_at': notification.created_at.isoformat(),
-                    'is_read': notification.is_read,
-                    'url': notification.url,
-                    'icon': notification.get_icon(),
-                    'color': notification.get_color()
-                }
-            }))
+    async def notification_read(self, event):
+        """그룹으로부터 읽음 처리 변경분 수신 및 전송"""
+        await self.send(text_data=json.dumps({
+            'type': 'read',
+            'data': event['data']
+        }))
     
-    @database_sync_to_async
-    def get_unread_notifications(self):
-        """읽지 않은 알림 조회"""
-        return list(self.user.notifications.filter(is_read=False).order_by('-created_at')[:10])
+    async def send_snapshot(self):
+        """읽지 않은 알림 개수와 최근 알림을 한 번에 전송"""
+        snapshot = await aget_snapshot(self.user.id)
+        await self.send(text_data=json.dumps({
+            'type': 'snapshot',
+            'data': snapshot
+        }))
     
     @database_sync_to_async
     def mark_notification_read(self, notification_id):
         """특정 알림을 읽음 처리"""
         try:
-            notification = Notification.objects.get(
-                id=notification_id,
-                user=self.user
-            )
-            notification.is_read = True
-            notification.read_at = timezone.now()
-            notification.save()
-            return True
-        except Notification.DoesNotExist:
+            notification_id = int(notification_id)
+        except (TypeError, ValueError):
             return False
+        return mark_read(self.user, [notification_id]) > 0
     
     @database_sync_to_async
     def mark_all_notifications_read(self):
         """모든 알림을 읽음 처리"""
-        self.user.notifications.filter(is_read=False).update(
-            is_read=True,
-            read_at=timezone.now()
-        )
-        return True
\ No newline at end of file
+        mark_read(self.user)
+        return True
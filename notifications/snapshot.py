@@ -0,0 +1,162 @@
+# notifications/snapshot.py
+"""
+알림 스냅샷 (읽지 않은 개수 + 최근 알림)
+
+WebSocket 연결 시 NotificationConsumer 는 스냅샷 한 건을 보내고, 이후에는
+변경분(새 알림, 읽음 처리)만 보낸다. notification_api 도 같은 스냅샷을 쓴다.
+
+- 읽지 않은 개수는 공유 캐시의 카운터로 유지한다. 알림 생성 시 incr, 읽음
+  처리 시 decr 하고, 카운터가 없으면 다음 조회 때 DB 에서 다시 센다.
+- 최근 알림 목록은 생성/읽음/삭제 시 지우고 다음 조회 때 다시 채운다.
+- 두 키는 get_many 한 번으로 읽으므로, 배포 직후 재연결이 몰려도 클라이언트당
+  캐시 조회 한 번이면 된다. 카운터가 어긋나도 SNAPSHOT_TIMEOUT 뒤에는 DB 값으로
+  다시 맞춰진다.
+"""
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Notification
+
+UNREAD_KEY = 'notification_unread:{user_id}'
+RECENT_KEY = 'notification_recent:{user_id}'
+SNAPSHOT_TIMEOUT = 60 * 10
+DEFAULT_SNAPSHOT_SIZE = 10
+
+
+def get_snapshot_size():
+    return getattr(settings, 'NOTIFICATION_SETTINGS', {}).get('SNAPSHOT_SIZE', DEFAULT_SNAPSHOT_SIZE)
+
+
+def _keys(user_id):
+    return UNREAD_KEY.format(user_id=user_id), RECENT_KEY.format(user_id=user_id)
+
+
+def _build_snapshot(user_id, values):
+    unread_key, recent_key = _keys(user_id)
+    if unread_key in values and recent_key in values:
+        return {'unread_count': max(values[unread_key], 0), 'notifications': values[recent_key]}
+    return None
+
+
+def load_snapshot(user_id):
+    """DB 에서 스냅샷을 읽어 캐시에 저장"""
+    from .utils import notification_payload
+
+    unread_key, recent_key = _keys(user_id)
+    unread_count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+    recent = [
+        notification_payload(notification)
+        for notification in Notification.objects.filter(user_id=user_id)[:get_snapshot_size()]
+    ]
+    cache.set_many({unread_key: unread_count, recent_key: recent}, SNAPSHOT_TIMEOUT)
+    return {'unread_count': unread_count, 'notifications': recent}
+
+
+def get_snapshot(user_id):
+    """스냅샷 {'unread_count': 개수, 'notifications': 최근 알림 목록}"""
+    snapshot = _build_snapshot(user_id, cache.get_many(_keys(user_id)))
+    if snapshot is None:
+        snapshot = load_snapshot(user_id)
+    return snapshot
+
+
+async def aget_snapshot(user_id):
+    """get_snapshot 의 비동기 버전 (캐시에 있으면 스레드 전환 없이 반환)"""
+    from channels.db import database_sync_to_async
+
+    snapshot = _build_snapshot(user_id, await cache.aget_many(_keys(user_id)))
+    if snapshot is None:
+        snapshot = await database_sync_to_async(load_snapshot)(user_id)
+    return snapshot
+
+
+def get_unread_count(user_id):
+    """읽지 않은 알림 개수 (카운터가 없으면 DB 에서 세어 저장)"""
+    unread_key = UNREAD_KEY.format(user_id=user_id)
+    unread_count = cache.get(unread_key)
+    if unread_count is None:
+        unread_count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(unread_key, unread_count, SNAPSHOT_TIMEOUT)
+    return max(unread_count, 0)
+
+
+def _incr(key, delta):
+    """카운터 증감 (키가 없으면 다음 조회 때 다시 센다)"""
+    try:
+        if delta > 0:
+            cache.incr(key, delta)
+        elif delta < 0:
+            cache.decr(key, -delta)
+    except ValueError:
+        pass
+
+
+def _apply_created(counts):
+    for user_id, count in counts.items():
+        _incr(UNREAD_KEY.format(user_id=user_id), count)
+    cache.delete_many([RECENT_KEY.format(user_id=user_id) for user_id in counts])
+
+
+def notifications_created(notifications):
+    """알림 생성 반영: 커밋 후 사용자별 카운터 증가, 최근 목록 무효화"""
+    counts = {}
+    for notification in notifications:
+        if not notification.is_read:
+            counts[notification.user_id] = counts.get(notification.user_id, 0) + 1
+    if counts:
+        transaction.on_commit(lambda: _apply_created(counts))
+
+
+def notifications_changed(user_id, unread_delta=0):
+    """읽음/삭제 반영: 커밋 후 카운터 조정, 최근 목록 무효화"""
+    unread_key, recent_key = _keys(user_id)
+
+    def apply():
+        _incr(unread_key, unread_delta)
+        cache.delete(recent_key)
+
+    transaction.on_commit(apply)
+
+
+def mark_read(user, notification_ids=None):
+    """
+    알림 읽음 처리 (notification_ids 가 None 이면 전체)
+
+    DB 갱신 후 카운터를 맞추고, 사용자의 다른 연결에 읽음 변경분을 보낸다.
+    읽음 처리된 개수를 반환한다.
+    """
+    queryset = Notification.objects.filter(user=user, is_read=False)
+    if notification_ids is not None:
+        queryset = queryset.filter(id__in=notification_ids)
+    updated = queryset.update(is_read=True, read_at=timezone.now())
+
+    if notification_ids is None:
+        # 전체 읽음: 카운터를 0 으로
+        unread_key, recent_key = _keys(user.pk)
+
+        def reset():
+            cache.set(unread_key, 0, SNAPSHOT_TIMEOUT)
+            cache.delete(recent_key)
+
+        transaction.on_commit(reset)
+    elif updated:
+        notifications_changed(user.pk, -updated)
+
+    if updated:
+        data = {'all': True} if notification_ids is None else {'ids': list(notification_ids)}
+        transaction.on_commit(lambda: broadcast_read(user.pk, data))
+    return updated
+
+
+def broadcast_read(user_id, data):
+    """사용자의 모든 연결에 읽음 변경분 전송"""
+    channel_layer = get_channel_layer()
+    if channel_layer:
+        async_to_sync(channel_layer.group_send)(
+            f"user_{user_id}",
+            {'type': 'notification_read', 'data': dict(data, unread_count=get_unread_count(user_id))}
+        )
@@ -0,0 +1,51 @@
+# notifications/tasks.py
+from celery import shared_task
+from django.contrib.auth import get_user_model
+import logging
+
+from .utils import (
+    send_bulk_notification, staff_recipients, stock_alert_recipients,
+    order_notification_content, stock_alert_content
+)
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def send_bulk_notification_task(user_ids, title, message, notification_type='info', url=None):
+    """여러 사용자에게 같은 알림 전송"""
+    User = get_user_model()
+    notifications = send_bulk_notification(
+        User.objects.filter(pk__in=user_ids), title, message, notification_type, url
+    )
+    return len(notifications)
+
+
+@shared_task
+def send_order_notifications(order_id):
+    """새 주문 알림을 관리자들에게 전송"""
+    from orders.models import Order
+
+    order = Order.objects.filter(pk=order_id).first()
+    if order is None:
+        logger.warning(f"주문 알림 대상 주문 없음: {order_id}")
+        return 0
+
+    title, message, url = order_notification_content(order)
+    notifications = send_bulk_notification(staff_recipients(), title, message, 'order', url)
+    return len(notifications)
+
+
+@shared_task
+def send_stock_alert_notifications(product_id, current_stock):
+    """재고 부족 알림을 재고 관리자들에게 전송"""
+    from products.models import Product
+
+    product = Product.objects.filter(pk=product_id).only('id', 'name').first()
+    if product is None:
+        logger.warning(f"재고 알림 대상 상품 없음: {product_id}")
+        return 0
+
+    title, message, url = stock_alert_content(product, current_stock)
+    notifications = send_bulk_notification(stock_alert_recipients(), title, message, 'stock', url)
+    return len(notifications)
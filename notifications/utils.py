@@ -1,6 +1,38 @@
+import asyncio
+import logging
+
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
 from .models import Notification
+from .snapshot import notifications_created
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 동시에 보내는 WebSocket 그룹 메시지 수
+SEND_CONCURRENCY = 50
+
+
+def get_notification_setting(name, default):
+    return getattr(settings, 'NOTIFICATION_SETTINGS', {}).get(name, default)
+
+
+def notification_payload(notification):
+    """WebSocket 으로 보내는 알림 데이터"""
+    return {
+        'id': notification.id,
+        'title': notification.title,
+        'message': notification.message,
+        'notification_type': notification.notification_type,
+        'created_at': notification.created_at.isoformat(),
+        'is_read': notification.is_read,
+        'url': notification.url,
+        'icon': notification.get_icon(),
+        'color': notification.get_color()
+    }
+
 
 def send_notification(user, title, message, notification_type='info', url=None):
     """사용자에게 실시간 알림 전송"""
@@ -13,6 +45,7 @@ def send_notification(user, title, message, notification_type='info', url=None):
             notification_type=notification_type,
             url=url
         )
+        notifications_created([notification])
         
         # WebSocket을 통해 실시간 전송
         channel_layer = get_channel_layer()
@@ -23,17 +56,7 @@ def send_notification(user, title, message, notification_type='info', url=None):
                 group_name,
                 {
                     'type': 'send_notification',
-                    'data': {
-                        'id': notification.id,
-                        'title': notification.title,
-                        'message': notification.message,
-                        'notification_type': notification.notification_type,
-                        'created_at': notification.created_at.isoformat(),
-                        'is_read': notification.is_read,
-                        'url': notification.url,
-                        'icon': notification.get_icon(),
-                        'color': notification.get_color()
-                    }
+                    'data': notification_payload(notification)
                 }
             )
         
@@ -42,37 +65,137 @@ def send_notification(user, title, message, notification_type='info', url=None):
         print(f"알림 발송 오류: {e}")
         return None
 
+
+async def _group_send_all(channel_layer, messages):
+    """(그룹, 메시지) 목록을 한 이벤트 루프에서 SEND_CONCURRENCY 개씩 동시에 전송"""
+    failed = 0
+    for start in range(0, len(messages), SEND_CONCURRENCY):
+        chunk = messages[start:start + SEND_CONCURRENCY]
+        results = await asyncio.gather(
+            *(channel_layer.group_send(group, message) for group, message in chunk),
+            return_exceptions=True
+        )
+        failed += sum(1 for result in results if isinstance(result, Exception))
+    return failed
+
+
+def send_bulk_notification(recipients, title, message, notification_type='info', url=None):
+    """
+    여러 사용자에게 같은 알림 전송
+    
+    recipients 는 사용자 쿼리셋(또는 사용자/ID 목록)이다. 알림은
+    NOTIFICATION_SETTINGS['BATCH_SIZE'] 단위로 bulk_create 하고, WebSocket
+    메시지는 한 이벤트 루프에서 동시에 보낸다. 생성한 알림 목록을 반환한다.
+    """
+    if hasattr(recipients, 'values_list'):
+        user_ids = list(recipients.order_by().values_list('pk', flat=True).distinct())
+    else:
+        user_ids = list(dict.fromkeys(getattr(user, 'pk', user) for user in recipients))
+    if not user_ids:
+        return []
+    
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(
+                user_id=user_id,
+                title=title,
+                message=message,
+                notification_type=notification_type,
+                url=url
+            )
+            for user_id in user_ids
+        ],
+        batch_size=get_notification_setting('BATCH_SIZE', 100)
+    )
+    notifications_created(notifications)
+    
+    channel_layer = get_channel_layer()
+    if channel_layer and get_notification_setting('REAL_TIME_ENABLED', True):
+        messages = [
+            (f"user_{notification.user_id}", {
+                'type': 'send_notification',
+                'data': notification_payload(notification)
+            })
+            for notification in notifications
+        ]
+        failed = async_to_sync(_group_send_all)(channel_layer, messages)
+        if failed:
+            logger.warning(f"실시간 알림 전송 실패: {failed}/{len(messages)}건 ({title})")
+    
+    return notifications
+
+
+def queue_bulk_notification(recipients, title, message, notification_type='info', url=None):
+    """send_bulk_notification 을 트랜잭션 커밋 후 Celery 작업으로 실행"""
+    from .tasks import send_bulk_notification_task
+    
+    user_ids = list(recipients.order_by().values_list('pk', flat=True).distinct())
+    if user_ids:
+        dispatch_task(send_bulk_notification_task, user_ids, title, message, notification_type, url)
+
+
+def dispatch_task(task, *args):
+    """트랜잭션 커밋 후 알림 작업 예약 (브로커 오류는 기록만 하고 요청은 계속)"""
+    def dispatch():
+        try:
+            task.delay(*args)
+        except Exception as e:
+            logger.error(f"알림 작업 예약 실패: {task.name} - {str(e)}")
+    
+    transaction.on_commit(dispatch)
+
+
+def staff_recipients():
+    """관리자 알림 수신자"""
+    return get_user_model().objects.filter(is_staff=True)
+
+
+def stock_alert_recipients():
+    """재고 알림 수신자 (재고 관리자 그룹, 없으면 관리자)"""
+    User = get_user_model()
+    stock_managers = User.objects.filter(groups__name='Stock Managers')
+    if not stock_managers.exists():
+        # 그룹이 없으면 관리자들에게 발송
+        stock_managers = staff_recipients()
+    return stock_managers
+
+
+def order_notification_content(order):
+    """주문 알림 (제목, 내용, URL)"""
+    order_number = getattr(order, 'order_number', None) or order.id
+    total_amount = getattr(order, 'total_amount', None)
+    if total_amount is None:
+        message = "주문이 접수되었습니다."
+    else:
+        message = f"주문 금액: {total_amount:,}원"
+    return f"새로운 주문 #{order_number}", message, f'/orders/{order.id}/'
+
+
+def stock_alert_content(product, current_stock):
+    """재고 부족 알림 (제목, 내용, URL)"""
+    return "재고 부족 알림", f"{product.name} - 현재 재고: {current_stock}개", f'/products/{product.id}/'
+
 def send_order_notification(user, order):
     """주문 관련 알림 전송"""
-    try:
-        return send_notification(
-            user=user,
-            title=f"새로운 주문 #{order.order_number}",
-            message=f"주문 금액: {order.total_amount:,}원",
-            notification_type='order',
-            url=f'/orders/{order.id}/'
-        )
-    except AttributeError as e:
-        # 필드가 없는 경우 기본값 사용
-        order_number = getattr(order, 'order_number', order.id)
-        total_amount = getattr(order, 'total_amount', 0)
-        return send_notification(
-            user=user,
-            title=f"새로운 주문 #{order_number}",
-            message=f"주문이 접수되었습니다.",
-            notification_type='order',
-            url=f'/orders/{order.id}/'
-        )
+    title, message, url = order_notification_content(order)
+    return send_notification(
+        user=user,
+        title=title,
+        message=message,
+        notification_type='order',
+        url=url
+    )
 
 def send_stock_alert(user, product, current_stock):
     """재고 부족 알림 전송"""
     try:
+        title, message, url = stock_alert_content(product, current_stock)
         return send_notification(
             user=user,
-            title=f"재고 부족 알림",
-            message=f"{product.name} - 현재 재고: {current_stock}개",
+            title=title,
+            message=message,
             notification_type='stock',
-            url=f'/products/{product.id}/'
+            url=url
         )
     except Exception as e:
         print(f"재고 알림 발송 오류: {e}")
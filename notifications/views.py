@@ -10,6 +10,8 @@ from django.utils import timezone
 from django.core.paginator import Paginator
 from django.db.models import Q
 from .models import Notification
+from .snapshot import get_snapshot, mark_read, notifications_changed
+from datetime import datetime
 import json
 
 @method_decorator(login_required, name='dispatch')
@@ -47,32 +49,17 @@ class NotificationListView(LoginRequiredMixin, ListView):
 @login_required
 @require_http_methods(["GET"])
 def notification_api(request):
-    """알림 API - 읽지 않은 알림 개수 및 최신 알림 반환"""
-    user = request.user
-    
-    # 읽지 않은 알림 개수
-    unread_count = user.notifications.filter(is_read=False).count()
+    """알림 API - 읽지 않은 알림 개수 및 최신 알림 반환 (캐시된 스냅샷)"""
+    snapshot = get_snapshot(request.user.id)
     
     # 최신 알림 5개
-    recent_notifications = user.notifications.all()[:5]
-    
     notifications_data = []
-    for notification in recent_notifications:
-        notifications_data.append({
-            'id': notification.id,
-            'title': notification.title,
-            'message': notification.message,
-            'notification_type': notification.notification_type,
-            'created_at': notification.created_at.isoformat(),
-            'is_read': notification.is_read,
-            'url': notification.url,
-            'icon': notification.get_icon(),
-            'color': notification.get_color(),
-            'time_ago': notification.created_at.strftime('%Y-%m-%d %H:%M')
-        })
+    for notification in snapshot['notifications'][:5]:
+        created_at = datetime.fromisoformat(notification['created_at'])
+        notifications_data.append(dict(notification, time_ago=created_at.strftime('%Y-%m-%d %H:%M')))
     
     return JsonResponse({
-        'unread_count': unread_count,
+        'unread_count': snapshot['unread_count'],
         'notifications': notifications_data
     })
 
@@ -87,9 +74,7 @@ def mark_notification_read(request, notification_id):
             user=request.user
         )
         
-        notification.is_read = True
-        notification.read_at = timezone.now()
-        notification.save()
+        mark_read(request.user, [notification.id])
         
         return JsonResponse({
             'success': True,
@@ -106,10 +91,7 @@ def mark_notification_read(request, notification_id):
 def mark_all_notifications_read(request):
     """모든 알림을 읽음 처리"""
     try:
-        request.user.notifications.filter(is_read=False).update(
-            is_read=True,
-            read_at=timezone.now()
-        )
+        mark_read(request.user)
         
         return JsonResponse({
             'success': True,
@@ -133,6 +115,7 @@ def delete_notification(request, notification_id):
         )
         
         notification.delete()
+        notifications_changed(request.user.id, 0 if notification.is_read else -1)
         
         return JsonResponse({
             'success': True,
@@ -1,6 +1,6 @@
 # File: orders/admin.py
 from django.contrib import admin
-from .models import Order, OrderItem
+from .models import Order, OrderItem, DailySalesRollup
 
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
@@ -36,4 +36,11 @@ class OrderAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(DailySalesRollup)
+class DailySalesRollupAdmin(admin.ModelAdmin):
+    list_display = ['date', 'platform', 'status', 'order_count', 'total_amount', 'updated_at']
+    list_filter = ['status', 'platform']
+    date_hierarchy = 'date'
+    readonly_fields = ['date', 'platform', 'status', 'order_count', 'total_amount', 'updated_at']
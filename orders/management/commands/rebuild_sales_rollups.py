@@ -0,0 +1,44 @@
+# orders/management/commands/rebuild_sales_rollups.py
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.rollups import rebuild_sales_rollups
+
+
+class Command(BaseCommand):
+    help = '주문 데이터로 일별 매출 집계를 재구축합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start-date',
+            type=str,
+            help='재구축 시작일 (YYYY-MM-DD, 기본: 전체 기간)'
+        )
+        parser.add_argument(
+            '--end-date',
+            type=str,
+            help='재구축 종료일 (YYYY-MM-DD, 기본: 전체 기간)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start_date = self._parse_date(options['start_date'])
+            end_date = self._parse_date(options['end_date'])
+        except ValueError:
+            raise CommandError('날짜는 YYYY-MM-DD 형식으로 입력해주세요.')
+
+        if start_date and end_date and start_date > end_date:
+            raise CommandError('시작일이 종료일보다 늦을 수 없습니다.')
+
+        count = rebuild_sales_rollups(start_date, end_date)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'일별 매출 집계 {count}건을 재구축했습니다.')
+        )
+
+    @staticmethod
+    def _parse_date(value):
+        if not value:
+            return None
+        return datetime.strptime(value, '%Y-%m-%d').date()
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0001_initial"),
+        ("platforms", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySalesRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="일자")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "대기중"),
+                            ("CONFIRMED", "확인됨"),
+                            ("PROCESSING", "처리중"),
+                            ("SHIPPED", "배송중"),
+                            ("DELIVERED", "배송완료"),
+                            ("CANCELLED", "취소됨"),
+                            ("REFUNDED", "환불됨"),
+                        ],
+                        max_length=20,
+                        verbose_name="상태",
+                    ),
+                ),
+                ("order_count", models.IntegerField(default=0, verbose_name="주문 수")),
+                (
+                    "total_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=20,
+                        verbose_name="총 금액",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="수정일시"),
+                ),
+                (
+                    "platform",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="sales_rollups",
+                        to="platforms.platform",
+                        verbose_name="플랫폼",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "일별 매출 집계",
+                "verbose_name_plural": "일별 매출 집계",
+                "ordering": ["-date"],
+                "indexes": [
+                    models.Index(
+                        fields=["date", "status"], name="orders_dail_date_8765e1_idx"
+                    )
+                ],
+                "unique_together": {("date", "platform", "status")},
+            },
+        ),
+    ]
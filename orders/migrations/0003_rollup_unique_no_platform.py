@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:17
+
+from django.db import migrations, models
+
+
+def merge_null_platform_rollups(apps, schema_editor):
+    """플랫폼 삭제로 생긴 (일자, NULL, 상태) 중복 행을 하나로 합침"""
+    DailySalesRollup = apps.get_model('orders', 'DailySalesRollup')
+    kept = {}
+    for rollup in DailySalesRollup.objects.filter(platform__isnull=True).order_by('pk'):
+        key = (rollup.date, rollup.status)
+        if key not in kept:
+            kept[key] = rollup
+            continue
+        target = kept[key]
+        target.order_count += rollup.order_count
+        target.total_amount += rollup.total_amount
+        target.save(update_fields=['order_count', 'total_amount'])
+        rollup.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_dailysalesrollup'),
+        ('platforms', '0003_platform_delta_sync'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='dailysalesrollup',
+            unique_together=set(),
+        ),
+        migrations.RunPython(merge_null_platform_rollups, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dailysalesrollup',
+            constraint=models.UniqueConstraint(fields=('date', 'platform', 'status'), name='unique_daily_sales_rollup'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailysalesrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('platform__isnull', True)), fields=('date', 'status'), name='unique_daily_sales_rollup_no_platform'),
+        ),
+    ]
@@ -120,4 +120,40 @@ class OrderItem(models.Model):
     
     def save(self, *args, **kwargs):
         self.total_price = self.quantity * self.unit_price
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+class DailySalesRollup(models.Model):
+    """일별 매출 집계 (일자/플랫폼/상태별)
+
+    orders.signals 에서 주문 생성·변경·삭제 시 증분 갱신되며,
+    rebuild_sales_rollups 명령으로 재구축할 수 있다.
+    """
+    date = models.DateField(verbose_name='일자')
+    platform = models.ForeignKey('platforms.Platform', on_delete=models.SET_NULL, null=True, blank=True, related_name='sales_rollups', verbose_name='플랫폼')
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES, verbose_name='상태')
+    order_count = models.IntegerField(default=0, verbose_name='주문 수')
+    total_amount = models.DecimalField(max_digits=20, decimal_places=2, default=0, verbose_name='총 금액')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일시')
+
+    class Meta:
+        verbose_name = '일별 매출 집계'
+        verbose_name_plural = '일별 매출 집계'
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'platform', 'status'],
+                name='unique_daily_sales_rollup',
+            ),
+            # NULL 은 유일 인덱스에서 서로 다른 값이므로 플랫폼 없음 행은 따로 제한
+            models.UniqueConstraint(
+                fields=['date', 'status'],
+                condition=models.Q(platform__isnull=True),
+                name='unique_daily_sales_rollup_no_platform',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.platform_id or '-'} {self.status}: {self.order_count}건"
@@ -0,0 +1,159 @@
+# orders/rollups.py
+"""
+일별 매출 집계(DailySalesRollup) 관리
+
+주문 테이블 전체를 매번 집계하는 대신, (일자, 플랫폼, 상태) 단위로 미리
+집계된 행을 읽어 매출/주문 수 KPI 를 계산한다.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Order, DailySalesRollup
+
+# 매출로 집계하는 주문 상태
+REVENUE_STATUSES = ['PROCESSING', 'SHIPPED', 'DELIVERED']
+
+
+def order_local_date(order_date):
+    """주문일시를 현재 타임존 기준 일자로 변환"""
+    if isinstance(order_date, datetime):
+        if timezone.is_naive(order_date):
+            order_date = timezone.make_aware(order_date)
+        return timezone.localdate(order_date)
+    return order_date
+
+
+def rollup_key(order):
+    """주문의 집계 키 (일자, 플랫폼 ID, 상태)"""
+    return (order_local_date(order.order_date), order.platform_id, order.status)
+
+
+def apply_rollup_delta(date, platform_id, status, count, amount):
+    """집계 행에 주문 수/금액 증감 반영"""
+    if not count and not amount:
+        return
+
+    with transaction.atomic():
+        updated = DailySalesRollup.objects.filter(
+            date=date, platform_id=platform_id, status=status
+        ).update(
+            order_count=F('order_count') + count,
+            total_amount=F('total_amount') + amount,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            rollup, created = DailySalesRollup.objects.get_or_create(
+                date=date, platform_id=platform_id, status=status,
+                defaults={'order_count': count, 'total_amount': amount}
+            )
+            if not created:
+                DailySalesRollup.objects.filter(pk=rollup.pk).update(
+                    order_count=F('order_count') + count,
+                    total_amount=F('total_amount') + amount,
+                    updated_at=timezone.now(),
+                )
+
+
+def merge_platform_rollups(platform_id):
+    """
+    플랫폼 삭제 전 그 플랫폼의 집계 행을 플랫폼 없음(NULL) 행으로 합친다.
+
+    FK 의 SET_NULL 에 맡기면 같은 (일자, 상태) 의 NULL 행이 여러 개 생기고,
+    이후 증분이 그 행들 모두에 반영된다.
+    """
+    platform_rows = DailySalesRollup.objects.filter(platform_id=platform_id)
+    null_rows = DailySalesRollup.objects.filter(platform__isnull=True)
+    matching = platform_rows.filter(date=OuterRef('date'), status=OuterRef('status'))
+
+    with transaction.atomic():
+        # 같은 (일자, 상태) 의 NULL 행이 있으면 더하고 플랫폼 행은 삭제
+        null_rows.filter(Exists(matching)).update(
+            order_count=F('order_count') + Subquery(matching.values('order_count')[:1]),
+            total_amount=F('total_amount') + Subquery(matching.values('total_amount')[:1]),
+            updated_at=timezone.now(),
+        )
+        merged = null_rows.filter(date=OuterRef('date'), status=OuterRef('status'))
+        platform_rows.filter(Exists(merged)).delete()
+
+        # 나머지는 플랫폼만 비움
+        platform_rows.update(platform=None, updated_at=timezone.now())
+
+
+def rebuild_sales_rollups(start_date=None, end_date=None):
+    """
+    주문 테이블에서 집계를 다시 계산한다.
+
+    기간이 주어지면 해당 기간의 집계 행만 교체한다. 생성된 집계 행 수를 반환한다.
+    """
+    orders = Order.objects.all()
+    rollups = DailySalesRollup.objects.all()
+    if start_date:
+        orders = orders.filter(order_date__date__gte=start_date)
+        rollups = rollups.filter(date__gte=start_date)
+    if end_date:
+        orders = orders.filter(order_date__date__lte=end_date)
+        rollups = rollups.filter(date__lte=end_date)
+
+    rows = orders.order_by().annotate(
+        day=TruncDate('order_date', tzinfo=timezone.get_current_timezone())
+    ).values('day', 'platform_id', 'status').annotate(
+        order_count=Count('id'),
+        total_amount=Sum('total_amount'),
+    )
+
+    new_rollups = [
+        DailySalesRollup(
+            date=row['day'],
+            platform_id=row['platform_id'],
+            status=row['status'],
+            order_count=row['order_count'],
+            total_amount=row['total_amount'] or Decimal('0'),
+        )
+        for row in rows
+    ]
+
+    with transaction.atomic():
+        rollups.delete()
+        DailySalesRollup.objects.bulk_create(new_rollups, batch_size=1000)
+
+    return len(new_rollups)
+
+
+def _filter_rollups(start_date=None, end_date=None, statuses=None, platform_id=None):
+    rollups = DailySalesRollup.objects.all()
+    if start_date:
+        rollups = rollups.filter(date__gte=start_date)
+    if end_date:
+        rollups = rollups.filter(date__lte=end_date)
+    if statuses:
+        rollups = rollups.filter(status__in=statuses)
+    if platform_id:
+        rollups = rollups.filter(platform_id=platform_id)
+    return rollups
+
+
+def sales_totals(start_date=None, end_date=None, statuses=None, platform_id=None):
+    """기간 내 주문 수와 금액 합계 {'orders': int, 'revenue': Decimal}"""
+    totals = _filter_rollups(start_date, end_date, statuses, platform_id).aggregate(
+        orders=Sum('order_count'),
+        revenue=Sum('total_amount'),
+    )
+    return {
+        'orders': totals['orders'] or 0,
+        'revenue': totals['revenue'] or Decimal('0'),
+    }
+
+
+def daily_sales_totals(start_date=None, end_date=None, statuses=None, platform_id=None):
+    """일자별 주문 수와 금액 합계 목록 (데이터가 있는 일자만)"""
+    return list(
+        _filter_rollups(start_date, end_date, statuses, platform_id).order_by().values('date').annotate(
+            total=Sum('total_amount'),
+            count=Sum('order_count'),
+        ).order_by('date')
+    )
@@ -1,9 +1,12 @@
-# orders/signals.py (주문 생성 시 알림 발송)
-from django.db.models.signals import post_save
+# orders/signals.py (주문 생성 시 알림 발송, 매출 집계 갱신)
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from .models import Order
-from notifications.utils import send_order_notification
+from .rollups import rollup_key, apply_rollup_delta, merge_platform_rollups
+from platforms.models import Platform
+from notifications.tasks import send_order_notifications
+from notifications.utils import dispatch_task
 
 User = get_user_model()
 
@@ -11,7 +14,45 @@ User = get_user_model()
 def order_created_notification(sender, instance, created, **kwargs):
     """새 주문 생성 시 알림 발송"""
     if created:
-        # 관리자들에게 알림 발송
-        admin_users = User.objects.filter(is_staff=True)
-        for admin in admin_users:
-            send_order_notification(admin, instance)
\ No newline at end of file
+        # 관리자들에게 알림 발송 (커밋 후 Celery 작업으로 일괄 발송)
+        dispatch_task(send_order_notifications, instance.pk)
+
+@receiver(pre_save, sender=Order)
+def track_rollup_changes(sender, instance, **kwargs):
+    """주문 변경 전 집계 키/금액 저장"""
+    instance._old_rollup = None
+    if instance.pk:
+        old_order = Order.objects.filter(pk=instance.pk).only(
+            'order_date', 'platform', 'status', 'total_amount'
+        ).first()
+        if old_order:
+            instance._old_rollup = (rollup_key(old_order), old_order.total_amount)
+
+@receiver(post_save, sender=Order)
+def update_sales_rollup(sender, instance, created, raw=False, **kwargs):
+    """주문 생성/변경 시 일별 매출 집계 증분 갱신"""
+    if raw:
+        return
+    
+    new_key = rollup_key(instance)
+    new_amount = instance.total_amount or 0
+    old_rollup = getattr(instance, '_old_rollup', None)
+    
+    if old_rollup:
+        old_key, old_amount = old_rollup
+        if old_key == new_key and old_amount == new_amount:
+            return
+        apply_rollup_delta(*old_key, -1, -(old_amount or 0))
+    
+    apply_rollup_delta(*new_key, 1, new_amount)
+    instance._old_rollup = (new_key, new_amount)
+
+@receiver(post_delete, sender=Order)
+def remove_sales_rollup(sender, instance, **kwargs):
+    """주문 삭제 시 일별 매출 집계 차감"""
+    apply_rollup_delta(*rollup_key(instance), -1, -(instance.total_amount or 0))
+
+@receiver(pre_delete, sender=Platform)
+def merge_deleted_platform_rollups(sender, instance, **kwargs):
+    """플랫폼 삭제 시 집계 행을 플랫폼 없음 행으로 합침 (SET_NULL 로 중복 행이 생기지 않도록)"""
+    merge_platform_rollups(instance.pk)
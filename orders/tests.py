@@ -1,3 +1,81 @@
-from django.test import TestCase
+import csv
+import io
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from core.exports import UTF8_BOM
+from platforms.models import Platform
+
+from .models import DailySalesRollup, Order
+from .views import order_export_csv
+
+
+class DailySalesRollupPlatformDeleteTest(TestCase):
+    """플랫폼 삭제 후에도 (일자, 상태) 당 NULL 집계 행은 하나"""
+
+    def create_order(self, number, platform=None, amount=1000):
+        return Order.objects.create(
+            order_number=number,
+            platform=platform,
+            customer_name='고객',
+            shipping_address='서울',
+            shipping_zipcode='00000',
+            total_amount=Decimal(amount),
+            order_date=timezone.now(),
+            status='DELIVERED',
+        )
+
+    def null_rows(self):
+        return list(
+            DailySalesRollup.objects.filter(platform__isnull=True)
+            .values_list('order_count', 'total_amount')
+        )
+
+    def test_platform_rows_merge_into_existing_null_row(self):
+        platform = Platform.objects.create(name='스토어', platform_type='SMARTSTORE')
+        self.create_order('N-1')
+        self.create_order('P-1', platform)
+        self.create_order('P-2', platform)
+
+        platform.delete()
+        self.assertEqual(self.null_rows(), [(3, Decimal('3000'))])
+
+        # 이후 증분은 한 행에만 반영
+        self.create_order('N-2')
+        self.assertEqual(self.null_rows(), [(4, Decimal('4000'))])
+
+    def test_platform_rows_become_null_rows_when_no_null_row(self):
+        platform = Platform.objects.create(name='스토어', platform_type='COUPANG')
+        self.create_order('P-1', platform, 500)
+
+        platform.delete()
+        self.assertEqual(self.null_rows(), [(1, Decimal('500'))])
+
+
+class OrderCsvExportTest(TestCase):
+
+    def test_export_body(self):
+        platform = Platform.objects.create(name='스마트스토어', platform_type='SMARTSTORE')
+        for number, status in [('CSV-ORDER-1', 'DELIVERED'), ('CSV-ORDER-2', 'PENDING')]:
+            Order.objects.create(
+                order_number=number, platform=platform, customer_name='홍길동', shipping_address='서울',
+                shipping_zipcode='00000', total_amount=Decimal('15000'), order_date=timezone.now(), status=status
+            )
+        request = RequestFactory().get('/orders/export-csv/', {'status': 'DELIVERED'})
+        request.user = get_user_model().objects.create_user(username='staff', password='pass')
+
+        response = order_export_csv(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        body = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(body.startswith(UTF8_BOM))
+
+        rows = list(csv.reader(io.StringIO(body[len(UTF8_BOM):])))
+        self.assertEqual(rows[0][:4], ['주문번호', '플랫폼', '플랫폼주문ID', '고객명'])
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][:2], ['CSV-ORDER-1', '스마트스토어'])
+        self.assertEqual(rows[1][6:8], ['배송완료', '15000.00'])
@@ -22,6 +22,7 @@ logger = logging.getLogger(__name__)
 
 from .models import Order
 from platforms.models import Platform
+from core.exports import format_datetime, iter_values, streaming_csv_response
 
 
 class OrderListView(LoginRequiredMixin, ListView):
@@ -260,60 +261,58 @@ def order_bulk_action(request):
 
 @login_required
 def order_export_csv(request):
-    """주문 데이터 CSV 내보내기"""
-    try:
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        
-        # 현재 날짜를 파일명에 포함
-        current_date = timezone.now().strftime('%Y%m%d_%H%M%S')
-        filename = f'orders_{current_date}.csv'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        
-        # UTF-8 BOM 추가 (Excel에서 한글 깨짐 방지)
-        response.write('\ufeff')
-        
-        writer = csv.writer(response)
-        
-        # 헤더 작성
-        writer.writerow([
-            '주문번호', '플랫폼', '플랫폼주문ID', '고객명', '고객이메일', '고객전화번호',
-            '상태', '총금액', '배송비', '할인금액', '주문일시', '배송일시', '배송완료일시',
-            '배송주소', '우편번호', '배송방법', '송장번호', '비고'
-        ])
-        
-        # 필터링된 주문 데이터 (ListView와 동일한 로직)
-        view = OrderListView()
-        view.request = request
-        orders = view.get_queryset().select_related('platform')
-        
-        # 데이터 작성
-        for order in orders:
-            writer.writerow([
-                order.order_number,
-                order.platform.name if order.platform else '',
-                order.platform_order_id or '',
-                order.customer_name,
-                order.customer_email or '',
-                order.customer_phone or '',
-                order.get_status_display(),
-                order.total_amount,
-                order.shipping_fee,
-                order.discount_amount,
-                order.order_date.strftime('%Y-%m-%d %H:%M:%S'),
-                order.shipped_date.strftime('%Y-%m-%d %H:%M:%S') if order.shipped_date else '',
-                order.delivered_date.strftime('%Y-%m-%d %H:%M:%S') if order.delivered_date else '',
-                order.shipping_address,
-                order.shipping_zipcode or '',
-                order.shipping_method or '',
-                order.tracking_number or '',
-                order.notes or ''
-            ])
-        
-        return response
-        
-    except Exception as e:
-        messages.error(request, f'CSV 내보내기 중 오류가 발생했습니다: {str(e)}')
-        return redirect('orders:list')
+    """주문 데이터 CSV 내보내기 (스트리밍)"""
+    # 현재 날짜를 파일명에 포함
+    current_date = timezone.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'orders_{current_date}.csv'
+    
+    header = [
+        '주문번호', '플랫폼', '플랫폼주문ID', '고객명', '고객이메일', '고객전화번호',
+        '상태', '총금액', '배송비', '할인금액', '주문일시', '배송일시', '배송완료일시',
+        '배송주소', '우편번호', '배송방법', '송장번호', '비고'
+    ]
+    
+    # 필터링된 주문 데이터 (ListView와 동일한 로직)
+    view = OrderListView()
+    view.request = request
+    orders = view.get_queryset()
+    
+    status_labels = dict(Order.STATUS_CHOICES)
+    fields = [
+        'order_number', 'platform__name', 'platform_order_id', 'customer_name',
+        'customer_email', 'customer_phone', 'status', 'total_amount', 'shipping_fee',
+        'discount_amount', 'order_date', 'shipped_date', 'delivered_date',
+        'shipping_address', 'shipping_zipcode', 'shipping_method', 'tracking_number', 'notes'
+    ]
+    
+    def rows():
+        for (order_number, platform_name, platform_order_id, customer_name,
+             customer_email, customer_phone, status, total_amount, shipping_fee,
+             discount_amount, order_date, shipped_date, delivered_date,
+             shipping_address, shipping_zipcode, shipping_method, tracking_number,
+             notes) in iter_values(orders, fields):
+            yield [
+                order_number,
+                platform_name or '',
+                platform_order_id or '',
+                customer_name,
+                customer_email or '',
+                customer_phone or '',
+                status_labels.get(status, status),
+                total_amount,
+                shipping_fee,
+                discount_amount,
+                format_datetime(order_date),
+                format_datetime(shipped_date),
+                format_datetime(delivered_date),
+                shipping_address,
+                shipping_zipcode or '',
+                shipping_method or '',
+                tracking_number or '',
+                notes or ''
+            ]
+    
+    return streaming_csv_response(filename, header, rows())
 
 
 @login_required
@@ -11,20 +11,26 @@ class Command(BaseCommand):
             type=int,
             help='특정 플랫폼 ID만 동기화'
         )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='변경분이 아닌 전체 상품 동기화'
+        )
 
     def handle(self, *args, **options):
         platform_id = options.get('platform_id')
+        full = options.get('full', False)
         
         if platform_id:
             from platforms.tasks import sync_platform_products
             self.stdout.write(f'플랫폼 ID {platform_id} 동기화를 시작합니다...')
-            sync_platform_products.delay(platform_id)
+            sync_platform_products.delay(platform_id, full=full)
             self.stdout.write(
                 self.style.SUCCESS(f'플랫폼 ID {platform_id} 동기화 작업이 큐에 추가되었습니다.')
             )
         else:
             self.stdout.write('모든 플랫폼 동기화를 시작합니다...')
-            sync_all_platforms.delay()
+            sync_all_platforms.delay(full=full)
             self.stdout.write(
                 self.style.SUCCESS('모든 플랫폼 동기화 작업이 큐에 추가되었습니다.')
             )
\ No newline at end of file
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platforms", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="platform",
+            name="last_sync_duration",
+            field=models.FloatField(
+                blank=True, null=True, verbose_name="마지막 동기화 소요 시간(초)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="platform",
+            name="last_sync_stats",
+            field=models.JSONField(
+                blank=True, default=dict, verbose_name="마지막 동기화 통계"
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("platforms", "0002_platform_sync_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="platform",
+            name="sync_cursor",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="변경분 동기화 기준 시각"
+            ),
+        ),
+        migrations.AddField(
+            model_name="platformproduct",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, max_length=64, verbose_name="동기화 데이터 해시"
+            ),
+        ),
+    ]
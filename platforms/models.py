@@ -39,6 +39,9 @@ class Platform(models.Model):
         verbose_name='마지막 동기화 상태'
     )
     last_sync_message = models.TextField(blank=True, verbose_name='마지막 동기화 메시지')
+    last_sync_duration = models.FloatField(blank=True, null=True, verbose_name='마지막 동기화 소요 시간(초)')
+    last_sync_stats = models.JSONField(default=dict, blank=True, verbose_name='마지막 동기화 통계')
+    sync_cursor = models.DateTimeField(blank=True, null=True, verbose_name='변경분 동기화 기준 시각')
     api_endpoint = models.URLField(blank=True, null=True, verbose_name='API 엔드포인트')
     description = models.TextField(blank=True, verbose_name='설명')
 
@@ -64,6 +67,7 @@ class PlatformProduct(models.Model):
     # 플랫폼별 상태
     is_active = models.BooleanField(default=True, verbose_name='플랫폼 활성 상태')
     last_sync_at = models.DateTimeField(blank=True, null=True, verbose_name='마지막 동기화')
+    content_hash = models.CharField(max_length=64, blank=True, verbose_name='동기화 데이터 해시')
     
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일시')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일시')
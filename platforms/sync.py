@@ -0,0 +1,583 @@
+# platforms/sync.py
+"""
+플랫폼 상품 동기화 오케스트레이터
+
+플랫폼마다 작업 스레드 하나가 상품 목록을 페이지 단위로 가져온다. 각 플랫폼은
+연결 풀을 쓰는 requests.Session 과 초당 요청 수 제한을 가진다. 가져온 페이지는
+큐를 통해 호출 스레드로 전달되며, 호출 스레드가 페이지별로 일괄 DB 쓰기를
+수행한다. DB 쓰기는 한 스레드에서만 일어난다.
+
+변경분(delta) 모드에서는 지원하는 플랫폼에 마지막 동기화 시각 이후 변경된
+상품만 요청하고, 정규화된 상품 데이터의 해시가 저장된 값과 같은 상품은
+DB 에 쓰지 않는다. 로컬에 SKU 가 없어 반영하지 못한 상품이 있어도 커서는
+전진하고, 그 상품 데이터만 last_sync_stats['retry_items'] 에 남겨 다음 변경분
+동기화를 시작할 때 다시 반영한다.
+"""
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from decimal import Decimal
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from products.models import Product
+from .models import PlatformProduct
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_SETTINGS = {
+    'MAX_WORKERS': 4,
+    'PAGE_SIZE': 100,
+    'REQUEST_TIMEOUT': 30,
+    'RATE_LIMITS': {},
+    'DELTA_SYNC': True,
+}
+
+# 처리 대기 중인 페이지 수 상한 (가져오기가 DB 쓰기보다 빠를 때 메모리 제한)
+MAX_PENDING_PAGES = 8
+
+# 재시도 목록 상한 (넘으면 커서를 비워 다음 동기화에서 전체를 다시 받는다)
+MAX_RETRY_ITEMS = 1000
+
+
+def get_sync_settings():
+    sync_settings = dict(DEFAULT_SYNC_SETTINGS)
+    sync_settings.update(getattr(settings, 'PLATFORM_SYNC_SETTINGS', {}))
+    return sync_settings
+
+
+class RateLimiter:
+    """초당 요청 수 제한 (스레드 안전)"""
+
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+# ----------------------------------------------------------------------
+# 플랫폼 API 클라이언트
+# ----------------------------------------------------------------------
+
+class PlatformClient:
+    """
+    플랫폼 상품 API 클라이언트 기본 클래스
+
+    하위 클래스는 fetch_page 에서 (정규화된 상품 목록, 다음 커서)를 반환한다.
+    다음 커서가 None 이면 마지막 페이지이다. 정규화된 상품은
+    {'id', 'sku', 'platform_sku', 'name', 'price', 'stock', 'is_active'} 형식이다.
+    """
+
+    # "변경 이후" 필터 파라미터명 (플랫폼 API 가 지원하는 경우)
+    modified_since_param = None
+
+    def __init__(self, platform, page_size=100, timeout=30, rate_limit=None, pool_size=4, modified_since=None):
+        self.platform = platform
+        self.page_size = page_size
+        self.modified_since = modified_since if self.modified_since_param else None
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(rate_limit)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(self.get_headers())
+
+    def get_headers(self):
+        return {'Content-Type': 'application/json'}
+
+    def get(self, path, params=None):
+        if self.modified_since:
+            params = dict(params or {})
+            params[self.modified_since_param] = self.modified_since.isoformat()
+        self.rate_limiter.wait()
+        response = self.session.get(f"{self.platform.api_url}{path}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_page(self, cursor):
+        raise NotImplementedError
+
+    def iter_pages(self):
+        """(페이지 번호, 상품 목록, 소요 시간) 을 페이지 순서대로 반환"""
+        cursor = None
+        page_number = 0
+        while True:
+            page_number += 1
+            started = time.monotonic()
+            items, cursor = self.fetch_page(cursor)
+            yield page_number, items, time.monotonic() - started
+            if cursor is None:
+                break
+
+    def close(self):
+        self.session.close()
+
+
+class SmartstoreClient(PlatformClient):
+    """스마트스토어 상품 API (page/size 페이지네이션)"""
+
+    modified_since_param = 'modifiedSince'
+
+    def get_headers(self):
+        headers = super().get_headers()
+        headers.update({
+            'Authorization': f'Bearer {self.platform.api_key}',
+            'X-Timestamp': str(int(timezone.now().timestamp())),
+        })
+        return headers
+
+    def fetch_page(self, cursor):
+        page = cursor or 1
+        data = self.get('/v1/products', params={'page': page, 'size': self.page_size})
+        items = data.get('products', [])
+
+        has_next = data.get('hasNext')
+        if has_next is None:
+            has_next = len(items) >= self.page_size
+        return items, (page + 1 if has_next and items else None)
+
+
+class CoupangClient(PlatformClient):
+    """쿠팡 판매자 상품 API (nextToken 페이지네이션)"""
+
+    def get_headers(self):
+        # 실제 구현 시 HMAC 서명 필요
+        headers = super().get_headers()
+        headers.update({
+            'Authorization': f'Bearer {self.platform.api_key}',
+            'X-COUPANG-APICredentials': self.platform.api_secret or '',
+        })
+        return headers
+
+    def fetch_page(self, cursor):
+        params = {'maxPerPage': self.page_size}
+        if cursor:
+            params['nextToken'] = cursor
+        data = self.get('/v2/providers/seller_api/apis/api/v1/marketplace/seller-products', params=params)
+
+        items = [self.normalize(product_data) for product_data in data.get('data', [])]
+        return items, (data.get('nextToken') or None)
+
+    @staticmethod
+    def normalize(product_data):
+        """쿠팡 데이터 형식을 공통 형식으로 변환"""
+        return {
+            'id': product_data.get('vendorItemId'),
+            'sku': product_data.get('sellerProductId'),
+            'name': product_data.get('sellerProductName'),
+            'price': product_data.get('salePrice', 0),
+            'stock': product_data.get('quantity', 0),
+            'is_active': product_data.get('displayStatus') == 'ON_SALE'
+        }
+
+
+PLATFORM_CLIENTS = {
+    'SMARTSTORE': SmartstoreClient,
+    'COUPANG': CoupangClient,
+}
+
+
+# ----------------------------------------------------------------------
+# DB 반영
+# ----------------------------------------------------------------------
+
+def compute_content_hash(product_data):
+    """정규화된 상품 데이터(SKU, 가격, 재고, 판매 상태)의 해시"""
+    payload = {
+        'sku': str(product_data.get('sku') or ''),
+        'platform_sku': product_data.get('platform_sku', '') or '',
+        'price': str(Decimal(str(product_data.get('price') or 0)).quantize(Decimal('0.01'))),
+        'stock': int(product_data.get('stock') or 0),
+        'is_active': bool(product_data.get('is_active', True)),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def apply_platform_items(platform, items, user=None, delta=False):
+    """
+    정규화된 상품 목록을 일괄 반영
+
+    SKU 와 기존 플랫폼 상품을 한 번씩 조회한 뒤 PlatformProduct 를
+    bulk_create/bulk_update 하고, 기존 매핑의 재고가 마스터 재고와 다르면
+    마스터 재고를 플랫폼 재고로 맞추고 재고 이동을 기록한다.
+
+    delta=True 이면 저장된 content_hash 와 같은 상품은 건너뛴다.
+
+    {'updated_count', 'created_count', 'unchanged_count', 'stock_changed_count',
+     'error_count', 'errors', 'unmatched_items'} 반환. unmatched_items 는 로컬에
+    SKU 가 없어 반영하지 못한 상품 데이터 목록이다.
+    """
+    from inventory.models import StockMovement
+    from inventory.signals import check_and_create_stock_alerts_bulk
+
+    result = {
+        'updated_count': 0, 'created_count': 0, 'unchanged_count': 0,
+        'stock_changed_count': 0, 'error_count': 0, 'errors': [], 'unmatched_items': []
+    }
+
+    def add_error(message):
+        result['error_count'] += 1
+        result['errors'].append(message)
+
+    valid_items = []
+    for product_data in items:
+        if not product_data.get('sku'):
+            add_error('SKU가 없습니다.')
+        else:
+            valid_items.append(product_data)
+
+    if not valid_items:
+        return result
+
+    products = Product.objects.in_bulk({str(item['sku']) for item in valid_items}, field_name='sku')
+    existing = {
+        platform_product.platform_product_id: platform_product
+        for platform_product in PlatformProduct.objects.filter(
+            platform=platform,
+            platform_product_id__in={str(item.get('id', '')) for item in valid_items}
+        )
+    }
+
+    now = timezone.now()
+    reference_number = f"PLATFORM_SYNC_{platform.id}_{now.strftime('%Y%m%d_%H%M%S')}"
+    to_create = {}
+    to_update = {}
+    changed_products = {}
+    movements = []
+
+    for product_data in valid_items:
+        sku = str(product_data['sku'])
+        product = products.get(sku)
+        if product is None:
+            add_error(f'SKU {sku}에 해당하는 상품을 찾을 수 없습니다.')
+            result['unmatched_items'].append(product_data)
+            continue
+
+        platform_product_id = str(product_data.get('id', ''))
+        content_hash = compute_content_hash(product_data)
+        platform_product = existing.get(platform_product_id)
+
+        if (delta and platform_product is not None and
+                platform_product.content_hash == content_hash and
+                platform_product.product_id == product.pk):
+            result['unchanged_count'] += 1
+            continue
+
+        values = {
+            'product': product,
+            'platform_sku': product_data.get('platform_sku', ''),
+            'platform_price': product_data.get('price', 0),
+            'platform_stock': product_data.get('stock', 0),
+            'is_active': product_data.get('is_active', True),
+            'last_sync_at': now,
+            'content_hash': content_hash,
+        }
+
+        if platform_product is None:
+            to_create[platform_product_id] = PlatformProduct(
+                platform=platform, platform_product_id=platform_product_id, **values
+            )
+            continue
+
+        for field, value in values.items():
+            setattr(platform_product, field, value)
+        platform_product.updated_at = now
+        to_update[platform_product_id] = platform_product
+
+        # 재고 변동 확인 및 기록
+        new_stock = int(product_data.get('stock', 0))
+        old_stock = product.stock_quantity
+        if old_stock != new_stock and new_stock >= 0:
+            movements.append(StockMovement(
+                product=product,
+                movement_type='ADJUST',
+                quantity=new_stock - old_stock,
+                previous_stock=old_stock,
+                current_stock=new_stock,
+                reference_number=reference_number,
+                notes=f"{platform.name} 플랫폼 동기화로 인한 재고 조정",
+                created_by=user
+            ))
+            product.stock_quantity = new_stock
+            product.updated_at = now
+            changed_products[product.pk] = product
+
+    with transaction.atomic():
+        PlatformProduct.objects.bulk_create(to_create.values(), batch_size=500)
+        PlatformProduct.objects.bulk_update(
+            to_update.values(),
+            ['product', 'platform_sku', 'platform_price', 'platform_stock', 'is_active',
+             'last_sync_at', 'content_hash', 'updated_at'],
+            batch_size=500
+        )
+        if changed_products:
+            Product.objects.bulk_update(changed_products.values(), ['stock_quantity', 'updated_at'], batch_size=500)
+            StockMovement.objects.bulk_create(movements, batch_size=500)
+            check_and_create_stock_alerts_bulk(changed_products.values())
+
+    result['created_count'] = len(to_create)
+    result['updated_count'] = len(to_create) + len(to_update)
+    result['stock_changed_count'] = len(changed_products)
+    return result
+
+
+# ----------------------------------------------------------------------
+# 오케스트레이터
+# ----------------------------------------------------------------------
+
+class PlatformSyncOrchestrator:
+    """여러 플랫폼의 상품을 병렬로 가져와 순차적으로 반영"""
+
+    _DONE = object()
+
+    def __init__(self, platforms, max_workers=None, page_size=None, delta=None):
+        sync_settings = get_sync_settings()
+        self.platforms = list(platforms)
+        self.delta = sync_settings['DELTA_SYNC'] if delta is None else delta
+        self.max_workers = max_workers or sync_settings['MAX_WORKERS']
+        self.page_size = page_size or sync_settings['PAGE_SIZE']
+        self.timeout = sync_settings['REQUEST_TIMEOUT']
+        self.rate_limits = sync_settings['RATE_LIMITS']
+
+    def get_client(self, platform):
+        client_class = PLATFORM_CLIENTS.get(platform.platform_type)
+        if client_class is None:
+            return None
+        return client_class(
+            platform,
+            page_size=self.page_size,
+            timeout=self.timeout,
+            rate_limit=self.rate_limits.get(platform.platform_type),
+            modified_since=platform.sync_cursor if self.delta else None,
+        )
+
+    def _put(self, pages, message):
+        """큐가 찬 동안 대기하되, 호출 스레드가 중단되면 포기 (False 반환)"""
+        while not self._cancelled.is_set():
+            try:
+                pages.put(message, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fetch(self, client, pages):
+        """작업 스레드: 페이지를 가져와 큐에 넣는다 (DB 접근 없음)"""
+        platform_id = client.platform.id
+        try:
+            for page_number, items, fetch_time in client.iter_pages():
+                if not self._put(pages, (platform_id, page_number, items, fetch_time, None)):
+                    return
+        except Exception as e:
+            self._put(pages, (platform_id, None, None, None, e))
+        finally:
+            client.close()
+            self._put(pages, (platform_id, self._DONE, None, None, None))
+
+    def run(self):
+        """동기화 실행, {플랫폼 ID: 결과} 반환"""
+        results = {}
+        states = {}
+        clients = []
+
+        for platform in self.platforms:
+            client = self.get_client(platform)
+            if client is None:
+                logger.warning(f"Unsupported platform type: {platform.platform_type}")
+                results[platform.id] = {
+                    'success': False,
+                    'message': f'지원하지 않는 플랫폼: {platform.platform_type}'
+                }
+                continue
+
+            platform.last_sync_status = 'running'
+            platform.save(update_fields=['last_sync_status'])
+            states[platform.id] = {
+                'platform': platform,
+                'started': time.monotonic(),
+                'started_at': timezone.now(),
+                'modified_since': client.modified_since,
+                'pages': [],
+                'unmatched': {},
+                'retried_count': 0,
+                'totals': {
+                    'updated_count': 0, 'created_count': 0, 'unchanged_count': 0,
+                    'stock_changed_count': 0, 'error_count': 0
+                },
+                'error': None,
+            }
+            clients.append(client)
+
+        if not clients:
+            return results
+
+        if self.delta:
+            for state in states.values():
+                try:
+                    self._retry_unmatched(state)
+                except Exception as e:
+                    logger.error(f"Error retrying unmatched items for platform {state['platform'].name}: {e}")
+                    state['error'] = e
+
+        pages = queue.Queue(maxsize=MAX_PENDING_PAGES)
+        remaining = len(clients)
+        self._cancelled = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(clients))) as executor:
+            for client in clients:
+                executor.submit(self._fetch, client, pages)
+
+            # 모든 작업 스레드의 _DONE 을 받을 때까지 큐를 비운다. 처리 중 예외로
+            # 루프를 빠져나가면 put 에서 대기 중인 작업 스레드가 끝나지 않으므로
+            # 페이지/플랫폼 단위 예외는 여기서 잡고, 그 밖의 경우에는 중단을 알린다.
+            try:
+                while remaining:
+                    platform_id, page_number, items, fetch_time, error = pages.get()
+                    state = states[platform_id]
+
+                    if page_number is self._DONE:
+                        remaining -= 1
+                        try:
+                            results[platform_id] = self._finish(state)
+                        except Exception as e:
+                            logger.error(f"Error recording sync result for platform {state['platform'].name}: {e}")
+                            results[platform_id] = {
+                                'success': False,
+                                'message': f"{state['platform'].name} 동기화 결과 저장 오류: {e}"
+                            }
+                        continue
+
+                    if error is not None:
+                        logger.error(f"Error fetching products for platform {state['platform'].name}: {error}")
+                        state['error'] = error
+                        continue
+
+                    try:
+                        self._apply_page(state, page_number, items, fetch_time)
+                    except Exception as e:
+                        logger.error(f"Error applying page {page_number} for platform {state['platform'].name}: {e}")
+                        state['error'] = e
+            finally:
+                self._cancelled.set()
+
+        if any(result.get('stock_changed_count') for result in results.values()):
+            from inventory.snapshot import invalidate_inventory_snapshot
+            invalidate_inventory_snapshot()
+
+        return results
+
+    def _accumulate(self, state, items, page_result):
+        """반영 결과를 통계에 더하고 미반영 상품 목록 갱신 (나중에 받은 데이터 우선)"""
+        for key in state['totals']:
+            state['totals'][key] += page_result[key]
+        for message in page_result['errors'][:5]:
+            logger.warning(f"Failed to update product: {message}")
+
+        unmatched = state['unmatched']
+        for product_data in items:
+            unmatched.pop(str(product_data.get('id', '')), None)
+        for product_data in page_result['unmatched_items']:
+            unmatched[str(product_data.get('id', ''))] = product_data
+
+    def _retry_unmatched(self, state):
+        """지난 동기화에서 반영하지 못한 상품을 다시 반영 (페이지를 받기 전에)"""
+        items = (state['platform'].last_sync_stats or {}).get('retry_items') or []
+        if not items:
+            return
+        # 반영 중 오류가 나도 목록을 잃지 않도록 먼저 미반영 목록에 넣어 둔다
+        state['unmatched'].update((str(product_data.get('id', '')), product_data) for product_data in items)
+        page_result = apply_platform_items(state['platform'], items, delta=self.delta)
+        self._accumulate(state, items, page_result)
+        state['retried_count'] = len(items)
+
+    def _apply_page(self, state, page_number, items, fetch_time):
+        """페이지 하나를 DB 에 반영하고 통계 누적"""
+        started = time.monotonic()
+        page_result = apply_platform_items(state['platform'], items, delta=self.delta)
+        self._accumulate(state, items, page_result)
+
+        state['pages'].append({
+            'page': page_number,
+            'items': len(items),
+            'fetch_ms': round(fetch_time * 1000, 1),
+            'apply_ms': round((time.monotonic() - started) * 1000, 1),
+        })
+
+    def _finish(self, state):
+        """플랫폼 동기화 결과 기록"""
+        platform = state['platform']
+        totals = state['totals']
+        retry_items = list(state['unmatched'].values())
+        duration = time.monotonic() - state['started']
+
+        if state['error'] is not None:
+            result = {'success': False, 'message': f"{platform.name} 동기화 오류: {state['error']}"}
+            platform.last_sync_status = 'error'
+        else:
+            result = {
+                'success': True,
+                'message': (
+                    f"{platform.name} 동기화 완료: {totals['updated_count']}개 업데이트, "
+                    f"{totals['unchanged_count']}개 변경 없음, {totals['error_count']}개 오류"
+                ),
+            }
+            platform.last_sync_status = 'success'
+            # 다음 변경분 동기화는 이번 동기화 시작 시각 이후의 변경만 요청한다.
+            # SKU 가 없어 반영하지 못한 상품은 retry_items 로 다시 반영하므로
+            # 커서를 막지 않는다.
+            platform.sync_cursor = state['started_at']
+        if len(retry_items) > MAX_RETRY_ITEMS:
+            logger.warning(f"{platform.name}: 미반영 상품 {len(retry_items)}개, 다음 동기화에서 전체를 다시 받습니다.")
+            platform.sync_cursor = None
+            retry_items = []
+        result.update(totals)
+        result['page_count'] = len(state['pages'])
+        result['duration'] = round(duration, 3)
+
+        platform.last_sync_at = timezone.now()
+        platform.last_sync_message = result['message']
+        platform.last_sync_duration = result['duration']
+        platform.last_sync_stats = {
+            'delta': self.delta,
+            'modified_since': state['modified_since'].isoformat() if state['modified_since'] else None,
+            'pages': state['pages'],
+            'totals': totals,
+            'retried_count': state['retried_count'],
+            'retry_items': retry_items,
+        }
+        platform.save(update_fields=[
+            'last_sync_at', 'last_sync_status', 'last_sync_message',
+            'last_sync_duration', 'last_sync_stats', 'sync_cursor'
+        ])
+        return result
+
+
+def sync_platforms(platforms, max_workers=None, delta=None):
+    """여러 플랫폼 동기화 (병렬), {플랫폼 ID: 결과} 반환"""
+    return PlatformSyncOrchestrator(platforms, max_workers=max_workers, delta=delta).run()
+
+
+def sync_platform(platform, delta=None):
+    """단일 플랫폼 동기화"""
+    return sync_platforms([platform], delta=delta)[platform.id]
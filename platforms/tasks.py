@@ -4,7 +4,8 @@ from django.utils import timezone
 from django.db.models import F
 from django.core.mail import send_mail
 from django.conf import settings
-from .models import Platform, PlatformProduct
+from .models import Platform
+from .sync import PLATFORM_CLIENTS, apply_platform_items, sync_platform, sync_platforms
 from products.models import Product
 from inventory.models import StockMovement
 import requests
@@ -16,18 +17,16 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task
-def sync_platform_products(platform_id):
-    """플랫폼 상품 동기화"""
+def sync_platform_products(platform_id, full=False):
+    """플랫폼 상품 동기화 (full=True 이면 변경분이 아닌 전체 동기화)"""
     try:
         platform = Platform.objects.get(id=platform_id, is_active=True)
         
         logger.info(f"Starting sync for platform: {platform.name}")
         
         # 플랫폼별 API 호출 로직
-        if platform.platform_type == 'SMARTSTORE':
-            result = sync_smartstore_products(platform)
-        elif platform.platform_type == 'COUPANG':
-            result = sync_coupang_products(platform)
+        if platform.platform_type in PLATFORM_CLIENTS:
+            result = sync_platform(platform, delta=False if full else None)
         elif platform.platform_type == 'GMARKET':
             result = sync_gmarket_products(platform)
         elif platform.platform_type == 'AUCTION':
@@ -50,119 +49,13 @@ def sync_platform_products(platform_id):
         logger.error(error_msg)
         return {'success': False, 'message': error_msg}
 
-def sync_smartstore_products(platform):
+def sync_smartstore_products(platform, full=False):
     """스마트스토어 상품 동기화"""
-    try:
-        headers = {
-            'Authorization': f'Bearer {platform.api_key}',
-            'Content-Type': 'application/json',
-            'X-Timestamp': str(int(timezone.now().timestamp())),
-        }
-        
-        # API 요청 (실제 API 엔드포인트에 맞게 수정 필요)
-        response = requests.get(
-            f"{platform.api_url}/v1/products",
-            headers=headers,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            products_data = data.get('products', [])
-            
-            updated_count = 0
-            error_count = 0
-            
-            for product_data in products_data:
-                try:
-                    result = update_platform_product(platform, product_data)
-                    if result['success']:
-                        updated_count += 1
-                    else:
-                        error_count += 1
-                        logger.warning(f"Failed to update product: {result['message']}")
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error processing product {product_data.get('id')}: {str(e)}")
-            
-            return {
-                'success': True,
-                'message': f'스마트스토어 동기화 완료: {updated_count}개 업데이트, {error_count}개 오류',
-                'updated_count': updated_count,
-                'error_count': error_count
-            }
-        else:
-            error_msg = f"API request failed with status {response.status_code}: {response.text}"
-            logger.error(error_msg)
-            return {'success': False, 'message': error_msg}
-            
-    except requests.RequestException as e:
-        error_msg = f"Network error during smartstore sync: {str(e)}"
-        logger.error(error_msg)
-        return {'success': False, 'message': error_msg}
-    except Exception as e:
-        error_msg = f"Unexpected error during smartstore sync: {str(e)}"
-        logger.error(error_msg)
-        return {'success': False, 'message': error_msg}
+    return sync_platform(platform, delta=False if full else None)
 
-def sync_coupang_products(platform):
+def sync_coupang_products(platform, full=False):
     """쿠팡 상품 동기화"""
-    try:
-        # 쿠팡 API 인증 헤더 (실제 구현 시 HMAC 서명 필요)
-        headers = {
-            'Authorization': f'Bearer {platform.api_key}',
-            'X-COUPANG-APICredentials': platform.api_secret,
-            'Content-Type': 'application/json',
-        }
-        
-        response = requests.get(
-            f"{platform.api_url}/v2/providers/seller_api/apis/api/v1/marketplace/seller-products",
-            headers=headers,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            products_data = data.get('data', [])
-            
-            updated_count = 0
-            error_count = 0
-            
-            for product_data in products_data:
-                try:
-                    # 쿠팡 데이터 형식에 맞게 변환
-                    normalized_data = {
-                        'id': product_data.get('vendorItemId'),
-                        'sku': product_data.get('sellerProductId'),
-                        'name': product_data.get('sellerProductName'),
-                        'price': product_data.get('salePrice', 0),
-                        'stock': product_data.get('quantity', 0),
-                        'is_active': product_data.get('displayStatus') == 'ON_SALE'
-                    }
-                    
-                    result = update_platform_product(platform, normalized_data)
-                    if result['success']:
-                        updated_count += 1
-                    else:
-                        error_count += 1
-                        
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"Error processing coupang product: {str(e)}")
-            
-            return {
-                'success': True,
-                'message': f'쿠팡 동기화 완료: {updated_count}개 업데이트, {error_count}개 오류',
-                'updated_count': updated_count,
-                'error_count': error_count
-            }
-        else:
-            return {'success': False, 'message': f'쿠팡 API 오류: {response.status_code}'}
-            
-    except Exception as e:
-        error_msg = f"쿠팡 동기화 오류: {str(e)}"
-        logger.error(error_msg)
-        return {'success': False, 'message': error_msg}
+    return sync_platform(platform, delta=False if full else None)
 
 def sync_gmarket_products(platform):
     """G마켓 상품 동기화 (기본 구조)"""
@@ -180,60 +73,18 @@ def sync_11st_products(platform):
     return {'success': True, 'message': '11번가 동기화는 준비중입니다.'}
 
 def update_platform_product(platform, product_data):
-    """플랫폼 상품 정보 업데이트"""
+    """플랫폼 상품 정보 업데이트 (단건)"""
     try:
-        # SKU로 상품 매칭
-        sku = product_data.get('sku')
-        if not sku:
-            return {'success': False, 'message': 'SKU가 없습니다.'}
-        
-        try:
-            product = Product.objects.get(sku=sku)
-        except Product.DoesNotExist:
-            return {'success': False, 'message': f'SKU {sku}에 해당하는 상품을 찾을 수 없습니다.'}
-        
-        # 플랫폼 상품 정보 업데이트 또는 생성
-        platform_product, created = PlatformProduct.objects.update_or_create(
-            product=product,
-            platform=platform,
-            platform_product_id=str(product_data.get('id', '')),
-            defaults={
-                'platform_sku': product_data.get('platform_sku', ''),
-                'platform_price': product_data.get('price', 0),
-                'platform_stock': product_data.get('stock', 0),
-                'is_active': product_data.get('is_active', True),
-                'last_sync_at': timezone.now(),
-            }
-        )
-        
-        # 재고 변동 확인 및 기록
-        stock_changed = False
-        if not created:
-            old_stock = product.stock_quantity
-            new_stock = product_data.get('stock', 0)
-            
-            if old_stock != new_stock:
-                stock_changed = True
-                
-                # 재고 이동 기록 생성
-                StockMovement.objects.create(
-                    product=product,
-                    movement_type='ADJUST',
-                    quantity=new_stock - old_stock,
-                    previous_stock=old_stock,
-                    current_stock=new_stock,
-                    reference_number=f"PLATFORM_SYNC_{platform.id}_{timezone.now().strftime('%Y%m%d_%H%M%S')}",
-                    notes=f"{platform.name} 플랫폼 동기화로 인한 재고 조정"
-                )
-                
-                # 마스터 재고 업데이트
-                product.stock_quantity = new_stock
-                product.save(update_fields=['stock_quantity'])
+        result = apply_platform_items(platform, [product_data])
+        if result['error_count']:
+            return {'success': False, 'message': result['errors'][0]}
         
+        created = bool(result['created_count'])
+        stock_changed = bool(result['stock_changed_count'])
         action = '생성' if created else ('업데이트(재고변동)' if stock_changed else '업데이트')
         return {
             'success': True, 
-            'message': f'상품 {action}: {product.sku}',
+            'message': f"상품 {action}: {product_data.get('sku')}",
             'created': created,
             'stock_changed': stock_changed
         }
@@ -244,28 +95,35 @@ def update_platform_product(platform, product_data):
         return {'success': False, 'message': error_msg}
 
 @shared_task
-def sync_all_platforms():
-    """모든 활성 플랫폼 동기화"""
-    active_platforms = Platform.objects.filter(is_active=True)
+def sync_all_platforms(full=False):
+    """모든 활성 플랫폼 동기화 (API 연동 플랫폼은 병렬 처리)"""
+    active_platforms = list(Platform.objects.filter(is_active=True))
     
-    if not active_platforms.exists():
+    if not active_platforms:
         logger.info("No active platforms found for sync")
         return {'success': True, 'message': '활성화된 플랫폼이 없습니다.'}
     
+    supported = [platform for platform in active_platforms if platform.platform_type in PLATFORM_CLIENTS]
+    sync_results = sync_platforms(supported, delta=False if full else None) if supported else {}
+    
     results = []
     for platform in active_platforms:
-        # 각 플랫폼을 개별 태스크로 실행
-        task_result = sync_platform_products.delay(platform.id)
+        if platform.id in sync_results:
+            result = sync_results[platform.id]
+        else:
+            result = sync_platform_products(platform.id, full=full)
         results.append({
             'platform_id': platform.id,
             'platform_name': platform.name,
-            'task_id': task_result.id
+            'success': result['success'],
+            'message': result['message']
         })
     
-    logger.info(f"Initiated sync for {active_platforms.count()} platforms")
+    success_count = sum(1 for result in results if result['success'])
+    logger.info(f"Synced {len(active_platforms)} platforms ({success_count} succeeded)")
     return {
         'success': True,
-        'message': f'{active_platforms.count()}개 플랫폼 동기화가 시작되었습니다.',
+        'message': f'{len(active_platforms)}개 플랫폼 동기화 완료: 성공 {success_count}개, 실패 {len(active_platforms) - success_count}개',
         'results': results
     }
 
@@ -1,3 +1,295 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from products.models import Product
+
+from .models import Platform, PlatformProduct
+from .sync import PlatformSyncOrchestrator, apply_platform_items, sync_platform, sync_platforms
+
+
+class FakeMarketplace:
+    """
+    로컬 스레드 HTTP 서버로 띄우는 가짜 스마트스토어 상품 API
+
+    GET /v1/products?page=&size= 에 catalog 를 페이지로 나눠 응답하고,
+    요청마다 (시각, 쿼리 파라미터) 를 requests 에 기록한다.
+    """
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog or []
+        self.requests = []
+        self._lock = threading.Lock()
+
+        marketplace = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                with marketplace._lock:
+                    marketplace.requests.append((time.monotonic(), params))
+
+                if url.path != '/v1/products':
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                page = int(params.get('page', 1))
+                size = int(params.get('size', 100))
+                items = marketplace.catalog[(page - 1) * size:page * size]
+                body = json.dumps({
+                    'products': items,
+                    'hasNext': page * size < len(marketplace.catalog),
+                }).encode('utf-8')
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def catalog_items(count, stock=10, prefix='SYNC'):
+    return [
+        {
+            'id': f'{prefix}-{i}',
+            'sku': f'{prefix}-{i}',
+            'platform_sku': f'P-{i}',
+            'name': f'상품 {i}',
+            'price': 1000 + i,
+            'stock': stock,
+            'is_active': True,
+        }
+        for i in range(count)
+    ]
+
+
+class FakeMarketplaceMixin:
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.marketplace = FakeMarketplace()
+        cls.marketplace.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.marketplace.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.marketplace.requests = []
+        self.platform = self.create_platform('스마트스토어')
+
+    def create_platform(self, name):
+        return Platform.objects.create(
+            name=name, platform_type='SMARTSTORE', api_url=self.marketplace.url, api_key='test'
+        )
+
+    def set_catalog(self, count, stock=10, prefix='SYNC'):
+        self.marketplace.catalog = catalog_items(count, stock, prefix)
+        Product.objects.bulk_create([
+            Product(sku=item['sku'], name=item['name'], cost_price=500, selling_price=1000, stock_quantity=stock)
+            for item in self.marketplace.catalog
+        ], ignore_conflicts=True)
+
+
+class PlatformSyncTestCase(FakeMarketplaceMixin, TestCase):
+    pass
+
+
+class PlatformSyncPagingTest(PlatformSyncTestCase):
+
+    @override_settings(PLATFORM_SYNC_SETTINGS={'PAGE_SIZE': 100})
+    def test_fetches_every_page(self):
+        self.set_catalog(250)
+
+        result = sync_platform(self.platform, delta=False)
+
+        self.assertTrue(result['success'], result['message'])
+        self.assertEqual(result['page_count'], 3)
+        self.assertEqual(result['created_count'], 250)
+        self.assertEqual(PlatformProduct.objects.filter(platform=self.platform).count(), 250)
+        self.assertEqual(
+            [(params['page'], params['size']) for _, params in self.marketplace.requests],
+            [('1', '100'), ('2', '100'), ('3', '100')]
+        )
+
+    @override_settings(PLATFORM_SYNC_SETTINGS={'PAGE_SIZE': 10})
+    def test_unknown_sku_is_counted_not_fatal(self):
+        self.set_catalog(5)
+        self.marketplace.catalog.append(catalog_items(1, prefix='MISSING')[0])
+
+        result = sync_platform(self.platform, delta=False)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['created_count'], 5)
+        self.assertEqual(result['error_count'], 1)
+
+
+class PlatformSyncDeltaTest(PlatformSyncTestCase):
+
+    def modified_since_params(self):
+        return [params.get('modifiedSince') for _, params in self.marketplace.requests]
+
+    def test_cursor_advances_after_clean_run(self):
+        self.set_catalog(5)
+
+        sync_platform(self.platform, delta=True)
+        self.platform.refresh_from_db()
+        cursor = self.platform.sync_cursor
+        self.assertIsNotNone(cursor)
+
+        self.marketplace.requests = []
+        result = sync_platform(self.platform, delta=True)
+        self.assertEqual(self.modified_since_params(), [cursor.isoformat()])
+        self.assertEqual(result['unchanged_count'], 5)
+
+    def retry_ids(self):
+        self.platform.refresh_from_db()
+        return [item['id'] for item in self.platform.last_sync_stats['retry_items']]
+
+    def test_unmatched_items_do_not_block_cursor(self):
+        self.set_catalog(5)
+        self.marketplace.catalog.append(catalog_items(1, prefix='MISSING')[0])
+
+        result = sync_platform(self.platform, delta=True)
+        self.assertEqual(result['error_count'], 1)
+        self.assertEqual(self.retry_ids(), ['MISSING-0'])
+        cursor = self.platform.sync_cursor
+        self.assertIsNotNone(cursor)
+
+        # 커서 이후 변경이 없어도 미반영 상품은 다시 반영한다 (여전히 SKU 없음)
+        self.marketplace.catalog = []
+        self.marketplace.requests = []
+        result = sync_platform(self.platform, delta=True)
+        self.assertEqual(self.modified_since_params(), [cursor.isoformat()])
+        self.assertEqual(result['error_count'], 1)
+        self.assertEqual(self.retry_ids(), ['MISSING-0'])
+        self.assertGreater(self.platform.sync_cursor, cursor)
+
+        # 상품이 등록되면 다음 동기화에서 반영되고 재시도 목록에서 빠진다
+        Product.objects.create(sku='MISSING-0', name='누락 상품', cost_price=500, selling_price=1000)
+        result = sync_platform(self.platform, delta=True)
+        self.assertEqual((result['created_count'], result['error_count']), (1, 0))
+        self.assertEqual(self.retry_ids(), [])
+        self.assertTrue(PlatformProduct.objects.filter(platform=self.platform, platform_product_id='MISSING-0').exists())
+
+    def test_fetched_item_replaces_retry_item(self):
+        self.set_catalog(1)
+        missing = catalog_items(1, prefix='MISSING')[0]
+        self.marketplace.catalog.append(missing)
+        sync_platform(self.platform, delta=True)
+
+        # 변경된 상품을 다시 받으면 지난 데이터 대신 새 데이터를 반영한다
+        Product.objects.create(sku='MISSING-0', name='누락 상품', cost_price=500, selling_price=1000)
+        self.marketplace.catalog = [dict(missing, stock=7)]
+        result = sync_platform(self.platform, delta=True)
+
+        self.assertEqual(result['error_count'], 0)
+        self.assertEqual(self.retry_ids(), [])
+        platform_product = PlatformProduct.objects.get(platform=self.platform, platform_product_id='MISSING-0')
+        self.assertEqual(platform_product.platform_stock, 7)
+
+    @mock.patch('platforms.sync.MAX_RETRY_ITEMS', 1)
+    def test_too_many_unmatched_items_reset_cursor(self):
+        self.set_catalog(1)
+        self.marketplace.catalog += catalog_items(2, prefix='MISSING')
+
+        sync_platform(self.platform, delta=True)
+
+        self.assertEqual(self.retry_ids(), [])
+        self.assertIsNone(self.platform.sync_cursor)
+
+
+class PlatformSyncRateLimitTest(PlatformSyncTestCase):
+
+    @override_settings(PLATFORM_SYNC_SETTINGS={'PAGE_SIZE': 2, 'RATE_LIMITS': {'SMARTSTORE': 20}})
+    def test_requests_are_spaced_by_rate_limit(self):
+        self.set_catalog(10)
+
+        sync_platform(self.platform, delta=False)
+
+        times = [requested_at for requested_at, _ in self.marketplace.requests]
+        self.assertEqual(len(times), 5)
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        # 초당 20회 = 50ms 간격 (타이머 오차 허용)
+        self.assertGreaterEqual(min(gaps), 0.04)
+
+
+class PlatformSyncBatchedWriteTest(PlatformSyncTestCase):
+
+    def apply_queries(self, items):
+        with CaptureQueriesContext(connection) as queries:
+            result = apply_platform_items(self.platform, items)
+        self.assertEqual(result['error_count'], 0)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        # SQLite 파라미터 수 제한으로 bulk_create 가 나뉘지 않는 범위
+        self.set_catalog(60)
+        items = self.marketplace.catalog
+
+        # 신규 매핑 생성
+        small = self.apply_queries(items[:10])
+        large = self.apply_queries(items[10:])
+        self.assertEqual(small, large)
+
+        # 재고 변경이 있는 기존 매핑 갱신
+        for item in items:
+            item['stock'] = 3
+        small = self.apply_queries(items[:10])
+        large = self.apply_queries(items[10:])
+        self.assertEqual(small, large)
+        self.assertEqual(Product.objects.filter(sku__startswith='SYNC-', stock_quantity=3).count(), 60)
+
+
+class PlatformSyncFailureTest(FakeMarketplaceMixin, TransactionTestCase):
+    """별도 스레드에서 동기화를 실행하므로 데이터를 커밋해 둔다"""
+
+    @override_settings(PLATFORM_SYNC_SETTINGS={'PAGE_SIZE': 1})
+    def test_failed_result_save_does_not_block_other_fetchers(self):
+        # 큐 상한(MAX_PENDING_PAGES)보다 페이지가 많은 플랫폼 둘
+        self.set_catalog(30)
+        platforms = [self.platform, self.create_platform('스마트스토어 2')]
+
+        outcome = {}
+
+        def run():
+            with mock.patch.object(PlatformSyncOrchestrator, '_finish', side_effect=RuntimeError('save failed')):
+                try:
+                    outcome['results'] = sync_platforms(platforms, max_workers=2, delta=False)
+                finally:
+                    connections.close_all()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join(timeout=30)
+
+        self.assertFalse(thread.is_alive(), '동기화가 끝나지 않음 (작업 스레드가 큐에서 대기 중)')
+        self.assertEqual(
+            {platform_id: result['success'] for platform_id, result in outcome['results'].items()},
+            {platform.id: False for platform in platforms}
+        )
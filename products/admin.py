@@ -1,7 +1,9 @@
 # File: products/admin.py
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import Category, Brand, Product, ProductImage
+from .models import Category, Brand, Product, ProductImage, Tag
+from .category_tree import invalidate_category_tree
 from django.db.models import Count, Q
 
 class ProductImageInline(admin.TabularInline):
@@ -119,7 +121,7 @@ class CategoryAdmin(admin.ModelAdmin):
         
         # 자기 자신과 하위 카테고리를 부모 선택에서 제외
         if obj:
-            descendants = [obj.pk] + [cat.pk for cat in obj.get_descendants()]
+            descendants = obj.get_descendant_ids(include_self=True)
             form.base_fields['parent'].queryset = Category.objects.exclude(pk__in=descendants)
         
         return form
@@ -140,13 +142,15 @@ class CategoryAdmin(admin.ModelAdmin):
     
     def make_active(self, request, queryset):
         """선택된 카테고리들을 활성화"""
-        updated = queryset.update(is_active=True)
+        updated = queryset.update(is_active=True, updated_at=timezone.now())
+        invalidate_category_tree()
         self.message_user(request, f'{updated}개 카테고리가 활성화되었습니다.')
     make_active.short_description = '선택된 카테고리 활성화'
     
     def make_inactive(self, request, queryset):
         """선택된 카테고리들을 비활성화"""
-        updated = queryset.update(is_active=False)
+        updated = queryset.update(is_active=False, updated_at=timezone.now())
+        invalidate_category_tree()
         self.message_user(request, f'{updated}개 카테고리가 비활성화되었습니다.')
     make_inactive.short_description = '선택된 카테고리 비활성화'
     
@@ -162,4 +166,10 @@ class CategoryAdmin(admin.ModelAdmin):
 class BrandAdmin(admin.ModelAdmin):
     list_display = ['name', 'code', 'is_active']
     list_filter = ['is_active']
-    search_fields = ['name', 'code']
\ No newline at end of file
+    search_fields = ['name', 'code']
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'product_count', 'created_at']
+    search_fields = ['name', 'normalized_name']
+    readonly_fields = ['normalized_name', 'product_count', 'created_at']
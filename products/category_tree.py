@@ -0,0 +1,139 @@
+# products/category_tree.py
+"""
+카테고리 트리 캐시
+
+모든 카테고리를 한 번의 쿼리로 읽어 자식 목록, 하위 카테고리 ID 집합,
+깊이, 경로를 미리 계산해 프로세스 메모리에 보관한다. 카테고리 저장/삭제
+시그널에서 공유 캐시의 버전 토큰을 바꾸면 각 프로세스는 다음 확인 때
+트리를 다시 읽는다. 버전 토큰은 설정 캐시와 같이 VERSION_CHECK_INTERVAL 초마다
+한 번만 확인한다 (core.config_cache.VersionedProcessCache).
+
+하위 카테고리는 Category.get_descendants 와 같이 활성 하위 카테고리만
+따라 내려가며 계산한다.
+"""
+from django.db import transaction
+
+from core.config_cache import VersionedProcessCache
+
+CATEGORY_TREE_VERSION_KEY = 'category_tree_version'
+
+
+class CategoryTree:
+    """메모리에 적재된 카테고리 트리"""
+
+    def __init__(self, rows):
+        # rows: 정렬 순서(sort_order, name)대로 정렬된 카테고리 values() 목록
+        self.nodes = {row['id']: row for row in rows}
+        self.root_ids = []
+        self.children = {category_id: [] for category_id in self.nodes}
+        for row in rows:
+            parent_id = row['parent_id']
+            if parent_id in self.children:
+                self.children[parent_id].append(row['id'])
+            else:
+                self.root_ids.append(row['id'])
+
+        self.paths = {}
+        for category_id in self.nodes:
+            self._build_path(category_id)
+
+        # 활성 하위 카테고리 ID (깊이 우선 순서)
+        self._descendants = {}
+        for category_id in self.nodes:
+            self._build_descendants(category_id)
+        self._descendant_sets = {
+            category_id: frozenset(descendants)
+            for category_id, descendants in self._descendants.items()
+        }
+
+    def _build_path(self, category_id):
+        """루트부터 자신까지의 카테고리명 경로 (순환 참조는 끊는다)"""
+        chain = []
+        seen = set()
+        current = category_id
+        while current in self.nodes and current not in seen and current not in self.paths:
+            seen.add(current)
+            chain.append(current)
+            current = self.nodes[current]['parent_id']
+        prefix = self.paths.get(current, ())
+        for node_id in reversed(chain):
+            prefix = prefix + (self.nodes[node_id]['name'],)
+            self.paths[node_id] = prefix
+
+    def _build_descendants(self, category_id):
+        if category_id in self._descendants:
+            return self._descendants[category_id]
+        self._descendants[category_id] = ()  # 순환 참조 방지
+        descendants = []
+        for child_id in self.children[category_id]:
+            if self.nodes[child_id]['is_active']:
+                descendants.append(child_id)
+                descendants.extend(self._build_descendants(child_id))
+        self._descendants[category_id] = tuple(descendants)
+        return self._descendants[category_id]
+
+    def __contains__(self, category_id):
+        return category_id in self.nodes
+
+    def descendant_ids(self, category_id, include_self=False):
+        """활성 하위 카테고리 ID 집합"""
+        descendants = self._descendant_sets.get(category_id, frozenset())
+        if include_self:
+            return descendants | {category_id}
+        return descendants
+
+    def ordered_descendant_ids(self, category_id):
+        """활성 하위 카테고리 ID (get_descendants 와 같은 깊이 우선 순서)"""
+        return self._descendants.get(category_id, ())
+
+    def child_ids(self, category_id=None, active_only=True):
+        """자식 카테고리 ID (category_id 가 None 이면 최상위)"""
+        ids = self.root_ids if category_id is None else self.children.get(category_id, [])
+        if active_only:
+            return [child_id for child_id in ids if self.nodes[child_id]['is_active']]
+        return list(ids)
+
+    def depth(self, category_id):
+        """카테고리 레벨 (0부터 시작)"""
+        path = self.paths.get(category_id)
+        return len(path) - 1 if path else None
+
+    def path(self, category_id, separator=' > '):
+        """전체 카테고리 경로 문자열"""
+        path = self.paths.get(category_id)
+        return separator.join(path) if path else None
+
+
+def load_category_tree():
+    """DB 에서 카테고리 트리를 한 번의 쿼리로 적재"""
+    from .models import Category
+
+    rows = list(
+        Category.objects.order_by('sort_order', 'name')
+        .values('id', 'name', 'parent_id', 'is_active', 'sort_order')
+    )
+    return CategoryTree(rows)
+
+
+_tree = VersionedProcessCache(CATEGORY_TREE_VERSION_KEY, load_category_tree)
+
+
+def get_category_tree():
+    """현재 프로세스의 카테고리 트리 (다른 프로세스에서 변경되면 다시 적재)"""
+    return _tree.get()
+
+
+def invalidate_category_tree():
+    """
+    카테고리 트리 캐시 무효화
+
+    현재 프로세스의 사본은 바로 버리고, 다른 프로세스에는 트랜잭션 커밋 후
+    버전 토큰을 바꿔 알린다.
+    """
+    _tree.clear_local()
+    transaction.on_commit(_tree.reset)
+
+
+def descendant_ids(category_id, include_self=True):
+    """상품 필터링용 카테고리 ID 집합 (기본: 자신 포함)"""
+    return get_category_tree().descendant_ids(category_id, include_self=include_self)
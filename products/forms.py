@@ -512,7 +512,7 @@ class CategoryForm(forms.ModelForm):
         
         # 자기 자신과 자기 하위 카테고리들을 부모 선택에서 제외
         if self.instance.pk:
-            descendants = [self.instance.pk] + [cat.pk for cat in self.instance.get_descendants()]
+            descendants = self.instance.get_descendant_ids(include_self=True)
             self.fields['parent'].queryset = Category.objects.exclude(pk__in=descendants)
         
         # 부모 카테고리 선택 필드 개선
@@ -529,7 +529,7 @@ class CategoryForm(forms.ModelForm):
             if parent.pk == self.instance.pk:
                 raise ValidationError('자기 자신을 부모 카테고리로 설정할 수 없습니다.')
             # 순환 참조 방지
-            if self.instance in parent.get_descendants():
+            if self.instance.pk in parent.get_descendant_ids():
                 raise ValidationError('하위 카테고리를 부모로 설정할 수 없습니다.')
         return parent
 
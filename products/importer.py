@@ -0,0 +1,448 @@
+# products/importer.py
+"""
+상품 일괄 가져오기 파이프라인
+
+CSV/XLSX 파일을 고정 크기 청크로 스트리밍하며 처리한다. 청크마다 SKU,
+카테고리, 브랜드를 한 번씩 조회하고 상품은 bulk_create/bulk_update 로
+저장한다. 진행 상황은 InventoryTransaction 에 기록된다.
+"""
+import csv
+import logging
+import math
+from decimal import Decimal, InvalidOperation
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .category_tree import invalidate_category_tree
+from .models import Product, Category, Brand, ProductPriceHistory
+from .tags import sync_product_tags
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 20
+
+# 가져오기 시 갱신되는 상품 필드 (update_existing 사용 시)
+UPDATE_FIELDS = [
+    'name', 'category', 'brand', 'short_description', 'description', 'status',
+    'is_featured', 'cost_price', 'selling_price', 'discount_price',
+    'stock_quantity', 'min_stock_level', 'max_stock_level', 'weight',
+    'dimensions_length', 'dimensions_width', 'dimensions_height',
+    'barcode', 'tags', 'updated_at',
+]
+
+
+def clean_value(value):
+    """셀 값을 문자열로 정규화 (빈 값/NaN 은 빈 문자열)"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and math.isnan(value):
+        return ''
+    return str(value).strip()
+
+
+def _decimal(value, default=None):
+    value = clean_value(value)
+    if not value:
+        return default
+    return Decimal(value)
+
+
+def _integer(value, default=0):
+    value = clean_value(value)
+    if not value:
+        return default
+    return int(Decimal(value))
+
+
+def iter_import_rows(file_path):
+    """파일의 데이터 행을 dict 로 하나씩 반환 (전체를 메모리에 올리지 않음)"""
+    if file_path.endswith(('.xlsx', '.xlsm')):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [clean_value(header) for header in next(rows, [])]
+            for values in rows:
+                if values is None or all(value is None for value in values):
+                    continue
+                yield dict(zip(headers, values))
+        finally:
+            workbook.close()
+    else:
+        with open(file_path, newline='', encoding='utf-8-sig') as csv_file:
+            for row in csv.DictReader(csv_file):
+                yield row
+
+
+def iter_chunks(rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """(행 번호, 행) 목록을 chunk_size 단위로 묶어 반환"""
+    chunk = []
+    for row_number, row in enumerate(rows, 1):
+        chunk.append((row_number, row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ProductImportPipeline:
+    """청크 단위 상품 가져오기"""
+
+    def __init__(self, user=None, chunk_size=IMPORT_CHUNK_SIZE, update_existing=False, inventory_transaction=None):
+        self.user = user
+        self.chunk_size = chunk_size
+        self.update_existing = update_existing
+        self.inventory_transaction = inventory_transaction
+
+        self.success_count = 0
+        self.error_count = 0
+        self.created_count = 0
+        self.updated_count = 0
+        self.errors = []
+        self.seen_skus = set()
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    def run_file(self, file_path):
+        """파일 가져오기 실행"""
+        if self.inventory_transaction is not None:
+            self.inventory_transaction.total_items = sum(1 for _ in iter_import_rows(file_path))
+            self.inventory_transaction.save(update_fields=['total_items'])
+        return self.run(iter_import_rows(file_path))
+
+    def run(self, rows):
+        """행 iterable 가져오기 실행"""
+        if self.inventory_transaction is not None:
+            self.inventory_transaction.start_processing()
+
+        try:
+            for chunk in iter_chunks(rows, self.chunk_size):
+                self.process_chunk(chunk)
+                self._report_progress()
+        except Exception as e:
+            if self.inventory_transaction is not None:
+                self.inventory_transaction.fail(str(e))
+            raise
+
+        if self.success_count:
+            from inventory.snapshot import invalidate_inventory_snapshot
+            invalidate_inventory_snapshot()
+
+        if self.inventory_transaction is not None:
+            self.inventory_transaction.metadata.update(self.result())
+            self.inventory_transaction.save(update_fields=['metadata'])
+            self.inventory_transaction.complete()
+
+        return self.result()
+
+    def result(self):
+        return {
+            'success_count': self.success_count,
+            'error_count': self.error_count,
+            'created_count': self.created_count,
+            'updated_count': self.updated_count,
+            'errors': self.errors[:MAX_REPORTED_ERRORS],
+        }
+
+    def _report_progress(self):
+        if self.inventory_transaction is None:
+            return
+        self.inventory_transaction.processed_items = self.success_count + self.error_count
+        self.inventory_transaction.failed_items = self.error_count
+        self.inventory_transaction.save(update_fields=['processed_items', 'failed_items'])
+
+    def _add_errors(self, messages):
+        self.error_count += 1
+        self.errors.extend(messages)
+
+    # ------------------------------------------------------------------
+    # 청크 처리
+    # ------------------------------------------------------------------
+
+    def process_chunk(self, chunk):
+        """청크 하나 처리: 검증 → 참조 데이터 일괄 조회 → 일괄 저장"""
+        valid_rows = []
+        for row_number, row in chunk:
+            errors = self.validate_row(row, row_number)
+            if errors:
+                self._add_errors(errors)
+            else:
+                valid_rows.append((row_number, row))
+
+        if not valid_rows:
+            return
+
+        skus = [clean_value(row.get('SKU')) for _, row in valid_rows]
+        existing = Product.objects.in_bulk(skus, field_name='sku')
+        categories = self._resolve_categories(row for _, row in valid_rows)
+        brands = self._resolve_brands(row for _, row in valid_rows)
+
+        to_create = []
+        to_update = []
+        now = timezone.now()
+
+        for row_number, row in valid_rows:
+            sku = clean_value(row.get('SKU'))
+
+            if sku in self.seen_skus or (sku in existing and not self.update_existing):
+                self._add_errors([f'행 {row_number}: SKU "{sku}"는 이미 존재합니다.'])
+                continue
+
+            category_code = clean_value(row.get('카테고리코드'))
+            brand_code = clean_value(row.get('브랜드코드'))
+            if category_code and category_code not in categories:
+                self._add_errors([f'행 {row_number}: 카테고리 "{category_code}"를 생성할 수 없습니다.'])
+                continue
+            if brand_code and brand_code not in brands:
+                self._add_errors([f'행 {row_number}: 브랜드 "{brand_code}"를 생성할 수 없습니다.'])
+                continue
+
+            self.seen_skus.add(sku)
+            fields = self.build_product_fields(row)
+            fields['category'] = categories.get(category_code)
+            fields['brand'] = brands.get(brand_code)
+
+            if sku in existing:
+                product = existing[sku]
+                price_history = None
+                if (product.cost_price != fields['cost_price'] or
+                        product.selling_price != fields['selling_price'] or
+                        product.discount_price != fields['discount_price']):
+                    price_history = ProductPriceHistory(
+                        product=product,
+                        cost_price=product.cost_price,
+                        selling_price=product.selling_price,
+                        discount_price=product.discount_price,
+                        reason='가격 변경 (일괄 가져오기)',
+                        changed_by=self.user
+                    )
+                product._old_stock_quantity = product.stock_quantity
+                for field, value in fields.items():
+                    setattr(product, field, value)
+                product.updated_at = now
+                to_update.append((row_number, product, price_history))
+            else:
+                to_create.append((row_number, Product(sku=sku, created_by=self.user, **fields), None))
+
+        self._save_products(to_create, to_update)
+
+    def validate_row(self, row, row_number):
+        """DB 조회 없이 행 검증 (SKU 중복은 청크 단위로 확인)"""
+        errors = []
+
+        # 필수 필드 검사
+        if not clean_value(row.get('SKU')):
+            errors.append(f'행 {row_number}: SKU는 필수입니다.')
+
+        if not clean_value(row.get('상품명')):
+            errors.append(f'행 {row_number}: 상품명은 필수입니다.')
+
+        # 가격 검증
+        try:
+            cost_price = _decimal(row.get('원가'), Decimal('0'))
+            selling_price = _decimal(row.get('판매가'), Decimal('0'))
+            discount_price = _decimal(row.get('할인가'))
+
+            if cost_price < 0:
+                errors.append(f'행 {row_number}: 원가는 0 이상이어야 합니다.')
+
+            if selling_price <= 0:
+                errors.append(f'행 {row_number}: 판매가는 0보다 커야 합니다.')
+
+            if selling_price <= cost_price:
+                errors.append(f'행 {row_number}: 판매가는 원가보다 높아야 합니다.')
+
+            if discount_price and discount_price >= selling_price:
+                errors.append(f'행 {row_number}: 할인가는 판매가보다 낮아야 합니다.')
+
+        except (InvalidOperation, ValueError, TypeError):
+            errors.append(f'행 {row_number}: 올바른 가격을 입력해주세요.')
+
+        # 수량 검증
+        try:
+            for column in ('재고수량', '최소재고', '최대재고'):
+                if _integer(row.get(column)) < 0:
+                    errors.append(f'행 {row_number}: {column}는 0 이상이어야 합니다.')
+            for column in ('무게', '길이', '너비', '높이'):
+                _decimal(row.get(column))
+        except (InvalidOperation, ValueError, TypeError):
+            errors.append(f'행 {row_number}: 올바른 숫자를 입력해주세요.')
+
+        return errors
+
+    @staticmethod
+    def build_product_fields(row):
+        """행 데이터를 상품 필드 dict 로 변환"""
+        discount_price = _decimal(row.get('할인가'))
+        return {
+            'name': clean_value(row.get('상품명')),
+            'short_description': clean_value(row.get('간단설명')),
+            'description': clean_value(row.get('상세설명')),
+            'status': 'ACTIVE' if (clean_value(row.get('상태')) or 'ACTIVE') == 'ACTIVE' else 'INACTIVE',
+            'is_featured': (clean_value(row.get('추천상품')) or '아니오').lower() in ['예', 'yes', 'true', '1'],
+            'cost_price': _decimal(row.get('원가'), Decimal('0')),
+            'selling_price': _decimal(row.get('판매가'), Decimal('0')),
+            'discount_price': discount_price or None,
+            'stock_quantity': _integer(row.get('재고수량')),
+            'min_stock_level': _integer(row.get('최소재고')),
+            'max_stock_level': _integer(row.get('최대재고'), 1000),
+            'weight': _decimal(row.get('무게')) or None,
+            'dimensions_length': _decimal(row.get('길이')) or None,
+            'dimensions_width': _decimal(row.get('너비')) or None,
+            'dimensions_height': _decimal(row.get('높이')) or None,
+            'barcode': clean_value(row.get('바코드')),
+            'tags': clean_value(row.get('태그')),
+        }
+
+    # ------------------------------------------------------------------
+    # 참조 데이터 (카테고리/브랜드)
+    # ------------------------------------------------------------------
+
+    def _resolve_categories(self, rows):
+        """청크의 카테고리 코드를 한 번에 조회하고 없는 것은 생성"""
+        names = {}
+        for row in rows:
+            code = clean_value(row.get('카테고리코드'))
+            if code:
+                names.setdefault(code, clean_value(row.get('카테고리명')) or code)
+        if not names:
+            return {}
+
+        categories = Category.objects.in_bulk(list(names), field_name='code')
+        missing = [Category(code=code, name=name) for code, name in names.items() if code not in categories]
+        if missing:
+            Category.objects.bulk_create(missing, ignore_conflicts=True)
+            invalidate_category_tree()  # bulk_create 는 시그널을 발생시키지 않는다
+            categories = Category.objects.in_bulk(list(names), field_name='code')
+        return categories
+
+    def _resolve_brands(self, rows):
+        """청크의 브랜드 코드를 한 번에 조회하고 없는 것은 생성"""
+        names = {}
+        for row in rows:
+            code = clean_value(row.get('브랜드코드'))
+            if code:
+                names.setdefault(code, clean_value(row.get('브랜드명')) or code)
+        if not names:
+            return {}
+
+        brands = Brand.objects.in_bulk(list(names), field_name='code')
+        missing = [Brand(code=code, name=name) for code, name in names.items() if code not in brands]
+        if missing:
+            # 브랜드명도 유일하므로 충돌한 브랜드는 생성되지 않고 해당 행은 오류 처리된다
+            Brand.objects.bulk_create(missing, ignore_conflicts=True)
+            brands = Brand.objects.in_bulk(list(names), field_name='code')
+        return brands
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+
+    def _save_products(self, to_create, to_update):
+        """상품 일괄 저장, 실패 시 행 단위로 재시도하여 오류 행만 보고"""
+        try:
+            with transaction.atomic():
+                self._bulk_save(to_create, to_update)
+        except IntegrityError:
+            logger.warning('상품 일괄 저장 실패, 행 단위로 재시도합니다.', exc_info=True)
+            for entry in to_create:
+                self._save_single(entry[0], [entry], [])
+            for entry in to_update:
+                self._save_single(entry[0], [], [entry])
+            return
+
+        self.created_count += len(to_create)
+        self.updated_count += len(to_update)
+        self.success_count += len(to_create) + len(to_update)
+
+    def _save_single(self, row_number, created, updated):
+        try:
+            with transaction.atomic():
+                self._bulk_save(created, updated)
+        except IntegrityError as e:
+            self._add_errors([f'행 {row_number}: {str(e)}'])
+            return
+        self.created_count += len(created)
+        self.updated_count += len(updated)
+        self.success_count += 1
+
+    def _bulk_save(self, created, updated):
+        """
+        상품과 부가 데이터 저장 (항목: (행 번호, 상품, 가격 이력))
+
+        bulk_create/bulk_update 는 save 시그널을 발생시키지 않으므로, 신규
+        상품의 재고 수준(StockLevel)과 초기 재고 이동 기록, 기존 상품의 가격
+        변경 이력과 장바구니 합계 캐시 삭제, 태그/검색 색인을 여기서 함께 처리한다.
+        """
+        from inventory.models import StockLevel, StockMovement
+        from inventory.signals import check_and_create_stock_alerts_bulk
+        from search.backends import index_products
+        from shop.cart import invalidate_product_carts
+
+        price_histories = [history for _, _, history in updated if history is not None]
+        created = [product for _, product, _ in created]
+        updated = [product for _, product, _ in updated]
+
+        if created:
+            Product.objects.bulk_create(created, batch_size=self.chunk_size)
+            StockLevel.objects.bulk_create([
+                StockLevel(
+                    product=product,
+                    min_stock_level=product.min_stock_level,
+                    max_stock_level=product.max_stock_level,
+                    reorder_point=product.min_stock_level,
+                    reorder_quantity=max(50, product.min_stock_level * 2),
+                    safety_stock=max(10, product.min_stock_level // 2),
+                )
+                for product in created
+            ], batch_size=self.chunk_size, ignore_conflicts=True)
+            StockMovement.objects.bulk_create([
+                StockMovement(
+                    product=product,
+                    movement_type='IN',
+                    quantity=product.stock_quantity,
+                    previous_stock=0,
+                    current_stock=product.stock_quantity,
+                    reason='초기 재고 등록',
+                    created_by=self.user
+                )
+                for product in created if product.stock_quantity > 0
+            ], batch_size=self.chunk_size)
+
+        if updated:
+            Product.objects.bulk_update(updated, UPDATE_FIELDS, batch_size=self.chunk_size)
+            ProductPriceHistory.objects.bulk_create(price_histories, batch_size=self.chunk_size)
+            if price_histories:
+                # 가격 이력 시그널이 없으므로 장바구니 합계 캐시를 직접 삭제 (커밋 후)
+                repriced_ids = [history.product_id for history in price_histories]
+                transaction.on_commit(lambda: invalidate_product_carts(*repriced_ids))
+
+            stock_changed = [
+                product for product in updated
+                if product._old_stock_quantity != product.stock_quantity
+            ]
+            if stock_changed:
+                reference_time = timezone.now().strftime('%Y%m%d%H%M%S')
+                StockMovement.objects.bulk_create([
+                    StockMovement(
+                        product=product,
+                        movement_type='IN' if product.stock_quantity > product._old_stock_quantity else 'OUT',
+                        quantity=abs(product.stock_quantity - product._old_stock_quantity),
+                        previous_stock=product._old_stock_quantity,
+                        current_stock=product.stock_quantity,
+                        reference_number=f'IMPORT-{reference_time}-{product.id}',
+                        reason='상품 일괄 가져오기',
+                        created_by=self.user
+                    )
+                    for product in stock_changed
+                ], batch_size=self.chunk_size)
+                check_and_create_stock_alerts_bulk(stock_changed)
+
+        sync_product_tags(created + updated)
+        index_products(created + updated)
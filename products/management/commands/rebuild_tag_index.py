@@ -0,0 +1,15 @@
+# products/management/commands/rebuild_tag_index.py
+from django.core.management.base import BaseCommand
+
+from products.tags import rebuild_tag_index
+
+
+class Command(BaseCommand):
+    help = '상품 태그 색인과 태그별 사용 수를 재구축합니다'
+
+    def handle(self, *args, **options):
+        count = rebuild_tag_index()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'태그 {count}개의 색인을 재구축했습니다.')
+        )
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='태그명')),
+                ('normalized_name', models.CharField(max_length=100, unique=True, verbose_name='정규화 태그명')),
+                ('product_count', models.PositiveIntegerField(db_index=True, default=0, verbose_name='활성 상품 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+            ],
+            options={
+                'verbose_name': '태그',
+                'verbose_name_plural': '태그',
+                'ordering': ['-product_count', 'name'],
+                'indexes': [models.Index(fields=['normalized_name'], name='products_tag_prefix_idx', opclasses=['varchar_pattern_ops'])],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='products.product', verbose_name='상품')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='product_links', to='products.tag', verbose_name='태그')),
+            ],
+            options={
+                'verbose_name': '상품 태그',
+                'verbose_name_plural': '상품 태그',
+                'unique_together': {('product', 'tag')},
+            },
+        ),
+    ]
@@ -72,38 +72,51 @@ class Category(models.Model):
 
     @property
     def full_path(self):
-        """전체 카테고리 경로"""
-        if self.parent:
-            return f"{self.parent.full_path} > {self.name}"
+        """전체 카테고리 경로 (상위 경로는 카테고리 트리 캐시에서 조회)"""
+        if self.parent_id:
+            from .category_tree import get_category_tree
+            parent_path = get_category_tree().path(self.parent_id)
+            if parent_path is None:
+                parent_path = self.parent.full_path
+            return f"{parent_path} > {self.name}"
         return self.name
 
     @property
     def level(self):
         """카테고리 레벨 (0부터 시작)"""
-        if self.parent:
-            return self.parent.level + 1
+        if self.parent_id:
+            from .category_tree import get_category_tree
+            parent_depth = get_category_tree().depth(self.parent_id)
+            if parent_depth is None:
+                parent_depth = self.parent.level
+            return parent_depth + 1
         return 0
 
     def get_children(self):
         """하위 카테고리들"""
         return self.children.filter(is_active=True).order_by('sort_order', 'name')
 
+    def get_descendant_ids(self, include_self=False):
+        """모든 활성 하위 카테고리 ID 집합 (카테고리 트리 캐시 사용)"""
+        from .category_tree import get_category_tree
+        return get_category_tree().descendant_ids(self.pk, include_self=include_self)
+
     def get_descendants(self):
-        """모든 하위 카테고리들 (재귀적)"""
-        descendants = []
-        for child in self.get_children():
-            descendants.append(child)
-            descendants.extend(child.get_descendants())
-        return descendants
+        """모든 하위 카테고리들 (깊이 우선 순서, 한 번의 쿼리)"""
+        from .category_tree import get_category_tree
+        descendant_ids = get_category_tree().ordered_descendant_ids(self.pk)
+        if not descendant_ids:
+            return []
+        categories = Category.objects.in_bulk(descendant_ids)
+        return [categories[pk] for pk in descendant_ids if pk in categories]
 
     def get_products(self, include_descendants=False):
         """카테고리의 상품들"""
         if include_descendants:
             # 하위 카테고리의 상품들도 포함
-            categories = [self] + self.get_descendants()
             try:
                 return Product.objects.filter(
-                    category__in=categories,
+                    category_id__in=self.get_descendant_ids(include_self=True),
                     status='ACTIVE'
                 ).order_by('-created_at')
             except:
@@ -148,6 +161,18 @@ class Brand(models.Model):
     def __str__(self):
         return self.name
 
+class ProductQuerySet(models.QuerySet):
+    """상품 쿼리셋"""
+
+    def with_primary_image(self):
+        """대표 이미지를 한 번의 추가 쿼리로 미리 가져온다 (Product.primary_image 에서 사용)"""
+        return self.prefetch_related(models.Prefetch(
+            'images',
+            queryset=ProductImage.objects.filter(is_primary=True),
+            to_attr='prefetched_primary_images'
+        ))
+
+
 class Product(models.Model):
     """상품 모델"""
     STATUS_CHOICES = [
@@ -208,6 +233,8 @@ class Product(models.Model):
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, 
                                   related_name='created_products', verbose_name='생성자')
 
+    objects = ProductQuerySet.as_manager()
+
     class Meta:
         verbose_name = '상품'
         verbose_name_plural = '상품'
@@ -233,9 +260,17 @@ class Product(models.Model):
 
     @property
     def primary_image(self):
-        """대표 이미지 반환"""
+        """대표 이미지 반환 (with_primary_image() 로 가져온 경우 추가 쿼리 없음)"""
+        if hasattr(self, 'prefetched_primary_images'):
+            return self.prefetched_primary_images[0] if self.prefetched_primary_images else None
         return self.images.filter(is_primary=True).first()
 
+    @property
+    def primary_image_url(self):
+        """대표 이미지 URL (없으면 None)"""
+        primary_image = self.primary_image
+        return primary_image.image.url if primary_image else None
+
     @property
     def all_images(self):
         """모든 이미지 반환"""
@@ -275,6 +310,11 @@ class Product(models.Model):
         """실제 판매가 (할인가가 있으면 할인가, 없으면 판매가)"""
         return self.discount_price if self.discount_price else self.selling_price
 
+    @property
+    def final_price(self):
+        """최종 판매가 (effective_price 와 동일, API 호환용)"""
+        return self.effective_price
+
     @property
     def discount_percentage(self):
         """할인율 계산"""
@@ -319,6 +359,39 @@ class Product(models.Model):
             return True
         return False
 
+class Tag(models.Model):
+    """상품 태그 (Product.tags 를 정규화한 색인, products.tags 참고)"""
+    name = models.CharField('태그명', max_length=100)
+    normalized_name = models.CharField('정규화 태그명', max_length=100, unique=True)
+    product_count = models.PositiveIntegerField('활성 상품 수', default=0, db_index=True)
+    created_at = models.DateTimeField('생성일', auto_now_add=True)
+
+    class Meta:
+        verbose_name = '태그'
+        verbose_name_plural = '태그'
+        ordering = ['-product_count', 'name']
+        indexes = [
+            # 접두어 검색 (LIKE 'abc%') 용
+            models.Index(fields=['normalized_name'], name='products_tag_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class ProductTag(models.Model):
+    """상품-태그 연결"""
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='tag_links', verbose_name='상품')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='product_links', verbose_name='태그')
+
+    class Meta:
+        verbose_name = '상품 태그'
+        verbose_name_plural = '상품 태그'
+        unique_together = ['product', 'tag']
+
+    def __str__(self):
+        return f"{self.product_id} - {self.tag_id}"
+
 class ProductImage(models.Model):
     """상품 이미지 모델"""
     
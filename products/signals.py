@@ -1,8 +1,9 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Product, ProductPriceHistory
-from notifications.utils import send_stock_alert
+from .models import Product, Category, ProductPriceHistory
+from .category_tree import invalidate_category_tree
+from .tags import sync_product_tags, refresh_tag_counts
 
 User = get_user_model()
 
@@ -46,25 +47,22 @@ def update_stock_movements(sender, instance, created, **kwargs):
         except ImportError:
             pass
 
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_tree_cache(sender, **kwargs):
+    """카테고리 변경 시 카테고리 트리 캐시 무효화"""
+    invalidate_category_tree()
+
 @receiver(post_save, sender=Product)
-def stock_low_notification(sender, instance, **kwargs):
-    """재고 부족 시 알림 발송"""
-    # low_stock_threshold 필드가 있는 경우에만 체크
-    if hasattr(instance, 'low_stock_threshold') and hasattr(instance, 'stock_quantity'):
-        if instance.stock_quantity <= getattr(instance, 'low_stock_threshold', 10):
-            # 재고 관리자들에게 알림 발송
-            try:
-                from django.contrib.auth.models import Group
-                User = get_user_model()
-                stock_managers = User.objects.filter(
-                    groups__name='Stock Managers'
-                )
-                
-                if not stock_managers.exists():
-                    # 그룹이 없으면 관리자들에게 발송
-                    stock_managers = User.objects.filter(is_staff=True)
-                
-                for manager in stock_managers:
-                    send_stock_alert(manager, instance, instance.stock_quantity)
-            except Exception as e:
-                print(f"재고 알림 발송 오류: {e}")
\ No newline at end of file
+def update_product_tag_index(sender, instance, **kwargs):
+    """상품 저장 시 태그 색인 갱신"""
+    sync_product_tags([instance])
+
+@receiver(pre_delete, sender=Product)
+def remember_product_tags(sender, instance, **kwargs):
+    """삭제될 상품의 태그 기억 (연결은 CASCADE 로 함께 삭제된다)"""
+    instance._tag_ids = list(instance.tag_links.values_list('tag_id', flat=True))
+
+@receiver(post_delete, sender=Product)
+def update_deleted_product_tag_counts(sender, instance, **kwargs):
+    """상품 삭제 후 태그 사용 수 재계산"""
+    refresh_tag_counts(getattr(instance, '_tag_ids', []))
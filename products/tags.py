@@ -0,0 +1,139 @@
+# products/tags.py
+"""
+상품 태그 색인
+
+쉼표로 구분된 Product.tags 문자열을 Tag/ProductTag 테이블로 정규화한다.
+Tag.product_count 에는 해당 태그를 가진 활성 상품 수가 미리 계산되어
+있으므로, 태그 목록과 자동완성은 상품 테이블을 읽지 않고 태그 테이블만
+조회한다.
+
+색인은 상품 저장/삭제 시그널에서 갱신되며, rebuild_tag_index 명령으로
+재구축할 수 있다. 태그는 대소문자를 구분하지 않고 같은 태그로 취급한다.
+"""
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Product, ProductTag, Tag
+
+TAG_BATCH_SIZE = 500
+TAG_MAX_LENGTH = 100
+
+
+def parse_tags(text):
+    """태그 문자열을 {정규화 태그명: 태그명} 으로 분해 (입력 순서 유지)"""
+    tags = {}
+    for tag in (text or '').split(','):
+        tag = tag.strip()[:TAG_MAX_LENGTH]
+        if tag:
+            tags.setdefault(tag.lower(), tag)
+    return tags
+
+
+def refresh_tag_counts(tag_ids=None):
+    """태그별 활성 상품 수 재계산 (tag_ids 가 None 이면 전체)"""
+    active_counts = ProductTag.objects.filter(
+        tag=OuterRef('pk'), product__status='ACTIVE'
+    ).order_by().values('tag').annotate(count=Count('pk')).values('count')
+
+    tags = Tag.objects.all()
+    if tag_ids is not None:
+        tag_ids = list(tag_ids)
+        if not tag_ids:
+            return 0
+        tags = tags.filter(pk__in=tag_ids)
+    return tags.update(product_count=Coalesce(Subquery(active_counts, output_field=IntegerField()), 0))
+
+
+def refresh_product_tag_counts(products):
+    """상품 상태가 일괄 변경된 경우 해당 상품들의 태그 수 재계산"""
+    tag_ids = ProductTag.objects.filter(product__in=products).values_list('tag_id', flat=True).distinct()
+    return refresh_tag_counts(set(tag_ids))
+
+
+def _get_or_create_tags(names):
+    """{정규화 태그명: 태그명} 에 해당하는 Tag 를 조회하고 없는 것은 생성"""
+    if not names:
+        return {}
+    tags = Tag.objects.in_bulk(list(names), field_name='normalized_name')
+    missing = [Tag(name=name, normalized_name=key) for key, name in names.items() if key not in tags]
+    if missing:
+        Tag.objects.bulk_create(missing, ignore_conflicts=True)
+        tags = Tag.objects.in_bulk(list(names), field_name='normalized_name')
+    return tags
+
+
+@transaction.atomic
+def sync_product_tags(products):
+    """
+    상품들의 Product.tags 를 태그 색인에 반영
+
+    연결을 추가/삭제하고, 변경 전후 태그의 활성 상품 수를 다시 계산한다
+    (상품 상태 변경도 반영되도록 연결 변경이 없어도 재계산한다).
+    """
+    products = [product for product in products if product.pk]
+    if not products:
+        return
+
+    wanted = {product.pk: parse_tags(product.tags) for product in products}
+    all_names = {}
+    for names in wanted.values():
+        for key, name in names.items():
+            all_names.setdefault(key, name)
+    tags = _get_or_create_tags(all_names)
+
+    existing = {}
+    for link in ProductTag.objects.filter(product__in=products).select_related('tag').only('id', 'product_id', 'tag__id', 'tag__normalized_name'):
+        existing.setdefault(link.product_id, {})[link.tag.normalized_name] = link
+
+    to_create = []
+    to_delete = []
+    affected = set()
+    for product in products:
+        current = existing.get(product.pk, {})
+        names = wanted[product.pk]
+        for key in names:
+            affected.add(tags[key].pk)
+            if key not in current:
+                to_create.append(ProductTag(product_id=product.pk, tag_id=tags[key].pk))
+        for key, link in current.items():
+            affected.add(link.tag_id)
+            if key not in names:
+                to_delete.append(link.pk)
+
+    if to_delete:
+        ProductTag.objects.filter(pk__in=to_delete).delete()
+    ProductTag.objects.bulk_create(to_create, batch_size=TAG_BATCH_SIZE, ignore_conflicts=True)
+    refresh_tag_counts(affected)
+
+
+def rebuild_tag_index():
+    """모든 상품의 태그 색인 재구축, 반환값: 태그 수"""
+    batch = []
+    for product in Product.objects.only('id', 'tags').order_by('pk').iterator(chunk_size=TAG_BATCH_SIZE):
+        batch.append(product)
+        if len(batch) >= TAG_BATCH_SIZE:
+            sync_product_tags(batch)
+            batch = []
+    sync_product_tags(batch)
+
+    # 어떤 상품에도 연결되지 않은 태그 정리
+    Tag.objects.filter(product_links__isnull=True).delete()
+    refresh_tag_counts()
+    return Tag.objects.count()
+
+
+def search_tags(query, limit=10):
+    """접두어로 태그 검색 (사용 빈도순)"""
+    return Tag.objects.filter(
+        normalized_name__startswith=query.strip().lower(),
+        product_count__gt=0
+    ).order_by('-product_count', 'name')[:limit]
+
+
+def tag_counts(search=None):
+    """활성 상품에서 사용 중인 태그 목록 (사용 빈도순)"""
+    tags = Tag.objects.filter(product_count__gt=0)
+    if search:
+        tags = tags.filter(Q(normalized_name__contains=search.lower()) | Q(name__icontains=search))
+    return tags.order_by('-product_count', 'name')
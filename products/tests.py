@@ -1,3 +1,60 @@
-from django.test import TestCase
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from .category_tree import _tree, get_category_tree
+from .models import Category, Product
+from .views import search_products_ajax
+
+
+class CategoryTreeCacheTest(TestCase):
+
+    def setUp(self):
+        _tree.clear_local()
+        self.parent = Category.objects.create(name='의류', code='CLOTH')
+
+    def test_version_token_checked_once_per_interval(self):
+        get_category_tree()
+        with mock.patch.object(cache, 'get', wraps=cache.get) as cache_get:
+            with self.assertNumQueries(0):
+                for _ in range(10):
+                    get_category_tree()
+        cache_get.assert_not_called()
+
+    def test_local_change_is_visible_immediately(self):
+        self.assertEqual(get_category_tree().child_ids(self.parent.pk), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            child = Category.objects.create(name='상의', code='TOP', parent=self.parent)
+
+        self.assertEqual(get_category_tree().child_ids(self.parent.pk), [child.pk])
+        self.assertEqual(child.full_path, '의류 > 상의')
+
+    def test_other_process_change_is_seen_after_interval(self):
+        get_category_tree()
+        # 다른 프로세스의 변경: 버전 토큰만 바뀐다
+        Category.objects.filter(pk=self.parent.pk).update(name='패션')
+        cache.set('category_tree_version', 'other')
+
+        self.assertEqual(get_category_tree().path(self.parent.pk), '의류')
+        with mock.patch('core.config_cache.time.monotonic', return_value=_tree._checked_at + 60):
+            self.assertEqual(get_category_tree().path(self.parent.pk), '패션')
+
+
+class ProductAjaxSearchTest(TestCase):
+
+    def test_search_uses_index(self):
+        Product.objects.create(sku='AJAX-1', name='겨울 패딩 점퍼', cost_price=500, selling_price=1000, status='ACTIVE')
+        Product.objects.create(sku='AJAX-2', name='여름 반팔 티셔츠', cost_price=500, selling_price=1000, status='ACTIVE')
+        request = RequestFactory().get('/products/search/', {'q': '패딩'})
+        request.user = get_user_model().objects.create_user(username='staff', password='pass')
+
+        response = search_products_ajax(request)
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual([item['sku'] for item in data['results']], ['AJAX-1'])
+        self.assertEqual(data['pagination']['total_count'], 1)
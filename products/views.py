@@ -22,6 +22,10 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 
 from .models import Product, Category, Brand, ProductImage
 from .forms import ProductForm, BrandForm, CategoryForm
+from .category_tree import get_category_tree as get_cached_category_tree, invalidate_category_tree
+from .tags import refresh_product_tag_counts, search_tags, tag_counts
+from core.exports import format_datetime, iter_values, streaming_csv_response
+from search.backends import search_products
 
 logger = logging.getLogger(__name__)
 
@@ -267,14 +271,14 @@ def brand_bulk_action(request):
         brands = Brand.objects.filter(id__in=brand_ids)
         
         if action == 'activate':
-            updated_count = brands.update(is_active=True)
+            updated_count = brands.update(is_active=True, updated_at=timezone.now())
             return JsonResponse({
                 'success': True,
                 'message': f'{updated_count}개의 브랜드가 활성화되었습니다.'
             })
         
         elif action == 'deactivate':
-            updated_count = brands.update(is_active=False)
+            updated_count = brands.update(is_active=False, updated_at=timezone.now())
             return JsonResponse({
                 'success': True,
                 'message': f'{updated_count}개의 브랜드가 비활성화되었습니다.'
@@ -424,7 +428,7 @@ def category_detail(request, pk):
     children = category.get_children()
     
     # 카테고리의 상품들 (페이지네이션)
-    products = category.get_products().select_related('brand')
+    products = category.get_products().select_related('brand').with_primary_image()
     paginator = Paginator(products, 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
@@ -653,7 +657,8 @@ def category_bulk_action(request):
         
         if action == 'activate':
             # 일괄 활성화
-            updated = categories.update(is_active=True)
+            updated = categories.update(is_active=True, updated_at=timezone.now())
+            invalidate_category_tree()
             return JsonResponse({
                 'success': True,
                 'message': f'{updated}개 카테고리가 활성화되었습니다.'
@@ -661,7 +666,8 @@ def category_bulk_action(request):
         
         elif action == 'deactivate':
             # 일괄 비활성화
-            updated = categories.update(is_active=False)
+            updated = categories.update(is_active=False, updated_at=timezone.now())
+            invalidate_category_tree()
             return JsonResponse({
                 'success': True,
                 'message': f'{updated}개 카테고리가 비활성화되었습니다.'
@@ -842,7 +848,11 @@ def product_bulk_update(request):
         if not update_data:
             return JsonResponse({'success': False, 'error': '수정할 항목이 없습니다.'})
         
+        # update() 는 auto_now 를 채우지 않으므로 직접 갱신 (보고서 캐시 워터마크)
+        update_data['updated_at'] = timezone.now()
         count = Product.objects.filter(id__in=product_ids).update(**update_data)
+        if 'status' in update_data:
+            refresh_product_tag_counts(product_ids)
         
         return JsonResponse({
             'success': True,
@@ -986,7 +996,7 @@ def get_categories_api(request):
         'id': cat.id,
         'name': cat.name,
         'full_path': cat.full_path,
-        'parent_id': cat.parent.id if cat.parent else None
+        'parent_id': cat.parent_id
     } for cat in categories]
     
     return JsonResponse({'categories': data})
@@ -1010,14 +1020,11 @@ def get_brands_api(request):
 def export_products_csv(request):
     """상품 CSV 내보내기"""
     try:
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        response['Content-Disposition'] = f'attachment; filename="products_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-        response.write('\ufeff')  # UTF-8 BOM
-        
-        writer = csv.writer(response)
-        write_products_to_csv(writer, get_filtered_products(request))
-        
-        return response
+        return streaming_csv_response(
+            f'products_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv',
+            PRODUCT_CSV_HEADERS,
+            product_csv_rows(get_filtered_products(request))
+        )
         
     except Exception as e:
         messages.error(request, f'CSV 내보내기 중 오류: {str(e)}')
@@ -1105,7 +1112,11 @@ def unfeature_product(request, pk):
 
 def apply_product_filters(products, request):
     """상품 목록에 필터 적용"""
-    search = request.GET.get('search', '').strip()
+    return filter_products(products, request.GET)
+
+def filter_products(products, params):
+    """상품 쿼리셋에 필터 파라미터(request.GET 또는 dict) 적용"""
+    search = (params.get('search') or '').strip()
     if search:
         products = products.filter(
             Q(name__icontains=search) |
@@ -1114,15 +1125,15 @@ def apply_product_filters(products, request):
             Q(tags__icontains=search)
         )
     
-    category = request.GET.get('category')
+    category = params.get('category')
     if category:
         products = products.filter(category_id=category)
     
-    brand = request.GET.get('brand')
+    brand = params.get('brand')
     if brand:
         products = products.filter(brand_id=brand)
     
-    stock_status = request.GET.get('stock_status')
+    stock_status = params.get('stock_status')
     if stock_status == 'low':
         products = products.filter(stock_quantity__lte=F('min_stock_level'))
     elif stock_status == 'out':
@@ -1133,8 +1144,8 @@ def apply_product_filters(products, request):
             stock_quantity__lte=F('max_stock_level')
         )
     
-    min_price = request.GET.get('min_price')
-    max_price = request.GET.get('max_price')
+    min_price = params.get('min_price')
+    max_price = params.get('max_price')
     if min_price:
         products = products.filter(selling_price__gte=min_price)
     if max_price:
@@ -1623,43 +1634,50 @@ def get_filtered_products(request):
     products = Product.objects.select_related('brand', 'category').filter(status='ACTIVE')
     return apply_product_filters(products, request)
 
-def write_products_to_csv(writer, products):
-    """상품 데이터를 CSV로 작성"""
-    # 헤더
-    headers = [
-        'SKU', '상품명', '카테고리', '브랜드', '간단설명', '상세설명',
-        '상태', '추천상품', '원가', '판매가', '할인가', '재고수량',
-        '최소재고', '최대재고', '무게', '길이', '너비', '높이',
-        '바코드', '태그', '등록일'
-    ]
-    writer.writerow(headers)
-    
-    # 데이터
-    for product in products:
-        row = [
-            product.sku,
-            product.name,
-            product.category.name if product.category else '',
-            product.brand.name if product.brand else '',
-            product.short_description,
-            product.description,
-            product.get_status_display(),
-            '예' if product.is_featured else '아니오',
-            product.cost_price,
-            product.selling_price,
-            product.discount_price or '',
-            product.stock_quantity,
-            product.min_stock_level,
-            product.max_stock_level,
-            product.weight or '',
-            product.dimensions_length or '',
-            product.dimensions_width or '',
-            product.dimensions_height or '',
-            product.barcode,
-            product.tags,
-            product.created_at.strftime('%Y-%m-%d %H:%M:%S')
+PRODUCT_CSV_HEADERS = [
+    'SKU', '상품명', '카테고리', '브랜드', '간단설명', '상세설명',
+    '상태', '추천상품', '원가', '판매가', '할인가', '재고수량',
+    '최소재고', '최대재고', '무게', '길이', '너비', '높이',
+    '바코드', '태그', '등록일'
+]
+
+PRODUCT_CSV_FIELDS = [
+    'sku', 'name', 'category__name', 'brand__name', 'short_description', 'description',
+    'status', 'is_featured', 'cost_price', 'selling_price', 'discount_price', 'stock_quantity',
+    'min_stock_level', 'max_stock_level', 'weight', 'dimensions_length', 'dimensions_width', 'dimensions_height',
+    'barcode', 'tags', 'created_at'
+]
+
+def product_csv_rows(products):
+    """상품 데이터를 CSV 행으로 스트리밍 (모델 인스턴스를 만들지 않는다)"""
+    status_labels = dict(Product.STATUS_CHOICES)
+    for (sku, name, category_name, brand_name, short_description, description,
+         status, is_featured, cost_price, selling_price, discount_price, stock_quantity,
+         min_stock_level, max_stock_level, weight, length, width, height,
+         barcode, tags, created_at) in iter_values(products, PRODUCT_CSV_FIELDS):
+        yield [
+            sku,
+            name,
+            category_name or '',
+            brand_name or '',
+            short_description,
+            description,
+            status_labels.get(status, status),
+            '예' if is_featured else '아니오',
+            cost_price,
+            selling_price,
+            discount_price or '',
+            stock_quantity,
+            min_stock_level,
+            max_stock_level,
+            weight or '',
+            length or '',
+            width or '',
+            height or '',
+            barcode,
+            tags,
+            format_datetime(created_at)
         ]
-        writer.writerow(row)
 
 def write_import_template(writer):
     """가져오기 템플릿 작성"""
@@ -1831,7 +1849,7 @@ def product_quick_info(request, pk):
         'is_featured': product.is_featured,
         'stock_status': check_stock_level(product),
         'profit_margin': calculate_profit_margin(product.cost_price, product.selling_price),
-        'image_url': product.images.filter(is_primary=True).first().image.url if product.images.filter(is_primary=True).exists() else None
+        'image_url': product.primary_image_url
     }
     
     return JsonResponse(data)
@@ -1908,23 +1926,9 @@ def product_price_history(request, pk):
 @login_required
 def tag_list(request):
     """태그 목록"""
-    # 모든 상품의 태그를 수집하고 빈도순으로 정렬
-    all_tags = []
-    for product in Product.objects.filter(status='ACTIVE').exclude(tags=''):
-        tags = [tag.strip() for tag in product.tags.split(',') if tag.strip()]
-        all_tags.extend(tags)
-    
-    from collections import Counter
-    tag_counts = Counter(all_tags)
-    
-    # 검색 필터
+    # 태그 색인에서 사용 빈도순으로 조회
     search = request.GET.get('search', '').strip()
-    if search:
-        tag_counts = {tag: count for tag, count in tag_counts.items() 
-                     if search.lower() in tag.lower()}
-    
-    # 정렬 (사용 빈도순)
-    sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
+    sorted_tags = list(tag_counts(search).values_list('name', 'product_count'))
     
     return render(request, 'products/tag_list.html', {
         'tags': sorted_tags,
@@ -1940,17 +1944,8 @@ def tag_autocomplete(request):
     if len(query) < 2:
         return JsonResponse({'results': []})
     
-    # 기존 태그들에서 검색
-    all_tags = set()
-    for product in Product.objects.filter(status='ACTIVE').exclude(tags=''):
-        tags = [tag.strip() for tag in product.tags.split(',') if tag.strip()]
-        all_tags.update(tags)
-    
-    # 쿼리와 매치되는 태그 찾기
-    matching_tags = [tag for tag in all_tags if query.lower() in tag.lower()]
-    matching_tags.sort(key=lambda x: x.lower().startswith(query.lower()), reverse=True)
-    
-    results = [{'id': tag, 'text': tag} for tag in matching_tags[:10]]
+    # 태그 색인에서 접두어 검색 (사용 빈도순)
+    results = [{'id': tag.name, 'text': tag.name} for tag in search_tags(query, limit=10)]
     
     return JsonResponse({'results': results})
 
@@ -2034,16 +2029,18 @@ def product_bulk_action(request):
         products = Product.objects.filter(id__in=product_ids)
         
         if action == 'activate':
-            count = products.update(status='ACTIVE')
+            count = products.update(status='ACTIVE', updated_at=timezone.now())
+            refresh_product_tag_counts(products)
             message = f'{count}개 상품이 활성화되었습니다.'
         elif action == 'deactivate':
-            count = products.update(status='INACTIVE')
+            count = products.update(status='INACTIVE', updated_at=timezone.now())
+            refresh_product_tag_counts(products)
             message = f'{count}개 상품이 비활성화되었습니다.'
         elif action == 'feature':
-            count = products.update(is_featured=True)
+            count = products.update(is_featured=True, updated_at=timezone.now())
             message = f'{count}개 상품이 추천 상품으로 설정되었습니다.'
         elif action == 'unfeature':
-            count = products.update(is_featured=False)
+            count = products.update(is_featured=False, updated_at=timezone.now())
             message = f'{count}개 상품의 추천이 해제되었습니다.'
         elif action == 'delete':
             count = products.count()
@@ -2100,39 +2097,22 @@ def import_confirm(request):
         return JsonResponse({'success': False, 'error': '가져올 데이터가 없습니다.'})
     
     try:
-        with transaction.atomic():
-            success_count = 0
-            error_count = 0
-            errors = []
-            
-            for index, row in enumerate(import_data):
-                try:
-                    row_errors = validate_import_row(row, index + 1)
-                    if row_errors:
-                        error_count += 1
-                        errors.extend(row_errors)
-                        continue
-                    
-                    # 상품 생성 또는 업데이트
-                    create_product_from_import(row, request.user)
-                    success_count += 1
-                    
-                except Exception as e:
-                    error_count += 1
-                    errors.append(f'행 {index + 1}: {str(e)}')
-            
-            # 세션 데이터 정리
-            if 'import_data' in request.session:
-                del request.session['import_data']
-            
-            return JsonResponse({
-                'success': True,
-                'message': f'총 {success_count}개 상품이 성공적으로 가져왔습니다.',
-                'success_count': success_count,
-                'error_count': error_count,
-                'errors': errors[:10]  # 최대 10개 오류만 표시
-            })
-            
+        from .importer import ProductImportPipeline
+
+        result = ProductImportPipeline(user=request.user).run(import_data)
+
+        # 세션 데이터 정리
+        if 'import_data' in request.session:
+            del request.session['import_data']
+
+        return JsonResponse({
+            'success': True,
+            'message': f'총 {result["success_count"]}개 상품이 성공적으로 가져왔습니다.',
+            'success_count': result['success_count'],
+            'error_count': result['error_count'],
+            'errors': result['errors'][:10]  # 최대 10개 오류만 표시
+        })
+
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
@@ -2215,132 +2195,13 @@ def validate_import_row(row, row_number):
     
     return errors
 
-def create_product_from_import(row, user):
-    """가져오기 데이터로 상품 생성"""
-    # 카테고리 및 브랜드 찾기 또는 생성
-    category = None
-    if row.get('카테고리코드'):
-        category, _ = Category.objects.get_or_create(
-            code=row['카테고리코드'],
-            defaults={'name': row.get('카테고리명', row['카테고리코드'])}
-        )
-    
-    brand = None
-    if row.get('브랜드코드'):
-        brand, _ = Brand.objects.get_or_create(
-            code=row['브랜드코드'],
-            defaults={'name': row.get('브랜드명', row['브랜드코드'])}
-        )
-    
-    # 상품 생성
-    product_data = {
-        'sku': row['SKU'],
-        'name': row['상품명'],
-        'category': category,
-        'brand': brand,
-        'short_description': row.get('간단설명', ''),
-        'description': row.get('상세설명', ''),
-        'status': 'ACTIVE' if row.get('상태', 'ACTIVE') == 'ACTIVE' else 'INACTIVE',
-        'is_featured': row.get('추천상품', '아니오').lower() in ['예', 'yes', 'true', '1'],
-        'cost_price': float(row.get('원가', 0)),
-        'selling_price': float(row.get('판매가', 0)),
-        'discount_price': float(row.get('할인가', 0)) if row.get('할인가') else None,
-        'stock_quantity': int(row.get('재고수량', 0)),
-        'min_stock_level': int(row.get('최소재고', 0)),
-        'max_stock_level': int(row.get('최대재고', 1000)),
-        'weight': float(row.get('무게', 0)) if row.get('무게') else None,
-        'dimensions_length': float(row.get('길이', 0)) if row.get('길이') else None,
-        'dimensions_width': float(row.get('너비', 0)) if row.get('너비') else None,
-        'dimensions_height': float(row.get('높이', 0)) if row.get('높이') else None,
-        'barcode': row.get('바코드', ''),
-        'tags': row.get('태그', ''),
-        'created_by': user
-    }
-    
-    return Product.objects.create(**product_data)
-
 @login_required
 def export_products_excel(request):
-    """상품 Excel 내보내기"""
+    """상품 Excel 내보내기 (대용량이면 백그라운드 작업으로 생성)"""
     try:
-        import xlsxwriter
-        from io import BytesIO
-        from django.http import HttpResponse
-        
-        # 메모리에 Excel 파일 생성
-        output = BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-        worksheet = workbook.add_worksheet('상품목록')
-        
-        # 스타일 정의
-        header_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#4F81BD',
-            'font_color': 'white',
-            'border': 1
-        })
-        
-        cell_format = workbook.add_format({
-            'border': 1,
-            'text_wrap': True
-        })
-        
-        # 헤더 작성
-        headers = [
-            'SKU', '상품명', '카테고리', '브랜드', '간단설명', '상세설명',
-            '상태', '추천상품', '원가', '판매가', '할인가', '재고수량',
-            '최소재고', '최대재고', '무게', '길이', '너비', '높이',
-            '바코드', '태그', '등록일'
-        ]
-        
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header, header_format)
-        
-        # 상품 데이터 작성
-        products = get_filtered_products(request)
-        for row, product in enumerate(products, 1):
-            data = [
-                product.sku,
-                product.name,
-                product.category.name if product.category else '',
-                product.brand.name if product.brand else '',
-                product.short_description,
-                product.description,
-                product.get_status_display(),
-                '예' if product.is_featured else '아니오',
-                product.cost_price,
-                product.selling_price,
-                product.discount_price or '',
-                product.stock_quantity,
-                product.min_stock_level,
-                product.max_stock_level,
-                product.weight or '',
-                product.dimensions_length or '',
-                product.dimensions_width or '',
-                product.dimensions_height or '',
-                product.barcode,
-                product.tags,
-                product.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ]
-            
-            for col, value in enumerate(data):
-                worksheet.write(row, col, value, cell_format)
-        
-        # 컬럼 너비 자동 조정
-        for col, header in enumerate(headers):
-            worksheet.set_column(col, col, len(header) + 5)
+        from reports.excel_exports import ProductExcelExport, export_excel
         
-        workbook.close()
-        output.seek(0)
-        
-        # HTTP 응답 생성
-        response = HttpResponse(
-            output.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="products_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-        
-        return response
+        return export_excel(request, ProductExcelExport(request.GET.dict()))
         
     except ImportError:
         # xlsxwriter가 없는 경우 CSV로 대체
@@ -2390,16 +2251,6 @@ def get_products_by_brand(brand_id):
         status='ACTIVE'
     ).select_related('category')
 
-def search_products(query):
-    """상품 검색"""
-    return Product.objects.filter(
-        Q(name__icontains=query) |
-        Q(sku__icontains=query) |
-        Q(description__icontains=query) |
-        Q(tags__icontains=query),
-        status='ACTIVE'
-    ).select_related('category', 'brand')
-
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
@@ -2561,7 +2412,7 @@ def get_product_suggestions(request):
     products = Product.objects.filter(
         Q(name__icontains=query) | Q(sku__icontains=query),
         status='ACTIVE'
-    ).select_related('brand', 'category')[:limit]
+    ).select_related('brand', 'category').with_primary_image()[:limit]
     
     suggestions = []
     for product in products:
@@ -2573,7 +2424,7 @@ def get_product_suggestions(request):
             'category': product.category.name if product.category else '',
             'price': float(product.selling_price),
             'stock': product.stock_quantity,
-            'image_url': product.images.filter(is_primary=True).first().image.url if product.images.filter(is_primary=True).exists() else None,
+            'image_url': product.primary_image_url,
             'display_text': f"{product.name} ({product.sku})"
         })
     
@@ -2617,24 +2468,38 @@ def validate_sku_ajax(request):
 @login_required
 def get_category_tree(request):
     """카테고리 트리 구조 API"""
-    categories = Category.objects.filter(is_active=True).order_by('sort_order', 'name')
+    categories = {
+        category.id: category
+        for category in Category.objects.filter(is_active=True).order_by('sort_order', 'name')
+    }
+    tree = get_cached_category_tree()
+    
+    # 카테고리별 활성 상품 수 (한 번의 집계 쿼리)
+    product_counts = dict(
+        Product.objects.filter(status='ACTIVE', category_id__in=categories)
+        .values_list('category_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
     
-    def build_tree(parent_id=None):
+    def build_tree(category_ids):
         items = []
-        for category in categories.filter(parent_id=parent_id):
+        for category_id in category_ids:
+            category = categories.get(category_id)
+            if category is None:
+                continue
             item = {
                 'id': category.id,
                 'name': category.name,
                 'code': category.code,
-                'level': category.level,
-                'product_count': category.products.filter(status='ACTIVE').count(),
-                'children': build_tree(category.id)
+                'level': tree.depth(category.id),
+                'product_count': product_counts.get(category.id, 0),
+                'children': build_tree(tree.child_ids(category.id))
             }
             items.append(item)
         return items
     
-    tree = build_tree()
-    return JsonResponse({'tree': tree})
+    return JsonResponse({'tree': build_tree(tree.child_ids())})
 
 @login_required
 def product_quick_edit(request, pk):
@@ -2720,7 +2585,8 @@ def bulk_import_products(request):
         import tempfile
         import os
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
+        suffix = os.path.splitext(file.name)[1].lower() or '.csv'
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
             for chunk in file.chunks():
                 tmp_file.write(chunk)
             tmp_file_path = tmp_file.name
@@ -2749,51 +2615,40 @@ def bulk_import_products(request):
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
-def process_import_file(file_path, user):
-    """가져오기 파일 처리"""
-    import pandas as pd
-    
+def process_import_file(file_path, user, update_existing=False):
+    """
+    가져오기 파일 처리
+
+    파일을 청크 단위로 스트리밍하여 일괄 저장한다. 진행 상황은
+    InventoryTransaction(BULK_UPDATE)의 processed_items 로 확인할 수 있다.
+    """
+    import os
+    from inventory.models import InventoryTransaction
+    from .importer import ProductImportPipeline
+
+    inventory_transaction = InventoryTransaction.objects.create(
+        transaction_type='BULK_UPDATE',
+        description=f'상품 일괄 가져오기: {os.path.basename(file_path)}',
+        created_by=user
+    )
+
     try:
-        # 파일 읽기
-        if file_path.endswith('.xlsx'):
-            df = pd.read_excel(file_path)
-        else:
-            df = pd.read_csv(file_path)
-        
-        success_count = 0
-        error_count = 0
-        errors = []
-        
-        for index, row in df.iterrows():
-            try:
-                # 행 검증
-                row_dict = row.to_dict()
-                validation_errors = validate_import_row(row_dict, index + 1)
-                
-                if validation_errors:
-                    error_count += 1
-                    errors.extend(validation_errors)
-                    continue
-                
-                # 상품 생성
-                create_product_from_import(row_dict, user)
-                success_count += 1
-                
-            except Exception as e:
-                error_count += 1
-                errors.append(f'행 {index + 1}: {str(e)}')
-        
-        return {
-            'success_count': success_count,
-            'error_count': error_count,
-            'errors': errors[:20]  # 최대 20개 오류만 반환
-        }
-        
+        pipeline = ProductImportPipeline(
+            user=user,
+            update_existing=update_existing,
+            inventory_transaction=inventory_transaction
+        )
+        result = pipeline.run_file(file_path)
+        result['transaction_id'] = inventory_transaction.id
+        return result
+
     except Exception as e:
+        logger.error(f'상품 가져오기 파일 처리 실패: {e}', exc_info=True)
         return {
             'success_count': 0,
             'error_count': 1,
-            'errors': [str(e)]
+            'errors': [str(e)],
+            'transaction_id': inventory_transaction.id
         }
 
 # ====================== 고급 검색 및 필터링 ======================
@@ -2819,15 +2674,11 @@ def search_products_ajax(request):
     per_page = int(request.GET.get('per_page', 20))
     
     # 기본 쿼리셋
-    products = Product.objects.filter(status='ACTIVE').select_related('brand', 'category')
+    products = Product.objects.filter(status='ACTIVE').select_related('brand', 'category').with_primary_image()
     
     # 검색어 필터
     if query:
-        products = products.filter(
-            Q(name__icontains=query) |
-            Q(sku__icontains=query) |
-            Q(description__icontains=query)
-        )
+        products = search_products(query, products)
     
     # 카테고리 필터
     if category_id:
@@ -2870,7 +2721,7 @@ def search_products_ajax(request):
             'stock_quantity': product.stock_quantity,
             'stock_status': check_stock_level(product),
             'is_featured': product.is_featured,
-            'image_url': product.images.filter(is_primary=True).first().image.url if product.images.filter(is_primary=True).exists() else None,
+            'image_url': product.primary_image_url,
             'detail_url': reverse('products:detail', kwargs={'pk': product.pk})
         })
     
@@ -0,0 +1,441 @@
+# reports/excel_exports.py
+"""
+대용량 Excel 내보내기
+
+워크북을 BytesIO 에 통째로 만들지 않고 xlsxwriter 의 constant_memory 모드로
+파일에 한 행씩 기록한다. 행은 values_list().iterator() 로 읽으므로 모델
+인스턴스도 만들지 않는다.
+
+내보낼 행 수가 REPORT_SETTINGS['EXCEL_ASYNC_ROW_THRESHOLD'] 를 넘으면 요청
+스레드에서 파일을 만들지 않고 GeneratedReport(PENDING) 를 만든 뒤 Celery
+작업(generate_excel_export)에 넘긴다. 진행 상황은 api_report_status 로
+확인하고, 완료되면 download_report 로 내려받는다.
+
+내보내기 종류는 ExcelExport 하위 클래스로 정의해 EXCEL_EXPORTS 에 등록한다.
+필터 파라미터는 작업 인자로 넘길 수 있도록 JSON 으로 직렬화 가능한 dict 로
+다룬다.
+"""
+import logging
+import os
+import tempfile
+import time
+from datetime import timedelta
+
+import xlsxwriter
+from django.conf import settings
+from django.contrib import messages
+from django.db import transaction
+from django.db.models import Avg, Q, Sum
+from django.http import FileResponse, JsonResponse
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils import timezone
+
+from core.exports import format_datetime, iter_values
+
+from .models import GeneratedReport
+
+logger = logging.getLogger(__name__)
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+PROGRESS_ROWS = 5000  # 진행률을 기록하는 행 간격
+
+DEFAULT_ASYNC_ROW_THRESHOLD = 20000
+DEFAULT_RETENTION_DAYS = 7
+
+# 열 형식 (ExcelExport.columns 의 세 번째 값)
+CELL_FORMATS = {
+    'text': {'border': 1},
+    'center': {'border': 1, 'align': 'center'},
+    'wrap': {'border': 1, 'text_wrap': True},
+    'number': {'border': 1, 'num_format': '#,##0'},
+    'currency': {'border': 1, 'num_format': '#,##0"원"'},
+    'date': {'border': 1, 'num_format': 'yyyy-mm-dd'},
+}
+
+
+def get_report_setting(name, default):
+    return getattr(settings, 'REPORT_SETTINGS', {}).get(name, default)
+
+
+class ExcelExport:
+    """Excel 내보내기 정의 (하위 클래스에서 쿼리셋과 행을 정의)"""
+
+    name = None
+    title = ''
+    sheet_name = 'Sheet1'
+    header_color = '#4F46E5'
+    columns = []  # (헤더, 열 너비, 형식)
+
+    def __init__(self, params=None):
+        self.params = params or {}
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def iter_rows(self, queryset):
+        """쿼리셋을 Excel 행(값 목록)으로 변환하는 제너레이터"""
+        raise NotImplementedError
+
+    def get_filename(self):
+        return f'{self.name}_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+
+    def count(self):
+        return self.get_queryset().count()
+
+    def write_summary(self, worksheet, row, formats, queryset, row_count):
+        """데이터 아래 요약 행 작성 (선택)"""
+
+    def write(self, output, progress=None):
+        """
+        output(파일 경로 또는 파일 객체)에 워크북 작성, 반환값: 데이터 행 수
+
+        constant_memory 모드에서는 이미 기록한 행으로 돌아갈 수 없으므로
+        모든 셀을 행 순서대로 기록한다.
+        """
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+        try:
+            formats = {kind: workbook.add_format(spec) for kind, spec in CELL_FORMATS.items()}
+            formats['header'] = workbook.add_format({
+                'bold': True,
+                'bg_color': self.header_color,
+                'font_color': 'white',
+                'align': 'center',
+                'valign': 'vcenter',
+                'border': 1
+            })
+            worksheet = workbook.add_worksheet(self.sheet_name)
+
+            for col, (header, width, kind) in enumerate(self.columns):
+                worksheet.set_column(col, col, width)
+                worksheet.write(0, col, header, formats['header'])
+            cell_formats = [formats[kind] for _, _, kind in self.columns]
+
+            queryset = self.get_queryset()
+            row_count = 0
+            for row_count, values in enumerate(self.iter_rows(queryset), 1):
+                for col, value in enumerate(values):
+                    worksheet.write(row_count, col, value, cell_formats[col])
+                if progress and row_count % PROGRESS_ROWS == 0:
+                    progress(row_count)
+
+            self.write_summary(worksheet, row_count + 2, formats, queryset, row_count)
+        finally:
+            workbook.close()
+        return row_count
+
+
+class ProductExcelExport(ExcelExport):
+    """상품 목록 (products:export_excel)"""
+
+    name = 'products'
+    title = '상품 목록'
+    sheet_name = '상품목록'
+    header_color = '#4F81BD'
+
+    def __init__(self, params=None):
+        from products.views import PRODUCT_CSV_HEADERS
+
+        super().__init__(params)
+        self.columns = [(header, len(header) + 5, 'wrap') for header in PRODUCT_CSV_HEADERS]
+
+    def get_queryset(self):
+        from products.models import Product
+        from products.views import filter_products
+
+        return filter_products(Product.objects.filter(status='ACTIVE'), self.params)
+
+    def iter_rows(self, queryset):
+        from products.views import product_csv_rows
+
+        return product_csv_rows(queryset)
+
+    def get_filename(self):
+        return f'products_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+
+
+class InventoryExcelExport(ExcelExport):
+    """재고 보고서 (reports:export inventory)"""
+
+    name = 'inventory'
+    title = '재고 보고서'
+    sheet_name = '재고 보고서'
+    columns = [
+        ('SKU', 15, 'center'),
+        ('상품명', 30, 'center'),
+        ('카테고리', 15, 'center'),
+        ('브랜드', 15, 'center'),
+        ('현재재고', 10, 'number'),
+        ('최소재고', 10, 'number'),
+        ('판매가격', 12, 'currency'),
+        ('재고가치', 15, 'currency'),
+        ('상태', 10, 'center'),
+    ]
+    fields = ['sku', 'name', 'category__name', 'brand__name', 'stock_quantity', 'min_stock_level', 'selling_price']
+
+    def get_queryset(self):
+        from products.models import Product
+
+        return Product.objects.filter(status='ACTIVE')
+
+    def iter_rows(self, queryset):
+        for (sku, name, category_name, brand_name, stock_quantity,
+             min_stock_level, selling_price) in iter_values(queryset, self.fields):
+            yield [
+                sku,
+                name,
+                category_name or '',
+                brand_name or '',
+                stock_quantity,
+                min_stock_level,
+                selling_price,
+                stock_quantity * selling_price,
+                '재고부족' if stock_quantity <= min_stock_level else '정상'
+            ]
+
+    def get_filename(self):
+        return f'재고보고서_{timezone.now().strftime("%Y%m%d")}.xlsx'
+
+
+class InventoryStatusExcelExport(ExcelExport):
+    """고급 재고 리포트 (reports:export_inventory), 파라미터: category_id, search"""
+
+    name = 'inventory_status'
+    title = '재고 현황'
+    sheet_name = '재고현황'
+    columns = [
+        ('SKU', 15, 'center'),
+        ('상품명', 30, 'center'),
+        ('카테고리', 15, 'center'),
+        ('현재고', 12, 'number'),
+        ('안전재고', 12, 'number'),
+        ('원가', 12, 'currency'),
+        ('판매가', 12, 'currency'),
+        ('재고가치', 12, 'currency'),
+        ('재고상태', 10, 'center'),
+        ('최종수정일', 18, 'center'),
+    ]
+    fields = ['sku', 'name', 'category__name', 'stock_quantity', 'min_stock_level', 'cost_price', 'selling_price', 'updated_at']
+
+    def get_queryset(self):
+        from products.models import Product
+
+        products = Product.objects.filter(status='ACTIVE')
+        if self.params.get('category_id'):
+            products = products.filter(category_id=self.params['category_id'])
+        if self.params.get('search'):
+            search_query = self.params['search']
+            products = products.filter(
+                Q(name__icontains=search_query) |
+                Q(sku__icontains=search_query)
+            )
+        return products
+
+    def iter_rows(self, queryset):
+        for (sku, name, category_name, stock_quantity, min_stock_level,
+             cost_price, selling_price, updated_at) in iter_values(queryset, self.fields):
+            if stock_quantity == 0:
+                status = '품절'
+            elif stock_quantity <= min_stock_level:
+                status = '부족'
+            else:
+                status = '정상'
+            cost_price = cost_price or selling_price or 0
+            yield [
+                sku,
+                name,
+                category_name or '미분류',
+                stock_quantity,
+                min_stock_level,
+                float(cost_price),
+                float(selling_price or 0),
+                float(stock_quantity * cost_price),
+                status,
+                format_datetime(updated_at, '%Y-%m-%d %H:%M')
+            ]
+
+    def get_filename(self):
+        return f'inventory_report_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+
+
+class SalesExcelExport(ExcelExport):
+    """매출 보고서 (reports:export sales), 파라미터: period (일)"""
+
+    name = 'sales'
+    title = '매출 보고서'
+    sheet_name = '매출 보고서'
+    header_color = '#059669'
+    columns = [
+        ('주문번호', 20, 'text'),
+        ('주문일', 12, 'date'),
+        ('플랫폼', 15, 'text'),
+        ('주문금액', 15, 'currency'),
+        ('상태', 12, 'text'),
+        ('고객정보', 25, 'text'),
+    ]
+    fields = ['order_number', 'order_date', 'platform__name', 'total_amount', 'status', 'customer_email']
+
+    @property
+    def period(self):
+        end_date = timezone.now().date()
+        start_date = end_date - timedelta(days=int(self.params.get('period') or 30))
+        return start_date, end_date
+
+    def get_queryset(self):
+        from orders.models import Order
+
+        start_date, end_date = self.period
+        return Order.objects.filter(
+            order_date__date__gte=start_date,
+            order_date__date__lte=end_date,
+            status__in=['PROCESSING', 'SHIPPED', 'DELIVERED', 'COMPLETED']
+        )
+
+    def iter_rows(self, queryset):
+        from orders.models import Order
+
+        status_labels = dict(Order.STATUS_CHOICES)
+        for (order_number, order_date, platform_name, total_amount,
+             status, customer_email) in iter_values(queryset, self.fields):
+            yield [
+                order_number,
+                timezone.localtime(order_date).date(),
+                platform_name or '',
+                total_amount,
+                status_labels.get(status, status),
+                customer_email
+            ]
+
+    def write_summary(self, worksheet, row, formats, queryset, row_count):
+        totals = queryset.aggregate(total_revenue=Sum('total_amount'), avg_order=Avg('total_amount'))
+        worksheet.write(row, 0, '총 주문 수:', formats['header'])
+        worksheet.write(row, 1, row_count, formats['text'])
+        worksheet.write(row + 1, 0, '총 매출:', formats['header'])
+        worksheet.write(row + 1, 1, totals['total_revenue'] or 0, formats['currency'])
+        worksheet.write(row + 2, 0, '평균 주문금액:', formats['header'])
+        worksheet.write(row + 2, 1, totals['avg_order'] or 0, formats['currency'])
+
+    def get_filename(self):
+        start_date, end_date = self.period
+        return f'매출보고서_{start_date}_{end_date}.xlsx'
+
+
+EXCEL_EXPORTS = {
+    export.name: export
+    for export in [ProductExcelExport, InventoryExcelExport, InventoryStatusExcelExport, SalesExcelExport]
+}
+
+
+def get_excel_export(name, params=None):
+    """이름으로 내보내기 정의 생성"""
+    try:
+        return EXCEL_EXPORTS[name](params)
+    except KeyError:
+        raise ValueError(f"지원하지 않는 Excel 내보내기: {name}")
+
+
+def excel_file_response(export):
+    """작은 내보내기: 익명 임시 파일에 작성해 바로 다운로드"""
+    output = tempfile.TemporaryFile(suffix='.xlsx')
+    try:
+        export.write(output)
+        output.seek(0)
+    except Exception:
+        output.close()
+        raise
+    return FileResponse(output, as_attachment=True, filename=export.get_filename(), content_type=XLSX_CONTENT_TYPE)
+
+
+def start_excel_export(export, user, row_count=None):
+    """대용량 내보내기: 보고서 레코드를 만들고 Celery 작업 예약 (트랜잭션 커밋 후)"""
+    from .tasks import generate_excel_export
+
+    now = timezone.now()
+    report = GeneratedReport.objects.create(
+        title=f"{export.title} - {now.strftime('%Y-%m-%d %H:%M')}",
+        period_start=now,
+        period_end=now,
+        status='PENDING',
+        format='EXCEL',
+        data={'export': export.name, 'params': export.params, 'filename': export.get_filename()},
+        summary={'progress': 0, 'processed_rows': 0, 'total_rows': row_count},
+        generated_by=user,
+        expires_at=now + timedelta(days=get_report_setting('RETENTION_DAYS', DEFAULT_RETENTION_DAYS))
+    )
+    report_id = str(report.report_id)
+    transaction.on_commit(lambda: generate_excel_export.delay(report_id))
+    return report
+
+
+def export_excel(request, export):
+    """
+    Excel 내보내기 응답
+
+    행 수가 임계값 이하이면 바로 파일을 내려주고, 넘으면 백그라운드 작업을
+    예약한 뒤 AJAX 요청에는 202 와 상태 확인 URL 을, 일반 요청에는 안내
+    메시지와 함께 이전 페이지로 리다이렉트한다.
+    """
+    row_count = export.count()
+    if row_count <= get_report_setting('EXCEL_ASYNC_ROW_THRESHOLD', DEFAULT_ASYNC_ROW_THRESHOLD):
+        return excel_file_response(export)
+
+    report = start_excel_export(export, request.user, row_count)
+    message = f'{row_count:,}건의 데이터를 Excel 파일로 준비하고 있습니다. 완료되면 생성된 보고서 목록에서 내려받을 수 있습니다.'
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest' or 'application/json' in request.headers.get('Accept', ''):
+        return JsonResponse({
+            'success': True,
+            'status': report.status,
+            'report_id': str(report.report_id),
+            'status_url': reverse('reports:api_report_status', args=[report.report_id]),
+            'message': message
+        }, status=202)
+
+    messages.info(request, message)
+    return redirect(request.META.get('HTTP_REFERER') or 'reports:generated_list')
+
+
+def run_excel_export(report_id):
+    """generate_excel_export 작업 본문: 파일 작성 후 보고서 레코드 갱신"""
+    report = GeneratedReport.objects.get(report_id=report_id)
+    if report.status not in ('PENDING', 'FAILED'):
+        return {'success': False, 'error': f'이미 처리된 보고서입니다: {report.status}'}
+
+    export = get_excel_export(report.data['export'], report.data.get('params'))
+    total_rows = report.summary.get('total_rows')
+
+    def progress(processed_rows):
+        summary = dict(report.summary, processed_rows=processed_rows)
+        if total_rows:
+            summary['progress'] = min(99, processed_rows * 100 // total_rows)
+        GeneratedReport.objects.filter(pk=report.pk).update(summary=summary)
+
+    report.status = 'GENERATING'
+    report.save(update_fields=['status'])
+    started = time.monotonic()
+
+    reports_dir = os.path.join(settings.MEDIA_ROOT, 'reports')
+    os.makedirs(reports_dir, exist_ok=True)
+    file_path = os.path.join(reports_dir, f"{report.report_id}_{report.data.get('filename') or export.get_filename()}")
+    partial_path = f'{file_path}.part'
+    try:
+        row_count = export.write(partial_path, progress=progress)
+        os.replace(partial_path, file_path)
+    except Exception as e:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        report.status = 'FAILED'
+        report.summary = dict(report.summary, error=str(e))
+        report.save(update_fields=['status', 'summary'])
+        logger.error(f"Excel 내보내기 실패: {report.title} - {str(e)}")
+        raise
+
+    report.status = 'COMPLETED'
+    report.file_path = file_path
+    report.file_size = os.path.getsize(file_path)
+    report.row_count = row_count
+    report.summary = dict(report.summary, progress=100, processed_rows=row_count)
+    report.generation_time = time.monotonic() - started
+    report.save(update_fields=['status', 'file_path', 'file_size', 'row_count', 'summary', 'generation_time'])
+    logger.info(f"Excel 내보내기 완료: {report.title} ({row_count}행)")
+    return {'success': True, 'report_id': str(report.report_id), 'row_count': row_count}
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generatedreport',
+            name='cache_key',
+            field=models.CharField(blank=True, max_length=64, verbose_name='캐시 키'),
+        ),
+        migrations.AddIndex(
+            model_name='generatedreport',
+            index=models.Index(fields=['cache_key', 'status'], name='reports_gen_cache_k_8294fd_idx'),
+        ),
+    ]
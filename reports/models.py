@@ -97,6 +97,9 @@ class GeneratedReport(models.Model):
     generation_time = models.FloatField(null=True, blank=True, verbose_name='생성 시간(초)')
     row_count = models.PositiveIntegerField(null=True, blank=True, verbose_name='데이터 행 수')
     
+    # 결과 캐시 키 (템플릿/필터/데이터 워터마크 해시, reports.report_cache 참고)
+    cache_key = models.CharField(max_length=64, blank=True, verbose_name='캐시 키')
+    
     class Meta:
         verbose_name = '생성된 보고서'
         verbose_name_plural = '생성된 보고서'
@@ -104,6 +107,7 @@ class GeneratedReport(models.Model):
         indexes = [
             models.Index(fields=['status', 'generated_at']),
             models.Index(fields=['template', 'period_start']),
+            models.Index(fields=['cache_key', 'status']),
         ]
     
     def __str__(self):
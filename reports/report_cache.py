@@ -0,0 +1,240 @@
+# reports/report_cache.py
+"""
+보고서 결과 캐시
+
+같은 템플릿과 필터의 보고서를 여러 사용자가 잇달아 요청해도 한 번만
+생성한다. GeneratedReport.cache_key 는 (템플릿, 정규화한 필터, 형식, 보고서
+기간, 데이터 워터마크)의 SHA-256 이다. 워터마크는 보고서가 읽는 테이블의
+(행 수, 최종 수정일시)이므로 데이터가 바뀌면 키도 바뀐다. QuerySet.update()
+는 auto_now 를 채우지 않으므로 대상 모델을 일괄 수정하는 코드는 updated_at 도
+함께 갱신해야 한다 (상품 일괄 수정/상태 변경, 카테고리/브랜드 활성화 등).
+
+- 만료되지 않은 완료 보고서가 있으면 다시 생성하지 않고 그 파일을 쓴다
+  (다른 사용자의 요청이면 같은 파일을 가리키는 레코드를 만든다).
+- 같은 키의 생성 작업이 진행 중이면 작업을 새로 예약하지 않고 대기
+  레코드만 만든다. 작업이 끝나면 같은 키의 대기 레코드도 함께 완료/실패
+  처리된다. 진행 중 여부는 공유 캐시의 cache.add 로 판단하므로 여러
+  프로세스에서 동시에 요청해도 작업은 하나만 예약된다.
+"""
+import hashlib
+import json
+import logging
+import os
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .excel_exports import DEFAULT_RETENTION_DAYS, get_report_setting
+from .models import GeneratedReport
+
+logger = logging.getLogger(__name__)
+
+REPORT_PERIOD_DAYS = 30
+INFLIGHT_KEY_PREFIX = 'report_inflight'
+INFLIGHT_TIMEOUT = 60 * 30  # 작업이 이 시간 안에 끝나지 않으면 새 작업을 허용
+
+ACTIVE_STATUSES = ['PENDING', 'GENERATING']
+
+# 보고서 유형별 워터마크 대상 모델 (app_label.ModelName)
+WATERMARK_MODELS = {
+    'INVENTORY': ['products.Product', 'products.Category', 'products.Brand'],
+    'SALES': ['orders.Order'],
+    'FINANCIAL': ['orders.Order', 'products.Product', 'products.Category', 'products.Brand'],
+}
+
+
+def report_period():
+    """보고서 기간 (최근 30일, 날짜 단위)"""
+    end_date = timezone.now().date()
+    return end_date - timedelta(days=REPORT_PERIOD_DAYS), end_date
+
+
+def normalize_filters(filters):
+    """
+    필터를 키 정렬된 문자열 dict 로 정규화
+
+    빈 값은 필터를 지정하지 않은 것과 같으므로 버리고, 숫자와 문자열
+    ('1' 과 1)은 같은 값으로 취급한다.
+    """
+    normalized = {}
+    for key, value in (filters or {}).items():
+        if value in (None, '', [], False):
+            continue
+        if isinstance(value, (list, tuple)):
+            value = sorted(str(item) for item in value)
+        else:
+            value = str(value)
+        normalized[str(key)] = value
+    return dict(sorted(normalized.items()))
+
+
+def data_watermark(report_type):
+    """보고서가 읽는 테이블의 [모델, 행 수, 최종 수정일시] 목록"""
+    from django.apps import apps
+
+    watermark = []
+    for label in WATERMARK_MODELS.get(report_type, []):
+        stats = apps.get_model(label).objects.aggregate(count=Count('pk'), last_modified=Max('updated_at'))
+        last_modified = stats['last_modified']
+        watermark.append([label, stats['count'], last_modified.isoformat() if last_modified else None])
+    return watermark
+
+
+def report_cache_key(template, filters=None, format_type='excel'):
+    """보고서 결과 캐시 키"""
+    start_date, end_date = report_period()
+    payload = {
+        'template': template.pk,
+        'template_updated_at': template.updated_at.isoformat() if template.updated_at else None,
+        'report_type': template.report_type,
+        'filters': normalize_filters(filters),
+        'format': format_type.upper(),
+        'period': [start_date.isoformat(), end_date.isoformat()],
+        'watermark': data_watermark(template.report_type),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _inflight_key(cache_key):
+    return f'{INFLIGHT_KEY_PREFIX}:{cache_key}'
+
+
+def find_cached_report(cache_key):
+    """파일이 남아 있는 만료 전 완료 보고서"""
+    reports = GeneratedReport.objects.filter(
+        cache_key=cache_key,
+        status='COMPLETED',
+        expires_at__gt=timezone.now()
+    ).exclude(file_path='').order_by('-generated_at')
+    for report in reports[:3]:
+        if os.path.exists(report.file_path):
+            return report
+    return None
+
+
+def _copy_for_user(source, user):
+    """완료 보고서를 다른 사용자 레코드로 복사 (파일은 공유)"""
+    if source.generated_by_id == user.pk:
+        return source
+    return GeneratedReport.objects.create(
+        template=source.template,
+        title=source.title,
+        period_start=source.period_start,
+        period_end=source.period_end,
+        status='COMPLETED',
+        format=source.format,
+        file_path=source.file_path,
+        file_size=source.file_size,
+        data=source.data,
+        summary=dict(source.summary or {}, reused_from=str(source.report_id)),
+        generated_by=user,
+        expires_at=source.expires_at,
+        generation_time=0,
+        row_count=source.row_count,
+        cache_key=source.cache_key
+    )
+
+
+def request_report(template, user, filters=None, format_type='excel', dispatch=True):
+    """
+    보고서 요청, 반환값: (보고서, 상태)
+
+    상태는 'cached'(완료된 보고서 재사용), 'queued'(새 생성 작업 예약),
+    'joined'(진행 중인 같은 작업에 합류) 중 하나다. dispatch 가 False 면
+    'queued' 여도 작업을 예약하지 않는다 (호출한 작업이 직접 생성한다).
+    """
+    cache_key = report_cache_key(template, filters, format_type)
+
+    cached = find_cached_report(cache_key)
+    if cached is not None:
+        return _copy_for_user(cached, user), 'cached'
+
+    now = timezone.now()
+    report = GeneratedReport.objects.create(
+        template=template,
+        title=f"{template.name} - {now.strftime('%Y-%m-%d %H:%M')}",
+        period_start=now - timedelta(days=REPORT_PERIOD_DAYS),
+        period_end=now,
+        status='PENDING',
+        format=format_type.upper(),
+        data={'filters': normalize_filters(filters)},
+        generated_by=user,
+        cache_key=cache_key
+    )
+
+    if not cache.add(_inflight_key(cache_key), str(report.report_id), INFLIGHT_TIMEOUT):
+        # 진행 중인 작업이 방금 끝났을 수 있으므로 한 번 더 확인
+        cached = find_cached_report(cache_key)
+        if cached is not None:
+            _complete_followers(cached, [report.pk])
+            report.refresh_from_db()
+            return report, 'cached'
+        return report, 'joined'
+
+    if dispatch:
+        transaction.on_commit(lambda: _dispatch(report, filters))
+    return report, 'queued'
+
+
+def _dispatch(report, filters):
+    from .tasks import generate_report_async
+
+    try:
+        generate_report_async.delay(
+            template_id=report.template_id,
+            user_id=report.generated_by_id,
+            filters=filters,
+            format_type=report.format.lower(),
+            report_id=str(report.report_id)
+        )
+    except Exception as e:
+        logger.error(f"보고서 생성 작업 예약 실패: {report.title} - {str(e)}")
+        fail_report(report, str(e))
+
+
+def _complete_followers(report, pks=None):
+    """같은 키로 대기 중인 레코드를 완료된 보고서로 채움"""
+    followers = GeneratedReport.objects.filter(cache_key=report.cache_key, status__in=ACTIVE_STATUSES)
+    if pks is not None:
+        followers = followers.filter(pk__in=pks)
+    return followers.exclude(pk=report.pk).update(
+        status='COMPLETED',
+        file_path=report.file_path,
+        file_size=report.file_size,
+        data=report.data,
+        summary={'reused_from': str(report.report_id)},
+        expires_at=report.expires_at,
+        generation_time=0,
+        row_count=report.row_count
+    )
+
+
+def complete_report(report):
+    """생성 완료 처리: 저장, 대기 레코드 완료, 진행 중 표시 해제"""
+    report.status = 'COMPLETED'
+    if report.expires_at is None:
+        report.expires_at = timezone.now() + timedelta(days=get_report_setting('RETENTION_DAYS', DEFAULT_RETENTION_DAYS))
+    with transaction.atomic():
+        report.save()
+        if report.cache_key:
+            _complete_followers(report)
+    if report.cache_key:
+        cache.delete(_inflight_key(report.cache_key))
+
+
+def fail_report(report, error=''):
+    """생성 실패 처리: 같은 키의 대기 레코드도 실패로 표시"""
+    report.status = 'FAILED'
+    report.summary = dict(report.summary or {}, error=error)
+    with transaction.atomic():
+        report.save(update_fields=['status', 'summary'])
+        if report.cache_key:
+            GeneratedReport.objects.filter(
+                cache_key=report.cache_key, status__in=ACTIVE_STATUSES
+            ).update(status='FAILED', summary={'error': error})
+    if report.cache_key:
+        cache.delete(_inflight_key(report.cache_key))
@@ -4,8 +4,10 @@ from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
+from django.core.serializers.json import DjangoJSONEncoder
 from datetime import timedelta
 import os
+import json
 import logging
 
 from .models import ReportSchedule, GeneratedReport
@@ -82,73 +84,76 @@ def cleanup_expired_reports():
     }
 
 @shared_task
-def generate_report_async(template_id, user_id, filters=None, format_type='excel'):
-    """비동기 보고서 생성"""
+def generate_report_async(template_id, user_id, filters=None, format_type='excel', report_id=None):
+    """
+    비동기 보고서 생성
+    
+    report_id 는 report_cache.request_report 가 만든 대기 레코드다. 지정하지
+    않으면 여기서 요청하며, 같은 보고서가 이미 있거나 생성 중이면 다시
+    만들지 않는다.
+    """
     try:
         from django.contrib.auth import get_user_model
         from .models import ReportTemplate
+        from .report_cache import complete_report, fail_report, report_period, request_report
         
         User = get_user_model()
         template = ReportTemplate.objects.get(id=template_id)
         user = User.objects.get(id=user_id)
         filters = filters or {}
         
-        # 보고서 생성 레코드 생성
-        report = GeneratedReport.objects.create(
-            template=template,
-            title=f"{template.name} - {timezone.now().strftime('%Y-%m-%d %H:%M')}",
-            period_start=timezone.now() - timedelta(days=30),
-            period_end=timezone.now(),
-            status='GENERATING',
-            format=format_type.upper(),
-            generated_by=user
-        )
+        # 보고서 생성 레코드
+        if report_id:
+            report = GeneratedReport.objects.get(report_id=report_id)
+        else:
+            report, state = request_report(template, user, filters, format_type, dispatch=False)
+            if state != 'queued':
+                logger.info(f"보고서 재사용 ({state}): {report.title}")
+                return {'success': True, 'report_id': str(report.report_id), 'state': state}
+        
+        if report.status not in ('PENDING', 'GENERATING'):
+            return {'success': report.status == 'COMPLETED', 'report_id': str(report.report_id), 'state': 'done'}
+        
+        report.status = 'GENERATING'
+        report.save(update_fields=['status'])
         
         try:
             # 보고서 데이터 생성
             generator = ReportGenerator(user=user)
+            start_date, end_date = report_period()
             
             if template.report_type == 'INVENTORY':
                 report_data = generator.generate_inventory_report(filters)
             elif template.report_type == 'SALES':
-                end_date = timezone.now().date()
-                start_date = end_date - timedelta(days=30)
                 report_data = generator.generate_sales_report(start_date, end_date, filters)
             elif template.report_type == 'FINANCIAL':
-                end_date = timezone.now().date()
-                start_date = end_date - timedelta(days=30)
                 report_data = generator.generate_financial_report(start_date, end_date)
             else:
                 raise ValueError(f"지원하지 않는 보고서 유형: {template.report_type}")
             
-            # 파일 생성
-            export_manager = ExportManager(report_data)
-            file_content, filename = export_manager.to_excel()
-            
-            # 파일 저장
+            # 파일 생성 (constant_memory 모드로 파일에 직접 작성)
             reports_dir = os.path.join(settings.MEDIA_ROOT, 'reports')
             os.makedirs(reports_dir, exist_ok=True)
             
+            export_manager = ExportManager(report_data)
+            filename = f"report_{export_manager.timestamp}.xlsx"
             file_path = os.path.join(reports_dir, f"{report.report_id}_{filename}")
-            with open(file_path, 'wb') as f:
-                f.write(file_content.getvalue())
+            export_manager.to_excel(filename, output=file_path)
             
-            # 보고서 정보 업데이트
-            report.status = 'COMPLETED'
+            # 보고서 정보 업데이트 (같은 보고서를 기다리는 요청도 함께 완료)
             report.file_path = file_path
             report.file_size = os.path.getsize(file_path)
-            report.data = report_data
+            report.data = json.loads(json.dumps(report_data, cls=DjangoJSONEncoder))
             report.row_count = len(report_data.get('products', []))
             report.generation_time = (timezone.now() - report.generated_at).total_seconds()
-            report.save()
+            complete_report(report)
             
             logger.info(f"보고서 생성 성공: {report.title}")
-            return {'success': True, 'report_id': str(report.report_id)}
+            return {'success': True, 'report_id': str(report.report_id), 'state': 'generated'}
             
         except Exception as e:
             # 오류 발생 시 상태 업데이트
-            report.status = 'FAILED'
-            report.save()
+            fail_report(report, str(e))
             logger.error(f"보고서 생성 실패: {report.title} - {str(e)}")
             raise
     
@@ -156,6 +161,17 @@ def generate_report_async(template_id, user_id, filters=None, format_type='excel
         logger.error(f"비동기 보고서 생성 오류: {str(e)}")
         return {'success': False, 'error': str(e)}
 
+@shared_task
+def generate_excel_export(report_id):
+    """대용량 Excel 내보내기 (reports.excel_exports 참고)"""
+    from .excel_exports import run_excel_export
+    
+    try:
+        return run_excel_export(report_id)
+    except Exception as e:
+        logger.error(f"Excel 내보내기 작업 오류: {report_id} - {str(e)}")
+        return {'success': False, 'error': str(e)}
+
 @shared_task
 def send_report_email(report_id, recipient_email, subject=None):
     """보고서 이메일 전송"""
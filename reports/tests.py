@@ -1,3 +1,229 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import openpyxl
+from django.core.cache import cache
+from django.http import FileResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User
+from core.exports import UTF8_BOM
+from products.models import Category, Product
+from products.views import category_bulk_action, product_bulk_action, product_bulk_update
+
+from .excel_exports import InventoryExcelExport, export_excel, run_excel_export
+from .models import GeneratedReport, ReportTemplate
+from .report_cache import report_cache_key, request_report
+from .views import api_report_status, download_report, export_report
+
+
+class RequestReportTest(TestCase):
+    """같은 템플릿/필터의 보고서는 한 번만 생성"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reporter', password='pass', user_type='STAFF')
+        self.other = User.objects.create_user(username='reporter2', password='pass', user_type='STAFF')
+        self.template = ReportTemplate.objects.create(name='재고 현황', report_type='INVENTORY')
+        self.category = Category.objects.create(name='의류', code='CLOTH')
+        self.product = Product.objects.create(
+            sku='REPORT-1', name='보고서 상품', category=self.category,
+            cost_price=500, selling_price=1000, status='ACTIVE'
+        )
+        # 일괄 수정 시각이 생성 시각과 확실히 다르도록 과거로 돌려 둔다
+        past = timezone.now() - timedelta(days=1)
+        Product.objects.filter(pk=self.product.pk).update(updated_at=past)
+        Category.objects.filter(pk=self.category.pk).update(updated_at=past)
+
+    def complete(self, report):
+        handle, path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        report.status = 'COMPLETED'
+        report.file_path = path
+        report.expires_at = timezone.now() + timedelta(days=1)
+        report.save()
+        cache.delete(f'report_inflight:{report.cache_key}')
+        return report
+
+    def post(self, view, data):
+        request = RequestFactory().post('/', data)
+        request.user = self.user
+        response = view(request)
+        self.assertTrue(json.loads(response.content)['success'])
+
+    def test_queued_then_joined_then_cached(self):
+        with mock.patch('reports.tasks.generate_report_async.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                first, first_status = request_report(self.template, self.user, {'category': 1})
+                second, second_status = request_report(self.template, self.other, {'category': '1'})
+
+        self.assertEqual(first_status, 'queued')
+        self.assertEqual(second_status, 'joined')
+        self.assertEqual(first.cache_key, second.cache_key)
+        self.assertEqual(second.status, 'PENDING')
+        delay.assert_called_once()
+        self.assertEqual(delay.call_args.kwargs['report_id'], str(first.report_id))
+
+        self.complete(first)
+        third, third_status = request_report(self.template, self.other, {'category': 1})
+
+        self.assertEqual(third_status, 'cached')
+        self.assertNotEqual(third.pk, first.pk)
+        self.assertEqual(third.generated_by, self.other)
+        self.assertEqual(third.file_path, first.file_path)
+        self.assertEqual(third.summary['reused_from'], str(first.report_id))
+
+    def test_missing_file_is_not_reused(self):
+        report, status = request_report(self.template, self.user, dispatch=False)
+        self.complete(report)
+        report.file_path += '.removed'
+        report.save(update_fields=['file_path'])
+
+        _, status = request_report(self.template, self.user, dispatch=False)
+
+        self.assertEqual(status, 'queued')
+
+    def test_key_depends_on_filters_and_format(self):
+        key = report_cache_key(self.template, {'category': 1, 'brand': ''})
+
+        self.assertEqual(key, report_cache_key(self.template, {'category': '1'}))
+        self.assertNotEqual(key, report_cache_key(self.template, {'category': 2}))
+        self.assertNotEqual(key, report_cache_key(self.template, {'category': 1}, 'pdf'))
+
+    def test_key_changes_on_product_bulk_action(self):
+        key = report_cache_key(self.template)
+
+        self.post(product_bulk_action, {'product_ids': [self.product.pk], 'action': 'feature'})
+
+        self.assertNotEqual(report_cache_key(self.template), key)
+
+    def test_key_changes_on_product_bulk_update(self):
+        key = report_cache_key(self.template)
+
+        self.post(product_bulk_update, {'product_ids': [self.product.pk], 'status': 'INACTIVE'})
+
+        self.assertNotEqual(report_cache_key(self.template), key)
+
+    def test_key_changes_on_category_bulk_action(self):
+        key = report_cache_key(self.template)
+
+        request = RequestFactory().post(
+            '/', json.dumps({'action': 'deactivate', 'category_ids': [self.category.pk]}),
+            content_type='application/json'
+        )
+        request.user = self.user
+        with self.captureOnCommitCallbacks(execute=True):
+            category_bulk_action(request)
+
+        self.assertNotEqual(report_cache_key(self.template), key)
+
+    def test_key_changes_on_category_rename(self):
+        key = report_cache_key(self.template)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = '패션'
+            self.category.save()
+
+        self.assertNotEqual(report_cache_key(self.template), key)
+
+
+class ExcelExportTest(TestCase):
+    """임계값 이하는 바로 내려받고, 넘으면 작업으로 생성한 뒤 상태 API 로 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='exporter', password='pass', user_type='STAFF')
+        for i in range(3):
+            Product.objects.create(
+                sku=f'XLSX-{i}', name=f'엑셀 상품 {i}', cost_price=500, selling_price=1000,
+                status='ACTIVE', stock_quantity=10 * i
+            )
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def request(self, path='/reports/export/', **headers):
+        request = RequestFactory().get(path, **headers)
+        request.user = self.user
+        return request
+
+    def read_rows(self, response):
+        self.assertIsInstance(response, FileResponse)
+        content = b''.join(response.streaming_content)
+        response.close()
+        workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True)
+        rows = list(workbook['재고 보고서'].iter_rows(values_only=True))
+        workbook.close()
+        return rows
+
+    @override_settings(REPORT_SETTINGS={'EXCEL_ASYNC_ROW_THRESHOLD': 3})
+    def test_small_export_is_returned_inline(self):
+        response = export_excel(self.request(), InventoryExcelExport())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment;', response['Content-Disposition'])
+        rows = self.read_rows(response)
+        self.assertEqual(rows[0][:2], ('SKU', '상품명'))
+        self.assertEqual(sorted(row[0] for row in rows[1:]), ['XLSX-0', 'XLSX-1', 'XLSX-2'])
+        self.assertFalse(GeneratedReport.objects.exists())
+
+    @override_settings(REPORT_SETTINGS={'EXCEL_ASYNC_ROW_THRESHOLD': 2})
+    @mock.patch('reports.tasks.generate_excel_export.delay')
+    def test_large_export_is_deferred(self, delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = export_excel(self.request(HTTP_X_REQUESTED_WITH='XMLHttpRequest'), InventoryExcelExport())
+
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.content)
+        report = GeneratedReport.objects.get(report_id=data['report_id'])
+        self.assertEqual(data['status'], 'PENDING')
+        self.assertEqual(data['status_url'], reverse('reports:api_report_status', args=[report.report_id]))
+        self.assertEqual(report.summary['total_rows'], 3)
+        delay.assert_called_once_with(str(report.report_id))
+
+        # 작업 실행 후 상태 API 는 완료와 다운로드 URL 을 돌려준다
+        result = run_excel_export(str(report.report_id))
+        self.assertEqual((result['success'], result['row_count']), (True, 3))
+
+        status = json.loads(api_report_status(self.request(), report.report_id).content)
+        self.assertEqual((status['status'], status['progress']), ('COMPLETED', 100))
+        self.assertEqual(status['download_url'], f'/reports/download/{report.report_id}/')
+
+        response = download_report(self.request(status['download_url']), report.report_id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.read_rows(response)), 4)
+
+
+class InventoryCsvExportTest(TestCase):
+
+    def test_export_body(self):
+        Product.objects.create(
+            sku='INV-CSV-1', name='재고 부족 상품', cost_price=500, selling_price=1000,
+            stock_quantity=3, min_stock_level=5, status='ACTIVE'
+        )
+        request = RequestFactory().get('/reports/export/inventory/', {'format': 'csv'})
+        request.user = User.objects.create_user(username='staff', password='pass')
+
+        response = export_report(request, 'inventory')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        body = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(body.startswith(UTF8_BOM))
+
+        rows = list(csv.reader(io.StringIO(body[len(UTF8_BOM):])))
+        self.assertEqual(rows[0], ['SKU', '상품명', '카테고리', '브랜드', '현재재고', '최소재고', '판매가격', '재고가치', '상태'])
+        self.assertEqual(rows[1:], [['INV-CSV-1', '재고 부족 상품', '', '', '3', '5', '1000.00', '3000.00', '재고부족']])
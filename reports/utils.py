@@ -13,8 +13,11 @@ from django.template.loader import render_to_string
 
 from products.models import Product, Category, Brand
 from orders.models import Order, OrderItem
+from orders.rollups import sales_totals
 from platforms.models import Platform, PlatformProduct
 from inventory.models import StockMovement
+from inventory.snapshot import build_inventory_snapshot, get_inventory_snapshot
+from core.timeseries import aggregate_series, GRANULARITY_DAY, GRANULARITY_MONTH
 
 class ReportGenerator:
     """보고서 생성 유틸리티 클래스"""
@@ -38,35 +41,43 @@ class ReportGenerator:
         if filters.get('low_stock_only'):
             products = products.filter(stock_quantity__lte=F('min_stock_level'))
         
+        # 재고 스냅샷 (필터가 없으면 캐시된 전체 스냅샷 사용)
+        if filters.get('category_id') or filters.get('brand_id') or filters.get('low_stock_only'):
+            snapshot = build_inventory_snapshot(products)
+        else:
+            snapshot = get_inventory_snapshot()
+        totals = snapshot['totals']
+        
         # 통계 계산
         stats = {
-            'total_products': products.count(),
-            'total_stock_quantity': products.aggregate(total=Sum('stock_quantity'))['total'] or 0,
-            'total_stock_value': products.aggregate(
-                total=Sum(F('stock_quantity') * F('selling_price'))
-            )['total'] or 0,
-            'low_stock_count': products.filter(stock_quantity__lte=F('min_stock_level')).count(),
-            'out_of_stock_count': products.filter(stock_quantity=0).count(),
+            'total_products': totals['product_count'],
+            'total_stock_quantity': totals['total_stock'],
+            'total_stock_value': totals['selling_value'],
+            'low_stock_count': totals['below_min_count'],
+            'out_of_stock_count': totals['out_count'],
         }
         
         # 카테고리별 분석
-        category_analysis = products.values('category__name').annotate(
-            product_count=Count('id'),
-            total_stock=Sum('stock_quantity'),
-            total_value=Sum(F('stock_quantity') * F('selling_price')),
-            low_stock_count=Count(
-                Q(stock_quantity__lte=F('min_stock_level'))
-            )
-        ).order_by('-total_value')
+        category_analysis = sorted(
+            (
+                {
+                    'category__name': category['name'],
+                    'product_count': category['product_count'],
+                    'total_stock': category['total_stock'],
+                    'total_value': category['selling_value'],
+                    'low_stock_count': category['below_min_count'],
+                }
+                for category in snapshot['categories']
+            ),
+            key=lambda item: item['total_value'],
+            reverse=True
+        )
         
         # 재고 상태별 분석
         stock_status_analysis = {
-            'normal': products.filter(stock_quantity__gt=F('min_stock_level')).count(),
-            'low': products.filter(
-                stock_quantity__lte=F('min_stock_level'),
-                stock_quantity__gt=0
-            ).count(),
-            'out': products.filter(stock_quantity=0).count(),
+            'normal': totals['normal_count'],
+            'low': totals['low_count'],
+            'out': totals['out_count'],
         }
         
         return {
@@ -77,7 +88,7 @@ class ReportGenerator:
                 'sku', 'name', 'category__name', 'brand__name',
                 'stock_quantity', 'min_stock_level', 'selling_price'
             )),
-            'category_analysis': list(category_analysis),
+            'category_analysis': category_analysis,
             'stock_status_analysis': stock_status_analysis,
             'filters_applied': filters,
         }
@@ -112,20 +123,17 @@ class ReportGenerator:
         }
         
         # 일별 매출 추이
-        daily_sales = []
-        current_date = start_date
-        while current_date <= end_date:
-            daily_orders = orders.filter(order_date__date=current_date)
-            daily_revenue = daily_orders.filter(
-                status__in=['PROCESSING', 'SHIPPED', 'DELIVERED', 'COMPLETED']
-            ).aggregate(total=Sum('total_amount'))['total'] or 0
-            
-            daily_sales.append({
-                'date': current_date.isoformat(),
-                'orders': daily_orders.count(),
-                'revenue': float(daily_revenue),
-            })
-            current_date += timedelta(days=1)
+        daily_sales = [
+            {
+                'date': point['start'].isoformat(),
+                'orders': point['count'],
+                'revenue': float(point['total']),
+            }
+            for point in aggregate_series(
+                orders, start_date, end_date, GRANULARITY_DAY,
+                value_filter=Q(status__in=['PROCESSING', 'SHIPPED', 'DELIVERED', 'COMPLETED'])
+            )
+        ]
         
         # 플랫폼별 분석
         platform_analysis = completed_orders.values('platform__name').annotate(
@@ -176,30 +184,15 @@ class ReportGenerator:
         
         # 월별 매출 추이
         monthly_revenue = []
-        current_month = start_date.replace(day=1)
-        
-        while current_month <= end_date:
-            next_month = (current_month + timedelta(days=32)).replace(day=1)
-            month_end = min(next_month - timedelta(days=1), end_date)
-            
-            month_revenue = completed_orders.filter(
-                order_date__date__gte=current_month,
-                order_date__date__lte=month_end
-            ).aggregate(total=Sum('total_amount'))['total'] or 0
-            
-            month_orders = completed_orders.filter(
-                order_date__date__gte=current_month,
-                order_date__date__lte=month_end
-            ).count()
-            
+        for point in aggregate_series(completed_orders, start_date, end_date, GRANULARITY_MONTH):
+            month_revenue = point['total']
+            month_orders = point['count']
             monthly_revenue.append({
-                'month': current_month.strftime('%Y-%m'),
+                'month': point['start'].strftime('%Y-%m'),
                 'revenue': float(month_revenue),
                 'orders': month_orders,
                 'avg_order_value': float(month_revenue / month_orders) if month_orders > 0 else 0,
             })
-            
-            current_month = next_month
         
         # 재고 자산 가치
         inventory_value = Product.objects.filter(
@@ -247,24 +240,19 @@ class ChartDataGenerator:
     @staticmethod
     def get_sales_trend_data(days=30):
         """매출 추이 차트 데이터"""
-        end_date = timezone.now().date()
+        end_date = timezone.localdate()
         start_date = end_date - timedelta(days=days)
         
-        data = []
-        current_date = start_date
-        
-        while current_date <= end_date:
-            daily_revenue = Order.objects.filter(
-                order_date__date=current_date,
-                status__in=['PROCESSING', 'SHIPPED', 'DELIVERED', 'COMPLETED']
-            ).aggregate(total=Sum('total_amount'))['total'] or 0
-            
-            data.append({
-                'date': current_date.strftime('%m/%d'),
-                'revenue': float(daily_revenue)
-            })
-            
-            current_date += timedelta(days=1)
+        data = [
+            {
+                'date': point['start'].strftime('%m/%d'),
+                'revenue': float(point['total'])
+            }
+            for point in aggregate_series(
+                Order.objects.filter(status__in=['PROCESSING', 'SHIPPED', 'DELIVERED', 'COMPLETED']),
+                start_date, end_date, GRANULARITY_DAY
+            )
+        ]
         
         return {
             'labels': [item['date'] for item in data],
@@ -362,13 +350,22 @@ class ExportManager:
         self.report_data = report_data
         self.timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
     
-    def to_excel(self, filename=None):
-        """Excel 파일로 내보내기"""
+    def to_excel(self, filename=None, output=None):
+        """
+        Excel 파일로 내보내기
+        
+        output(파일 경로 또는 파일 객체)을 지정하면 constant_memory 모드로
+        그곳에 직접 작성하고, 지정하지 않으면 BytesIO 를 만들어 반환한다.
+        각 시트는 행 순서대로 작성된다.
+        """
         if not filename:
             filename = f"report_{self.timestamp}.xlsx"
         
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        if output is None:
+            output = io.BytesIO()
+            workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+        else:
+            workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
         
         # 스타일 정의
         header_format = workbook.add_format({
@@ -391,7 +388,8 @@ class ExportManager:
             self._write_financial_excel(workbook, header_format, data_format, currency_format, number_format)
         
         workbook.close()
-        output.seek(0)
+        if hasattr(output, 'seek'):
+            output.seek(0)
         
         return output, filename
     
@@ -548,20 +546,15 @@ class ReportScheduler:
 
 def get_report_summary_stats():
     """보고서 대시보드용 요약 통계"""
-    today = timezone.now().date()
+    today = timezone.localdate()
     week_ago = today - timedelta(days=7)
     month_ago = today - timedelta(days=30)
     
     try:
-        # 매출 통계
-        total_revenue = Order.objects.filter(
-            order_date__date__gte=month_ago,
-            status__in=['PROCESSING', 'SHIPPED', 'DELIVERED', 'COMPLETED']
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
-        
-        total_orders = Order.objects.filter(
-            order_date__date__gte=month_ago
-        ).count()
+        # 매출 통계 (일별 매출 집계에서 조회)
+        revenue_statuses = ['PROCESSING', 'SHIPPED', 'DELIVERED', 'COMPLETED']
+        total_revenue = sales_totals(month_ago, statuses=revenue_statuses)['revenue']
+        total_orders = sales_totals(month_ago)['orders']
         
         # 상품 통계
         total_products = Product.objects.filter(status='ACTIVE').count()
@@ -574,11 +567,8 @@ def get_report_summary_stats():
         connected_platforms = Platform.objects.filter(is_active=True).count()
         
         # 오늘 활동
-        today_orders = Order.objects.filter(order_date__date=today).count()
-        today_revenue = Order.objects.filter(
-            order_date__date=today,
-            status__in=['PROCESSING', 'SHIPPED', 'DELIVERED', 'COMPLETED']
-        ).aggregate(total=Sum('total_amount'))['total'] or 0
+        today_orders = sales_totals(today, today)['orders']
+        today_revenue = sales_totals(today, today, statuses=revenue_statuses)['revenue']
         
         return {
             'total_revenue': total_revenue,
@@ -3,12 +3,12 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from django.http import JsonResponse, HttpResponse, Http404
+from django.http import FileResponse, JsonResponse, HttpResponse, Http404
 from django.db.models import Sum, Count, Avg, F, Q, Case, When, Value, CharField
 from django.utils import timezone
 from django.core.paginator import Paginator
 from django.contrib import messages
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from datetime import datetime, timedelta, date
 import json
 import csv
@@ -27,12 +27,15 @@ from django.db.models import DecimalField
 # 모델 임포트
 from .models import ReportTemplate, GeneratedReport, ReportSchedule, ReportBookmark
 from products.models import Product, Category, Brand
+from core.exports import iter_values, streaming_csv_response
 from orders.models import Order, OrderItem
 from platforms.models import Platform, PlatformProduct
 from inventory.models import StockMovement
+from inventory.snapshot import build_inventory_snapshot, get_inventory_snapshot
 
 # 보고서 생성 유틸리티
 from .utils import ReportGenerator, ChartDataGenerator, ExportManager
+from .excel_exports import InventoryExcelExport, InventoryStatusExcelExport, SalesExcelExport, export_excel
 
 @login_required
 def reports_dashboard(request):
@@ -454,7 +457,7 @@ def export_report(request, report_type):
     format_type = request.GET.get('format', 'excel')
     
     if report_type == 'inventory':
-        return export_inventory_report(request, format_type)
+        return export_inventory_report_file(request, format_type)
     elif report_type == 'sales':
         return export_sales_report(request, format_type)
     elif report_type == 'financial':
@@ -463,100 +466,34 @@ def export_report(request, report_type):
         messages.error(request, '지원하지 않는 보고서 유형입니다.')
         return redirect('reports:dashboard')
 
-def export_inventory_report(request, format_type):
-    """재고 보고서 내보내기"""
+def export_inventory_report_file(request, format_type):
+    """재고 보고서 내보내기 (아래 고급 재고 리포트의 export_inventory_report 와 구분)"""
     products = Product.objects.select_related('category', 'brand').filter(status='ACTIVE')
     
     if format_type == 'excel':
-        # Excel 파일 생성
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-        worksheet = workbook.add_worksheet('재고 보고서')
-        
-        # 헤더 스타일
-        header_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#4F46E5',
-            'font_color': 'white',
-            'align': 'center',
-            'valign': 'vcenter',
-            'border': 1
-        })
-        
-        # 데이터 스타일
-        data_format = workbook.add_format({'border': 1, 'align': 'center'})
-        number_format = workbook.add_format({'border': 1, 'num_format': '#,##0'})
-        currency_format = workbook.add_format({'border': 1, 'num_format': '#,##0"원"'})
-        
-        # 헤더 작성
-        headers = ['SKU', '상품명', '카테고리', '브랜드', '현재재고', '최소재고', '판매가격', '재고가치', '상태']
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header, header_format)
-        
-        # 데이터 작성
-        for row, product in enumerate(products, 1):
-            stock_value = product.stock_quantity * product.selling_price
-            status = '재고부족' if product.stock_quantity <= product.min_stock_level else '정상'
-            
-            worksheet.write(row, 0, product.sku, data_format)
-            worksheet.write(row, 1, product.name, data_format)
-            worksheet.write(row, 2, product.category.name if product.category else '', data_format)
-            worksheet.write(row, 3, product.brand.name if product.brand else '', data_format)
-            worksheet.write(row, 4, product.stock_quantity, number_format)
-            worksheet.write(row, 5, product.min_stock_level, number_format)
-            worksheet.write(row, 6, product.selling_price, currency_format)
-            worksheet.write(row, 7, stock_value, currency_format)
-            worksheet.write(row, 8, status, data_format)
-        
-        # 컬럼 너비 조정
-        worksheet.set_column('A:A', 15)  # SKU
-        worksheet.set_column('B:B', 30)  # 상품명
-        worksheet.set_column('C:C', 15)  # 카테고리
-        worksheet.set_column('D:D', 15)  # 브랜드
-        worksheet.set_column('E:E', 10)  # 현재재고
-        worksheet.set_column('F:F', 10)  # 최소재고
-        worksheet.set_column('G:G', 12)  # 판매가격
-        worksheet.set_column('H:H', 15)  # 재고가치
-        worksheet.set_column('I:I', 10)  # 상태
-        
-        workbook.close()
-        output.seek(0)
-        
-        response = HttpResponse(
-            output.read(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="재고보고서_{timezone.now().strftime("%Y%m%d")}.xlsx"'
-        return response
+        return export_excel(request, InventoryExcelExport())
     
     elif format_type == 'csv':
-        # CSV 파일 생성
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
-        response['Content-Disposition'] = f'attachment; filename="재고보고서_{timezone.now().strftime("%Y%m%d")}.csv"'
-        
-        # BOM 추가 (Excel에서 한글 깨짐 방지)
-        response.write('\ufeff')
-        
-        writer = csv.writer(response)
-        writer.writerow(['SKU', '상품명', '카테고리', '브랜드', '현재재고', '최소재고', '판매가격', '재고가치', '상태'])
-        
-        for product in products:
-            stock_value = product.stock_quantity * product.selling_price
-            status = '재고부족' if product.stock_quantity <= product.min_stock_level else '정상'
-            
-            writer.writerow([
-                product.sku,
-                product.name,
-                product.category.name if product.category else '',
-                product.brand.name if product.brand else '',
-                product.stock_quantity,
-                product.min_stock_level,
-                product.selling_price,
-                stock_value,
-                status
-            ])
-        
-        return response
+        # CSV 파일 스트리밍
+        header = ['SKU', '상품명', '카테고리', '브랜드', '현재재고', '최소재고', '판매가격', '재고가치', '상태']
+        fields = ['sku', 'name', 'category__name', 'brand__name', 'stock_quantity', 'min_stock_level', 'selling_price']
+        
+        def rows():
+            for (sku, name, category_name, brand_name, stock_quantity,
+                 min_stock_level, selling_price) in iter_values(products, fields):
+                yield [
+                    sku,
+                    name,
+                    category_name or '',
+                    brand_name or '',
+                    stock_quantity,
+                    min_stock_level,
+                    selling_price,
+                    stock_quantity * selling_price,
+                    '재고부족' if stock_quantity <= min_stock_level else '정상'
+                ]
+        
+        return streaming_csv_response(f'재고보고서_{timezone.now().strftime("%Y%m%d")}.csv', header, rows())
     
     else:
         messages.error(request, '지원하지 않는 파일 형식입니다.')
@@ -575,67 +512,7 @@ def export_sales_report(request, format_type):
     ).select_related('platform')
     
     if format_type == 'excel':
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-        worksheet = workbook.add_worksheet('매출 보고서')
-        
-        # 스타일 정의
-        header_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#059669',
-            'font_color': 'white',
-            'align': 'center',
-            'border': 1
-        })
-        
-        data_format = workbook.add_format({'border': 1})
-        currency_format = workbook.add_format({'border': 1, 'num_format': '#,##0"원"'})
-        date_format = workbook.add_format({'border': 1, 'num_format': 'yyyy-mm-dd'})
-        
-        # 헤더
-        headers = ['주문번호', '주문일', '플랫폼', '주문금액', '상태', '고객정보']
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header, header_format)
-        
-        # 데이터
-        for row, order in enumerate(orders, 1):
-            worksheet.write(row, 0, order.order_number, data_format)
-            worksheet.write(row, 1, order.order_date, date_format)
-            worksheet.write(row, 2, order.platform.name if order.platform else '', data_format)
-            worksheet.write(row, 3, order.total_amount, currency_format)
-            worksheet.write(row, 4, order.get_status_display(), data_format)
-            worksheet.write(row, 5, getattr(order, 'customer_email', ''), data_format)
-        
-        # 요약 정보 추가
-        summary_row = len(orders) + 3
-        worksheet.write(summary_row, 0, '총 주문 수:', header_format)
-        worksheet.write(summary_row, 1, len(orders), data_format)
-        
-        worksheet.write(summary_row + 1, 0, '총 매출:', header_format)
-        total_revenue = sum(order.total_amount for order in orders)
-        worksheet.write(summary_row + 1, 1, total_revenue, currency_format)
-        
-        worksheet.write(summary_row + 2, 0, '평균 주문금액:', header_format)
-        avg_order = total_revenue / len(orders) if orders else 0
-        worksheet.write(summary_row + 2, 1, avg_order, currency_format)
-        
-        # 컬럼 너비 조정
-        worksheet.set_column('A:A', 20)  # 주문번호
-        worksheet.set_column('B:B', 12)  # 주문일
-        worksheet.set_column('C:C', 15)  # 플랫폼
-        worksheet.set_column('D:D', 15)  # 주문금액
-        worksheet.set_column('E:E', 12)  # 상태
-        worksheet.set_column('F:F', 25)  # 고객정보
-        
-        workbook.close()
-        output.seek(0)
-        
-        response = HttpResponse(
-            output.read(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="매출보고서_{start_date}_{end_date}.xlsx"'
-        return response
+        return export_excel(request, SalesExcelExport({'period': period}))
     
     elif format_type == 'csv':
         response = HttpResponse(content_type='text/csv; charset=utf-8')
@@ -832,12 +709,13 @@ def download_report(request, report_id):
             user_agent=request.META.get('HTTP_USER_AGENT', '')
         )
         
-        # 파일 다운로드
-        with open(report.file_path, 'rb') as f:
-            response = HttpResponse(f.read(), content_type='application/octet-stream')
-            filename = os.path.basename(report.file_path)
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            return response
+        # 파일 다운로드 (파일 전체를 메모리에 읽지 않고 나눠 보냄)
+        return FileResponse(
+            open(report.file_path, 'rb'),
+            as_attachment=True,
+            filename=os.path.basename(report.file_path),
+            content_type='application/octet-stream'
+        )
             
     except Exception as e:
         messages.error(request, f'다운로드 중 오류가 발생했습니다: {str(e)}')
@@ -850,11 +728,21 @@ def api_report_status(request, report_id):
     """보고서 생성 상태 확인 API"""
     try:
         report = get_object_or_404(GeneratedReport, report_id=report_id, generated_by=request.user)
-        return JsonResponse({
+        summary = report.summary or {}
+        data = {
             'status': report.status,
-            'progress': 100 if report.status == 'COMPLETED' else 0,
-            'message': '보고서 생성이 완료되었습니다.' if report.status == 'COMPLETED' else '보고서를 생성 중입니다...'
-        })
+            'progress': 100 if report.status == 'COMPLETED' else summary.get('progress', 0),
+            'processed_rows': summary.get('processed_rows'),
+            'total_rows': summary.get('total_rows'),
+        }
+        if report.status == 'COMPLETED':
+            data['message'] = '보고서 생성이 완료되었습니다.'
+            data['download_url'] = report.get_file_url()
+        elif report.status == 'FAILED':
+            data['message'] = f"보고서 생성에 실패했습니다: {summary.get('error', '')}".rstrip(': ')
+        else:
+            data['message'] = '보고서를 생성 중입니다...'
+        return JsonResponse(data)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)
 
@@ -1092,19 +980,25 @@ def api_generate_report(request):
         if not template_id:
             return JsonResponse({'error': '템플릿 ID가 필요합니다.'}, status=400)
         
-        # 비동기 보고서 생성 작업 시작
-        from .tasks import generate_report_async
-        task = generate_report_async.delay(
-            template_id=template_id,
-            user_id=request.user.id,
-            filters=filters,
-            format_type=format_type
-        )
+        template = get_object_or_404(ReportTemplate, id=template_id)
+        
+        # 같은 보고서가 있으면 재사용하고, 생성 중이면 그 작업에 합류
+        from .report_cache import request_report
+        report, state = request_report(template, request.user, filters, format_type)
         
+        messages_by_state = {
+            'cached': '이미 생성된 보고서를 사용합니다.',
+            'joined': '같은 보고서를 생성 중입니다. 완료되면 함께 제공됩니다.',
+            'queued': '보고서 생성이 시작되었습니다.',
+        }
         return JsonResponse({
             'success': True,
-            'task_id': task.id,
-            'message': '보고서 생성이 시작되었습니다.'
+            'report_id': str(report.report_id),
+            'status': report.status,
+            'state': state,
+            'status_url': reverse('reports:api_report_status', args=[report.report_id]),
+            'download_url': report.get_file_url() if report.status == 'COMPLETED' else None,
+            'message': messages_by_state[state]
         })
         
     except json.JSONDecodeError:
@@ -1223,29 +1117,28 @@ def inventory_report_data(request):
             elif filters['stock_status'] == 'out':
                 products = products.filter(stock_quantity=0)
         
-        # 총 통계 계산
-        total_products = products.count()
+        # 재고 스냅샷 (필터가 없으면 캐시된 전체 스냅샷 사용)
+        if any(filters[key] for key in ('category_id', 'search', 'stock_status')):
+            snapshot = build_inventory_snapshot(products)
+        else:
+            snapshot = get_inventory_snapshot()
+        totals = snapshot['totals']
         
-        # 재고 가치 계산
+        # 재고 가치 계산 (이미지는 페이지 단위로 한 번에 가져온다)
         products_with_value = products.annotate(
             stock_value=Case(
                 When(cost_price__isnull=False, then=F('stock_quantity') * F('cost_price')),
                 default=F('stock_quantity') * F('selling_price'),
                 output_field=DecimalField(max_digits=15, decimal_places=2)
             )
-        )
+        ).prefetch_related('images')
         
         # 통계 계산
         stats = {
-            'totalProducts': total_products,
-            'totalValue': products_with_value.aggregate(
-                total=Sum('stock_value')
-            )['total'] or 0,
-            'lowStockCount': products.filter(
-                stock_quantity__lte=F('min_stock_level'),
-                stock_quantity__gt=0
-            ).count(),
-            'outOfStockCount': products.filter(stock_quantity=0).count(),
+            'totalProducts': totals['product_count'],
+            'totalValue': totals['cost_value'],
+            'lowStockCount': totals['low_count'],
+            'outOfStockCount': totals['out_count'],
         }
         
         # 정렬
@@ -1284,10 +1177,10 @@ def inventory_report_data(request):
             # 상품 이미지 URL
             image_url = None
             try:
-                if hasattr(product, 'primary_image') and product.primary_image:
-                    image_url = product.primary_image.image.url
-                elif hasattr(product, 'images') and product.images.exists():
-                    image_url = product.images.first().image.url
+                images = list(product.images.all())
+                image = next((image for image in images if image.is_primary), images[0] if images else None)
+                if image:
+                    image_url = image.image.url
             except:
                 pass
             
@@ -1307,17 +1200,15 @@ def inventory_report_data(request):
             })
         
         # 카테고리별 분석
-        category_analysis = products.values('category__name').annotate(
-            product_count=Count('id'),
-            total_stock=Sum('stock_quantity'),
-            total_value=Sum(
-                Case(
-                    When(cost_price__isnull=False, then=F('stock_quantity') * F('cost_price')),
-                    default=F('stock_quantity') * F('selling_price'),
-                    output_field=DecimalField(max_digits=15, decimal_places=2)
-                )
-            )
-        ).order_by('-total_value')[:10]
+        category_analysis = [
+            {
+                'category__name': category['name'],
+                'product_count': category['product_count'],
+                'total_stock': category['total_stock'],
+                'total_value': category['cost_value'],
+            }
+            for category in snapshot['categories'][:10]
+        ]
         
         # 재고 경고 알림 생성
         alerts = []
@@ -1353,7 +1244,7 @@ def inventory_report_data(request):
             'success': True,
             'stats': stats,
             'products': products_data,
-            'categoryAnalysis': list(category_analysis),
+            'categoryAnalysis': category_analysis,
             'alerts': alerts,
             'pagination': {
                 'currentPage': page,
@@ -1384,14 +1275,11 @@ def inventory_chart_data(request):
         
         if chart_type == 'stock_status':
             # 재고 상태별 분포
-            products = Product.objects.filter(status='ACTIVE')
+            totals = get_inventory_snapshot()['totals']
             
-            normal_count = products.filter(stock_quantity__gt=F('min_stock_level')).count()
-            low_count = products.filter(
-                stock_quantity__lte=F('min_stock_level'),
-                stock_quantity__gt=0
-            ).count()
-            out_count = products.filter(stock_quantity=0).count()
+            normal_count = totals['normal_count']
+            low_count = totals['low_count']
+            out_count = totals['out_count']
             
             data = {
                 'labels': ['정상', '부족', '품절'],
@@ -1404,20 +1292,10 @@ def inventory_chart_data(request):
             
         elif chart_type == 'category_value':
             # 카테고리별 재고 가치
-            category_data = Product.objects.filter(status='ACTIVE').values(
-                'category__name'
-            ).annotate(
-                total_value=Sum(
-                    Case(
-                        When(cost_price__isnull=False, then=F('stock_quantity') * F('cost_price')),
-                        default=F('stock_quantity') * F('selling_price'),
-                        output_field=DecimalField(max_digits=15, decimal_places=2)
-                    )
-                )
-            ).order_by('-total_value')[:10]
+            category_data = get_inventory_snapshot()['categories'][:10]
             
-            labels = [item['category__name'] or '미분류' for item in category_data]
-            values = [float(item['total_value'] or 0) / 1000000 for item in category_data]  # 백만원 단위
+            labels = [item['name'] or '미분류' for item in category_data]
+            values = [float(item['cost_value']) / 1000000 for item in category_data]  # 백만원 단위
             
             data = {
                 'labels': labels,
@@ -1478,115 +1356,12 @@ def export_inventory_report(request):
     try:
         # 필터 파라미터 받기
         if request.method == 'POST':
-            import json
             filters = json.loads(request.body)
         else:
-            filters = dict(request.GET)
+            filters = request.GET.dict()
         
-        # 상품 데이터 가져오기
-        products = Product.objects.select_related('category').filter(status='ACTIVE')
-        
-        # 필터 적용
-        if filters.get('category_id'):
-            products = products.filter(category_id=filters['category_id'])
-        if filters.get('search'):
-            search_query = filters['search']
-            products = products.filter(
-                Q(name__icontains=search_query) |
-                Q(sku__icontains=search_query)
-            )
-        
-        # Excel 파일 생성
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
-        worksheet = workbook.add_worksheet('재고현황')
-        
-        # 헤더 스타일
-        header_format = workbook.add_format({
-            'bold': True,
-            'bg_color': '#4F46E5',
-            'font_color': 'white',
-            'border': 1,
-            'align': 'center',
-            'valign': 'vcenter'
-        })
-        
-        # 데이터 스타일
-        data_format = workbook.add_format({
-            'border': 1,
-            'align': 'center',
-            'valign': 'vcenter'
-        })
-        
-        number_format = workbook.add_format({
-            'border': 1,
-            'align': 'right',
-            'valign': 'vcenter',
-            'num_format': '#,##0'
-        })
-        
-        currency_format = workbook.add_format({
-            'border': 1,
-            'align': 'right',
-            'valign': 'vcenter',
-            'num_format': '#,##0"원"'
-        })
-        
-        # 헤더 작성
-        headers = [
-            'SKU', '상품명', '카테고리', '현재고', '안전재고', 
-            '원가', '판매가', '재고가치', '재고상태', '최종수정일'
-        ]
-        
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header, header_format)
-        
-        # 데이터 작성
-        for row, product in enumerate(products, 1):
-            # 재고 상태 결정
-            if product.stock_quantity == 0:
-                status = '품절'
-            elif product.stock_quantity <= product.min_stock_level:
-                status = '부족'
-            else:
-                status = '정상'
-            
-            # 재고 가치 계산
-            cost_price = getattr(product, 'cost_price', None) or product.selling_price or 0
-            stock_value = product.stock_quantity * cost_price
-            
-            worksheet.write(row, 0, product.sku, data_format)
-            worksheet.write(row, 1, product.name, data_format)
-            worksheet.write(row, 2, product.category.name if product.category else '미분류', data_format)
-            worksheet.write(row, 3, product.stock_quantity, number_format)
-            worksheet.write(row, 4, product.min_stock_level, number_format)
-            worksheet.write(row, 5, float(cost_price), currency_format)
-            worksheet.write(row, 6, float(product.selling_price or 0), currency_format)
-            worksheet.write(row, 7, float(stock_value), currency_format)
-            worksheet.write(row, 8, status, data_format)
-            worksheet.write(row, 9, product.updated_at.strftime('%Y-%m-%d %H:%M') if product.updated_at else '', data_format)
-        
-        # 열 너비 조정
-        worksheet.set_column('A:A', 15)
-        worksheet.set_column('B:B', 30)
-        worksheet.set_column('C:C', 15)
-        worksheet.set_column('D:H', 12)
-        worksheet.set_column('I:I', 10)
-        worksheet.set_column('J:J', 18)
-        
-        workbook.close()
-        output.seek(0)
-        
-        # HTTP 응답
-        response = HttpResponse(
-            output.read(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        
-        filename = f'inventory_report_{timezone.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-        
-        return response
+        params = {key: filters[key] for key in ('category_id', 'search') if filters.get(key)}
+        return export_excel(request, InventoryStatusExcelExport(params))
         
     except Exception as e:
         messages.error(request, f'내보내기 실패: {str(e)}')
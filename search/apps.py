@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class SearchConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'search'
-    verbose_name = '검색'
\ No newline at end of file
+    verbose_name = '검색'
+
+    def ready(self):
+        import search.signals  # 검색 색인 시그널 등록
\ No newline at end of file
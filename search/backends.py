@@ -0,0 +1,232 @@
+# search/backends.py
+"""
+상품 검색 백엔드
+
+상품명/SKU/설명을 icontains 로 순차 검색하는 대신, 2-gram 으로 분해한
+검색어 색인(ProductSearchDocument)을 조회한다. 한국어는 띄어쓰기 단위가
+형태소와 일치하지 않으므로 모든 단어를 2글자씩 잘라 색인하고, 검색어도
+같은 방식으로 잘라 모든 조각이 포함된 상품을 찾는다.
+
+- PostgresProductSearchBackend: tsvector + GIN 색인, ts_rank 순 정렬
+- SQLiteProductSearchBackend: FTS5 가상 테이블, bm25 순 정렬 (개발/테스트용)
+- ProductSearchBackend: 색인 없이 icontains 로 검색 (기타 DB)
+
+사용할 백엔드는 SEARCH_SETTINGS['PRODUCT_BACKEND'] 로 지정하며, 지정하지
+않으면 DB 종류에 따라 선택된다. 색인은 상품 저장 시그널에서 갱신되고,
+rebuild_search_index 명령으로 재구축할 수 있다. 색인 도입 전에 등록된 상품은
+search/migrations/0002_backfill_search_index 에서 색인한다.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from products.models import Product
+
+from .models import ProductSearchDocument
+
+NGRAM_SIZE = 2
+INDEX_BATCH_SIZE = 500
+
+# SQLite FTS5 가상 테이블 (search/migrations/0001_initial 에서 생성)
+SQLITE_FTS_TABLE = 'search_productsearch_fts'
+
+# title_terms 가중치가 body_terms 보다 높다
+TITLE_FIELDS = ['name', 'sku', 'barcode']
+BODY_FIELDS = ['short_description', 'description', 'tags']
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+def ngram_terms(text):
+    """텍스트를 단어별 2-gram 검색어 목록으로 분해 (중복 제거, 순서 유지)"""
+    terms = {}
+    for word in _WORD_RE.findall((text or '').lower()):
+        if len(word) < NGRAM_SIZE:
+            continue
+        for i in range(len(word) - NGRAM_SIZE + 1):
+            terms.setdefault(word[i:i + NGRAM_SIZE], None)
+    return list(terms)
+
+
+def product_terms(product):
+    """상품의 (상품명 검색어, 본문 검색어) 문자열"""
+    title = ' '.join(str(getattr(product, field) or '') for field in TITLE_FIELDS)
+    body = ' '.join(str(getattr(product, field) or '') for field in BODY_FIELDS)
+    return ' '.join(ngram_terms(title)), ' '.join(ngram_terms(body))
+
+
+class ProductSearchBackend:
+    """색인 없이 icontains 로 검색하는 기본 백엔드"""
+
+    uses_index = False
+
+    def search(self, queryset, query, ranked=True):
+        """
+        검색어와 일치하는 상품 쿼리셋 반환
+
+        ranked 가 True 면 search_rank 로 annotate 하고 관련도 순으로 정렬한다
+        (색인을 사용하지 않는 백엔드는 정렬을 바꾸지 않는다).
+        """
+        query = (query or '').strip()
+        if not query:
+            return queryset
+        terms = ngram_terms(query)
+        if not self.uses_index or not terms:
+            # 한 글자 검색어는 2-gram 색인으로 찾을 수 없다
+            return queryset.filter(
+                Q(name__icontains=query) |
+                Q(sku__icontains=query) |
+                Q(description__icontains=query)
+            )
+        return self.search_terms(queryset, terms, ranked)
+
+    def search_terms(self, queryset, terms, ranked):
+        raise NotImplementedError
+
+    def index_products(self, products):
+        """상품 검색 색인 생성/갱신"""
+        if not self.uses_index:
+            return 0
+        products = list(products)
+        if not products:
+            return 0
+
+        existing = {
+            document.product_id: document
+            for document in ProductSearchDocument.objects.filter(product__in=products)
+        }
+        to_create = []
+        to_update = []
+        for product in products:
+            title_terms, body_terms = product_terms(product)
+            document = existing.get(product.pk)
+            if document is None:
+                to_create.append(ProductSearchDocument(product=product, title_terms=title_terms, body_terms=body_terms))
+            elif document.title_terms != title_terms or document.body_terms != body_terms:
+                document.title_terms = title_terms
+                document.body_terms = body_terms
+                to_update.append(document)
+
+        ProductSearchDocument.objects.bulk_create(to_create, batch_size=INDEX_BATCH_SIZE)
+        ProductSearchDocument.objects.bulk_update(
+            to_update, ['title_terms', 'body_terms', 'updated_at'], batch_size=INDEX_BATCH_SIZE
+        )
+        changed = [document.product_id for document in to_create + to_update]
+        if changed:
+            self.refresh_documents(changed)
+        return len(changed)
+
+    def refresh_documents(self, product_ids):
+        """검색어가 바뀐 문서의 DB 측 색인 갱신 (백엔드별)"""
+
+    def rebuild(self):
+        """모든 상품의 검색 색인 재구축"""
+        if not self.uses_index:
+            return 0
+        ProductSearchDocument.objects.all().delete()
+        count = 0
+        products = Product.objects.only(*TITLE_FIELDS, *BODY_FIELDS).order_by('pk')
+        batch = []
+        for product in products.iterator(chunk_size=INDEX_BATCH_SIZE):
+            batch.append(product)
+            if len(batch) >= INDEX_BATCH_SIZE:
+                count += self.index_products(batch)
+                batch = []
+        count += self.index_products(batch)
+        return count
+
+
+class PostgresProductSearchBackend(ProductSearchBackend):
+    """PostgreSQL tsvector/GIN 색인 백엔드"""
+
+    uses_index = True
+    config = 'simple'
+
+    def search_terms(self, queryset, terms, ranked):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search_query = SearchQuery(
+            ' & '.join(f"'{term}'" for term in terms), config=self.config, search_type='raw'
+        )
+        queryset = queryset.filter(search_document__search_vector=search_query)
+        if ranked:
+            queryset = queryset.annotate(
+                search_rank=SearchRank('search_document__search_vector', search_query)
+            ).order_by('-search_rank', 'name')
+        return queryset
+
+    def refresh_documents(self, product_ids):
+        from django.contrib.postgres.search import SearchVector
+
+        ProductSearchDocument.objects.filter(product_id__in=product_ids).update(
+            search_vector=(
+                SearchVector('title_terms', weight='A', config=self.config) +
+                SearchVector('body_terms', weight='C', config=self.config)
+            )
+        )
+
+
+class SQLiteProductSearchBackend(ProductSearchBackend):
+    """SQLite FTS5 색인 백엔드 (FTS5 테이블은 트리거로 동기화된다)"""
+
+    uses_index = True
+
+    # bm25 열 가중치 (title_terms, body_terms)
+    title_weight = 10.0
+    body_weight = 1.0
+
+    def search_terms(self, queryset, terms, ranked):
+        document_table = ProductSearchDocument._meta.db_table
+        match = ' AND '.join(f'"{term}"' for term in terms)
+        queryset = queryset.filter(pk__in=RawSQL(
+            f'SELECT d.product_id FROM {SQLITE_FTS_TABLE} '
+            f'JOIN {document_table} d ON d.id = {SQLITE_FTS_TABLE}.rowid '
+            f'WHERE {SQLITE_FTS_TABLE} MATCH %s',
+            [match]
+        ))
+        if ranked:
+            # bm25 는 낮을수록 관련도가 높으므로 부호를 바꿔 PostgreSQL 과 맞춘다
+            queryset = queryset.annotate(search_rank=RawSQL(
+                f'SELECT -bm25({SQLITE_FTS_TABLE}, %s, %s) FROM {SQLITE_FTS_TABLE} '
+                f'JOIN {document_table} d ON d.id = {SQLITE_FTS_TABLE}.rowid '
+                f'WHERE {SQLITE_FTS_TABLE} MATCH %s AND d.product_id = {Product._meta.db_table}.id',
+                [self.title_weight, self.body_weight, match]
+            )).order_by('-search_rank', 'name')
+        return queryset
+
+
+_BACKENDS = {
+    'postgresql': PostgresProductSearchBackend,
+    'sqlite': SQLiteProductSearchBackend,
+}
+
+_backend = None
+
+
+def get_product_search_backend():
+    """설정 또는 DB 종류에 맞는 상품 검색 백엔드 반환"""
+    global _backend
+    if _backend is None:
+        backend_path = getattr(settings, 'SEARCH_SETTINGS', {}).get('PRODUCT_BACKEND')
+        if backend_path:
+            backend_class = import_string(backend_path)
+        else:
+            backend_class = _BACKENDS.get(connection.vendor, ProductSearchBackend)
+        _backend = backend_class()
+    return _backend
+
+
+def search_products(query, queryset=None, ranked=True):
+    """상품 검색 (queryset 기본값: 전체 상품)"""
+    if queryset is None:
+        queryset = Product.objects.all()
+    return get_product_search_backend().search(queryset, query, ranked=ranked)
+
+
+def index_products(products):
+    """상품 검색 색인 갱신 (bulk_create/bulk_update 후 호출)"""
+    return get_product_search_backend().index_products(products)
@@ -0,0 +1,22 @@
+# search/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+
+from search.backends import get_product_search_backend
+
+
+class Command(BaseCommand):
+    help = '상품 검색 색인을 재구축합니다'
+
+    def handle(self, *args, **options):
+        backend = get_product_search_backend()
+        if not backend.uses_index:
+            self.stdout.write(
+                self.style.WARNING(f'{type(backend).__name__} 는 검색 색인을 사용하지 않습니다.')
+            )
+            return
+
+        count = backend.rebuild()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'상품 검색 색인 {count}건을 재구축했습니다.')
+        )
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def backfill_search_index(apps, schema_editor):
+    """기존 상품 검색 색인 생성 (이후 상품은 저장 시그널에서 색인된다)"""
+    from search.backends import product_terms
+
+    Product = apps.get_model('products', 'Product')
+    ProductSearchDocument = apps.get_model('search', 'ProductSearchDocument')
+    vendor = schema_editor.connection.vendor
+    if vendor not in ('sqlite', 'postgresql'):
+        # 색인을 사용하지 않는 DB
+        return
+
+    indexed = ProductSearchDocument.objects.values('product_id')
+    products = (
+        Product.objects.exclude(pk__in=indexed)
+        .only('name', 'sku', 'barcode', 'short_description', 'description', 'tags')
+        .order_by('pk')
+    )
+    batch = []
+    for product in products.iterator(chunk_size=BATCH_SIZE):
+        title_terms, body_terms = product_terms(product)
+        batch.append(ProductSearchDocument(product_id=product.pk, title_terms=title_terms, body_terms=body_terms))
+        if len(batch) >= BATCH_SIZE:
+            ProductSearchDocument.objects.bulk_create(batch)
+            batch = []
+    ProductSearchDocument.objects.bulk_create(batch)
+
+    # SQLite FTS5 테이블은 트리거로 채워지고, PostgreSQL 은 검색 벡터를 계산한다
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchVector
+
+        ProductSearchDocument.objects.filter(search_vector__isnull=True).update(
+            search_vector=(
+                SearchVector('title_terms', weight='A', config='simple') +
+                SearchVector('body_terms', weight='C', config='simple')
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_tag_index'),
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,24 @@
+# search/models.py
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
-# Create your models here.
+
+class ProductSearchDocument(models.Model):
+    """상품 검색 색인 문서
+
+    상품명/SKU/바코드와 설명/태그를 2-gram 단위로 분해한 검색어를 저장한다.
+    PostgreSQL 에서는 search_vector(GIN 색인), SQLite 에서는 FTS5 가상
+    테이블이 이 테이블을 기준으로 색인된다. search.backends 참고.
+    """
+    product = models.OneToOneField('products.Product', on_delete=models.CASCADE, related_name='search_document', verbose_name='상품')
+    title_terms = models.TextField(blank=True, verbose_name='상품명 검색어')
+    body_terms = models.TextField(blank=True, verbose_name='본문 검색어')
+    search_vector = SearchVectorField(null=True, editable=False, verbose_name='검색 벡터')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일시')
+
+    class Meta:
+        verbose_name = '상품 검색 색인'
+        verbose_name_plural = '상품 검색 색인'
+
+    def __str__(self):
+        return f"{self.product_id} 검색 색인"
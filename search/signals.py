@@ -0,0 +1,12 @@
+# search/signals.py - 검색 색인 시그널
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from products.models import Product
+from .backends import index_products
+
+
+@receiver(post_save, sender=Product)
+def update_product_search_index(sender, instance, **kwargs):
+    """상품 저장 시 검색 색인 갱신 (삭제는 CASCADE 로 함께 제거된다)"""
+    index_products([instance])
@@ -1,3 +1,31 @@
+from importlib import import_module
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from products.models import Product
+
+from .backends import search_products
+from .models import ProductSearchDocument
+
+backfill = import_module('search.migrations.0002_backfill_search_index')
+
+
+class SearchIndexBackfillTest(TestCase):
+    """색인 도입 전에 등록된 상품도 마이그레이션 후 검색된다"""
+
+    def test_backfill_indexes_existing_products(self):
+        indexed = Product.objects.create(sku='SRCH-1', name='겨울 니트 스웨터', cost_price=500, selling_price=1000)
+        missing = Product.objects.create(sku='SRCH-2', name='겨울 패딩 점퍼', cost_price=500, selling_price=1000)
+        # 색인 도입 전 상품
+        ProductSearchDocument.objects.filter(product=missing).delete()
+        self.assertEqual(list(search_products('패딩')), [])
+
+        # RunPython 은 schema_editor.connection 만 사용
+        backfill.backfill_search_index(apps, SimpleNamespace(connection=connection))
+
+        self.assertEqual(list(search_products('패딩')), [missing])
+        self.assertEqual(set(search_products('겨울')), {indexed, missing})
+        self.assertEqual(ProductSearchDocument.objects.count(), 2)
@@ -9,6 +9,7 @@ from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from products.models import Product, Category
 from orders.models import Order
+from .backends import search_products
 from django.contrib.auth import get_user_model
 import json
 
@@ -35,11 +36,7 @@ class SearchView(LoginRequiredMixin, TemplateView):
         
         if search_type == 'all' or search_type == 'products':
             # 상품 검색
-            product_results = Product.objects.filter(
-                Q(name__icontains=query) |
-                Q(description__icontains=query) |
-                Q(sku__icontains=query)
-            ).select_related('category')
+            product_results = search_products(query, Product.objects.select_related('category'))
             
             results['products'] = product_results[:10]
             results['products_count'] = product_results.count()
@@ -85,11 +82,7 @@ def search_api(request):
     
     if search_type == 'all' or search_type == 'products':
         # 상품 검색
-        products = Product.objects.filter(
-            Q(name__icontains=query) |
-            Q(description__icontains=query) |
-            Q(sku__icontains=query)
-        ).select_related('category')[:limit]
+        products = search_products(query, Product.objects.select_related('category'))[:limit]
         
         for product in products:
             results.append({
@@ -177,10 +170,7 @@ def quick_search_api(request):
     results = []
     
     # 상품 검색 (최대 3개)
-    products = Product.objects.filter(
-        Q(name__icontains=query) |
-        Q(sku__icontains=query)
-    ).select_related('category')[:3]
+    products = search_products(query, Product.objects.select_related('category'))[:3]
     
     for product in products:
         results.append({
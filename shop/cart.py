@@ -0,0 +1,136 @@
+# shop/cart.py
+"""
+DB 장바구니 서비스
+
+장바구니는 세션 대신 CartItem 테이블(사용자/상품당 한 줄)에 둔다. 담기/수량 변경/
+삭제는 해당 줄 하나만 고치므로 장바구니 전체를 다시 쓰지 않는다.
+
+- 장바구니 화면: 장바구니 줄 조회 1번 + 상품 in_bulk 1번 (상품 수와 무관).
+- 합계(상품 종류 수, 총 수량, 총 금액)는 사용자별로 캐시한다. 장바구니가 바뀌면
+  그 사용자의 캐시를, 상품 가격이 바뀌거나 상품이 삭제되면 그 상품을 담은
+  사용자들의 캐시를 지운다 (shop.signals, 시그널이 없는 일괄 가져오기는
+  products.importer 에서 직접 호출).
+- 세션에 남아 있는 예전 장바구니는 처음 접근할 때 테이블로 옮긴다.
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from products.models import Product
+
+from .models import CartItem
+
+CART_TOTAL_KEY = 'shop_cart_total:{user_id}'
+CART_TOTAL_TIMEOUT = 60 * 10
+SESSION_CART_KEY = 'cart'
+
+
+def get_cart(user):
+    """
+    장바구니 상품과 합계
+
+    반환값: {'items': [{'product', 'quantity', 'price', 'subtotal'}], 'total': 총 금액}
+    """
+    lines = list(
+        CartItem.objects.filter(user=user).order_by('-updated_at').values_list('product_id', 'quantity')
+    )
+    products = Product.objects.select_related('brand').in_bulk([product_id for product_id, _ in lines])
+
+    items = []
+    total = Decimal('0')
+    for product_id, quantity in lines:
+        product = products[product_id]
+        price = product.effective_price
+        subtotal = price * quantity
+        total += subtotal
+        items.append({
+            'product': product,
+            'quantity': quantity,
+            'price': price,
+            'subtotal': subtotal,
+        })
+
+    cache.set(CART_TOTAL_KEY.format(user_id=user.pk), _summary(items, total), CART_TOTAL_TIMEOUT)
+    return {'items': items, 'total': total}
+
+
+def get_cart_summary(user):
+    """장바구니 합계 {'count', 'quantity', 'total'} (캐시에 없으면 get_cart 로 다시 계산)"""
+    summary = cache.get(CART_TOTAL_KEY.format(user_id=user.pk))
+    if summary is None:
+        cart = get_cart(user)
+        summary = _summary(cart['items'], cart['total'])
+    return summary
+
+
+def _summary(items, total):
+    return {
+        'count': len(items),
+        'quantity': sum(item['quantity'] for item in items),
+        'total': total,
+    }
+
+
+def add_item(user, product, quantity=1):
+    """장바구니에 담기 (이미 있으면 수량 추가)"""
+    updated = CartItem.objects.filter(user=user, product=product).update(quantity=F('quantity') + quantity)
+    if not updated:
+        try:
+            with transaction.atomic():
+                CartItem.objects.create(user=user, product=product, quantity=quantity)
+        except IntegrityError:
+            # 동시에 같은 상품을 담은 경우
+            CartItem.objects.filter(user=user, product=product).update(quantity=F('quantity') + quantity)
+    invalidate_cart(user.pk)
+
+
+def set_quantity(user, product, quantity):
+    """수량 변경 (0 이하이면 삭제)"""
+    if quantity <= 0:
+        return remove_item(user, product.pk)
+    CartItem.objects.update_or_create(user=user, product=product, defaults={'quantity': quantity})
+    invalidate_cart(user.pk)
+    return True
+
+
+def remove_item(user, product_id):
+    """장바구니에서 삭제, 삭제한 줄이 있으면 True"""
+    deleted, _ = CartItem.objects.filter(user=user, product_id=product_id).delete()
+    if deleted:
+        invalidate_cart(user.pk)
+    return bool(deleted)
+
+
+def invalidate_cart(user_id):
+    cache.delete(CART_TOTAL_KEY.format(user_id=user_id))
+
+
+def invalidate_product_carts(*product_ids):
+    """상품들을 담은 모든 사용자의 합계 캐시 삭제 (가격 변경, 상품 삭제)"""
+    user_ids = (
+        CartItem.objects.filter(product_id__in=product_ids)
+        .order_by().values_list('user_id', flat=True).distinct()
+    )
+    cache.delete_many([CART_TOTAL_KEY.format(user_id=user_id) for user_id in user_ids])
+
+
+def migrate_session_cart(request):
+    """세션 장바구니 {상품 ID: 수량} 를 테이블로 옮기고 세션에서 삭제"""
+    session_cart = request.session.get(SESSION_CART_KEY)
+    if session_cart is None:
+        return
+
+    product_ids = list(Product.objects.filter(pk__in=list(session_cart)).values_list('pk', flat=True))
+    existing = dict(
+        CartItem.objects.filter(user=request.user, product_id__in=product_ids).values_list('product_id', 'quantity')
+    )
+    for product_id in product_ids:
+        quantity = session_cart[str(product_id)] + existing.get(product_id, 0)
+        CartItem.objects.update_or_create(
+            user=request.user, product_id=product_id, defaults={'quantity': quantity}
+        )
+
+    del request.session[SESSION_CART_KEY]
+    invalidate_cart(request.user.pk)
@@ -30,3 +30,36 @@ class Wishlist(models.Model):
     
     def __str__(self):
         return f"{self.user.username} - {self.product.name}"
+
+
+class CartItem(models.Model):
+    """장바구니 상품 (사용자/상품당 한 줄)"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='cart_items',
+        verbose_name='사용자'
+    )
+    product = models.ForeignKey(
+        'products.Product',
+        on_delete=models.CASCADE,
+        related_name='cart_items',
+        verbose_name='상품'
+    )
+    quantity = models.PositiveIntegerField(
+        default=1,
+        verbose_name='수량'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='수정일시'
+    )
+    
+    class Meta:
+        db_table = 'shop_cart_items'
+        verbose_name = '장바구니 상품'
+        verbose_name_plural = '장바구니 상품'
+        unique_together = ['user', 'product']
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.product_id} x {self.quantity}"
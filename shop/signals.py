@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from products.models import Product, ProductPriceHistory
+
+from .cart import invalidate_product_carts
+
+
+@receiver(post_save, sender=ProductPriceHistory)
+def invalidate_cart_totals_on_price_change(sender, instance, created, **kwargs):
+    """
+    가격 변경 이력이 생기면 해당 상품을 담은 장바구니 합계 캐시 삭제
+
+    이력은 Product pre_save 에서 새 가격을 저장하기 전에 만들어지므로, 그 사이
+    이전 가격으로 다시 캐시되지 않도록 커밋 후에 삭제한다.
+    """
+    if created:
+        product_id = instance.product_id
+        transaction.on_commit(lambda: invalidate_product_carts(product_id))
+
+
+@receiver(pre_delete, sender=Product)
+def invalidate_cart_totals_on_product_delete(sender, instance, **kwargs):
+    """상품 삭제 전 (장바구니 줄이 함께 삭제되기 전) 합계 캐시 삭제"""
+    invalidate_product_carts(instance.pk)
@@ -1,3 +1,44 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from products.importer import ProductImportPipeline
+from products.models import Product
+
+from .cart import add_item, get_cart_summary
+
+
+class CartTotalInvalidationTest(TestCase):
+    """상품 가격이 바뀌면 캐시된 장바구니 합계도 바뀐다"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='buyer', password='pass')
+        self.product = Product.objects.create(sku='CART-1', name='장바구니 상품', cost_price=500, selling_price=1000)
+        add_item(self.user, self.product, quantity=2)
+        self.assertEqual(get_cart_summary(self.user)['total'], Decimal('2000'))
+
+    def test_price_change_on_save(self):
+        self.product.selling_price = 1500
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+
+        self.assertEqual(get_cart_summary(self.user)['total'], Decimal('3000'))
+
+    def test_price_change_is_invalidated_after_commit(self):
+        with mock.patch('shop.signals.invalidate_product_carts') as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.product.selling_price = 1500
+                self.product.save()
+                invalidate.assert_not_called()
+        invalidate.assert_called_once_with(self.product.pk)
+
+    def test_price_change_by_bulk_import(self):
+        row = {'SKU': 'CART-1', '상품명': '장바구니 상품', '원가': '500', '판매가': '1200', '재고수량': '0'}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = ProductImportPipeline(update_existing=True).run([row])
+
+        self.assertEqual(result['updated_count'], 1)
+        self.assertEqual(get_cart_summary(self.user)['total'], Decimal('2400'))
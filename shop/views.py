@@ -5,6 +5,9 @@ from django.db.models import Q
 from products.models import Product, Category
 from orders.models import Order, OrderItem
 from core.models import SystemSettings
+from products.category_tree import descendant_ids, get_category_tree
+from search.backends import search_products
+from . import cart
 
 
 def home(request):
@@ -38,53 +41,37 @@ def product_list(request):
         selected_category = category
         
         # 선택된 카테고리와 모든 하위 카테고리의 상품 가져오기
-        categories_to_filter = [category]
-        
-        # 모든 하위 카테고리 찾기 (재귀적으로)
-        def get_descendants(cat):
-            children = Category.objects.filter(parent=cat, is_active=True)
-            descendants = list(children)
-            for child in children:
-                descendants.extend(get_descendants(child))
-            return descendants
-        
-        categories_to_filter.extend(get_descendants(category))
-        
-        # 카테고리 리스트로 필터링
-        products = products.filter(category__in=categories_to_filter)
+        products = products.filter(category_id__in=descendant_ids(category.id))
     
     # 검색
     search_query = request.GET.get('q')
+    sort_by = request.GET.get('sort')
     if search_query:
-        products = products.filter(
-            Q(name__icontains=search_query) |
-            Q(description__icontains=search_query)
-        )
+        # 정렬을 지정하지 않으면 관련도 순
+        products = search_products(search_query, products, ranked=not sort_by)
     
     # 정렬
-    sort_by = request.GET.get('sort', '-created_at')
-    products = products.order_by(sort_by)
-    
-    # 카테고리 트리 구조 생성 (사이드바용)
-    def build_category_tree():
-        root_categories = Category.objects.filter(parent__isnull=True, is_active=True)
-        
-        def build_tree(categories):
-            tree = []
-            for cat in categories:
-                children = Category.objects.filter(parent=cat, is_active=True)
-                tree.append({
-                    'category': cat,
-                    'children': build_tree(children) if children else []
-                })
-            return tree
-        
-        return build_tree(root_categories)
+    if sort_by or not search_query:
+        products = products.order_by(sort_by or '-created_at')
+    
+    # 카테고리 트리 구조 생성 (사이드바용, 캐시된 트리 + 활성 카테고리 한 번 조회)
+    active_categories = list(Category.objects.filter(is_active=True))
+    categories_by_id = {cat.id: cat for cat in active_categories}
+    tree = get_category_tree()
+    
+    def build_tree(category_ids):
+        return [
+            {
+                'category': categories_by_id[cat_id],
+                'children': build_tree(tree.child_ids(cat_id))
+            }
+            for cat_id in category_ids if cat_id in categories_by_id
+        ]
     
     context = {
         'products': products,
-        'categories': Category.objects.filter(is_active=True),
-        'category_tree': build_category_tree(),
+        'categories': active_categories,
+        'category_tree': build_tree(tree.child_ids()),
         'current_category': category_id,
         'selected_category': selected_category,
         'search_query': search_query,
@@ -110,30 +97,12 @@ def product_detail(request, pk):
 @login_required
 def cart_view(request):
     """장바구니"""
-    # 세션 기반 장바구니 구현
-    cart = request.session.get('cart', {})
-    cart_items = []
-    total = 0
-    
-    for product_id, quantity in cart.items():
-        try:
-            product = Product.objects.get(id=product_id)
-            price = product.effective_price
-            subtotal = price * quantity
-            total += subtotal
-            cart_items.append({
-                'product': product,
-                'quantity': quantity,
-                'price': price,
-                'subtotal': subtotal,
-            })
-        except Product.DoesNotExist:
-            # 상품이 삭제된 경우 장바구니에서 제거
-            del cart[product_id]
+    cart.migrate_session_cart(request)
+    user_cart = cart.get_cart(request.user)
     
     context = {
-        'cart_items': cart_items,
-        'total': total,
+        'cart_items': user_cart['items'],
+        'total': user_cart['total'],
     }
     return render(request, 'shop/cart.html', context)
 
@@ -142,16 +111,10 @@ def cart_view(request):
 def add_to_cart(request, product_id):
     """장바구니에 추가"""
     product = get_object_or_404(Product, id=product_id, status='ACTIVE')
-    cart = request.session.get('cart', {})
-    
     quantity = int(request.POST.get('quantity', 1))
     
-    if str(product_id) in cart:
-        cart[str(product_id)] += quantity
-    else:
-        cart[str(product_id)] = quantity
-    
-    request.session['cart'] = cart
+    cart.migrate_session_cart(request)
+    cart.add_item(request.user, product, quantity)
     messages.success(request, f'{product.name}이(가) 장바구니에 추가되었습니다.')
     
     return redirect('shop:cart')
@@ -162,7 +125,6 @@ def update_cart_item(request, product_id):
     """장바구니 수량 업데이트"""
     if request.method == 'POST':
         product = get_object_or_404(Product, id=product_id, status='ACTIVE')
-        cart = request.session.get('cart', {})
         
         quantity = int(request.POST.get('quantity', 1))
         
@@ -172,14 +134,10 @@ def update_cart_item(request, product_id):
             return redirect('shop:cart')
         
         if quantity > 0:
-            cart[str(product_id)] = quantity
-            request.session['cart'] = cart
+            cart.set_quantity(request.user, product, quantity)
             messages.success(request, '수량이 변경되었습니다.')
-        else:
-            if str(product_id) in cart:
-                del cart[str(product_id)]
-                request.session['cart'] = cart
-                messages.success(request, '상품이 장바구니에서 제거되었습니다.')
+        elif cart.remove_item(request.user, product.pk):
+            messages.success(request, '상품이 장바구니에서 제거되었습니다.')
     
     return redirect('shop:cart')
 
@@ -187,11 +145,7 @@ def update_cart_item(request, product_id):
 @login_required
 def remove_from_cart(request, product_id):
     """장바구니에서 제거"""
-    cart = request.session.get('cart', {})
-    
-    if str(product_id) in cart:
-        del cart[str(product_id)]
-        request.session['cart'] = cart
+    if cart.remove_item(request.user, product_id):
         messages.success(request, '상품이 장바구니에서 제거되었습니다.')
     
     return redirect('shop:cart')
@@ -53,6 +53,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -80,6 +81,7 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'accounts.context_processors.user_permissions',
                 'core.context_processors.system_settings',
+                'shop.context_processors.cart_summary',
             ],
         },
     },
@@ -258,6 +260,16 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 
 # Platform sync settings
 PLATFORM_SYNC_INTERVAL = 300  # 5 minutes
+PLATFORM_SYNC_SETTINGS = {
+    'MAX_WORKERS': 4,  # concurrently synced platforms
+    'PAGE_SIZE': 100,
+    'REQUEST_TIMEOUT': 30,
+    'DELTA_SYNC': True,  # skip unchanged items, request changes since last sync
+    'RATE_LIMITS': {  # requests per second per platform type
+        'SMARTSTORE': 2,
+        'COUPANG': 5,
+    },
+}
 
 # Admin settings
 ADMINS = [
@@ -282,6 +294,30 @@ NOTIFICATION_SETTINGS = {
     'BATCH_SIZE': 100,
     'RETENTION_DAYS': 30,
     'REAL_TIME_ENABLED': True,
+    'SNAPSHOT_SIZE': 10,  # WebSocket 연결 시 스냅샷에 담는 최근 알림 수
+}
+
+# Report settings
+REPORT_SETTINGS = {
+    'EXCEL_ASYNC_ROW_THRESHOLD': 20000,  # 이 행 수를 넘는 Excel 내보내기는 Celery 작업으로 생성
+    'RETENTION_DAYS': 7,  # 생성된 보고서/내보내기 파일 보관 기간
+}
+
+# Request metrics settings (core.metrics)
+METRICS_SETTINGS = {
+    'ENABLED': True,
+    'FLUSH_INTERVAL': 10,  # 공유 캐시에 기록하는 간격 (초)
+    'SLOW_REQUEST_MS': 1000,  # 이 시간(ms)을 넘는 요청은 경고 로그
+    'QUERY_BUDGET': 50,  # 이 쿼리 수를 넘는 요청은 경고 로그
+    'TOP_FINGERPRINTS': 5,  # 경고 로그에 남기는 반복 SQL 수
+}
+
+# Chat settings (chat.message_buffer, chat.scheduler)
+CHAT_SETTINGS = {
+    'MESSAGE_BATCH_SIZE': 50,  # 이 수만큼 모이면 메시지를 한 번에 저장
+    'MESSAGE_FLUSH_INTERVAL_MS': 50,  # 첫 메시지 후 이 시간(ms)이 지나면 저장
+    'MAX_CHATS_PER_AGENT': 5,  # 상담원 한 명에게 자동 배정하는 최대 진행 채팅 수 (chat.scheduler)
+    'AGENT_PRESENCE_TIMEOUT': 120,  # 대시보드 ping 이 이 시간(초) 동안 없으면 상담원을 접속 해제로 간주
 }
 
 # Search settings
@@ -289,6 +325,7 @@ SEARCH_SETTINGS = {
     'RESULTS_PER_PAGE': 20,
     'QUICK_SEARCH_LIMIT': 5,
     'MIN_SEARCH_LENGTH': 2,
+    'PRODUCT_BACKEND': None,  # dotted path; None = by DB vendor (search.backends)
 }
 
 # Channels Layer configuration
@@ -47,10 +47,17 @@ class NotificationManager {
     
     handleMessage(data) {
         switch (data.type) {
+            case 'snapshot':
+                // 연결 시 스냅샷: 개수만 맞추고 토스트는 띄우지 않음
+                this.setNotificationCount(data.data.unread_count);
+                break;
             case 'notification':
                 this.showNotification(data.data);
                 this.updateNotificationUI(data.data);
                 break;
+            case 'read':
+                this.setNotificationCount(data.data.unread_count);
+                break;
             default:
                 console.log('알 수 없는 메시지 타입:', data.type);
         }
@@ -188,6 +195,14 @@ class NotificationManager {
         }
     }
     
+    setNotificationCount(count) {
+        const badgeElement = document.querySelector('.notification-badge');
+        if (badgeElement) {
+            badgeElement.textContent = count > 99 ? '99+' : count;
+            badgeElement.style.display = count > 0 ? 'flex' : 'none';
+        }
+    }
+    
     decrementNotificationCount() {
         const badgeElement = document.querySelector('.notification-badge');
         if (badgeElement) {